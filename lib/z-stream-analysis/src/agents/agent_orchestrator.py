@@ -5,6 +5,12 @@ Bridges Claude Code agents with the actual Python service implementations.
 
 This module connects the high-level agent definitions with the real
 JenkinsIntelligenceService, EnvironmentValidationService, and RepositoryAnalysisService.
+
+The services are synchronous (curl/oc/git subprocesses), so adapters run them
+in a thread pool executor and never block the event loop. Within one
+investigation, Jenkins extraction and environment validation run concurrently;
+repository analysis starts as soon as Jenkins metadata is available. The
+orchestrator can analyze many Jenkins URLs concurrently in a single loop.
 """
 
 import asyncio
@@ -13,10 +19,11 @@ import logging
 import os
 import sys
 import uuid
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
@@ -58,10 +65,12 @@ class InvestigationAgentAdapter:
     to real service implementations.
     """
     
-    def __init__(self, context: AgentContext):
+    def __init__(self, context: AgentContext, executor: Optional[Executor] = None):
         self.logger = logging.getLogger(f"{__name__}.InvestigationAgent")
         self.context = context
         self.agent_id = "investigation-intelligence-agent"
+        # None = the event loop's default executor
+        self.executor = executor
         
         # Initialize real services
         self.jenkins_service = JenkinsIntelligenceService()
@@ -70,56 +79,45 @@ class InvestigationAgentAdapter:
         
         self.logger.info(f"Investigation Agent Adapter initialized for: {context.investigation_id}")
     
-    async def execute_investigation(self) -> AgentResult:
-        """Execute the full investigation phase using real services."""
-        start_time = datetime.utcnow()
-        errors = []
-        result = {
-            'jenkins_analysis': {},
-            'environment_assessment': {},
-            'repository_intelligence': {},
-            'evidence_correlation': {}
-        }
-        confidence = 0.0
-        
+    async def _run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a synchronous service call in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+    
+    async def _jenkins_phase(self) -> Tuple[Any, Dict[str, Any], float, Optional[str]]:
+        """Phase 1: Jenkins Intelligence Extraction (Real)"""
         try:
-            # Phase 1: Jenkins Intelligence Extraction (Real)
             self.logger.info("Phase 1: Extracting Jenkins intelligence...")
-            jenkins_intel = self.jenkins_service.analyze_jenkins_url(self.context.jenkins_url)
-            result['jenkins_analysis'] = self.jenkins_service.to_dict(jenkins_intel)
-            confidence += 0.3
-            
+            jenkins_intel = await self._run_blocking(
+                self.jenkins_service.analyze_jenkins_url, self.context.jenkins_url
+            )
+            return jenkins_intel, self.jenkins_service.to_dict(jenkins_intel), 0.3, None
         except Exception as e:
             self.logger.error(f"Jenkins analysis failed: {e}")
-            errors.append(f"Jenkins analysis: {str(e)}")
-            jenkins_intel = None
-        
+            return None, {}, 0.0, f"Jenkins analysis: {str(e)}"
+    
+    async def _environment_phase(self) -> Tuple[Dict[str, Any], float, Optional[str]]:
+        """Phase 2: Environment Validation (Real)"""
         try:
-            # Phase 2: Environment Validation (Real)
             self.logger.info("Phase 2: Validating environment...")
             
-            # Extract cluster info from Jenkins parameters if available
-            cluster_name = None
-            if jenkins_intel:
-                env_info = jenkins_intel.environment_info
-                cluster_name = env_info.get('cluster_name')
-            
+            # Runs alongside Phase 1: the service only reads cluster state and
+            # does not depend on anything extracted from Jenkins.
             namespaces = ['open-cluster-management', 'default']
-            env_validation = self.env_service.validate_environment(
-                cluster_name=cluster_name,
+            env_validation = await self._run_blocking(
+                self.env_service.validate_environment,
                 namespaces=namespaces
             )
-            result['environment_assessment'] = self.env_service.to_dict(env_validation)
-            
-            if env_validation.cluster_connectivity:
-                confidence += 0.2
-                
+            confidence = 0.2 if env_validation.cluster_connectivity else 0.0
+            return self.env_service.to_dict(env_validation), confidence, None
         except Exception as e:
             self.logger.error(f"Environment validation failed: {e}")
-            errors.append(f"Environment validation: {str(e)}")
-        
+            return {}, 0.0, f"Environment validation: {str(e)}"
+    
+    async def _repository_phase(self, jenkins_task: 'asyncio.Future') -> Tuple[Dict[str, Any], float, Optional[str]]:
+        """Phase 3: Repository Analysis (Real) - needs branch/job from Phase 1."""
+        jenkins_intel = (await jenkins_task)[0]
         try:
-            # Phase 3: Repository Analysis (Real)
             self.logger.info("Phase 3: Analyzing repository...")
             
             branch = None
@@ -128,18 +126,42 @@ class InvestigationAgentAdapter:
                 branch = jenkins_intel.metadata.branch
                 job_name = jenkins_intel.metadata.job_name
             
-            repo_analysis = self.repo_service.analyze_repository(
+            repo_analysis = await self._run_blocking(
+                self.repo_service.analyze_repository,
                 branch=branch,
                 job_name=job_name
             )
-            result['repository_intelligence'] = self.repo_service.to_dict(repo_analysis)
-            
-            if repo_analysis.repository_cloned:
-                confidence += 0.2
-                
+            confidence = 0.2 if repo_analysis.repository_cloned else 0.0
+            return self.repo_service.to_dict(repo_analysis), confidence, None
         except Exception as e:
             self.logger.error(f"Repository analysis failed: {e}")
-            errors.append(f"Repository analysis: {str(e)}")
+            return {}, 0.0, f"Repository analysis: {str(e)}"
+    
+    async def execute_investigation(self) -> AgentResult:
+        """Execute the full investigation phase using real services."""
+        start_time = datetime.utcnow()
+        result = {
+            'jenkins_analysis': {},
+            'environment_assessment': {},
+            'repository_intelligence': {},
+            'evidence_correlation': {}
+        }
+        
+        jenkins_task = asyncio.ensure_future(self._jenkins_phase())
+        (_, jenkins_dict, jenkins_conf, jenkins_err), \
+            (env_dict, env_conf, env_err), \
+            (repo_dict, repo_conf, repo_err) = await asyncio.gather(
+                jenkins_task,
+                self._environment_phase(),
+                self._repository_phase(jenkins_task),
+            )
+        
+        result['jenkins_analysis'] = jenkins_dict
+        result['environment_assessment'] = env_dict
+        result['repository_intelligence'] = repo_dict
+        # Errors keep phase order regardless of completion order
+        errors = [e for e in (jenkins_err, env_err, repo_err) if e]
+        confidence = jenkins_conf + env_conf + repo_conf
         
         # Phase 4: Evidence Correlation
         self.logger.info("Phase 4: Correlating evidence...")
@@ -589,7 +611,9 @@ class AgentOrchestrator:
     
     def __init__(self, kubeconfig_path: Optional[str] = None,
                  repo_base_path: Optional[str] = None,
-                 output_dir: Optional[str] = None):
+                 output_dir: Optional[str] = None,
+                 max_concurrent_analyses: int = 4,
+                 max_workers: int = 8):
         """
         Initialize the agent orchestrator.
         
@@ -597,11 +621,17 @@ class AgentOrchestrator:
             kubeconfig_path: Path to kubeconfig for cluster access
             repo_base_path: Base path for repository cloning
             output_dir: Directory for output files
+            max_concurrent_analyses: Pipelines analyzed at once by analyze_many()
+            max_workers: Threads for blocking service calls, shared by all analyses
         """
         self.logger = logging.getLogger(__name__)
         self.kubeconfig_path = kubeconfig_path
         self.repo_base_path = repo_base_path or '/tmp/z-stream-repos'
         self.output_dir = output_dir or './runs'
+        self.max_concurrent_analyses = max(1, max_concurrent_analyses)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix='agent-orchestrator'
+        )
         
         self.logger.info("Agent Orchestrator initialized")
     
@@ -630,7 +660,7 @@ class AgentOrchestrator:
         
         # Phase 1: Investigation Agent
         self.logger.info("=== PHASE 1: INVESTIGATION AGENT ===")
-        investigation_adapter = InvestigationAgentAdapter(context)
+        investigation_adapter = InvestigationAgentAdapter(context, executor=self.executor)
         investigation_result = await investigation_adapter.execute_investigation()
         
         self.logger.info(f"Investigation complete. Status: {investigation_result.status}, "
@@ -679,6 +709,30 @@ class AgentOrchestrator:
         
         return result
     
+    async def analyze_many(self, jenkins_urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze several pipelines concurrently.
+        
+        At most max_concurrent_analyses run at once. Results are returned in
+        input order; a failed analysis yields {'jenkins_url', 'status': 'error',
+        'error'} instead of aborting the others.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_analyses)
+        
+        async def analyze(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.analyze_pipeline_failure(url)
+                except Exception as e:
+                    self.logger.error(f"Analysis failed for {url}: {e}")
+                    return {'jenkins_url': url, 'status': 'error', 'error': str(e)}
+        
+        return await asyncio.gather(*(analyze(url) for url in jenkins_urls))
+    
+    def shutdown(self):
+        """Release the executor threads."""
+        self.executor.shutdown(wait=False)
+    
     def _compile_evidence_sources(self, investigation: Dict[str, Any]) -> List[str]:
         """Compile list of evidence sources used."""
         sources = []
@@ -698,26 +752,35 @@ class AgentOrchestrator:
 
 
 # Convenience function for synchronous use
-def run_agent_analysis(jenkins_url: str, 
+def run_agent_analysis(jenkins_url: Union[str, List[str]], 
                        kubeconfig_path: Optional[str] = None,
-                       output_dir: Optional[str] = None) -> Dict[str, Any]:
+                       output_dir: Optional[str] = None,
+                       max_concurrent_analyses: int = 4) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
     """
     Run agent analysis synchronously.
     
     Args:
-        jenkins_url: Jenkins build URL to analyze
+        jenkins_url: Jenkins build URL to analyze, or a list of URLs to
+            analyze concurrently in one event loop
         kubeconfig_path: Optional kubeconfig path
         output_dir: Optional output directory
+        max_concurrent_analyses: Pipelines analyzed at once (list input only)
         
     Returns:
-        Complete analysis result
+        Complete analysis result, or a list of results in input order
     """
     orchestrator = AgentOrchestrator(
         kubeconfig_path=kubeconfig_path,
-        output_dir=output_dir
+        output_dir=output_dir,
+        max_concurrent_analyses=max_concurrent_analyses
     )
     
-    return asyncio.run(orchestrator.analyze_pipeline_failure(jenkins_url))
+    try:
+        if isinstance(jenkins_url, str):
+            return asyncio.run(orchestrator.analyze_pipeline_failure(jenkins_url))
+        return asyncio.run(orchestrator.analyze_many(list(jenkins_url)))
+    finally:
+        orchestrator.shutdown()
 
 
 if __name__ == '__main__':
@@ -727,16 +790,19 @@ if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
     
     if len(sys.argv) < 2:
-        print("Usage: python agent_orchestrator.py <jenkins_url>")
+        print("Usage: python agent_orchestrator.py <jenkins_url> [<jenkins_url> ...]")
         sys.exit(1)
     
-    jenkins_url = sys.argv[1]
-    result = run_agent_analysis(jenkins_url)
+    results = run_agent_analysis(sys.argv[1:])
     
-    print("\n" + "=" * 60)
-    print("ANALYSIS COMPLETE")
-    print("=" * 60)
-    print(f"Classification: {result['overall_classification']}")
-    print(f"Confidence: {result['overall_confidence']:.1%}")
-    print(f"Time: {result['total_analysis_time']:.2f}s")
-    print("=" * 60)
+    for result in results:
+        print("\n" + "=" * 60)
+        print(f"ANALYSIS COMPLETE: {result['jenkins_url']}")
+        print("=" * 60)
+        if result.get('status') == 'error':
+            print(f"Error: {result['error']}")
+        else:
+            print(f"Classification: {result['overall_classification']}")
+            print(f"Confidence: {result['overall_confidence']:.1%}")
+            print(f"Time: {result['total_analysis_time']:.2f}s")
+        print("=" * 60)
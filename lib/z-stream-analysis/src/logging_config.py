@@ -8,6 +8,15 @@ Dual-output logging using structlog with stdlib integration:
 Context propagation via contextvars — run_id and stage are automatically
 attached to every log entry from every module without parameter passing.
 
+JSONL writes are asynchronous: the calling thread only stamps the record
+with its run_id/stage and puts it on a bounded queue. A QueueListener
+thread formats records and writes them in batches, flushing when the
+queue drains or every BATCH_SIZE records. orjson is used for encoding
+when installed. If the queue fills up, DEBUG/INFO records are dropped
+(and counted) rather than blocking the pipeline; WARNING and above wait
+briefly for space. The queue is drained and the file flushed at exit,
+or explicitly with shutdown_logging().
+
 Usage:
     from src.logging_config import configure_logging, bind_context
 
@@ -22,13 +31,21 @@ Usage:
     # existing logging.getLogger(__name__) calls produce structured output
 """
 
+import atexit
 import json
 import logging
 import logging.config
+import logging.handlers
+import queue
 from contextvars import ContextVar
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # optional: fast JSON encoding for the JSONL file
+    orjson = None
 
 
 # ---------------------------------------------------------------------------
@@ -36,6 +53,8 @@ from typing import Optional
 # ---------------------------------------------------------------------------
 _run_id_var: ContextVar[str] = ContextVar("run_id", default="")
 _stage_var: ContextVar[str] = ContextVar("stage", default="init")
+# Innermost open perf span (src.services.perf_tracing), 0 outside any span
+_span_id_var: ContextVar[int] = ContextVar("span_id", default=0)
 
 # Track the JSONL log file path so callers can reference it
 _log_file_path: Optional[Path] = None
@@ -43,17 +62,41 @@ _log_file_path: Optional[Path] = None
 # Track whether configure_logging has been called
 _configured = False
 
+# Records waiting to be written before low-severity ones are dropped
+QUEUE_SIZE = 10000
+# Records written between flushes while the queue stays busy
+BATCH_SIZE = 256
+# Seconds a WARNING+ record waits for queue space before it is dropped
+BLOCK_TIMEOUT = 1.0
+
+# JSONL pipeline: root QueueHandler -> QueueListener thread -> file handlers
+_queue_handler: Optional["_ContextQueueHandler"] = None
+_listener: Optional["_BatchingQueueListener"] = None
+_file_handlers: Dict[str, logging.FileHandler] = {}
+
 
 def bind_context(**kwargs) -> None:
     """Bind context variables that appear in every subsequent log entry.
 
-    Supported keys: run_id, stage.  Unknown keys are silently ignored
-    so callers don't need to worry about the exact set of supported vars.
+    Supported keys: run_id, stage, span_id.  Unknown keys are silently
+    ignored so callers don't need to worry about the exact set of
+    supported vars.  span_id is maintained by perf_tracing.span().
     """
     if "run_id" in kwargs:
         _run_id_var.set(kwargs["run_id"])
     if "stage" in kwargs:
         _stage_var.set(kwargs["stage"])
+    if "span_id" in kwargs:
+        _span_id_var.set(kwargs["span_id"])
+
+
+def get_context() -> dict:
+    """Return the currently bound run_id, stage and span_id."""
+    return {
+        "run_id": _run_id_var.get(),
+        "stage": _stage_var.get(),
+        "span_id": _span_id_var.get(),
+    }
 
 
 def get_log_file_path() -> Optional[Path]:
@@ -98,21 +141,181 @@ class _JSONFormatter(logging.Formatter):
     """Produces one JSON object per line for the JSONL log file.
 
     Includes: timestamp (ISO-8601 UTC), level, logger, message,
-    run_id, stage, and exception info when present.
+    run_id, stage, and exception info when present.  Records logged
+    inside a perf span carry its span_id; span records themselves
+    carry the finished span under "span".
+
+    Runs on the listener thread, so run_id/stage come from the values
+    _ContextQueueHandler stamped on the record in the logging thread; the
+    contextvars are only read for records that were not queued.
     """
 
     def format(self, record):
         entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname.lower(),
             "logger": record.name,
             "message": record.getMessage(),
-            "run_id": _run_id_var.get(),
-            "stage": _stage_var.get(),
+            "run_id": getattr(record, "run_id", None) or _run_id_var.get(),
+            "stage": getattr(record, "stage", None) or _stage_var.get(),
         }
-        if record.exc_info and record.exc_info[0]:
+        span_id = getattr(record, "span_id", None)
+        if span_id is None:
+            span_id = _span_id_var.get()
+        if span_id:
+            entry["span_id"] = span_id
+        if hasattr(record, "span"):
+            entry["span"] = record.span
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info and record.exc_info[0]:
             entry["exception"] = self.formatException(record.exc_info)
-        return json.dumps(entry, default=str)
+        return _dumps(entry)
+
+
+def _dumps(entry: dict) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(entry, default=str).decode()
+        except TypeError:  # e.g. integers beyond 64 bits
+            pass
+    return json.dumps(entry, default=str)
+
+
+# ---------------------------------------------------------------------------
+# Asynchronous JSONL pipeline
+# ---------------------------------------------------------------------------
+
+class _ContextQueueHandler(logging.handlers.QueueHandler):
+    """Queues records for the JSONL listener with a bounded-drop policy.
+
+    prepare() does only what must happen on the logging thread: resolve
+    the message, render the traceback and capture run_id/stage from the
+    contextvars, which the listener thread cannot see.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        record.run_id = _run_id_var.get()
+        record.stage = _stage_var.get()
+        record.span_id = _span_id_var.get()
+        return record
+
+    def enqueue(self, record):
+        try:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=BLOCK_TIMEOUT)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _BatchingFileHandler(logging.FileHandler):
+    """FileHandler that leaves flushing to the listener (see _BatchingQueueListener)."""
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """Writes queued records in batches.
+
+    Handlers are flushed when the queue runs empty or after BATCH_SIZE
+    records, instead of after every record. Records dropped by the queue
+    handler since the last flush are reported as one warning entry.
+    """
+
+    def __init__(self, log_queue: queue.Queue, queue_handler: _ContextQueueHandler):
+        super().__init__(log_queue, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self._pending = 0
+        self._reported_drops = 0
+
+    def dequeue(self, block):
+        if self._pending >= BATCH_SIZE:
+            self.flush()
+        try:
+            record = self.queue.get_nowait()
+        except queue.Empty:
+            self.flush()
+            record = self.queue.get(block)
+        self._pending += 1
+        return record
+
+    def enqueue_sentinel(self):
+        # Wait for space: the stop signal must not be dropped
+        self.queue.put(self._sentinel)
+
+    def add_handler(self, handler: logging.Handler) -> None:
+        self.handlers = self.handlers + (handler,)
+
+    def flush(self) -> None:
+        dropped = self.queue_handler.dropped - self._reported_drops
+        if dropped:
+            self._reported_drops += dropped
+            record = logging.makeLogRecord({
+                "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"Dropped {dropped} log records: JSONL log queue was full",
+            })
+            for handler in self.handlers:
+                handler.handle(record)
+        for handler in self.handlers:
+            handler.flush()
+        self._pending = 0
+
+    def stop(self):
+        super().stop()
+        self.flush()
+
+
+def _start_pipeline(root: logging.Logger) -> None:
+    global _queue_handler, _listener
+    log_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    _queue_handler = _ContextQueueHandler(log_queue)
+    _queue_handler.setLevel(logging.DEBUG)
+    _queue_handler.set_name("z-stream-jsonl")
+    _listener = _BatchingQueueListener(log_queue, _queue_handler)
+    root.addHandler(_queue_handler)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Drain queued JSONL records, flush and close the log files.
+
+    Registered with atexit. Safe to call more than once; a later
+    configure_logging(run_dir=...) starts a new pipeline.
+    """
+    global _queue_handler, _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    for handler in _file_handlers.values():
+        handler.close()
+    _file_handlers.clear()
+
+
+atexit.register(shutdown_logging)
 
 
 # ---------------------------------------------------------------------------
@@ -133,7 +336,8 @@ def configure_logging(
 
     Safe to call multiple times — subsequent calls update the root logger
     level and add a file handler for the new run_dir if one is provided
-    and not already attached.
+    and not already attached. JSONL records are written by a background
+    listener; call shutdown_logging() (also run at exit) to flush them.
     """
     global _log_file_path, _configured
 
@@ -164,13 +368,14 @@ def configure_logging(
         log_path = run_dir / "pipeline.log.jsonl"
         _log_file_path = log_path
 
+        if _listener is None:
+            _start_pipeline(root)
+
         # Avoid duplicate file handlers for the same path
-        existing_paths = {
-            getattr(h, "baseFilename", None) for h in root.handlers
-        }
-        if str(log_path.resolve()) not in existing_paths:
-            fh = logging.FileHandler(str(log_path), encoding="utf-8")
+        resolved = str(log_path.resolve())
+        if resolved not in _file_handlers:
+            fh = _BatchingFileHandler(str(log_path), encoding="utf-8")
             fh.setLevel(logging.DEBUG)
             fh.setFormatter(_JSONFormatter())
-            fh.set_name("z-stream-jsonl")
-            root.addHandler(fh)
+            _file_handlers[resolved] = fh
+            _listener.add_handler(fh)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Report Build Cache
+
+Lets Stage 3 skip work whose inputs did not change since the last run.
+
+Every report output (Markdown, JSON breakdown, summary, HTML) is recorded
+with a key built from the fingerprints of the files it was generated from.
+On the next run an output is only rebuilt when that key differs, or when
+the file on disk is missing or was modified since it was written. Per-test
+fragments (Markdown sections, HTML test cards) are cached by a hash of the
+test's own analysis entry, so reclassifying one test re-renders one
+fragment.
+
+File fingerprints are sha256 digests. Unchanged files (same size and
+mtime as last time) reuse the recorded digest without being re-read.
+
+The cache lives in the run directory as report-cache.json. It is dropped
+whenever the report code or the analysis schema changes.
+
+Usage:
+    cache = ReportBuildCache(run_dir)
+    inputs = cache.inputs('analysis-results.json', 'core-data.json')
+    if not cache.is_fresh('markdown', md_path, inputs):
+        ...  # rebuild
+        cache.record('markdown', md_path, inputs)
+    cache.save()
+"""
+
+import hashlib
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Pattern, Union
+
+CACHE_FILENAME = 'report-cache.json'
+CACHE_VERSION = 1
+
+_APP_ROOT = Path(__file__).resolve().parent.parent
+# Changing any file in these trees, or these files, invalidates every cached
+# output and fragment. The report imports widely from src/services (run
+# artifacts, perf tracing, masking), so the whole tree is covered.
+_CODE_TREES = [
+    (_APP_ROOT / 'reports', '*.py'),
+    (_APP_ROOT / 'services', '*.py'),
+    (_APP_ROOT / 'schemas', '*.json'),
+]
+_CODE_FILES = [
+    _APP_ROOT / 'scripts' / 'report.py',
+    _APP_ROOT / 'logging_config.py',
+]
+# pipeline.log.jsonl lines written while the report itself runs
+# (json.dumps or the compact orjson layout)
+_REPORT_STAGE_MARKER = re.compile(rb'"stage": ?"report"')
+
+_code_version: Optional[str] = None
+
+
+def code_version() -> str:
+    """Digest of the report generator sources (computed once per process)."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256(str(CACHE_VERSION).encode())
+        paths = list(_CODE_FILES)
+        for root, pattern in _CODE_TREES:
+            paths.extend(sorted(root.rglob(pattern)))
+        for path in paths:
+            digest.update(str(path.relative_to(_APP_ROOT)).encode())
+            try:
+                digest.update(path.read_bytes())
+            except OSError:
+                digest.update(b'-')
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def digest_json(value: Any) -> str:
+    """Stable digest of a JSON-serializable value."""
+    data = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:20]
+
+
+def _digest_file(path: Path, skip_line: Optional[Pattern[bytes]] = None) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        if skip_line is None:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        else:
+            for line in f:
+                if not skip_line.search(line):
+                    digest.update(line)
+    return digest.hexdigest()[:20]
+
+
+class ReportBuildCache:
+    """Fingerprint-keyed record of report outputs and per-test fragments."""
+
+    def __init__(self, run_dir: Union[str, Path], enabled: bool = True):
+        """
+        Args:
+            run_dir: Run directory (inputs, outputs and the cache file live here)
+            enabled: If False, nothing is ever fresh and nothing is saved
+        """
+        self.run_dir = Path(run_dir)
+        self.enabled = enabled
+        self.path = self.run_dir / CACHE_FILENAME
+        self.logger = logging.getLogger(__name__)
+        self.rebuilt: List[str] = []
+        self.reused: List[str] = []
+
+        data = self._load() if enabled else {}
+        self._files: Dict[str, Dict[str, Any]] = data.get('files', {})
+        self._outputs: Dict[str, Dict[str, Any]] = data.get('outputs', {})
+        self._validated: Optional[str] = data.get('validated')
+        self._fragments: Dict[str, Dict[str, Any]] = data.get('fragments', {})
+        # Only fragments used by this build are kept on save
+        self._used: Dict[str, Dict[str, Any]] = {}
+        self._fragment_hits = 0
+        self._fragment_misses = 0
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('code') != code_version():
+            return {}
+        return data
+
+    # -- inputs -------------------------------------------------------------
+
+    def fingerprint(self, name: str) -> Optional[str]:
+        """
+        Fingerprint of a run-directory file (or absolute path); None if missing.
+
+        pipeline.log.jsonl is fingerprinted without report-stage lines, since
+        every report run appends to it (the HTML report leaves them out too).
+        """
+        path = self.run_dir / name
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        known = self._files.get(name)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['sha256']
+        skip = _REPORT_STAGE_MARKER if path.name == 'pipeline.log.jsonl' else None
+        sha = _digest_file(path, skip)
+        self._files[name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha}
+        return sha
+
+    def inputs(self, *names: Union[str, Path]) -> Dict[str, Optional[str]]:
+        """Fingerprints of several input files, by name."""
+        return {str(name): self.fingerprint(str(name)) for name in names}
+
+    # -- outputs ------------------------------------------------------------
+
+    def is_fresh(self, output: str, output_path: Path, inputs: Dict[str, Any]) -> bool:
+        """True if output_path was built from exactly these inputs and is untouched."""
+        record = self._outputs.get(output)
+        fresh = bool(
+            self.enabled and record
+            and record['key'] == digest_json(inputs)
+            and self._unchanged(output_path, record)
+        )
+        if fresh:
+            self.reused.append(output)
+        return fresh
+
+    def record(self, output: str, output_path: Path, inputs: Dict[str, Any]):
+        """Remember that output_path was just built from inputs."""
+        stat = Path(output_path).stat()
+        self._outputs[output] = {
+            'key': digest_json(inputs),
+            'path': Path(output_path).name,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+        self.rebuilt.append(output)
+
+    @staticmethod
+    def _unchanged(path: Path, record: Dict[str, Any]) -> bool:
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            return False
+        return stat.st_size == record['size'] and stat.st_mtime_ns == record['mtime_ns']
+
+    # -- validation ---------------------------------------------------------
+
+    def is_validated(self, fingerprint: Optional[str]) -> bool:
+        """True if analysis-results.json with this fingerprint already passed validation."""
+        return self.enabled and fingerprint is not None and self._validated == fingerprint
+
+    def mark_validated(self, fingerprint: Optional[str]):
+        self._validated = fingerprint
+
+    # -- fragments ----------------------------------------------------------
+
+    def fragment(self, kind: str, key: Any, build: Callable[[], Any]) -> Any:
+        """
+        Cached fragment for key, building (and storing) it on a miss.
+
+        Args:
+            kind: Fragment family, e.g. 'md-test' or 'html-card'
+            key: JSON-serializable value the fragment is derived from
+            build: Produces the fragment (must be JSON-serializable)
+        """
+        if not self.enabled:
+            return build()
+        digest = digest_json(key)
+        store = self._fragments.get(kind, {})
+        if digest in store:
+            value = store[digest]
+            self._fragment_hits += 1
+        else:
+            value = build()
+            self._fragment_misses += 1
+        self._used.setdefault(kind, {})[digest] = value
+        return value
+
+    # -- persistence --------------------------------------------------------
+
+    def save(self):
+        """Write the cache; failures are logged and ignored."""
+        if not self.enabled:
+            return
+        data = {
+            'version': CACHE_VERSION,
+            'code': code_version(),
+            'files': self._files,
+            'outputs': self._outputs,
+            'validated': self._validated,
+            # Families untouched by this build (their output was fresh) carry over
+            'fragments': {**self._fragments, **self._used},
+        }
+        try:
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            tmp_path.write_text(json.dumps(data, separators=(',', ':')))
+            tmp_path.replace(self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save report cache: {e}")
+            return
+        self.logger.info(
+            f"Report cache: rebuilt {self.rebuilt or 'nothing'}, reused {self.reused or 'nothing'}; "
+            f"fragments {self._fragment_hits} reused, {self._fragment_misses} rendered"
+        )
@@ -20,6 +20,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from src.reports.trace_index import TraceIndex, run_window
+from src.services.perf_tracing import PERF_SUMMARY_FILENAME
+from src.services.run_artifacts import RunArtifacts
+
 logger = logging.getLogger(__name__)
 
 CLS_COLORS = {
@@ -32,6 +36,27 @@ CLS_COLORS = {
     "FLAKY": "#a855f7",
 }
 
+# Paged mode: test cards and log/trace rows are written as chunk files next to
+# the report and rendered by the page as they scroll into view
+PAGED_DATA_DIR = "analysis-report-data"
+PAGED_TEST_THRESHOLD = 150      # auto-page above this many analyzed tests
+PAGED_ROW_THRESHOLD = 10000     # ... or this many pipeline log + trace rows
+TEST_CHUNK_SIZE = 25
+ROW_CHUNK_SIZE = 500
+
+_SLOT = re_mod.compile(r"<!--slot:([\w-]+)-->")
+
+# Performance tab: span colors and the most spans drawn on the timeline
+PERF_KIND_COLORS = {
+    "step": "#6366f1",
+    "subprocess": "#f59e0b",
+    "jenkins": "#22c55e",
+    "kg": "#ec4899",
+    "polarion": "#a855f7",
+    "http": "#06b6d4",
+}
+PERF_TIMELINE_MAX_SPANS = 1500
+
 
 def _map_diagnosis_to_health(diag: dict) -> dict:
     """Map cluster-diagnosis.json fields to the dict shape html_report rendering expects.
@@ -149,29 +174,34 @@ def esc(s):
 def _find_trace_file(run_dir: Path) -> Optional[Path]:
     """Find the most relevant agent trace file for this run.
 
-    Searches .claude/traces/ for JSONL files whose timestamps overlap with
-    the run's pipeline.log.jsonl timestamps. Falls back to the most recent
-    trace file if no overlap is found.
+    Looks up .claude/traces/trace-index.json for the trace whose events
+    overlap the run window the most (see trace_index.py). Falls back to the
+    most recently active trace file if none overlap.
     """
     traces_dir = run_dir.parent.parent / ".claude" / "traces"
     if not traces_dir.exists():
         return None
+    index = TraceIndex(traces_dir)
+    trace_file = index.find(*run_window(run_dir))
+    index.save()
+    return trace_file
 
-    trace_files = sorted(traces_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not trace_files:
-        return None
 
-    # Try to find the trace that was active during this run's time window
-    log_file = run_dir / "pipeline.log.jsonl"
-    if log_file.exists():
-        run_start = log_file.stat().st_mtime - 600  # 10 min before first log
-        run_end = log_file.stat().st_mtime + 60
-        for tf in trace_files:
-            if tf.stat().st_mtime >= run_start and tf.stat().st_ctime <= run_end:
-                return tf
+def _trace_window_key(run_dir: Path, trace_file: Optional[Path]) -> Optional[list]:
+    """Build-cache key for the trace events a report of run_dir would show.
 
-    # Fall back to most recent trace
-    return trace_files[0] if trace_files else None
+    Trace files are only appended to, so the file, a digest of its first
+    bytes and the byte range of the run window identify those events
+    without hashing the whole file.
+    """
+    if not trace_file or not trace_file.exists():
+        return None
+    index = TraceIndex(trace_file.parent)
+    span = index.window(trace_file, *run_window(run_dir))
+    index.save()
+    if span is None:
+        return None
+    return [str(trace_file), index.entries[trace_file.name].head, *span]
 
 
 def _extract_build_label(jenkins_url: str) -> str:
@@ -190,6 +220,10 @@ def _extract_build_label(jenkins_url: str) -> str:
     return jenkins_url
 
 
+# core-data sections used by the report
+CORE_SECTIONS = ('cluster_health', 'environment', 'cluster_oracle', 'cluster_landscape')
+
+
 def load_data(run_dir: Path, trace_file: Optional[Path] = None):
     with open(run_dir / "analysis-results.json") as f:
         analysis = json.load(f)
@@ -203,11 +237,8 @@ def load_data(run_dir: Path, trace_file: Optional[Path] = None):
     if env_path.exists():
         with open(env_path) as f:
             env_status = json.load(f)
-    core_data = {}
-    core_path = run_dir / "core-data.json"
-    if core_path.exists():
-        with open(core_path) as f:
-            core_data = json.load(f)
+    # Only the sections the environment tab reads (packed runs decompress just these)
+    core_data = RunArtifacts(run_dir).load(*CORE_SECTIONS) or {}
     # v4.0: Load cluster-diagnosis.json for rich environment data
     # Falls back to cluster-health.json for older runs (v3.7-v3.9)
     cluster_health_full = {}
@@ -238,8 +269,10 @@ def load_data(run_dir: Path, trace_file: Optional[Path] = None):
     if trace_file is None:
         trace_file = _find_trace_file(run_dir)
     if trace_file and trace_file.exists():
-        with open(trace_file) as f:
-            trace = [json.loads(l) for l in f if l.strip()]
+        # Only events inside the run window are read
+        index = TraceIndex(trace_file.parent)
+        trace = index.read_events(trace_file, *run_window(run_dir))
+        index.save()
     return analysis, logs, env_status, core_data, trace
 
 
@@ -367,22 +400,23 @@ def build_test_card(t, idx):
     </div>'''
 
 
+def build_log_row(e):
+    level = e.get("level", "info")
+    ts = fmt_ts(e.get("timestamp", ""))
+    logger = esc(e.get("logger", ""))
+    msg = esc(e.get("message", ""))
+    return (
+        f'<div class="log-entry log-{level}">'
+        f'<span class="log-ts">{ts}</span>'
+        f'<span class="log-level">{level.upper()}</span>'
+        f'<span class="log-logger">{logger}</span>'
+        f'<span class="log-msg">{msg}</span>'
+        f'</div>'
+    )
+
+
 def build_log_entries(entries):
-    rows = ""
-    for e in entries:
-        level = e.get("level", "info")
-        ts = fmt_ts(e.get("timestamp", ""))
-        logger = esc(e.get("logger", ""))
-        msg = esc(e.get("message", ""))
-        rows += (
-            f'<div class="log-entry log-{level}">'
-            f'<span class="log-ts">{ts}</span>'
-            f'<span class="log-level">{level.upper()}</span>'
-            f'<span class="log-logger">{logger}</span>'
-            f'<span class="log-msg">{msg}</span>'
-            f'</div>'
-        )
-    return rows
+    return "".join(build_log_row(e) for e in entries)
 
 
 def _summarize_trace_output(output_str):
@@ -404,6 +438,89 @@ def _summarize_trace_output(output_str):
         return text[:300]
 
 
+def trace_in_window(trace, run_start_ts=None):
+    """Trace events at or after run_start_ts (all events if it is empty)."""
+    for e in trace:
+        entry_ts = e.get("timestamp", "")
+        if run_start_ts and entry_ts and entry_ts < run_start_ts:
+            continue
+        yield e
+
+
+def _trace_event_class(event):
+    return (
+        "trace-call" if event == "tool_call"
+        else "trace-result" if event == "tool_result"
+        else "trace-prompt" if event == "prompt"
+        else "trace-other"
+    )
+
+
+def build_trace_row(e):
+    """HTML row for one trace event."""
+    event = e.get("event", "")
+    tool = e.get("tool", "")
+    ts = fmt_ts(e.get("timestamp", ""))
+    mcp = e.get("mcp_server", "")
+    mcp_tool = e.get("mcp_tool", "")
+    inp = e.get("input", "")
+    output = e.get("output", "")
+    prompt_text = e.get("prompt", "")
+    is_continuation = e.get("is_continuation", False)
+
+    detail = ""
+
+    if event == "tool_call":
+        # Show input details for tool calls
+        if isinstance(inp, dict):
+            if "command" in inp:
+                detail = esc(str(inp["command"])[:300])
+            elif "file_path" in inp:
+                detail = esc(inp["file_path"])
+            elif "pattern" in inp:
+                detail = f'pattern: {esc(inp["pattern"])}'
+            elif "description" in inp:
+                detail = esc(str(inp.get("description", "")))
+            else:
+                detail = esc(json.dumps(inp)[:300])
+        elif inp:
+            detail = esc(str(inp)[:300])
+
+    elif event == "tool_result":
+        # Show output for tool results — this was previously missing
+        detail = esc(_summarize_trace_output(output))
+
+    elif event == "tool_error":
+        detail = esc(str(e.get("error", ""))[:300])
+
+    elif event == "prompt":
+        if prompt_text:
+            detail = esc(str(prompt_text)[:300])
+        elif is_continuation:
+            detail = '<span style="color:var(--text-muted);font-style:italic">agent continuation (auto-prompt)</span>'
+        else:
+            detail = '<span style="color:var(--text-muted);font-style:italic">agent continuation (auto-prompt)</span>'
+
+    elif event == "subagent_complete":
+        agent_type = e.get("agent_type", "")
+        detail = f'agent_type={esc(agent_type)}'
+
+    elif event == "turn_complete":
+        detail = '<span style="color:var(--text-muted)">--- turn boundary ---</span>'
+
+    if mcp:
+        tool = f"{mcp}__{mcp_tool}"
+
+    return (
+        f'<div class="log-entry {_trace_event_class(event)}">'
+        f'<span class="log-ts">{ts}</span>'
+        f'<span class="trace-event">{event}</span>'
+        f'<span class="trace-tool">{esc(tool)}</span>'
+        f'<span class="log-msg">{detail}</span>'
+        f'</div>'
+    )
+
+
 def build_trace_entries(trace, run_start_ts=None):
     """Build HTML rows for trace entries.
 
@@ -412,95 +529,345 @@ def build_trace_entries(trace, run_start_ts=None):
         run_start_ts: ISO timestamp string. Only include entries at or after
                       this time. If None, include all entries.
     """
-    rows = ""
-    for e in trace:
-        # Filter out entries from before the run started
-        if run_start_ts:
-            entry_ts = e.get("timestamp", "")
-            if entry_ts and entry_ts < run_start_ts:
-                continue
-        event = e.get("event", "")
-        tool = e.get("tool", "")
-        ts = fmt_ts(e.get("timestamp", ""))
-        mcp = e.get("mcp_server", "")
-        mcp_tool = e.get("mcp_tool", "")
-        inp = e.get("input", "")
-        output = e.get("output", "")
-        prompt_text = e.get("prompt", "")
-        is_continuation = e.get("is_continuation", False)
-
-        detail = ""
-
-        if event == "tool_call":
-            # Show input details for tool calls
-            if isinstance(inp, dict):
-                if "command" in inp:
-                    detail = esc(str(inp["command"])[:300])
-                elif "file_path" in inp:
-                    detail = esc(inp["file_path"])
-                elif "pattern" in inp:
-                    detail = f'pattern: {esc(inp["pattern"])}'
-                elif "description" in inp:
-                    detail = esc(str(inp.get("description", "")))
-                else:
-                    detail = esc(json.dumps(inp)[:300])
-            elif inp:
-                detail = esc(str(inp)[:300])
-
-        elif event == "tool_result":
-            # Show output for tool results — this was previously missing
-            detail = esc(_summarize_trace_output(output))
-
-        elif event == "tool_error":
-            detail = esc(str(e.get("error", ""))[:300])
-
-        elif event == "prompt":
-            if prompt_text:
-                detail = esc(str(prompt_text)[:300])
-            elif is_continuation:
-                detail = '<span style="color:var(--text-muted);font-style:italic">agent continuation (auto-prompt)</span>'
+    return "".join(build_trace_row(e) for e in trace_in_window(trace, run_start_ts))
+
+
+def iter_test_cards(tests, cache=None):
+    """(classification, card HTML) per test, isolating per-test rendering errors.
+
+    With a ReportBuildCache, cards of unchanged tests are reused.
+    """
+    for i, t in enumerate(tests):
+        cls = t.get("classification", "UNKNOWN")
+        try:
+            if cache is None:
+                yield cls, build_test_card(t, i)
             else:
-                detail = '<span style="color:var(--text-muted);font-style:italic">agent continuation (auto-prompt)</span>'
+                yield cls, cache.fragment("html-card", [i, t], lambda: build_test_card(t, i))
+        except Exception as card_err:
+            logger.warning(f"Failed to build card for test {i} ({t.get('test_name', '?')[:60]}): {card_err}")
+            yield cls, (
+                f'<div class="test-card" id="test-{i}"><div class="test-header">'
+                f'<span class="cls-badge" style="background:#6b7280">ERROR</span>'
+                f'<span class="test-name">{esc(t.get("test_name", "Unknown"))}</span>'
+                f'<span style="color:var(--danger);font-size:12px">Report rendering error: {esc(str(card_err))}</span>'
+                f'</div></div>'
+            )
 
-        elif event == "subagent_complete":
-            agent_type = e.get("agent_type", "")
-            detail = f'agent_type={esc(agent_type)}'
 
-        elif event == "turn_complete":
-            detail = '<span style="color:var(--text-muted)">--- turn boundary ---</span>'
+def iter_log_rows(entries):
+    """(row CSS class, row HTML) per pipeline log entry."""
+    for e in entries:
+        yield f'log-{e.get("level", "info")}', build_log_row(e)
 
-        if mcp:
-            tool = f"{mcp}__{mcp_tool}"
 
-        event_cls = (
-            "trace-call" if event == "tool_call"
-            else "trace-result" if event == "tool_result"
-            else "trace-prompt" if event == "prompt"
-            else "trace-other"
-        )
-        rows += (
-            f'<div class="log-entry {event_cls}">'
-            f'<span class="log-ts">{ts}</span>'
-            f'<span class="trace-event">{event}</span>'
-            f'<span class="trace-tool">{esc(tool)}</span>'
-            f'<span class="log-msg">{detail}</span>'
-            f'</div>'
+def iter_trace_rows(trace):
+    """(row CSS class, row HTML) per trace event."""
+    for e in trace:
+        yield _trace_event_class(e.get("event", "")), build_trace_row(e)
+
+
+def load_perf_summary(run_dir: Path) -> dict:
+    """perf-summary.json written by Stage 1, or {} for runs without one."""
+    path = run_dir / PERF_SUMMARY_FILENAME
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {PERF_SUMMARY_FILENAME}: {e}")
+        return {}
+
+
+def _fmt_secs(sec):
+    return f"{sec:.2f}s" if sec < 60 else f"{int(sec // 60)}m {sec % 60:.0f}s"
+
+
+def _fmt_bytes(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def build_perf_timeline(spans, total):
+    """Flame-style timeline: one row per nesting depth, bars positioned by start/duration."""
+    if not spans or total <= 0:
+        return ""
+    if len(spans) > PERF_TIMELINE_MAX_SPANS:
+        keep = sorted(spans, key=lambda s: -s.get("duration", 0))[:PERF_TIMELINE_MAX_SPANS]
+        spans = sorted(keep, key=lambda s: s.get("start", 0))
+    parents = {s["id"]: s.get("parent_id") for s in spans}
+    depths = {}
+
+    def depth(span_id):
+        if span_id not in depths:
+            parent = parents.get(span_id)
+            depths[span_id] = 0 if parent not in parents else depth(parent) + 1
+        return depths[span_id]
+
+    bars = []
+    for s in spans:
+        left = min(s.get("start", 0) / total * 100, 100)
+        width = max(min(s.get("duration", 0) / total * 100, 100 - left), 0.15)
+        color = PERF_KIND_COLORS.get(s.get("kind"), "#6b7280")
+        tip = (f'{s.get("name", "")} ({s.get("kind", "")}, {s.get("stage", "")}) '
+               f'{_fmt_secs(s.get("duration", 0))}')
+        if s.get("bytes"):
+            tip += f', {_fmt_bytes(s["bytes"])}'
+        cache = s.get("cache")
+        if cache:
+            tip += f', cache {cache["hits"]} hit / {cache["misses"]} miss'
+        if s.get("status") != "ok":
+            tip += ", error"
+        bars.append(
+            f'<div class="perf-bar{" perf-error" if s.get("status") != "ok" else ""}" '
+            f'style="left:{left:.3f}%;width:{width:.3f}%;top:{depth(s["id"]) * 22}px;background:{color}" '
+            f'title="{esc(tip)}">{esc(s.get("name", ""))}</div>'
         )
-    return rows
+    rows = max(depths.values()) + 1
+    return f'<div class="perf-timeline" style="height:{rows * 22}px">{"".join(bars)}</div>'
+
+
+def build_perf_panel(perf):
+    """Contents of the Performance tab."""
+    if not perf:
+        return ('<div class="perf-empty">No perf-summary.json in this run '
+                '(it is written at the end of Stage 1).</div>')
+    total = perf.get("total_seconds", 0)
+    kinds = perf.get("by_kind", {})
+    cards = [("Total", _fmt_secs(total)), ("Untraced", _fmt_secs(perf.get("untraced_seconds", 0))),
+             ("Spans", str(perf.get("span_count", 0)))]
+    for kind, t in sorted(kinds.items(), key=lambda kv: -kv[1].get("seconds", 0)):
+        label = f'{kind} ({t.get("count", 0)})'
+        value = _fmt_secs(t.get("seconds", 0))
+        cache = t.get("cache")
+        if cache:
+            value += f' &middot; {cache["hits"]}/{cache["hits"] + cache["misses"]} cached'
+        cards.append((label, value))
+    cards_html = "".join(
+        f'<div class="env-item"><div class="env-label">{esc(label)}</div>'
+        f'<div class="env-value">{value}</div></div>'
+        for label, value in cards
+    )
+    steps_html = "".join(
+        f'<div class="perf-row"><span class="perf-name">{esc(st["name"])}</span>'
+        f'<span class="perf-meta">{esc(st.get("stage", ""))}</span>'
+        f'<span class="perf-num">{_fmt_secs(st.get("duration", 0))}</span>'
+        f'<span class="perf-num" title="Not spent in traced subprocesses or requests">'
+        f'{_fmt_secs(st.get("self_seconds", 0))} self</span></div>'
+        for st in perf.get("steps", [])
+    )
+    slow_html = "".join(
+        f'<div class="perf-row"><span class="perf-name">{esc(t["name"])}</span>'
+        f'<span class="perf-meta">{esc(t.get("kind", ""))} &times; {t.get("count", 0)}</span>'
+        f'<span class="perf-num">{_fmt_secs(t.get("seconds", 0))}</span>'
+        f'<span class="perf-num">{_fmt_bytes(t.get("bytes", 0)) if t.get("bytes") else ""}</span></div>'
+        for t in perf.get("by_name", []) if t.get("kind") != "step"
+    )
+    legend = "".join(
+        f'<span class="perf-legend"><span class="legend-dot" style="background:{color}"></span>{kind}</span>'
+        for kind, color in PERF_KIND_COLORS.items()
+    )
+    return f'''
+    <div class="section-title">Where the time went</div>
+    <div class="env-grid">{cards_html}</div>
+    <div class="section-title" style="margin-top:24px">Timeline</div>
+    <div style="margin-bottom:8px">{legend}</div>
+    {build_perf_timeline(perf.get("spans", []), total)}
+    <div class="section-title" style="margin-top:24px">Steps</div>
+    <div class="perf-list">{steps_html}</div>
+    <div class="section-title" style="margin-top:24px">Slowest operations</div>
+    <div class="perf-list">{slow_html}</div>'''
+
+
+def _write_report(out_path: Path, template: str, slots: dict):
+    """Write the page, streaming each slot's fragments in place of its marker.
+
+    Written to a temp file and renamed, so a reader never sees half a report.
+    """
+    parts = _SLOT.split(template)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for i, part in enumerate(parts):
+            if i % 2:
+                f.writelines(slots.get(part, ()))
+            else:
+                f.write(part)
+    os.replace(tmp_path, out_path)
+
+
+def _clear_chunks(data_dir: Path):
+    """Remove chunk files left by a previous paged report."""
+    if not data_dir.is_dir():
+        return
+    for chunk in data_dir.glob("*.js"):
+        chunk.unlink()
+    if not any(data_dir.iterdir()):
+        data_dir.rmdir()
+
+
+def _write_chunks(data_dir: Path, section: str, rows, chunk_size: int) -> dict:
+    """Write rows as <section>-NNNN.js chunk files; returns the section's manifest entry.
+
+    Chunks are JSON arrays wrapped in a zsaChunk() call so the page can load
+    them with <script> tags - fetch() is blocked for file:// pages.
+    """
+    count = chunks = 0
+    batch = []
+
+    def flush():
+        nonlocal chunks
+        data_dir.mkdir(exist_ok=True)
+        payload = json.dumps(batch, separators=(",", ":"))
+        (data_dir / f"{section}-{chunks:04d}.js").write_text(
+            f"zsaChunk({json.dumps(section)},{chunks},{payload});\n", encoding="utf-8")
+        chunks += 1
+        batch.clear()
+
+    for row in rows:
+        batch.append(row)
+        count += 1
+        if len(batch) == chunk_size:
+            flush()
+    if batch:
+        flush()
+    return {"count": count, "chunk_size": chunk_size, "chunks": chunks}
+
+
+def _pager_script(manifest: dict) -> str:
+    data = json.dumps(manifest, separators=(",", ":")).replace("</", "<\\/")
+    return _PAGER_JS.replace("__REPORT_PAGES__", data)
+
+
+_PAGER_JS = """<script>
+// Paged report: cards and log rows live in analysis-report-data/ chunks.
+// These definitions replace the in-page filter/toggle functions above.
+const reportPages = __REPORT_PAGES__;
+const TEST_PAGE = 20, ROW_PAGE = 200;
+const chunkCache = {}, chunkWaiters = {}, lazyLists = {};
+let logLevel = 'all';
+
+function zsaChunk(section, n, items) {
+  const key = section + ':' + n;
+  chunkCache[key] = items;
+  (chunkWaiters[key] || []).forEach(resolve => resolve(items));
+  delete chunkWaiters[key];
+}
+
+function loadChunk(section, n) {
+  const key = section + ':' + n;
+  if (chunkCache[key]) return Promise.resolve(chunkCache[key]);
+  return new Promise(resolve => {
+    if (!chunkWaiters[key]) {
+      chunkWaiters[key] = [];
+      const s = document.createElement('script');
+      s.src = reportPages.dir + '/' + section + '-' + String(n).padStart(4, '0') + '.js';
+      s.onerror = () => zsaChunk(section, n, []);
+      document.head.appendChild(s);
+    }
+    chunkWaiters[key].push(resolve);
+  });
+}
 
+const lazyObserver = new IntersectionObserver(entries => {
+  entries.forEach(e => { if (e.isIntersecting) renderMore(e.target.lazyList); });
+}, {rootMargin: '400px'});
+
+function renderLazy(section, rows, accept, page) {
+  const box = document.getElementById(section === 'tests' ? 'testList' : section);
+  const old = lazyLists[section];
+  if (old) lazyObserver.unobserve(old.sentinel);
+  box.innerHTML = '';
+  const sentinel = document.createElement('div');
+  sentinel.style.height = '1px';
+  box.appendChild(sentinel);
+  const list = {section, rows, accept, page, pos: 0, busy: false, sentinel};
+  sentinel.lazyList = list;
+  lazyLists[section] = list;
+  lazyObserver.observe(sentinel);
+}
+
+async function renderMore(list) {
+  if (list.busy || list.pos >= list.rows.length) return;
+  list.busy = true;
+  const size = reportPages.sections[list.section].chunk_size;
+  const html = [];
+  while (html.length < list.page && list.pos < list.rows.length) {
+    const i = list.rows[list.pos++];
+    const items = await loadChunk(list.section, Math.floor(i / size));
+    const item = items[i % size];
+    if (item && list.accept(item[0])) html.push(item[1]);
+  }
+  if (lazyLists[list.section] !== list) return;  // superseded by a newer filter
+  list.sentinel.insertAdjacentHTML('beforebegin', html.join(''));
+  list.busy = false;
+  lazyObserver.unobserve(list.sentinel);
+  // Re-observing fires again if the sentinel is still on screen
+  if (list.pos < list.rows.length) lazyObserver.observe(list.sentinel);
+}
 
-def generate_html_report(run_dir: Path, trace_file: Optional[Path] = None) -> Path:
+function applyFilters() {
+  const term = searchTerm.toLowerCase();
+  const rows = [];
+  reportPages.tests.forEach(([cls, area, name], i) => {
+    if ((activeClass === 'ALL' || cls === activeClass) &&
+        (activeArea === 'ALL' || area === activeArea) &&
+        (!term || name.toLowerCase().includes(term))) rows.push(i);
+  });
+  renderLazy('tests', rows, () => true, TEST_PAGE);
+}
+
+function logAccept(kind) {
+  return logLevel === 'all' || kind === 'log-' + logLevel ||
+         kind === 'trace-call' || kind === 'trace-result' || kind === 'trace-other';
+}
+
+function renderLogStage(stage) {
+  const section = 'log-' + stage;
+  const rows = Array.from({length: reportPages.sections[section].count}, (_, i) => i);
+  renderLazy(section, rows, logAccept, ROW_PAGE);
+}
+
+function toggleLogStage(stage) {
+  const body = document.getElementById('log-' + stage);
+  const chev = document.getElementById(stage + '-chev');
+  body.classList.toggle('open');
+  if (chev) chev.innerHTML = body.classList.contains('open') ? '&#9660;' : '&#9654;';
+  if (body.classList.contains('open') && !lazyLists['log-' + stage]) renderLogStage(stage);
+}
+
+function filterLogs(level) {
+  document.querySelectorAll('.log-filter').forEach(b => b.classList.remove('active'));
+  event.target.classList.add('active');
+  logLevel = level;
+  Object.keys(lazyLists).filter(s => s.startsWith('log-')).forEach(s => renderLogStage(s.slice(4)));
+}
+
+applyFilters();
+</script>"""
+
+
+def generate_html_report(run_dir: Path, trace_file: Optional[Path] = None,
+                         paginated: Optional[bool] = None, cache=None) -> Path:
     """Generate the interactive HTML analysis report for a run.
 
     Args:
         run_dir: Path to the run directory containing analysis-results.json etc.
         trace_file: Optional explicit path to agent trace JSONL. Auto-discovered if None.
+        paginated: Write test cards and log/trace rows as JSON chunks in
+                   analysis-report-data/ and render them in the page on demand.
+                   None picks paged mode for large runs (see PAGED_*_THRESHOLD).
+        cache: Optional ReportBuildCache for reusing unchanged test cards.
 
     Returns:
         Path to the generated analysis-report.html file.
     """
     run_dir = Path(run_dir)
     analysis, logs, env_status, core_data, trace = load_data(run_dir, trace_file)
+    perf_html = build_perf_panel(load_perf_summary(run_dir))
 
     meta = analysis.get("analysis_metadata", {})
     summary = analysis.get("summary", {})
@@ -515,27 +882,16 @@ def generate_html_report(run_dir: Path, trace_file: Optional[Path] = None) -> Pa
         by_area.setdefault(fa, []).append(t)
 
     # Group logs by stage
+    # (span records are shown in the Performance tab instead; report-stage
+    # records are left out because this report is still being written and
+    # the build cache ignores them when deciding whether to rebuild it)
     logs_by_stage = {}
     for l in logs:
+        if "span" in l or l.get("stage") == "report":
+            continue
         s = l.get("stage", "unknown")
         logs_by_stage.setdefault(s, []).append(l)
 
-    # Build test cards (with per-test error isolation)
-    test_card_parts = []
-    for i, t in enumerate(tests):
-        try:
-            test_card_parts.append(build_test_card(t, i))
-        except Exception as card_err:
-            logger.warning(f"Failed to build card for test {i} ({t.get('test_name', '?')[:60]}): {card_err}")
-            test_card_parts.append(
-                f'<div class="test-card" id="test-{i}"><div class="test-header">'
-                f'<span class="cls-badge" style="background:#6b7280">ERROR</span>'
-                f'<span class="test-name">{esc(t.get("test_name", "Unknown"))}</span>'
-                f'<span style="color:var(--danger);font-size:12px">Report rendering error: {esc(str(card_err))}</span>'
-                f'</div></div>'
-            )
-    test_cards = "".join(test_card_parts)
-
     # Build classification filter buttons
     cls_filter_btns = ""
     for k, v in sorted(by_class.items(), key=lambda x: -x[1]):
@@ -556,20 +912,25 @@ def generate_html_report(run_dir: Path, trace_file: Optional[Path] = None) -> Pa
             f'{esc(area_name)} <span class="area-count">{n}</span></button>'
         )
 
-    # Build log sections
-    gather_logs = build_log_entries(logs_by_stage.get("gather", []))
-    oracle_logs = build_log_entries(logs_by_stage.get("oracle", []))
-    report_logs = build_log_entries(logs_by_stage.get("report", []))
     # Filter trace entries to only include those from the analysis run
     run_start_ts = meta.get("gathered_at", "")
-    trace_rows = build_trace_entries(trace, run_start_ts=run_start_ts)
-    # Count filtered entries (not total trace entries)
-    filtered_trace = [e for e in trace if not run_start_ts or e.get("timestamp", "") >= run_start_ts]
+    run_trace = list(trace_in_window(trace, run_start_ts))
 
     gather_count = len(logs_by_stage.get("gather", []))
     oracle_count = len(logs_by_stage.get("oracle", []))
-    report_count = len(logs_by_stage.get("report", []))
-    trace_count = len(filtered_trace)
+    trace_count = len(run_trace)
+
+    # Test cards and log rows are written into the template slots below;
+    # in paged mode they go to JSON chunks and the page renders them on demand
+    if paginated is None:
+        paginated = (len(tests) > PAGED_TEST_THRESHOLD
+                     or sum(map(len, logs_by_stage.values())) + trace_count > PAGED_ROW_THRESHOLD)
+    sections = {
+        "tests": (iter_test_cards(tests, cache), TEST_CHUNK_SIZE),
+        "log-oracle": (iter_log_rows(logs_by_stage.get("oracle", [])), ROW_CHUNK_SIZE),
+        "log-gather": (iter_log_rows(logs_by_stage.get("gather", [])), ROW_CHUNK_SIZE),
+        "log-trace": (iter_trace_rows(run_trace), ROW_CHUNK_SIZE),
+    }
 
     # Chart data
     chart_data = json.dumps([
@@ -1058,6 +1419,19 @@ body {{ background: var(--bg); color: var(--text); font-family: -apple-system, B
 .env-value.degraded {{ color: var(--warning); }}
 .env-value.down {{ color: var(--danger); }}
 
+.perf-timeline {{ position: relative; background: var(--bg-section); border: 1px solid var(--border); border-radius: var(--radius-sm); overflow: hidden; }}
+.perf-bar {{ position: absolute; height: 20px; border-radius: 3px; font-size: 11px; line-height: 20px; color: #fff; padding: 0 4px; overflow: hidden; white-space: nowrap; text-overflow: ellipsis; opacity: 0.85; }}
+.perf-bar:hover {{ opacity: 1; outline: 1px solid #fff; z-index: 1; }}
+.perf-bar.perf-error {{ outline: 1px solid var(--danger); }}
+.perf-legend {{ display: inline-flex; align-items: center; gap: 6px; margin-right: 16px; font-size: 12px; color: var(--text-dim); }}
+.perf-list {{ border: 1px solid var(--border); border-radius: var(--radius-sm); }}
+.perf-row {{ display: flex; gap: 16px; padding: 8px 12px; border-bottom: 1px solid var(--border); font-size: 13px; }}
+.perf-row:last-child {{ border-bottom: none; }}
+.perf-name {{ flex: 1; color: #fff; font-family: 'SF Mono', Menlo, monospace; }}
+.perf-meta {{ color: var(--text-dim); min-width: 120px; }}
+.perf-num {{ color: var(--text); min-width: 90px; text-align: right; }}
+.perf-empty {{ color: var(--text-dim); padding: 24px; }}
+
 ::-webkit-scrollbar {{ width: 6px; height: 6px; }}
 ::-webkit-scrollbar-track {{ background: var(--bg); }}
 ::-webkit-scrollbar-thumb {{ background: var(--border); border-radius: 3px; }}
@@ -1113,6 +1487,7 @@ body {{ background: var(--bg); color: var(--text); font-family: -apple-system, B
   <button class="tab active" onclick="showTab('results', this)">Results</button>
   <button class="tab" onclick="showTab('logs', this)">Pipeline Logs</button>
   <button class="tab" onclick="showTab('environment', this)">Environment</button>
+  <button class="tab" onclick="showTab('performance', this)">Performance</button>
 </div>
 
 <!-- Results Tab -->
@@ -1128,7 +1503,7 @@ body {{ background: var(--bg); color: var(--text); font-family: -apple-system, B
         {area_tabs}
         <input type="text" class="search-input" placeholder="Search tests..." oninput="searchTests(this.value)" />
       </div>
-      <div id="testList">{test_cards}</div>
+      <div id="testList"><!--slot:tests--></div>
     </div>
     <div class="section">
       <div class="section-title">Action Items</div>
@@ -1149,22 +1524,17 @@ body {{ background: var(--bg); color: var(--text); font-family: -apple-system, B
     <div class="log-stage-header" onclick="toggleLogStage('oracle')">
       Stage 0: Environment Oracle <span class="log-count">{oracle_count} entries <span id="oracle-chev">&#9654;</span></span>
     </div>
-    <div class="log-stage-body" id="log-oracle">{oracle_logs}</div>
+    <div class="log-stage-body" id="log-oracle"><!--slot:log-oracle--></div>
 
     <div class="log-stage-header" onclick="toggleLogStage('gather')">
       Stage 1: Data Gathering <span class="log-count">{gather_count} entries <span id="gather-chev">&#9654;</span></span>
     </div>
-    <div class="log-stage-body" id="log-gather">{gather_logs}</div>
+    <div class="log-stage-body" id="log-gather"><!--slot:log-gather--></div>
 
     <div class="log-stage-header" onclick="toggleLogStage('trace')">
       Stage 2: AI Analysis <span class="log-count">{trace_count} entries <span id="trace-chev">&#9654;</span></span>
     </div>
-    <div class="log-stage-body" id="log-trace">{trace_rows}</div>
-
-    <div class="log-stage-header" onclick="toggleLogStage('report')">
-      Stage 3: Report Generation <span class="log-count">{report_count} entries <span id="report-chev">&#9654;</span></span>
-    </div>
-    <div class="log-stage-body" id="log-report">{report_logs}</div>
+    <div class="log-stage-body" id="log-trace"><!--slot:log-trace--></div>
   </div>
 </div>
 
@@ -1227,6 +1597,12 @@ body {{ background: var(--bg); color: var(--text); font-family: -apple-system, B
   </div>
 </div>
 
+<!-- Performance Tab -->
+<div class="tab-panel" id="panel-performance">
+  <div style="padding: 24px;">{perf_html}
+  </div>
+</div>
+
 </div>
 
 <script>
@@ -1319,24 +1695,42 @@ function filterLogs(level) {{
     else {{ entry.style.display = entry.classList.contains('log-' + level) || entry.classList.contains('trace-call') || entry.classList.contains('trace-result') || entry.classList.contains('trace-other') ? '' : 'none'; }}
   }});
 }}
-</script>
+</script><!--slot:pager-->
 </body>
 </html>'''
 
     out_path = run_dir / "analysis-report.html"
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(html_out)
-    logger.info(f"HTML report written: {out_path} ({os.path.getsize(out_path):,} bytes)")
+    data_dir = run_dir / PAGED_DATA_DIR
+    _clear_chunks(data_dir)
+    if paginated:
+        manifest = {
+            "dir": PAGED_DATA_DIR,
+            "tests": [[t.get("classification", "UNKNOWN"), t.get("feature_area", "Unknown"),
+                       t.get("test_name", "Unknown")] for t in tests],
+            "sections": {
+                name: _write_chunks(data_dir, name, rows, size)
+                for name, (rows, size) in sections.items()
+            },
+        }
+        slots = {name: () for name in sections}
+        slots["pager"] = (_pager_script(manifest),)
+    else:
+        slots = {name: (row_html for _, row_html in rows) for name, (rows, _) in sections.items()}
+    _write_report(out_path, html_out, slots)
+    logger.info(f"HTML report written: {out_path} ({os.path.getsize(out_path):,} bytes"
+                f"{', paged' if paginated else ''})")
     return out_path
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python -m src.reports.html_report <run_dir>", file=sys.stderr)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Usage: python -m src.reports.html_report <run_dir> [--paged | --single-file]", file=sys.stderr)
         sys.exit(1)
-    run_dir = Path(sys.argv[1])
+    run_dir = Path(args[0])
     if not run_dir.exists():
         print(f"Error: Directory not found: {run_dir}", file=sys.stderr)
         sys.exit(1)
-    path = generate_html_report(run_dir)
+    paginated = True if "--paged" in sys.argv else False if "--single-file" in sys.argv else None
+    path = generate_html_report(run_dir, paginated=paginated)
     print(f"HTML report: file://{path.resolve()}")
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Agent Trace Index
+
+Maps runs to agent trace files without re-reading .claude/traces/ on every
+report.
+
+The trace hook appends one JSON event per line to
+.claude/traces/<session_id>.jsonl. The index (trace-index.json, kept in the
+same directory) records per file:
+
+- size, mtime and how far the file has been scanned
+- session id, first/last event timestamp and event count
+- a sparse seek table: (timestamp, byte offset) every OFFSET_STRIDE events
+
+Updates are incremental. Unchanged files are a single stat. Files that grew
+are scanned from where the last scan stopped. Files that shrank or whose
+first bytes changed are rescanned, and deleted files are dropped.
+
+Finding the trace for a run is then an interval lookup against the run
+window, and loading a trace seeks to the last checkpoint before the window
+and stops reading once events pass its end.
+
+Timestamps are compared as epoch seconds. Naive ISO timestamps are local
+time, which is how gathered_at and the trace hook write them.
+
+Usage:
+    index = TraceIndex(traces_dir)
+    start, end = run_window(run_dir)
+    trace_file = index.find(start, end)
+    events = index.read_events(trace_file, start, end)   # seeks to the window
+    index.save()
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+INDEX_FILENAME = 'trace-index.json'
+INDEX_VERSION = 1
+SESSION_INDEX_FILENAME = 'sessions.jsonl'   # per-session summaries, not a trace
+OFFSET_STRIDE = 256
+HEAD_BYTES = 256
+# Trace events may land slightly after the last run artifact is written
+WINDOW_GRACE_SECONDS = 60
+
+_TIMESTAMP = re.compile(rb'"timestamp":\s*"([^"]+)"')
+_SESSION_ID = re.compile(rb'"session_id":\s*"([^"]+)"')
+
+
+def parse_ts(value: Optional[str]) -> Optional[float]:
+    """ISO-8601 timestamp as epoch seconds (naive values are local time)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _line_ts(line: bytes) -> Optional[float]:
+    match = _TIMESTAMP.search(line)
+    return parse_ts(match.group(1).decode('utf-8', 'replace')) if match else None
+
+
+def _first_and_last_line(path: Path, tail_bytes: int = 65536) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """First and last non-empty lines of a file, reading only its ends."""
+    try:
+        with open(path, 'rb') as f:
+            first = f.readline()
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - tail_bytes))
+            tail = f.read().rstrip(b'\n').rsplit(b'\n', 1)[-1]
+    except OSError:
+        return None, None
+    return (first.strip() or None), (tail.strip() or None)
+
+
+def run_window(run_dir: Union[str, Path]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    (start, end) of a run's analysis as epoch seconds; either may be None.
+
+    Starts at the first pipeline.log.jsonl entry and ends when
+    analysis-results.json was last written (Stage 2 output), or at the last
+    log entry if there is no analysis yet.
+    """
+    run_dir = Path(run_dir)
+    first, last = _first_and_last_line(run_dir / 'pipeline.log.jsonl')
+    start = _line_ts(first) if first else None
+    try:
+        end = (run_dir / 'analysis-results.json').stat().st_mtime
+    except OSError:
+        end = _line_ts(last) if last else None
+    return start, end
+
+
+@dataclass
+class TraceFileEntry:
+    """Index record for one trace file."""
+    size: int
+    mtime_ns: int
+    scanned: int = 0                        # offset after the last complete line read
+    head: str = ''                          # digest of the first HEAD_BYTES scanned
+    session_id: Optional[str] = None
+    first_ts: Optional[float] = None
+    last_ts: Optional[float] = None
+    events: int = 0                         # timestamped events
+    offsets: List[List[float]] = field(default_factory=list)   # [timestamp, byte offset]
+
+    def overlap(self, start: Optional[float], end: Optional[float]) -> float:
+        """Seconds shared with [start, end]; -1 if the file does not touch it."""
+        if self.first_ts is None:
+            return -1
+        lo = self.first_ts if start is None else max(self.first_ts, start)
+        hi = self.last_ts if end is None else min(self.last_ts, end)
+        return hi - lo if hi >= lo else -1
+
+    def seek_offset(self, start: Optional[float]) -> int:
+        """Offset of the last checkpoint strictly before start (0 if none)."""
+        if start is None or not self.offsets:
+            return 0
+        i = bisect.bisect_left([ts for ts, _ in self.offsets], start)
+        return int(self.offsets[i - 1][1]) if i else 0
+
+
+class TraceIndex:
+    """Persistent, incrementally updated index of a trace directory."""
+
+    def __init__(self, traces_dir: Union[str, Path]):
+        self.traces_dir = Path(traces_dir)
+        self.path = self.traces_dir / INDEX_FILENAME
+        self.logger = logging.getLogger(__name__)
+        self.entries: Dict[str, TraceFileEntry] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, TraceFileEntry]:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+            return {}
+        try:
+            return {name: TraceFileEntry(**entry) for name, entry in data.get('files', {}).items()}
+        except TypeError:
+            return {}
+
+    # -- updating -----------------------------------------------------------
+
+    def trace_files(self) -> List[Path]:
+        return [
+            p for p in self.traces_dir.glob('*.jsonl')
+            if p.name != SESSION_INDEX_FILENAME
+        ]
+
+    def refresh(self) -> 'TraceIndex':
+        """Bring every trace file in the directory up to date."""
+        present = set()
+        for path in self.trace_files():
+            if self.entry(path) is not None:
+                present.add(path.name)
+        for name in set(self.entries) - present:
+            del self.entries[name]
+            self._dirty = True
+        return self
+
+    def entry(self, path: Union[str, Path]) -> Optional[TraceFileEntry]:
+        """Up-to-date record for one trace file (None if it cannot be read)."""
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            self.entries.pop(path.name, None)
+            return None
+        known = self.entries.get(path.name)
+        if known and known.size == stat.st_size and known.mtime_ns == stat.st_mtime_ns:
+            return known
+
+        if (known and stat.st_size >= known.scanned
+                and self._head(path, min(known.scanned, HEAD_BYTES)) == known.head):
+            entry = TraceFileEntry(**asdict(known))     # appended to - scan the new tail only
+        else:
+            entry = TraceFileEntry(size=0, mtime_ns=0)
+        try:
+            self._scan(path, entry)
+        except OSError as e:
+            self.logger.warning(f"Could not index trace {path.name}: {e}")
+            return None
+        entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+        if entry.session_id is None and entry.scanned:
+            entry.session_id = path.stem
+        self.entries[path.name] = entry
+        self._dirty = True
+        return entry
+
+    @staticmethod
+    def _head(path: Path, length: int) -> str:
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.sha1(f.read(length)).hexdigest()[:16]
+        except OSError:
+            return ''
+
+    def _scan(self, path: Path, entry: TraceFileEntry):
+        with open(path, 'rb') as f:
+            f.seek(entry.scanned)
+            offset = entry.scanned
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break               # still being written
+                ts = _line_ts(line)
+                if ts is not None:
+                    if entry.events % OFFSET_STRIDE == 0:
+                        entry.offsets.append([ts, offset])
+                    if entry.first_ts is None:
+                        entry.first_ts = ts
+                    entry.last_ts = ts if entry.last_ts is None else max(entry.last_ts, ts)
+                    entry.events += 1
+                if entry.session_id is None:
+                    match = _SESSION_ID.search(line)
+                    if match:
+                        entry.session_id = match.group(1).decode('utf-8', 'replace')
+                offset += len(line)
+        if entry.scanned < HEAD_BYTES:
+            entry.head = self._head(path, min(offset, HEAD_BYTES))
+        entry.scanned = offset
+
+    # -- lookups ------------------------------------------------------------
+
+    def find(self, start: Optional[float], end: Optional[float]) -> Optional[Path]:
+        """
+        Trace file whose events overlap [start, end] the most.
+
+        Falls back to the most recently active trace when none overlap.
+        """
+        self.refresh()
+        if end is not None:
+            end += WINDOW_GRACE_SECONDS
+        candidates = [(name, e) for name, e in self.entries.items() if e.first_ts is not None]
+        if not candidates:
+            return None
+        best = max(candidates, key=lambda item: (item[1].overlap(start, end), item[1].last_ts))
+        if best[1].overlap(start, end) < 0:
+            best = max(candidates, key=lambda item: item[1].last_ts)
+        return self.traces_dir / best[0]
+
+    def window(self, path: Union[str, Path], start: Optional[float] = None,
+               end: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """
+        Byte range of one trace file that holds the events inside [start, end].
+
+        Begins at the nearest checkpoint before start and ends at the first
+        event past end, so it may include a few earlier events. Only complete,
+        indexed lines are covered.
+        """
+        entry = self.entry(path)
+        if entry is None:
+            return None
+        begin, stop = entry.seek_offset(start), entry.scanned
+        if end is None:
+            return begin, stop
+        end += WINDOW_GRACE_SECONDS
+        offset = max(begin, entry.seek_offset(end))
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if offset + len(line) > entry.scanned:
+                    break
+                ts = _line_ts(line)
+                if ts is not None and ts > end:
+                    stop = offset
+                    break
+                offset += len(line)
+        return begin, stop
+
+    def read_events(self, path: Union[str, Path], start: Optional[float] = None,
+                    end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Events of one trace file inside [start, end]; untimestamped events are kept."""
+        span = self.window(path, start, end)
+        if span is None:
+            return []
+        begin, stop = span
+        with open(path, 'rb') as f:
+            f.seek(begin)
+            data = f.read(stop - begin)
+        events = []
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            if start is not None:
+                ts = _line_ts(line)
+                if ts is not None and ts < start:
+                    continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events
+
+    # -- persistence --------------------------------------------------------
+
+    def save(self):
+        """Write the index if it changed; failures are logged and ignored."""
+        if not self._dirty:
+            return
+        data = {
+            'version': INDEX_VERSION,
+            'files': {name: asdict(entry) for name, entry in sorted(self.entries.items())},
+        }
+        try:
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            tmp_path.write_text(json.dumps(data, separators=(',', ':')))
+            tmp_path.replace(self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not save trace index: {e}")
+            return
+        self._dirty = False
@@ -108,6 +108,14 @@ Examples:
         else:
             print("Overall accuracy:  No data")
 
+        for title, key in (("By classification", 'by_classification'),
+                           ("By feature area", 'by_feature_area')):
+            if stats.get(key):
+                print(f"\n{title}:")
+                for name, counts in sorted(stats[key].items()):
+                    print(f"  {name}: {counts['accuracy']:.1%} "
+                          f"({counts['correct']}/{counts['rated']})")
+
         if stats.get('per_run_accuracies'):
             print("\nPer-run breakdown:")
             for run_id, accuracy in stats['per_run_accuracies'].items():
@@ -146,14 +154,7 @@ Examples:
                   file=sys.stderr)
             sys.exit(1)
 
-        run_path = service._resolve_run_dir(run_dir)
-        feedback = service._load_run_feedback(run_path)
-        if feedback is None:
-            from src.services.feedback_service import RunFeedback
-            feedback = RunFeedback(run_id=run_dir)
-        feedback.overall_accuracy = args.overall_accuracy
-        service._save_run_feedback(run_path, feedback)
-        service._update_index(run_dir, feedback)
+        service.set_overall_accuracy(run_dir, args.overall_accuracy)
 
         print(f"Overall accuracy set to {args.overall_accuracy:.1%} for {run_dir}")
         return
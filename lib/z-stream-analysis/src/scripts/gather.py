@@ -21,6 +21,7 @@ Extracts complete test context upfront for systematic AI analysis.
 Usage:
     python -m src.scripts.gather <jenkins_url>
     python -m src.scripts.gather --url <jenkins_url> --output-dir ./runs
+    python -m src.scripts.gather --downstream <top_level_pipeline_url>
 
 Output:
     Creates a run directory with:
@@ -29,18 +30,23 @@ Output:
     - repos/console/ (full cloned console repo)
     - repos/kubevirt-plugin/ (version-correct kubevirt repo for VM tests)
     - console-log.txt
+    - console-index.json (per-stage / per-spec byte ranges into console-log.txt)
     - jenkins-build-info.json
     - test-report.json
     - cluster.kubeconfig (persisted cluster auth for Stage 1.5 and Stage 2)
 """
 
 import argparse
+import copy
+import itertools
 import json
 import logging
 import re
+import sqlite3
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
@@ -51,13 +57,21 @@ src_dir = script_dir.parent
 app_dir = src_dir.parent
 sys.path.insert(0, str(app_dir))
 
-from src.services.jenkins_api_client import JenkinsAPIClient, is_jenkins_available
+from src.services.jenkins_api_client import is_jenkins_available
+from src.services.jenkins_downstream_tree import DownstreamTreeCrawler
+from src.services.jenkins_evidence_store import JenkinsEvidenceStore
+from src.services.console_log import ConsoleLog
+from src.services.console_segments import INDEX_FILENAME, ConsoleIndex, ConsoleSegmenter
+from src.services.failure_clustering import FailureCluster, FailureClusterer
+from src.services.run_history import HISTORY_DB_FILENAME, RunHistoryIndex
+from src.services.run_artifacts import ARTIFACT_FORMATS, CODECS, RunArtifacts
 from src.services.jenkins_intelligence_service import JenkinsIntelligenceService
 from src.services.environment_validation_service import EnvironmentValidationService
 from src.services.repository_analysis_service import RepositoryAnalysisService
 from src.services.timeline_comparison_service import TimelineComparisonService
 from src.services.stack_trace_parser import StackTraceParser
-from src.services.shared_utils import mask_sensitive_dict, SENSITIVE_PATTERNS
+from src.services.perf_tracing import get_recorder, span, traced_run
+from src.services.shared_utils import MaskingJSONEncoder, SENSITIVE_PATTERNS, THRESHOLDS, get_masker
 from src.services.acm_console_knowledge import ACMConsoleKnowledge
 from src.services.acm_source_mcp_client import (
     ACMSourceMCPClient,
@@ -89,16 +103,31 @@ class DataGatherer:
     context extraction, feature grounding, and feature knowledge.
     """
 
-    def __init__(self, output_dir: str = './runs', verbose: bool = False):
+    def __init__(self, output_dir: str = './runs', verbose: bool = False,
+                 artifact_format: str = 'json', artifact_codec: Optional[str] = None,
+                 mask_values: bool = False):
         """
         Initialize the data gatherer.
 
         Args:
             output_dir: Base directory for output files
             verbose: Enable verbose logging
+            artifact_format: 'json' (core-data.json) or 'packed' (compressed,
+                             sectioned core-data.pack; see run_artifacts)
+            artifact_codec: Section codec for packed output (default: zstd if
+                            installed, else gzip)
+            mask_values: Also mask credentials embedded in string values
+                         (e.g. "--password=..." in parameters), not just
+                         values under sensitive keys
         """
+        if artifact_format not in ARTIFACT_FORMATS:
+            raise ValueError(f"Unknown artifact format: {artifact_format}")
         self.output_dir = Path(output_dir)
         self.verbose = verbose
+        self.artifact_format = artifact_format
+        self.artifact_codec = artifact_codec
+        # Masks credentials while output files are serialized (no masked copy)
+        self.masker = get_masker(SENSITIVE_PATTERNS, scan_values=mask_values)
         self.logger = self._setup_logging()
 
         # Initialize ACM Source MCP client (optional, for element discovery)
@@ -140,6 +169,13 @@ class DataGatherer:
         # Track what we've gathered
         self.gathered_data = {}
 
+        # Per-run Jenkins payloads (build info, console log, test report),
+        # fetched once and shared by Steps 1-3 and later consumers
+        self.evidence: Optional[JenkinsEvidenceStore] = None
+        self.console_index: Optional[ConsoleIndex] = None
+        # console-log.txt mapped for consumers when no evidence store owns it
+        self._run_console: Optional[ConsoleLog] = None
+
         # Track repo paths for run directory
         self.automation_repo_path: Optional[Path] = None
         self.console_repo_path: Optional[Path] = None
@@ -182,7 +218,7 @@ class DataGatherer:
         runtime = None
         for cmd in ['podman', 'docker']:
             try:
-                result = subprocess.run(
+                result = traced_run(
                     ['which', cmd], capture_output=True, timeout=5
                 )
                 if result.returncode == 0:
@@ -199,14 +235,14 @@ class DataGatherer:
         if runtime == 'podman':
             try:
                 # Check if podman can actually communicate
-                result = subprocess.run(
+                result = traced_run(
                     ['podman', 'ps', '--format', '{{.Names}}'],
                     capture_output=True, text=True, timeout=10
                 )
                 if result.returncode != 0:
                     # Machine probably stopped — try to start it
                     print("  Starting Podman machine...", flush=True)
-                    start_result = subprocess.run(
+                    start_result = traced_run(
                         ['podman', 'machine', 'start'],
                         capture_output=True, text=True, timeout=90
                     )
@@ -222,7 +258,7 @@ class DataGatherer:
 
         # Check if neo4j-rhacm container exists
         try:
-            result = subprocess.run(
+            result = traced_run(
                 [runtime, 'ps', '-a', '--filter', 'name=neo4j-rhacm',
                  '--format', '{{.Status}}'],
                 capture_output=True, text=True, timeout=10
@@ -238,7 +274,7 @@ class DataGatherer:
             else:
                 # Container exists but stopped — start it
                 print("  Starting Neo4j Knowledge Graph...", flush=True)
-                subprocess.run(
+                traced_run(
                     [runtime, 'start', 'neo4j-rhacm'],
                     capture_output=True, timeout=30
                 )
@@ -263,9 +299,10 @@ class DataGatherer:
         except Exception as e:
             self.logger.debug(f"Container check failed: {e}")
 
-    def _mask_sensitive_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Mask sensitive data before saving."""
-        return mask_sensitive_dict(data, SENSITIVE_PATTERNS)
+    def _write_masked_json(self, path: Path, data: Any):
+        """Write data as JSON with credentials masked during encoding."""
+        with open(path, 'w') as f:
+            json.dump(data, f, cls=MaskingJSONEncoder, masker=self.masker, indent=2, default=str)
 
     def _print_step(self, step: int, total: int, message: str):
         """Print progress step to user."""
@@ -354,7 +391,7 @@ class DataGatherer:
         cli = self.env_service.cli
 
         try:
-            result = subprocess.run(
+            result = traced_run(
                 [cli, '--kubeconfig', kubeconfig_path,
                  'get', 'deployment', 'acm-search-mcp-server',
                  '-n', 'acm-search',
@@ -375,7 +412,7 @@ class DataGatherer:
 
         print("  Deploying ACM Search MCP (first-time setup)...", flush=True)
         try:
-            result = subprocess.run(
+            result = traced_run(
                 ['bash', str(deploy_script), '--kubeconfig', kubeconfig_path],
                 capture_output=True, text=True, timeout=360
             )
@@ -410,7 +447,7 @@ class DataGatherer:
         """
         cli = self.env_service.cli or 'oc'
         try:
-            result = subprocess.run(
+            result = traced_run(
                 [cli, '--kubeconfig', kubeconfig_path,
                  'get', 'mch', '-A',
                  '-o', 'jsonpath={.items[0].metadata.namespace}'],
@@ -446,7 +483,7 @@ class DataGatherer:
                 '--insecure-skip-tls-verify=true',
                 '--kubeconfig', str(kubeconfig_path)
             ]
-            result = subprocess.run(
+            result = traced_run(
                 cmd, capture_output=True, text=True, timeout=30
             )
             if result.returncode == 0:
@@ -478,9 +515,12 @@ class DataGatherer:
             Tuple of (run_directory, gathered_data)
         """
         start_time = time.time()
+        # Spans for this run go to pipeline.log.jsonl and perf-summary.json
+        get_recorder().reset()
 
         # Pre-flight: ensure optional services are running
-        self._preflight_checks()
+        with span('preflight', kind='step'):
+            self._preflight_checks()
 
         # Initialize Knowledge Graph client AFTER pre-flight (which may start Neo4j)
         if self.knowledge_graph_client is None and is_knowledge_graph_available():
@@ -489,6 +529,11 @@ class DataGatherer:
 
         # Create run directory
         run_dir = self._create_run_directory(jenkins_url)
+        self._release_run_console()
+        self.evidence = JenkinsEvidenceStore(
+            jenkins_url, self.jenkins_service, console_path=run_dir / 'console-log.txt'
+        )
+        self.console_index = None
 
         # Enable JSONL file logging into this run directory
         configure_logging(run_dir=run_dir, verbose=self.verbose)
@@ -529,7 +574,8 @@ class DataGatherer:
 
         # Step 1: Gather Jenkins build info
         self._print_step(1, total_steps, "Fetching Jenkins build info...")
-        self._gather_jenkins_build_info(jenkins_url, run_dir)
+        with span('jenkins_build_info', kind='step'):
+            self._gather_jenkins_build_info(jenkins_url, run_dir)
         # Show build result immediately
         build_result = self.gathered_data.get('jenkins', {}).get('build_result', '?')
         job_name = self.gathered_data.get('jenkins', {}).get('job_name', '?')
@@ -538,11 +584,15 @@ class DataGatherer:
 
         # Step 2: Gather console log
         self._print_step(2, total_steps, "Downloading console log...")
-        self._gather_console_log(jenkins_url, run_dir)
+        with span('console_log', kind='step'):
+            self._gather_console_log(jenkins_url, run_dir)
 
         # Step 3: Gather test report (CRITICAL for per-test analysis)
         self._print_step(3, total_steps, "Extracting test report...")
-        self._gather_test_report(jenkins_url, run_dir)
+        with span('test_report', kind='step'):
+            self._gather_test_report(jenkins_url, run_dir)
+        with span('failure_history', kind='step'):
+            self._attach_failure_history()
         # Show test summary
         test_summary = self.gathered_data.get('test_report', {}).get('summary', {})
         total_tests = test_summary.get('total_tests', 0)
@@ -556,9 +606,11 @@ class DataGatherer:
         if not skip_environment:
             self._print_step(4, total_steps, "Cluster login & landscape...")
             # 4a: Login to cluster and persist kubeconfig + MCH namespace discovery
-            self._login_to_cluster(run_dir)
+            with span('cluster_login', kind='step'):
+                self._login_to_cluster(run_dir)
             # 4b: Cluster landscape (managed clusters, operators, resource pressure)
-            self._gather_cluster_landscape()
+            with span('cluster_landscape', kind='step'):
+                self._gather_cluster_landscape()
             # Backend health investigation handled by Stage 1.5 (cluster-diagnostic agent)
             # and Stage 2 (analysis agent with live cluster access)
             self.gathered_data['cluster_health'] = {
@@ -588,7 +640,8 @@ class DataGatherer:
             has_cluster_access = self.gathered_data.get(
                 'cluster_access', {}
             ).get('has_credentials', False)
-            self._run_environment_oracle(skip_cluster=not has_cluster_access)
+            with span('environment_oracle', kind='step'):
+                self._run_environment_oracle(skip_cluster=not has_cluster_access)
             # Show oracle summary
             oracle = self.gathered_data.get('cluster_oracle', {})
             overall = oracle.get('overall_feature_health', {})
@@ -612,7 +665,8 @@ class DataGatherer:
         # Step 6: Clone repositories to run directory (optional)
         if not skip_repository:
             self._print_step(6, total_steps, "Cloning repositories...")
-            self._clone_repositories(jenkins_url, run_dir)
+            with span('clone_repositories', kind='step'):
+                self._clone_repositories(jenkins_url, run_dir)
         else:
             self._print_step(6, total_steps, "Skipping repository clone (--skip-repo)")
 
@@ -620,18 +674,21 @@ class DataGatherer:
         # This provides AI with all needed context upfront
         if not skip_repository:
             self._print_step(7, total_steps, "Extracting test context (code, selectors, imports)...")
-            self._extract_complete_test_context(run_dir)
+            with span('test_context', kind='step'):
+                self._extract_complete_test_context(run_dir)
         else:
             self._print_step(7, total_steps, "Skipping context extraction (no repos)")
 
         # Step 8: Feature area grounding (v3.0)
         self._print_step(8, total_steps, "Grounding feature areas...")
-        self._ground_feature_areas()
+        with span('feature_grounding', kind='step'):
+            self._ground_feature_areas()
 
         # Step 9: Feature knowledge playbooks + KG dependency context (v3.1)
         # Now uses oracle results to resolve addon/operator/crd prerequisites
         self._print_step(9, total_steps, "Loading feature knowledge...")
-        self._check_feature_knowledge()
+        with span('feature_knowledge', kind='step'):
+            self._check_feature_knowledge()
 
         # Finalize MCP availability based on actual check results
         kg_status = self.gathered_data.get('feature_knowledge', {}).get('kg_status', {})
@@ -642,7 +699,10 @@ class DataGatherer:
         self.gathered_data['metadata']['gathering_time_seconds'] = gathering_time
 
         # Save data (NOTE: repos NOT cleaned up - AI needs access)
-        self._save_combined_data(run_dir)
+        with span('save', kind='step'):
+            self._save_combined_data(run_dir)
+        get_recorder().write_summary(run_dir, total_seconds=time.time() - start_time)
+        self._release_run_console()
 
         self.logger.info(f"Data gathering complete in {gathering_time:.2f}s")
         self.logger.info(f"Files saved to: {run_dir}")
@@ -684,14 +744,50 @@ class DataGatherer:
 
         return run_dir
 
+    def _get_evidence(self, jenkins_url: str, run_dir: Path) -> JenkinsEvidenceStore:
+        """Return the run's evidence store, creating it if this URL has none yet."""
+        if self.evidence is None or self.evidence.jenkins_url != jenkins_url:
+            self.evidence = JenkinsEvidenceStore(
+                jenkins_url, self.jenkins_service, console_path=run_dir / 'console-log.txt'
+            )
+        return self.evidence
+
+    def _console_log(self, run_dir: Path) -> Optional[ConsoleLog]:
+        """
+        The run's shared ConsoleLog, or None if there is no console log.
+
+        Comes from the evidence store when it owns this run's console-log.txt;
+        otherwise the file is memory-mapped once and cached on the gatherer.
+        """
+        console_path = run_dir / 'console-log.txt'
+        if self.evidence is not None and self.evidence.console_path == console_path:
+            console = self.evidence.console()
+            return console if console else None
+
+        if self._run_console is not None and self._run_console.path == console_path:
+            return self._run_console
+        self._release_run_console()
+        if not console_path.exists():
+            return None
+        self._run_console = ConsoleLog(console_path)
+        return self._run_console
+
+    def _release_run_console(self):
+        """Unmap the cached console log (between runs; the gatherer may be reused)."""
+        if self._run_console is not None:
+            self._run_console.close()
+            self._run_console = None
+
     def _gather_jenkins_build_info(self, jenkins_url: str, run_dir: Path):
         """Gather Jenkins build information."""
         self.logger.info("Gathering Jenkins build info...")
 
         try:
             # Skip console fetch here - we fetch it separately in _gather_console_log()
-            # This avoids fetching the console log twice (saves network bandwidth and time)
-            intelligence = self.jenkins_service.analyze_jenkins_url(jenkins_url, skip_console_fetch=True)
+            # The test report parsed here stays in the evidence store for Step 3
+            intelligence = self.jenkins_service.analyze_jenkins_url(
+                jenkins_url, skip_console_fetch=True, evidence=self._get_evidence(jenkins_url, run_dir)
+            )
 
             build_info = {
                 'build_url': intelligence.metadata.build_url,
@@ -709,9 +805,7 @@ class DataGatherer:
             self.gathered_data['jenkins'] = build_info
 
             # Save to file with masked credentials
-            masked_build_info = self._mask_sensitive_data(build_info)
-            output_path = run_dir / 'jenkins-build-info.json'
-            output_path.write_text(json.dumps(masked_build_info, indent=2, default=str))
+            self._write_masked_json(run_dir / 'jenkins-build-info.json', build_info)
 
             self.logger.info(f"Build result: {build_info['build_result']}")
 
@@ -726,34 +820,35 @@ class DataGatherer:
         self.logger.info("Gathering console log...")
 
         try:
-            api_client = JenkinsAPIClient()
-            if api_client.is_authenticated:
-                success, console_output, error = api_client.get_console_output(jenkins_url)
-                if not success:
-                    self.logger.warning(f"API client console fetch failed: {error}")
-                    console_output = self.jenkins_service._fetch_console_log(jenkins_url)
-            else:
-                console_output = self.jenkins_service._fetch_console_log(jenkins_url)
+            evidence = self._get_evidence(jenkins_url, run_dir)
+            console = evidence.console()
 
-            if console_output:
+            if console:
                 # Save full console log
-                console_path = run_dir / 'console-log.txt'
-                console_path.write_text(console_output)
-
-                # Extract key info
-                lines = console_output.split('\n')
-                error_lines = [l for l in lines if 'error' in l.lower() or 'fail' in l.lower()]
-
-                # Detect error patterns (factual, no classification)
-                has_500_errors = any('500' in l for l in error_lines)
-                has_network_errors = any('network' in l.lower() or 'connection' in l.lower() for l in error_lines)
-                has_timeout_mentions = any('timeout' in l.lower() or 'timed out' in l.lower() for l in lines)
+                evidence.save_console()
+
+                # Extract key info - regex scans run over the mapped file,
+                # only matching lines are decoded
+                error_count = 0
+                key_errors = []
+                has_500_errors = False
+                has_network_errors = False
+                for _, line in console.grep(r'error|fail', re.IGNORECASE):
+                    error_count += 1
+                    if len(key_errors) < 20:
+                        key_errors.append(line)
+                    # Detect error patterns (factual, no classification)
+                    has_500_errors = has_500_errors or '500' in line
+                    lowered = line.lower()
+                    has_network_errors = has_network_errors or 'network' in lowered or 'connection' in lowered
+                has_timeout_mentions = console.search(r'timeout|timed out', re.IGNORECASE) is not None
+                total_lines = console.line_count
 
                 self.gathered_data['console_log'] = {
                     'file_path': 'console-log.txt',
-                    'total_lines': len(lines),
-                    'error_lines_count': len(error_lines),
-                    'key_errors': error_lines[:20],
+                    'total_lines': total_lines,
+                    'error_lines_count': error_count,
+                    'key_errors': key_errors,
                     'error_patterns': {
                         'has_500_errors': has_500_errors,
                         'has_network_errors': has_network_errors,
@@ -761,7 +856,15 @@ class DataGatherer:
                     }
                 }
 
-                self.logger.info(f"Console log: {len(lines)} lines, {len(error_lines)} errors")
+                segments = self._index_console_log(console, run_dir)
+                if segments:
+                    self.gathered_data['console_log']['segments'] = segments
+
+                components = self._scan_console_components(console)
+                if components:
+                    self.gathered_data['console_log']['components'] = components
+
+                self.logger.info(f"Console log: {total_lines} lines, {error_count} errors")
             else:
                 self.gathered_data['console_log'] = {'error': 'Failed to fetch console log'}
 
@@ -771,12 +874,76 @@ class DataGatherer:
             self.gathered_data['errors'].append(error_msg)
             self.gathered_data['console_log'] = {'error': error_msg}
 
+    def _index_console_log(self, console: ConsoleLog, run_dir: Path) -> Optional[Dict[str, Any]]:
+        """
+        Segment the console log into per-stage and per-spec byte ranges.
+
+        The full index is saved as console-index.json; the returned summary
+        (stage outcomes, failing specs with their own error lines) goes into
+        core-data.json. Returns None if segmentation fails.
+        """
+        try:
+            index = ConsoleSegmenter().load_or_build(console, run_dir)
+        except Exception as e:
+            self.logger.warning(f"Console segmentation failed: {e}")
+            return None
+        self.console_index = index
+
+        failed_specs = []
+        for spec in index.failed_specs():
+            errors = console.grep(r'error|fail', re.IGNORECASE, spec.start, spec.end)
+            failed_specs.append({
+                'name': spec.name,
+                'stage': spec.parent,
+                'tests': spec.tests,
+                'lines': [spec.start_line, spec.end_line],
+                'key_errors': [line for _, line in itertools.islice(errors, 5)],
+            })
+
+        self.logger.info(f"Console index: {len(index.stages)} stages, {len(index.specs)} specs, "
+                         f"{len(failed_specs)} failing")
+        return {
+            'index_file': INDEX_FILENAME,
+            'stages': [
+                {'name': stage.name, 'status': stage.status,
+                 'duration_seconds': stage.duration_seconds}
+                for stage in index.stages
+            ],
+            'spec_count': len(index.specs),
+            'failed_specs': failed_specs,
+        }
+
+    def _scan_console_components(self, console: ConsoleLog) -> Optional[Dict[str, Any]]:
+        """
+        Per-component occurrence histogram of the console log, with the error
+        lines each component shows up on. Returns None if the scan fails.
+        """
+        try:
+            scan = self.component_extractor.scan_console_log(console)
+        except Exception as e:
+            self.logger.warning(f"Console component scan failed: {e}")
+            return None
+        summary = scan.to_dict()
+        if summary['histogram']:
+            top = ', '.join(f"{name}={count}" for name, count in list(summary['histogram'].items())[:5])
+            self.logger.info(f"Console components: {top}")
+        return summary
+
+    def _console_index(self, run_dir: Path) -> Optional[ConsoleIndex]:
+        """The run's console index: from Step 2, or the saved console-index.json."""
+        index = self.console_index
+        if index is None:
+            index = ConsoleIndex.load(run_dir / INDEX_FILENAME)
+            self.console_index = index
+        return index
+
     def _gather_test_report(self, jenkins_url: str, run_dir: Path):
         """Gather test report - CRITICAL for per-test analysis."""
         self.logger.info("Gathering test report...")
 
         try:
-            test_report = self.jenkins_service._fetch_and_analyze_test_report(jenkins_url)
+            # Already fetched and parsed in Step 1 - no second download
+            test_report = self._get_evidence(jenkins_url, run_dir).test_report()
 
             if test_report:
                 test_data = {
@@ -791,10 +958,10 @@ class DataGatherer:
                     'failed_tests': []
                 }
 
-                # Extract each failed test with FULL details and parsed stack traces
+                # Extract each failed test with FULL details
                 # NO pre-classification - AI will classify
                 for test in test_report.failed_tests:
-                    test_entry = {
+                    test_data['failed_tests'].append({
                         'test_name': test.test_name,
                         'class_name': test.class_name,
                         'status': test.status,
@@ -803,24 +970,41 @@ class DataGatherer:
                         'stack_trace': test.stack_trace,
                         'failure_type': test.failure_type
                         # NO classification fields - AI determines this
-                    }
+                    })
+                failed_entries = test_data['failed_tests']
 
-                    # Parse stack trace to extract structured data (Phase 1 enhancement)
-                    parsed_stack = self._parse_stack_trace_data(
-                        test.stack_trace,
-                        test.error_message
-                    )
-                    if parsed_stack:
-                        test_entry['parsed_stack_trace'] = parsed_stack
+                # Group tests that fail the same way (normalized error + code path)
+                clusters = self._cluster_failures(failed_entries)
 
-                    # Extract backend component names for Knowledge Graph queries
-                    detected_components = self._extract_components_from_failure(
-                        test.error_message,
-                        test.stack_trace
+                # Parse stack traces to extract structured data (Phase 1 enhancement).
+                # Per-test facts (lines, selectors); the parser memoizes repeated traces.
+                parsed_stacks = [
+                    self._parse_stack_trace_data(entry['stack_trace'], entry['error_message'])
+                    for entry in failed_entries
+                ]
+                for entry, parsed_stack in zip(failed_entries, parsed_stacks):
+                    if parsed_stack:
+                        entry['parsed_stack_trace'] = parsed_stack
+
+                # Extract backend component names for Knowledge Graph queries -
+                # once per cluster, copied to every member
+                cluster_components = [
+                    self._extract_components_from_failure(
+                        failed_entries[c.representative]['error_message'],
+                        failed_entries[c.representative]['stack_trace'],
                     )
-                    test_entry['detected_components'] = detected_components or []
-
-                    test_data['failed_tests'].append(test_entry)
+                    for c in clusters
+                ]
+                for cluster, detected_components in zip(clusters, cluster_components):
+                    for index in cluster.indices:
+                        entry = failed_entries[index]
+                        entry['detected_components'] = copy.deepcopy(detected_components or [])
+                        entry['failure_cluster'] = cluster.cluster_id
+
+                test_data['failure_clusters'] = {
+                    'total_clusters': len(clusters),
+                    'clusters': [c.to_dict() for c in clusters],
+                }
 
                 self.gathered_data['test_report'] = test_data
 
@@ -896,8 +1080,8 @@ class DataGatherer:
         Returns:
             (api_url, username, password) tuple, or None
         """
-        console_path = run_dir / 'console-log.txt'
-        if not console_path.exists():
+        console = self._console_log(run_dir)
+        if console is None:
             return None
 
         user_pat = re.compile(r'-u\s+(\S+)')
@@ -907,32 +1091,31 @@ class DataGatherer:
         first_match = None
 
         try:
-            with open(console_path, 'r', errors='replace') as f:
-                for line in f:
-                    if 'oc login' not in line or '-p ' not in line:
-                        continue
+            for _, line in console.grep(r'oc login'):
+                if '-p ' not in line:
+                    continue
 
-                    user_m = user_pat.search(line)
-                    pass_m = pass_pat.search(line)
-                    url_m = url_pat.search(line)
+                user_m = user_pat.search(line)
+                pass_m = pass_pat.search(line)
+                url_m = url_pat.search(line)
 
-                    if not (user_m and pass_m and url_m):
-                        continue
+                if not (user_m and pass_m and url_m):
+                    continue
 
-                    user = user_m.group(1)
-                    password = pass_m.group(1)
-                    api_url = url_m.group(1)
+                user = user_m.group(1)
+                password = pass_m.group(1)
+                api_url = url_m.group(1)
 
-                    # Skip masked passwords (Jenkins MaskPasswordsBuildWrapper)
-                    if re.match(r'^\*+$', password):
-                        continue
+                # Skip masked passwords (Jenkins MaskPasswordsBuildWrapper)
+                if re.match(r'^\*+$', password):
+                    continue
 
-                    # Admin credentials get immediate priority (hub login)
-                    if user in ('kubeadmin', 'admin'):
-                        return api_url, user, password
+                # Admin credentials get immediate priority (hub login)
+                if user in ('kubeadmin', 'admin'):
+                    return api_url, user, password
 
-                    if first_match is None:
-                        first_match = (api_url, user, password)
+                if first_match is None:
+                    first_match = (api_url, user, password)
 
         except Exception as e:
             self.logger.debug(f"Console log credential extraction failed: {e}")
@@ -1344,34 +1527,31 @@ class DataGatherer:
 
     def _extract_repo_info_from_console(self, run_dir: Path) -> Tuple[Optional[str], Optional[str]]:
         """Extract repository URL and branch from console log."""
-        console_path = run_dir / 'console-log.txt'
+        console = self._console_log(run_dir)
 
-        if not console_path.exists():
+        if console is None:
             return None, None
 
         repo_url = None
         branch = None
 
         try:
-            with open(console_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
             # Pattern 1: "Checking out git https://github.com/org/repo.git"
             checkout_pattern = r'Checking out git\s+(https?://[^\s]+\.git)'
-            match = re.search(checkout_pattern, content)
+            match = console.search(checkout_pattern)
             if match:
                 repo_url = match.group(1)
 
             # Pattern 2: "git fetch ... https://github.com/org/repo.git"
             if not repo_url:
                 fetch_pattern = r'git fetch[^\n]+(https?://github\.com/[^\s]+\.git)'
-                match = re.search(fetch_pattern, content)
+                match = console.search(fetch_pattern)
                 if match:
                     repo_url = match.group(1)
 
             # Extract branch
             branch_pattern = r'Checking out Revision [a-f0-9]+ \(origin/([^\)]+)\)'
-            match = re.search(branch_pattern, content)
+            match = console.search(branch_pattern)
             if match:
                 branch = match.group(1)
 
@@ -1606,6 +1786,21 @@ class DataGatherer:
 
         repos_dir = run_dir / 'repos'
         automation_path = repos_dir / 'automation'
+        console_index = self._console_index(run_dir)
+
+        # Each distinct test file is read once, however many of its tests failed
+        test_file_paths = [
+            (test.get('parsed_stack_trace') or {}).get('root_cause_file')
+            or (test.get('parsed_stack_trace') or {}).get('test_file')
+            for test in failed_tests
+        ]
+        test_files = self._read_test_files(automation_path, test_file_paths)
+
+        # Assertion values and failure mode, in report order
+        analyses = [
+            self._analyze_failure_context(test.get('failure_type', ''), test.get('error_message', ''))
+            for test in failed_tests
+        ]
 
         for i, test in enumerate(failed_tests):
             test_name = test.get('test_name', '')
@@ -1621,14 +1816,26 @@ class DataGatherer:
                 'assertion_analysis': None,
                 'failure_mode_category': None,
                 'temporal_summary': None,
+                'console_segment': None,
             }
 
-            # 1. Extract test file content
-            test_file_path = parsed_stack.get('root_cause_file') or parsed_stack.get('test_file')
-            if test_file_path and automation_path.exists():
-                test_content = self._read_test_file(automation_path, test_file_path)
-                if test_content:
-                    extracted_context['test_file'] = test_content
+            # 1. Extract test file content (a copy, so entries stay independent)
+            test_file_path = test_file_paths[i]
+            test_content = test_files.get(test_file_path)
+            if test_content:
+                extracted_context['test_file'] = dict(test_content)
+
+            # 1b. Locate this spec's slice of console-log.txt (see console-index.json)
+            if console_index:
+                spec = console_index.spec_for(parsed_stack.get('test_file') or test_file_path)
+                if spec:
+                    extracted_context['console_segment'] = {
+                        'spec': spec.name,
+                        'status': spec.status,
+                        'start': spec.start,
+                        'end': spec.end,
+                        'lines': [spec.start_line, spec.end_line],
+                    }
 
             # 2. Page objects — populated by data-collector agent after gather.py completes.
             # The agent traces imports and resolves selector definitions across any
@@ -1638,27 +1845,37 @@ class DataGatherer:
             # agent after gather.py completes. The agent uses MCP tools and git history
             # analysis for context-aware verification.
 
-            # 5. Extract assertion values from error message
-            error_message = test.get('error_message', '')
-            if error_message:
-                assertion_values = self.stack_parser.extract_assertion_values(error_message)
-                if assertion_values:
-                    extracted_context['assertion_analysis'] = assertion_values
-            # assertion_analysis stays None if no assertion values found
-
-            # 6. Determine failure mode category (GAP-01 + GAP-02)
-            extracted_context['failure_mode_category'] = self._classify_failure_mode(
-                test.get('failure_type', ''),
-                error_message,
-                extracted_context.get('console_search'),
-                extracted_context.get('assertion_analysis'),
-            )
+            # 5. Assertion values from the error message (None if none found)
+            # 6. Failure mode category (GAP-01 + GAP-02)
+            assertion_values, failure_mode = analyses[i]
+            extracted_context['assertion_analysis'] = assertion_values
+            extracted_context['failure_mode_category'] = failure_mode
 
             # Store extracted context in the test entry
             self.gathered_data['test_report']['failed_tests'][i]['extracted_context'] = extracted_context
 
         self.logger.info(f"Extracted context for {len(failed_tests)} failed tests")
 
+    def _analyze_failure_context(
+        self,
+        failure_type: str,
+        error_message: str
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Per-test assertion analysis and failure-mode classification (Step 7).
+
+        console_search is always None at this point - it is filled in later
+        by the data-collector agent.
+
+        Returns:
+            (assertion values or None, failure mode category)
+        """
+        assertion_values = None
+        if error_message:
+            assertion_values = self.stack_parser.extract_assertion_values(error_message) or None
+        failure_mode = self._classify_failure_mode(failure_type, error_message, None, assertion_values)
+        return assertion_values, failure_mode
+
     @staticmethod
     def _classify_failure_mode(
         failure_type: str,
@@ -1778,6 +1995,36 @@ class DataGatherer:
             self.logger.debug(f"Failed to read test file {test_file_path}: {e}")
             return None
 
+    def _read_test_files(
+        self,
+        automation_path: Path,
+        test_file_paths: List[Optional[str]]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Read each distinct test file once, concurrently.
+
+        Args:
+            automation_path: Path to automation repo
+            test_file_paths: Per-test file paths (duplicates and None allowed)
+
+        Returns:
+            Dict of test file path -> _read_test_file() result
+        """
+        unique_paths = list(dict.fromkeys(p for p in test_file_paths if p))
+        if not unique_paths or not automation_path.exists():
+            return {}
+
+        workers = min(THRESHOLDS.MAX_TEST_FILE_READERS, len(unique_paths))
+        if workers == 1:
+            contents = [self._read_test_file(automation_path, p) for p in unique_paths]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                contents = list(pool.map(lambda p: self._read_test_file(automation_path, p), unique_paths))
+
+        self.logger.debug(f"Read {len(unique_paths)} distinct test files for "
+                          f"{sum(1 for p in test_file_paths if p)} failed tests")
+        return dict(zip(unique_paths, contents))
+
     # page_objects, console_search, and element verification: populated by data-collector agent
     # (see .claude/agents/data-collector.md, Tasks 1-2)
 
@@ -1856,6 +2103,61 @@ class DataGatherer:
 
         return result
 
+    def _attach_failure_history(self):
+        """
+        Add each failed test's record over recent runs of the same job.
+
+        Reads runs/run-history.db (filled by Stage 3); skipped until a run
+        has been recorded there. Each failed test gets 'failure_history' with
+        its failure rate and fail/pass flips over the last runs, and how many
+        of those runs failed with the same failure_cluster fingerprint.
+        """
+        failed_tests = self.gathered_data.get('test_report', {}).get('failed_tests', [])
+        if not failed_tests or not (self.output_dir / HISTORY_DB_FILENAME).exists():
+            return
+        jenkins = self.gathered_data.get('jenkins', {})
+        job = jenkins.get('job_name')
+        # Earlier analyses of this same build are not history
+        build = jenkins.get('build_number')
+        try:
+            with RunHistoryIndex(self.output_dir) as history:
+                history.refresh()
+                flakiness = history.flakiness_many(
+                    [t['test_name'] for t in failed_tests], job, exclude_build=build
+                )
+                recurrence = {}
+                for test in failed_tests:
+                    entry = flakiness[test['test_name']].to_dict()
+                    del entry['test_name']
+                    fingerprint = test.get('failure_cluster')
+                    if fingerprint:
+                        if fingerprint not in recurrence:
+                            recurrence[fingerprint] = history.recurrence(
+                                fingerprint, job, exclude_build=build
+                            ).runs_failed
+                        entry['fingerprint_runs_failed'] = recurrence[fingerprint]
+                    test['failure_history'] = entry
+        except sqlite3.Error as e:
+            self.logger.warning(f"Run history unavailable: {e}")
+            return
+        flaky = sum(1 for t in failed_tests if t['failure_history']['is_flaky'])
+        self.logger.info(f"Attached run history to {len(failed_tests)} failed tests ({flaky} look flaky)")
+
+    def _cluster_failures(self, failed_tests: List[Dict[str, Any]]) -> List[FailureCluster]:
+        """
+        Fingerprint failed tests and group identical failures.
+
+        Per-failure enrichment then runs once per cluster. Each test's
+        'failure_cluster' field and test_report.failure_clusters let Stage 2
+        treat a cluster as one candidate group (still verified per test).
+        """
+        clusters = FailureClusterer(self.stack_parser).cluster(failed_tests)
+        if len(clusters) < len(failed_tests):
+            largest = max(clusters, key=lambda c: c.size)
+            self.logger.info(f"{len(failed_tests)} failed tests -> {len(clusters)} distinct failures "
+                             f"(largest: {largest.size} x {largest.signature[:80]!r})")
+        return clusters
+
     def _extract_components_from_failure(
         self,
         error_message: Optional[str],
@@ -1903,52 +2205,46 @@ class DataGatherer:
         self.gathered_data['metadata']['status'] = 'complete'
         self.gathered_data['metadata']['data_version'] = '4.0.0'
 
-        # Mask sensitive data
-        masked_data = self._mask_sensitive_data(self.gathered_data)
-
-        # Build core-data.json
+        # Build core-data.json (references into gathered_data; masking
+        # happens while it is serialized, so the tree is not copied)
+        data = self.gathered_data
         core_data = {
-            'metadata': masked_data.get('metadata', {}),
-            'jenkins': masked_data.get('jenkins', {}),
-            'test_report': masked_data.get('test_report', {}),
-            'console_log': masked_data.get('console_log', {}),
-            'environment': masked_data.get('environment', {}),
-            'cluster_health': masked_data.get('cluster_health', {}),
-            'repositories': masked_data.get('repositories', {}),
-            'cluster_landscape': masked_data.get('cluster_landscape', {}),
-            'feature_grounding': masked_data.get('feature_grounding', {}),
-            'feature_knowledge': masked_data.get('feature_knowledge', {}),
-            'cluster_access': masked_data.get('cluster_access', {}),
-            'cluster_oracle': masked_data.get('cluster_oracle', {}),
-            'errors': masked_data.get('errors', []),
+            'metadata': data.get('metadata', {}),
+            'jenkins': data.get('jenkins', {}),
+            'test_report': data.get('test_report', {}),
+            'console_log': data.get('console_log', {}),
+            'environment': data.get('environment', {}),
+            'cluster_health': data.get('cluster_health', {}),
+            'repositories': data.get('repositories', {}),
+            'cluster_landscape': data.get('cluster_landscape', {}),
+            'feature_grounding': data.get('feature_grounding', {}),
+            'feature_knowledge': data.get('feature_knowledge', {}),
+            'cluster_access': data.get('cluster_access', {}),
+            'cluster_oracle': data.get('cluster_oracle', {}),
+            'errors': data.get('errors', []),
         }
 
-        # Save core-data.json
-        core_path = run_dir / 'core-data.json'
-        core_path.write_text(json.dumps(core_data, indent=2, default=str))
+        # Save core-data.json (or core-data.pack, whose offset table goes in the manifest)
+        data_files = RunArtifacts(run_dir).write(core_data, self.artifact_format, self.artifact_codec,
+                                                 masker=self.masker)
 
         # Save manifest.json
-        manifest = self._build_manifest(run_dir)
+        manifest = self._build_manifest(run_dir, data_files)
         manifest_path = run_dir / 'manifest.json'
         manifest_path.write_text(json.dumps(manifest, indent=2, default=str))
 
-        self.logger.info(f"Saved core-data.json and manifest.json")
+        self.logger.info(f"Saved {', '.join(data_files)} and manifest.json")
         self.logger.info("Credentials have been masked in output files")
 
-    def _build_manifest(self, run_dir: Path) -> Dict[str, Any]:
+    def _build_manifest(self, run_dir: Path,
+                        data_files: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
         """Build manifest.json index file."""
         manifest = {
             'version': '4.0.0',
             'file_structure': 'multi-file-with-repos',
             'created_at': datetime.now().isoformat(),
             'acm_source_mcp_available': True,  # Always available via Claude Code native MCP
-            'files': {
-                'core-data.json': {
-                    'description': 'Primary analysis data (metadata, jenkins, test_report, console_log, environment, feature_knowledge)',
-                    'required': True,
-                    'load_first': True
-                }
-            },
+            'files': dict(data_files or {'core-data.json': RunArtifacts.json_entry()}),
             'repositories': {
                 'repos/automation/': {
                     'description': 'Full cloned automation repository - AI can read any file',
@@ -1975,6 +2271,13 @@ class DataGatherer:
             ]
         }
 
+        if (run_dir / INDEX_FILENAME).exists():
+            manifest['files'][INDEX_FILENAME] = {
+                'description': 'Byte/line ranges of each pipeline stage and Cypress spec in console-log.txt',
+                'required': False,
+                'use_case': "Read only a failing spec's slice of the console log",
+            }
+
         return manifest
 
     # _build_ai_instructions removed in v4.0 — Stage 2 reads instructions
@@ -1985,12 +2288,55 @@ class DataGatherer:
 
 
 def gather_all_data(jenkins_url: str, output_dir: str = './runs',
-                    verbose: bool = False) -> Tuple[Path, Dict[str, Any]]:
+                    verbose: bool = False, artifact_format: str = 'json') -> Tuple[Path, Dict[str, Any]]:
     """Convenience function to gather all data."""
-    gatherer = DataGatherer(output_dir=output_dir, verbose=verbose)
+    gatherer = DataGatherer(output_dir=output_dir, verbose=verbose, artifact_format=artifact_format)
     return gatherer.gather_all(jenkins_url)
 
 
+def gather_downstream(jenkins_url: str, output_dir: str = './runs',
+                      verbose: bool = False, skip_environment: bool = False,
+                      skip_repository: bool = False,
+                      max_depth: int = 5, artifact_format: str = 'json',
+                      artifact_codec: Optional[str] = None,
+                      mask_values: bool = False) -> List[Path]:
+    """
+    Crawl the downstream tree of a top-level pipeline and gather every
+    downstream build whose test report has failures.
+
+    The tree is saved as downstream-tree.json in the output directory.
+
+    Returns:
+        Run directories created, in tree order
+    """
+    configure_logging(verbose=verbose)
+    tree = DownstreamTreeCrawler(max_depth=max_depth).crawl(jenkins_url)
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    (out / 'downstream-tree.json').write_text(json.dumps(tree.to_dict(), indent=2))
+
+    targets = tree.failed_test_builds()
+    total_builds = sum(1 for _ in tree.walk())
+    print(f"  Downstream tree: {total_builds} builds, "
+          f"{len(targets)} with failing tests", flush=True)
+
+    run_dirs = []
+    for index, build in enumerate(targets, 1):
+        print(f"\n  [{index}/{len(targets)}] {build.job_name} #{build.build_number} "
+              f"({build.fail_count}/{build.total_count} failed)", flush=True)
+        gatherer = DataGatherer(output_dir=output_dir, verbose=verbose,
+                                artifact_format=artifact_format, artifact_codec=artifact_codec,
+                                mask_values=mask_values)
+        run_dir, _ = gatherer.gather_all(
+            build.url,
+            skip_environment=skip_environment,
+            skip_repository=skip_repository,
+        )
+        run_dirs.append(run_dir)
+    return run_dirs
+
+
 def main():
     """CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -2009,17 +2355,22 @@ Key Features (v4.0):
 
 Output Files:
   core-data.json         Primary data for AI (read this first)
+  core-data.pack         Compressed, sectioned core data (--artifact-format packed)
   manifest.json          File index with workflow instructions
   cluster.kubeconfig     Persisted cluster auth for Stage 1.5 and Stage 2
   repos/automation/      Full cloned automation repository
   repos/console/         Full cloned console repository
   console-log.txt        Full console output
+  console-index.json     Per-stage / per-spec ranges of console-log.txt
   jenkins-build-info.json
   test-report.json
 
 Examples:
   python -m src.scripts.gather https://jenkins.example.com/job/pipeline/123/
   python -m src.scripts.gather --url https://jenkins.example.com/job/pipeline/123/ --verbose
+  python -m src.scripts.gather --downstream https://jenkins.example.com/job/zstream-top/45/
+  python -m src.scripts.gather --artifact-format packed https://jenkins.example.com/job/pipeline/123/
+  python -m src.scripts.gather --export-json runs/<run_dir>
         """
     )
 
@@ -2029,9 +2380,35 @@ Examples:
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose logging')
     parser.add_argument('--skip-env', action='store_true', help='Skip environment validation')
     parser.add_argument('--skip-repo', action='store_true', help='Skip repository cloning')
+    parser.add_argument('--downstream', action='store_true',
+                        help='Treat URL as a top-level pipeline: crawl its downstream tree '
+                             'and gather every build with failing tests')
+    parser.add_argument('--max-depth', type=int, default=5,
+                        help='Downstream crawl depth (with --downstream, default 5)')
+    parser.add_argument('--artifact-format', choices=ARTIFACT_FORMATS, default='json',
+                        help='core-data.json (default) or compressed, sectioned core-data.pack')
+    parser.add_argument('--codec', choices=CODECS, default=None,
+                        help='Section codec for --artifact-format packed (default: zstd if installed, else gzip)')
+    parser.add_argument('--mask-values', action='store_true',
+                        help='Also mask credentials embedded in string values (e.g. "--password=..."), '
+                             'not only values under sensitive keys')
+    parser.add_argument('--export-json', metavar='RUN_DIR',
+                        help='Write core-data.json from an existing run\'s core-data.pack and exit')
+    parser.add_argument('--pack', metavar='RUN_DIR',
+                        help='Convert an existing run\'s core-data.json to core-data.pack and exit')
 
     args = parser.parse_args()
 
+    if args.export_json or args.pack:
+        artifacts = RunArtifacts(args.export_json or args.pack)
+        try:
+            path = artifacts.export_json() if args.export_json else artifacts.pack(args.codec)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"  Wrote {path}")
+        sys.exit(0)
+
     jenkins_url = args.url or args.url_flag
 
     if not jenkins_url:
@@ -2043,8 +2420,31 @@ Examples:
         print(f"Error: Invalid Jenkins URL: {jenkins_url}", file=sys.stderr)
         sys.exit(1)
 
+    if args.downstream:
+        try:
+            run_dirs = gather_downstream(
+                jenkins_url,
+                output_dir=args.output_dir,
+                verbose=args.verbose,
+                skip_environment=args.skip_env,
+                skip_repository=args.skip_repo,
+                max_depth=args.max_depth,
+                artifact_format=args.artifact_format,
+                artifact_codec=args.codec,
+                mask_values=args.mask_values,
+            )
+        except KeyboardInterrupt:
+            print("\nGathering cancelled", file=sys.stderr)
+            sys.exit(130)
+        print(f"\n  Gathered {len(run_dirs)} downstream run(s):")
+        for run_dir in run_dirs:
+            print(f"    {run_dir}")
+        sys.exit(0)
+
     try:
-        gatherer = DataGatherer(output_dir=args.output_dir, verbose=args.verbose)
+        gatherer = DataGatherer(output_dir=args.output_dir, verbose=args.verbose,
+                                artifact_format=args.artifact_format, artifact_codec=args.codec,
+                                mask_values=args.mask_values)
         run_dir, data = gatherer.gather_all(
             jenkins_url,
             skip_environment=args.skip_env,
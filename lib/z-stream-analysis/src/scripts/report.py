@@ -18,6 +18,7 @@ Output:
     - Detailed-Analysis.md (comprehensive markdown report)
     - per-test-breakdown.json (structured JSON for tooling)
     - SUMMARY.txt (brief text summary)
+    - report-cache.json (input fingerprints; unchanged outputs are not rebuilt)
 
 Note:
     Auto-detects multi-file structure (core-data.json) vs legacy (raw-data.json)
@@ -27,12 +28,16 @@ import argparse
 import json
 import logging
 import shutil
+import sqlite3
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from src.logging_config import configure_logging, bind_context
+from src.reports.build_cache import ReportBuildCache
+from src.services.run_artifacts import RunArtifacts
+from src.services.run_history import RunHistoryIndex
 
 
 class ReportFormatter:
@@ -61,16 +66,27 @@ class ReportFormatter:
         'LOW': '🟢'
     }
     
-    def __init__(self, run_dir: Path, validate_schema: bool = True):
+    # Files the Markdown, JSON and summary reports are generated from
+    DATA_INPUTS = ('analysis-results.json', 'core-data.json', 'core-data.pack', 'raw-data.json', 'manifest.json')
+    # Additional files read by the HTML report
+    HTML_INPUTS = ('cluster-diagnosis.json', 'cluster-health.json',
+                   'environment-status.json', 'pipeline.log.jsonl', 'perf-summary.json')
+
+    def __init__(self, run_dir: Path, validate_schema: bool = True, use_cache: bool = True):
         """
         Initialize report formatter.
 
         Args:
             run_dir: Path to the run directory containing gathered data and analysis
             validate_schema: If True, validate analysis-results.json before processing
+            use_cache: If True, skip outputs (and per-test fragments) whose inputs
+                       are unchanged since the last run (see report-cache.json)
         """
         self.run_dir = Path(run_dir)
         self.logger = logging.getLogger(__name__)
+        self.build_cache = ReportBuildCache(self.run_dir, enabled=use_cache)
+        # core-data.json or packed core-data.pack
+        self.artifacts = RunArtifacts(self.run_dir)
 
         # Auto-detect and load data (multi-file or legacy)
         self.raw_data = self._load_core_data()
@@ -83,7 +99,12 @@ class ReportFormatter:
         # Use 'is not None' (not truthiness) because {} is falsy but means the file
         # exists with an empty object, which is still a schema error.
         if validate_schema and self.analysis_results is not None:
-            self._validate_analysis_results(strict=True)
+            fingerprint = self.build_cache.fingerprint('analysis-results.json')
+            if self.build_cache.is_validated(fingerprint):
+                self.logger.debug("analysis-results.json unchanged since last validation")
+            else:
+                self._validate_analysis_results(strict=True)
+                self.build_cache.mark_validated(fingerprint)
 
     def _load_core_data(self) -> Optional[Dict[str, Any]]:
         """
@@ -91,6 +112,7 @@ class ReportFormatter:
 
         Detection logic:
         1. If manifest.json exists → multi-file mode, load core-data.json
+           (or core-data.pack when the run was gathered packed)
         2. If raw-data.json exists with _migration_version → multi-file mode
         3. If raw-data.json exists without _migration_version → legacy mode
 
@@ -101,7 +123,7 @@ class ReportFormatter:
         manifest = self._load_json('manifest.json')
         if manifest:
             self.logger.debug("Detected multi-file structure (manifest.json present)")
-            core_data = self._load_json('core-data.json')
+            core_data = self.artifacts.load()
             if core_data:
                 return core_data
             else:
@@ -113,7 +135,7 @@ class ReportFormatter:
             # Check if it's a migration stub
             if raw_data.get('_migration_version'):
                 self.logger.debug("Detected multi-file stub, loading core-data.json")
-                core_data = self._load_json('core-data.json')
+                core_data = self.artifacts.load()
                 if core_data:
                     return core_data
                 else:
@@ -125,7 +147,7 @@ class ReportFormatter:
                 return raw_data
 
         # Try core-data.json directly
-        core_data = self._load_json('core-data.json')
+        core_data = self.artifacts.load()
         if core_data:
             self.logger.debug("Loading core-data.json directly")
             return core_data
@@ -185,33 +207,54 @@ class ReportFormatter:
         """
         Generate all report formats.
 
+        Outputs whose inputs are unchanged since the last run are reused.
+
         Returns:
             Dictionary of report type to file path
         """
         reports = {}
+        data_inputs = {'run_dir': str(self.run_dir), **self.build_cache.inputs(*self.DATA_INPUTS)}
 
         # Generate Markdown report
-        md_path = self.format_markdown()
+        md_path = self._build('markdown', 'Detailed-Analysis.md', self.format_markdown, data_inputs)
         reports['markdown'] = str(md_path)
 
         # Generate JSON breakdown
-        json_path = self.format_json()
+        json_path = self._build('json', 'per-test-breakdown.json', self.format_json, data_inputs)
         reports['json'] = str(json_path)
 
         # Generate text summary
-        summary_path = self.format_summary()
+        summary_path = self._build('summary', 'SUMMARY.txt', self.format_summary, data_inputs)
         reports['summary'] = str(summary_path)
 
         # Generate interactive HTML report
         try:
-            from src.reports.html_report import generate_html_report
-            html_path = generate_html_report(self.run_dir)
+            from src.reports.html_report import _find_trace_file, _trace_window_key, generate_html_report
+            trace_file = _find_trace_file(self.run_dir)
+            html_inputs = {**data_inputs, **self.build_cache.inputs(*self.HTML_INPUTS)}
+            html_inputs['trace'] = _trace_window_key(self.run_dir, trace_file)
+            html_path = self._build(
+                'html', 'analysis-report.html',
+                lambda: generate_html_report(self.run_dir, trace_file, cache=self.build_cache),
+                html_inputs,
+            )
             reports['html'] = str(html_path)
         except Exception as e:
             self.logger.warning(f"HTML report generation failed: {e}")
 
+        self.build_cache.save()
         return reports
-    
+
+    def _build(self, output: str, filename: str, build, inputs: Dict[str, Any]) -> Path:
+        """Run build() unless the cached output for these inputs is still on disk."""
+        path = self.run_dir / filename
+        if self.build_cache.is_fresh(output, path, inputs):
+            self.logger.debug(f"{filename} is up to date")
+            return path
+        path = build()
+        self.build_cache.record(output, path, inputs)
+        return path
+
     def format_markdown(self) -> Path:
         """Generate detailed Markdown report."""
         lines = []
@@ -492,96 +535,107 @@ class ReportFormatter:
             "",
         ]
         
+        cache = getattr(self, 'build_cache', None)
         for i, test in enumerate(per_test, 1):
-            test_name = test.get('test_name', 'Unknown')
-            test_file = test.get('test_file', test.get('class_name', ''))
-            classification = test.get('classification', 'UNKNOWN')
-            confidence = test.get('confidence', 0)
-            reasoning = test.get('reasoning', {})
-            error = test.get('error', {})
-            recommended_fix = test.get('recommended_fix', {})
-            
-            emoji = self.CLASSIFICATION_EMOJI.get(classification, '⚪')
-            
+            if cache is None:
+                lines.extend(self._format_test_entry(i, test))
+            else:
+                lines.extend(cache.fragment('md-test', [i, test], lambda: self._format_test_entry(i, test)))
+
+        return lines
+
+    def _format_test_entry(self, i: int, test: Dict[str, Any]) -> List[str]:
+        """Format one test of the per-test analysis section."""
+        lines = []
+        test_name = test.get('test_name', 'Unknown')
+        test_file = test.get('test_file', test.get('class_name', ''))
+        classification = test.get('classification', 'UNKNOWN')
+        confidence = test.get('confidence', 0)
+        reasoning = test.get('reasoning', {})
+        error = test.get('error', {})
+        recommended_fix = test.get('recommended_fix', {})
+        
+        emoji = self.CLASSIFICATION_EMOJI.get(classification, '⚪')
+        
+        lines.extend([
+            f"### {i}. {test_name}",
+            "",
+            f"**File:** `{test_file}`",
+            "",
+            "| Property | Value |",
+            "|----------|-------|",
+            f"| **Classification** | {emoji} {classification.replace('_', ' ')} |",
+            f"| **Confidence** | {confidence:.0%} |",
+            "",
+        ])
+        
+        # Error message
+        if isinstance(error, str):
+            error_msg = error
+        else:
+            error_msg = error.get('message', '')
+        if error_msg:
+            error_display = error_msg[:200].replace('\n', ' ').replace('|', '\\|')
+            if len(error_msg) > 200:
+                error_display += "..."
             lines.extend([
-                f"### {i}. {test_name}",
-                "",
-                f"**File:** `{test_file}`",
-                "",
-                "| Property | Value |",
-                "|----------|-------|",
-                f"| **Classification** | {emoji} {classification.replace('_', ' ')} |",
-                f"| **Confidence** | {confidence:.0%} |",
+                "**Error:**",
+                "```",
+                error_display,
+                "```",
                 "",
             ])
+        
+        # Reasoning
+        if isinstance(reasoning, dict):
+            summary = reasoning.get('summary', '')
+            evidence = reasoning.get('evidence', [])
+            conclusion = reasoning.get('conclusion', '')
             
-            # Error message
-            if isinstance(error, str):
-                error_msg = error
-            else:
-                error_msg = error.get('message', '')
-            if error_msg:
-                error_display = error_msg[:200].replace('\n', ' ').replace('|', '\\|')
-                if len(error_msg) > 200:
-                    error_display += "..."
-                lines.extend([
-                    "**Error:**",
-                    "```",
-                    error_display,
-                    "```",
-                    "",
-                ])
+            if summary:
+                lines.append(f"**Analysis:** {summary}")
+                lines.append("")
             
-            # Reasoning
-            if isinstance(reasoning, dict):
-                summary = reasoning.get('summary', '')
-                evidence = reasoning.get('evidence', [])
-                conclusion = reasoning.get('conclusion', '')
-                
-                if summary:
-                    lines.append(f"**Analysis:** {summary}")
-                    lines.append("")
-                
-                if evidence:
-                    lines.append("**Evidence:**")
-                    for ev in evidence[:5]:  # Limit to 5
-                        lines.append(f"- {ev}")
-                    lines.append("")
-                
-                if conclusion:
-                    lines.append(f"**Conclusion:** {conclusion}")
-                    lines.append("")
-            elif isinstance(reasoning, str):
-                lines.append(f"**Analysis:** {reasoning}")
+            if evidence:
+                lines.append("**Evidence:**")
+                for ev in evidence[:5]:  # Limit to 5
+                    lines.append(f"- {ev}")
+                lines.append("")
+            
+            if conclusion:
+                lines.append(f"**Conclusion:** {conclusion}")
                 lines.append("")
+        elif isinstance(reasoning, str):
+            lines.append(f"**Analysis:** {reasoning}")
+            lines.append("")
+        
+        # Recommended fix
+        if isinstance(recommended_fix, dict):
+            action = recommended_fix.get('action', '')
+            steps = recommended_fix.get('steps', [])
+            owner = recommended_fix.get('owner', '')
             
-            # Recommended fix
-            if isinstance(recommended_fix, dict):
-                action = recommended_fix.get('action', '')
-                steps = recommended_fix.get('steps', [])
-                owner = recommended_fix.get('owner', '')
+            if action:
+                lines.append(f"**Recommended Fix:** {action}")
                 
-                if action:
-                    lines.append(f"**Recommended Fix:** {action}")
-                    
-                    if steps:
-                        lines.append("")
-                        for step in steps:
-                            lines.append(f"  - {step}")
-                    
-                    if owner:
-                        lines.append(f"  - **Owner:** {owner}")
-                    
+                if steps:
                     lines.append("")
-            elif isinstance(recommended_fix, str) and recommended_fix:
-                lines.append(f"**Recommended Fix:** {recommended_fix}")
+                    for step in steps:
+                        lines.append(f"  - {step}")
+                
+                if owner:
+                    lines.append(f"  - **Owner:** {owner}")
+                
                 lines.append("")
-            
-            lines.append("---")
+        elif isinstance(recommended_fix, str) and recommended_fix:
+            lines.append(f"**Recommended Fix:** {recommended_fix}")
             lines.append("")
         
+        lines.append("---")
+        lines.append("")
+
         return lines
-    
+
     def _format_cluster_investigation(self, cluster_inv: Dict[str, Any]) -> List[str]:
         """Format cluster investigation section from AI results."""
         lines = [
@@ -1040,6 +1094,17 @@ def format_reports(run_dir: str, cleanup_repos: bool = False) -> Dict[str, str]:
     return reports
 
 
+def record_run_history(run_dir: Path):
+    """Add a completed run to runs/run-history.db for cross-run queries."""
+    if not (run_dir / 'analysis-results.json').exists():
+        return
+    try:
+        with RunHistoryIndex(run_dir.parent) as history:
+            history.ingest_run(run_dir)
+    except (OSError, sqlite3.Error) as e:
+        logging.getLogger(__name__).warning(f"Could not record run history: {e}")
+
+
 def main():
     """CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -1058,11 +1123,14 @@ Output Files:
   Detailed-Analysis.md     Comprehensive markdown report
   per-test-breakdown.json  Structured data for tooling
   SUMMARY.txt              Brief text summary
+  report-cache.json        Input fingerprints; reports with unchanged inputs are reused
+  ../run-history.db        Cross-run failure history (this run is added or updated)
 
 Examples:
   python -m src.scripts.report ./runs/job_20260113_153000
   python -m src.scripts.report --run-dir ./runs/job_20260113_153000
   python -m src.scripts.report ./runs/job_20260113_153000 --keep-repos
+  python -m src.scripts.report ./runs/job_20260113_153000 --rebuild
         """
     )
 
@@ -1070,6 +1138,8 @@ Examples:
     parser.add_argument('--run-dir', '-r', dest='run_dir_flag', help='Path to run directory (alternative)')
     parser.add_argument('--keep-repos', '-k', action='store_true',
                         help='Keep repos/ directory after report generation (default: cleanup to save disk space)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Regenerate every report even if its inputs are unchanged (ignore report-cache.json)')
 
     args = parser.parse_args()
 
@@ -1095,12 +1165,13 @@ Examples:
         print("=" * 60)
 
         print("\n[1/3] Loading analysis results...", flush=True)
-        formatter = ReportFormatter(run_path)
+        formatter = ReportFormatter(run_path, use_cache=not args.rebuild)
 
         print("[2/3] Generating reports...", flush=True)
         reports = formatter.format_all()
 
         print("[3/3] Finalizing...", flush=True)
+        record_run_history(run_path)
 
         print("\n" + "=" * 60)
         print("REPORTS GENERATED")
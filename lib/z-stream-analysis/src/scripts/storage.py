@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Storage CLI
+
+Retention and deduplication for the runs/ directory. Without a policy
+flag it only reports disk usage per job.
+
+Usage:
+    # Disk usage per job
+    python -m src.scripts.storage
+
+    # Keep the last 10 runs per job, repos/ only in the last 2, dedup the rest
+    python -m src.scripts.storage --keep-last 10 --repos-keep-last 2 --dedup
+
+    # Age out runs older than 30 days and stay under 200 GiB (preview only)
+    python -m src.scripts.storage --max-age-days 30 --max-size 200G --dry-run
+
+Deleted runs keep their rows in run-history.db, so flakiness and recurrence
+queries still see them. --forget-history drops those rows.
+"""
+
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+# Add parent directories to path for imports
+script_dir = Path(__file__).parent
+src_dir = script_dir.parent
+app_dir = src_dir.parent
+sys.path.insert(0, str(app_dir))
+
+from src.services.run_history import HISTORY_DB_FILENAME, RunHistoryIndex
+from src.services.run_storage import (
+    DEFAULT_DEDUP_MIN_BYTES,
+    RunStorageManager,
+    format_size,
+    parse_size,
+)
+from src.logging_config import configure_logging
+
+
+def _at_least(minimum: int):
+    """argparse type: an integer no smaller than minimum."""
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid integer: {value}")
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {number}")
+        return number
+    return parse
+
+
+def _positive_days(value: str) -> float:
+    """argparse type: a number of days greater than zero."""
+    try:
+        days = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value}")
+    if not 0 < days < math.inf:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return days
+
+
+def _print_usage(manager: RunStorageManager):
+    runs = manager.runs()
+    print("\n" + "=" * 50)
+    print("RUNS STORAGE")
+    print("=" * 50)
+    print(f"Runs directory: {manager.runs_dir}")
+    print(f"Total on disk:  {format_size(manager.disk_usage())}")
+    print(f"Runs:           {len(runs)}")
+    jobs = {}
+    for run in runs:
+        jobs.setdefault(run.job, []).append(run)
+    if jobs:
+        print("\nBy job:")
+        for job, job_runs in sorted(jobs.items()):
+            size = sum(manager.disk_usage(run.path) for run in job_runs)
+            print(f"  {job}: {len(job_runs)} runs, {format_size(size)} "
+                  f"(newest {job_runs[-1].name})")
+
+
+def _print_report(report):
+    verb = "Would reclaim" if report.dry_run else "Reclaimed"
+    print("\n" + "=" * 50)
+    print("STORAGE CLEANUP" + (" (dry run)" if report.dry_run else ""))
+    print("=" * 50)
+    print(f"Runs deleted:         {len(report.runs_deleted)}")
+    for name in report.runs_deleted:
+        print(f"  - {name}")
+    print(f"repos/ pruned:        {len(report.repos_pruned)}")
+    print(f"Files deduplicated:   {report.files_deduplicated} "
+          f"({format_size(report.bytes_deduplicated)})")
+    print(f"Unused blobs removed: {report.blobs_collected}")
+    print(f"{verb + ':':<22}{format_size(report.bytes_reclaimed)}")
+    print(f"Disk usage:           {format_size(report.usage_before)} -> "
+          f"{format_size(report.usage_after)}")
+
+
+def _forget_history(runs_dir: Path, dry_run: bool) -> int:
+    """Drop run-history.db rows of runs whose directories are gone."""
+    if dry_run or not (runs_dir / HISTORY_DB_FILENAME).exists():
+        return 0
+    with RunHistoryIndex(runs_dir) as history:
+        history.refresh()
+        return history.forget_removed()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Z-Stream Analysis - Run Storage Manager',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Policies are applied in order: --keep-last / --max-age-days, --repos-keep-last,
+--dedup, then --max-size. Runs modified in the last hour are never touched.
+
+Examples:
+  # Show disk usage per job
+  python -m src.scripts.storage
+
+  # Keep the last 10 runs per job and deduplicate console logs and repos
+  python -m src.scripts.storage --keep-last 10 --dedup
+
+  # Keep repos/ only in the newest 2 runs per job
+  python -m src.scripts.storage --repos-keep-last 2
+
+  # Preview aging out old runs under a 200 GiB budget
+  python -m src.scripts.storage --max-age-days 30 --max-size 200G --dry-run
+        """
+    )
+
+    parser.add_argument('--runs-dir', default='./runs',
+                        help='Base runs directory (default: ./runs)')
+    parser.add_argument('--keep-last', type=_at_least(1), metavar='N',
+                        help='Keep only the newest N runs of each job (N >= 1)')
+    parser.add_argument('--max-age-days', type=_positive_days, metavar='DAYS',
+                        help='Delete runs older than DAYS (> 0)')
+    parser.add_argument('--repos-keep-last', type=_at_least(0), metavar='N',
+                        help='Delete repos/ from all but the newest N runs of each job')
+    parser.add_argument('--max-size', type=parse_size, metavar='SIZE',
+                        help='Delete the oldest runs until runs/ fits SIZE (e.g. 200G)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='Hard-link identical console logs and repository files')
+    parser.add_argument('--min-dedup-size', type=parse_size, default=DEFAULT_DEDUP_MIN_BYTES,
+                        metavar='SIZE', help='Smallest file to deduplicate (default: 16K)')
+    parser.add_argument('--forget-history', action='store_true',
+                        help='Also drop run-history.db rows of deleted runs (kept by default)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Show what would be removed without changing anything')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the cleanup report as JSON')
+
+    args = parser.parse_args()
+
+    configure_logging()
+
+    if not Path(args.runs_dir).is_dir():
+        print(f"Error: Runs directory not found: {args.runs_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    manager = RunStorageManager(args.runs_dir, dry_run=args.dry_run)
+
+    policies = (args.keep_last, args.max_age_days, args.repos_keep_last, args.max_size)
+    if all(p is None for p in policies) and not args.dedup and not args.forget_history:
+        _print_usage(manager)
+        sys.exit(0)
+
+    report = manager.apply(
+        keep_last=args.keep_last,
+        max_age_days=args.max_age_days,
+        repos_keep_last=args.repos_keep_last,
+        dedup=args.dedup,
+        min_dedup_bytes=args.min_dedup_size,
+        max_bytes=args.max_size,
+    )
+    forgotten = _forget_history(Path(args.runs_dir), args.dry_run) if args.forget_history else 0
+    if args.json:
+        print(json.dumps({**report.to_dict(), 'history_runs_forgotten': forgotten}, indent=2))
+    else:
+        _print_report(report)
+        if args.forget_history:
+            print(f"History runs dropped: {forgotten}" + (" (skipped in dry run)" if args.dry_run else ""))
+
+
+if __name__ == '__main__':
+    main()
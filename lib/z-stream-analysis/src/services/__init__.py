@@ -23,6 +23,15 @@ from .jenkins_api_client import (
     get_jenkins_api_client,
     is_jenkins_available,
 )
+from .jenkins_evidence_store import JenkinsEvidenceStore
+from .console_log import ConsoleLog, ConsoleMatch
+from .console_segments import ConsoleIndex, ConsoleSegment, ConsoleSegmenter
+from .failure_clustering import FailureCluster, FailureClusterer, normalize_error
+from .jenkins_downstream_tree import (
+    DownstreamBuild,
+    DownstreamTreeCrawler,
+    crawl_downstream_tree,
+)
 
 
 from .acm_source_mcp_client import (
@@ -78,6 +87,8 @@ from .acm_console_knowledge import ACMConsoleKnowledge
 # Component extraction and Knowledge Graph (optional RHACM integration)
 from .component_extractor import (
     ComponentExtractor,
+    ComponentOccurrences,
+    ComponentScan,
     ExtractedComponent
 )
 from .knowledge_graph_client import (
@@ -122,6 +133,34 @@ from .feedback_service import (
     RunFeedback,
 )
 
+# Cross-run failure history
+from .run_history import (
+    RunHistoryIndex,
+    FlakinessStats,
+    FingerprintRecurrence,
+)
+
+# Run artifacts (core-data.json or sectioned core-data.pack)
+from .run_artifacts import (
+    RunArtifacts,
+    ARTIFACT_FORMATS,
+)
+
+# Run-directory retention and deduplication
+from .run_storage import (
+    RunStorageManager,
+    StorageReport,
+)
+
+# Performance spans and perf-summary.json
+from .perf_tracing import (
+    PerfRecorder,
+    Span,
+    get_recorder,
+    span,
+    traced_run,
+)
+
 # Feature Knowledge Playbooks (v3.0)
 from .feature_knowledge_service import (
     FeatureKnowledgeService,
@@ -141,6 +180,7 @@ from .shared_utils import (
     THRESHOLDS,
     # Subprocess utilities
     run_subprocess,
+    stream_subprocess_output,
     build_curl_command,
     execute_curl,
     # JSON utilities
@@ -165,6 +205,9 @@ from .shared_utils import (
     SENSITIVE_PATTERNS,
     mask_sensitive_value,
     mask_sensitive_dict,
+    SensitiveDataMasker,
+    MaskingJSONEncoder,
+    get_masker,
 )
 
 __all__ = [
@@ -172,6 +215,23 @@ __all__ = [
     'JenkinsAPIClient',
     'get_jenkins_api_client',
     'is_jenkins_available',
+    # Jenkins Downstream Tree
+    'DownstreamBuild',
+    'DownstreamTreeCrawler',
+    'crawl_downstream_tree',
+    # Jenkins Evidence Store
+    'JenkinsEvidenceStore',
+    # Console Log Access
+    'ConsoleLog',
+    'ConsoleMatch',
+    # Console Log Segmentation
+    'ConsoleIndex',
+    'ConsoleSegment',
+    'ConsoleSegmenter',
+    # Failure Clustering
+    'FailureCluster',
+    'FailureClusterer',
+    'normalize_error',
     # ACM Source MCP Client
     'ACMSourceMCPClient',
     'ElementInfo',
@@ -213,6 +273,8 @@ __all__ = [
     'ACMConsoleKnowledge',
     # Component Extraction and Knowledge Graph
     'ComponentExtractor',
+    'ComponentOccurrences',
+    'ComponentScan',
     'ExtractedComponent',
     'KnowledgeGraphClient',
     'KG_SUBSYSTEM_MAP',
@@ -241,6 +303,22 @@ __all__ = [
     'FeedbackService',
     'ClassificationFeedback',
     'RunFeedback',
+    # Cross-run failure history
+    'RunHistoryIndex',
+    'FlakinessStats',
+    'FingerprintRecurrence',
+    # Run artifacts
+    'RunArtifacts',
+    'ARTIFACT_FORMATS',
+    # Run storage
+    'RunStorageManager',
+    'StorageReport',
+    # Performance tracing
+    'PerfRecorder',
+    'Span',
+    'get_recorder',
+    'span',
+    'traced_run',
     # Feature Knowledge Playbooks (v3.0)
     'FeatureKnowledgeService',
     'PrerequisiteCheck',
@@ -255,6 +333,7 @@ __all__ = [
     'THRESHOLDS',
     # Shared Utilities
     'run_subprocess',
+    'stream_subprocess_output',
     'build_curl_command',
     'execute_curl',
     'parse_json_response',
@@ -273,4 +352,7 @@ __all__ = [
     'SENSITIVE_PATTERNS',
     'mask_sensitive_value',
     'mask_sensitive_dict',
+    'SensitiveDataMasker',
+    'MaskingJSONEncoder',
+    'get_masker',
 ]
@@ -27,6 +27,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .perf_tracing import traced_run
 from .shared_utils import TIMEOUTS, validate_command_readonly
 
 try:
@@ -931,7 +932,7 @@ class ClusterHealthService:
         cmd.extend(args)
 
         try:
-            result = subprocess.run(
+            result = traced_run(
                 cmd, capture_output=True, text=True, timeout=timeout,
             )
             if result.returncode != 0:
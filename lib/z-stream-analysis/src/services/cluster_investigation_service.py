@@ -19,6 +19,7 @@ import logging
 import subprocess
 from dataclasses import dataclass, field
 
+from .perf_tracing import traced_run
 from .shared_utils import dataclass_to_dict, validate_command_readonly, THRESHOLDS
 from typing import Dict, Any, List, Optional, Tuple
 
@@ -292,7 +293,7 @@ class ClusterInvestigationService:
             return False, '', 'Command blocked: READ-ONLY mode violation'
         cmd = self._build_command(args)
         try:
-            result = subprocess.run(
+            result = traced_run(
                 cmd, capture_output=True, text=True, timeout=timeout
             )
             return result.returncode == 0, result.stdout, result.stderr
@@ -6,11 +6,57 @@ This service enables cascading failure detection and 500 error attribution.
 
 Part of the lightweight, optional RHACM Knowledge Graph integration.
 Works standalone without Neo4j - component extraction is always available.
+
+All component names are folded into one keyword trie, which is compiled to a
+single factored regex (shared prefixes are matched once, longest name wins at
+a given position). Console logs are scanned once over the mapped bytes by
+scan_console_log(), which reports per-component counts, offsets and the error
+lines each component appears on.
 """
 
 import re
-from dataclasses import dataclass
-from typing import List, Optional, Set
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .console_log import ConsoleLog
+
+MAX_HIT_OFFSETS = 20         # byte offsets kept per component
+MAX_ERROR_LINES = 3          # error lines kept per component
+
+_ERROR_WORDS = ('error', 'fail')
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Regex source for a keyword set, factored along its trie.
+
+    ['search-api', 'search-apis', 'hive'] -> '(?:hive|search\\-api(?:s)?)'. At each
+    node the longer continuation is tried first, so the longest keyword at a
+    position wins; word-boundary checks are left to the caller.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}  # end of keyword
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + emit(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return (body if len(branches) > 1 else '(?:' + body + ')') + '?'
+        return body
+
+    return emit(trie)
+
+
+def _is_error_line(line: str) -> bool:
+    lowered = line.lower()
+    return any(word in lowered for word in _ERROR_WORDS)
 
 
 @dataclass
@@ -21,6 +67,54 @@ class ExtractedComponent:
     context: str  # The snippet of text where it was found
 
 
+@dataclass
+class ComponentOccurrences:
+    """All hits of one component in a console log."""
+    name: str
+    subsystem: Optional[str] = None
+    count: int = 0
+    error_line_count: int = 0            # hits on lines containing 'error' or 'fail'
+    first_line: Optional[int] = None     # 0-based
+    offsets: List[int] = field(default_factory=list)                    # first byte offsets
+    error_lines: List[Tuple[int, str]] = field(default_factory=list)    # (line, text)
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'subsystem': self.subsystem,
+            'count': self.count,
+            'error_line_count': self.error_line_count,
+            'first_line': self.first_line,
+            'offsets': self.offsets,
+            'error_lines': [[line, text] for line, text in self.error_lines],
+        }
+
+
+@dataclass
+class ComponentScan:
+    """Result of one pass over a console log."""
+    occurrences: Dict[str, ComponentOccurrences] = field(default_factory=dict)  # first-hit order
+    error_order: List[str] = field(default_factory=list)  # first hit on an error line
+
+    def components(self, error_lines_only: bool = True) -> List[str]:
+        """Component names in order of first appearance."""
+        return list(self.error_order) if error_lines_only else list(self.occurrences)
+
+    def histogram(self, error_lines_only: bool = False) -> Dict[str, int]:
+        """Occurrence count per component, most frequent first."""
+        key = 'error_line_count' if error_lines_only else 'count'
+        counts = {name: getattr(occ, key) for name, occ in self.occurrences.items()}
+        return dict(sorted(((n, c) for n, c in counts.items() if c), key=lambda item: -item[1]))
+
+    def to_dict(self) -> Dict:
+        ranked = sorted(self.occurrences.values(), key=lambda occ: -occ.count)
+        return {
+            'total_hits': sum(occ.count for occ in ranked),
+            'histogram': self.histogram(),
+            'components': [occ.to_dict() for occ in ranked],
+        }
+
+
 class ComponentExtractor:
     """
     Extract ACM component names from error messages, stack traces, and logs.
@@ -147,12 +241,13 @@ class ComponentExtractor:
             self.INFRASTRUCTURE_COMPONENTS
         )
 
-        # Build a single regex pattern for efficiency
-        # Escape special characters and join with alternation
-        escaped_components = [re.escape(c) for c in all_components]
-        self._component_pattern = re.compile(
-            r'\b(' + '|'.join(escaped_components) + r')\b',
-            re.IGNORECASE
+        # One trie-factored pattern: shared prefixes are matched once, so the
+        # cost per position does not grow with the number of components
+        trie = _trie_pattern(all_components)
+        self._component_pattern = re.compile(r'\b(' + trie + r')\b', re.IGNORECASE)
+        # Byte twin for scanning mapped console logs without decoding them
+        self._component_bytes_pattern = re.compile(
+            rb'\b(' + trie.encode('utf-8') + rb')\b', re.IGNORECASE
         )
 
         # Subsystem mapping for categorization
@@ -215,34 +310,65 @@ class ComponentExtractor:
 
     def extract_from_console_log(
         self,
-        console_log: str,
+        console_log: Union[str, ConsoleLog],
         error_lines_only: bool = True
     ) -> List[str]:
         """
         Extract component names from Jenkins console log.
 
         Args:
-            console_log: Full console log text
-            error_lines_only: If True, only search lines containing 'error' or 'fail'
+            console_log: Full console log text or a ConsoleLog
+            error_lines_only: If True, only count hits on lines containing 'error' or 'fail'
 
         Returns:
             List of unique component names found
         """
         if not console_log:
             return []
+        return self.scan_console_log(console_log).components(error_lines_only)
 
-        if error_lines_only:
-            # Filter to error lines for more relevant results
-            lines = console_log.split('\n')
-            error_lines = [
-                line for line in lines
-                if 'error' in line.lower() or 'fail' in line.lower()
-            ]
-            text_to_search = '\n'.join(error_lines)
-        else:
-            text_to_search = console_log
-
-        return self.extract_from_error(text_to_search)
+    def scan_console_log(self, console_log: Union[str, ConsoleLog]) -> ComponentScan:
+        """
+        Find every component mention in a console log in one pass.
+
+        The pattern runs over the raw bytes; only lines that contain a hit are
+        decoded, to check for 'error'/'fail' and keep them as context.
+
+        Args:
+            console_log: Full console log text or a ConsoleLog
+
+        Returns:
+            ComponentScan with per-component counts, offsets and error lines
+        """
+        scan = ComponentScan()
+        if not console_log:
+            return scan
+        console = console_log if isinstance(console_log, ConsoleLog) else ConsoleLog.from_text(console_log)
+
+        line_number, is_error = -1, False
+        for match in console.finditer(self._component_bytes_pattern):
+            name = match.group(1).lower()
+            if match.line_number != line_number:
+                line_number = match.line_number
+                line = console.line(line_number)
+                is_error = _is_error_line(line)
+
+            occ = scan.occurrences.get(name)
+            if occ is None:
+                occ = scan.occurrences[name] = ComponentOccurrences(
+                    name=name, subsystem=self.get_subsystem(name), first_line=line_number,
+                )
+            occ.count += 1
+            if len(occ.offsets) < MAX_HIT_OFFSETS:
+                occ.offsets.append(match.start)
+            if is_error:
+                if not occ.error_line_count:
+                    scan.error_order.append(name)
+                occ.error_line_count += 1
+                if len(occ.error_lines) < MAX_ERROR_LINES and (
+                        not occ.error_lines or occ.error_lines[-1][0] != line_number):
+                    occ.error_lines.append((line_number, line.strip()))
+        return scan
 
     def extract_with_context(
         self,
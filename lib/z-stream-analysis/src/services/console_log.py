@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Console Log Access
+
+Read-only, memory-mapped view of a Jenkins console log. Consumers share one
+ConsoleLog instead of each holding (or re-reading) a copy of a log that can
+run to hundreds of MB.
+
+- The file is mmap'd; pages are loaded by the OS on demand
+- A line-offset index is built once, on first line-based access
+- Regex search runs directly over the mapped bytes, optionally restricted to
+  a byte range
+- Lines are decoded (UTF-8, errors replaced) only when asked for
+
+Line numbering follows ``text.split('\\n')``: line i is the text between the
+i-th and (i+1)-th newline, so a log ending in a newline has a final empty line.
+
+Usage:
+    with ConsoleLog('runs/<dir>/console-log.txt') as log:
+        print(log.line_count, log.tail(20))
+        match = log.search(r'Checking out Revision ([a-f0-9]+)')
+        if match:
+            print(match.group(1), log.context(match.line_number, before=2, after=2))
+"""
+
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Pattern, Tuple, Union
+
+PatternLike = Union[str, bytes, Pattern]
+
+ENCODING = 'utf-8'
+
+
+def _decode(data: bytes) -> str:
+    return data.decode(ENCODING, errors='replace')
+
+
+@dataclass
+class ConsoleMatch:
+    """A regex match in a console log, with decoded groups."""
+    start: int          # byte offset of the match
+    end: int            # byte offset just past the match
+    line_number: int    # 0-based line containing the match start
+    groups: Tuple[Optional[str], ...]  # group(0), group(1), ...
+
+    def group(self, index: int = 0) -> Optional[str]:
+        return self.groups[index]
+
+
+class ConsoleLog:
+    """Memory-mapped console log with a lazily built line-offset index."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Console log file (opened read-only)
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        size = self.path.stat().st_size
+        # mmap cannot map an empty file
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._line_starts: Optional[array] = None
+
+    @classmethod
+    def from_text(cls, text: Union[str, bytes]) -> 'ConsoleLog':
+        """In-memory ConsoleLog, for logs that were never written to disk."""
+        log = cls.__new__(cls)
+        log.path = None
+        log._file = None
+        log._data = text.encode(ENCODING) if isinstance(text, str) else bytes(text)
+        log._line_starts = None
+        return log
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b''
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._line_starts = None
+
+    def __enter__(self) -> 'ConsoleLog':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- size and index -----------------------------------------------------
+
+    @property
+    def size(self) -> int:
+        """Size in bytes."""
+        return len(self._data)
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def _index(self) -> array:
+        if self._line_starts is None:
+            starts = array('q', [0])
+            find = self._data.find
+            pos = find(b'\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = find(b'\n', pos + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    @property
+    def line_count(self) -> int:
+        return len(self._index())
+
+    def line_span(self, line_number: int) -> Tuple[int, int]:
+        """Byte range [start, end) of a line, excluding its newline."""
+        starts = self._index()
+        start = starts[line_number]
+        end = starts[line_number + 1] - 1 if line_number + 1 < len(starts) else self.size
+        return start, end
+
+    def line_at(self, offset: int) -> int:
+        """0-based line number containing byte offset."""
+        return bisect_right(self._index(), offset) - 1
+
+    # -- line access --------------------------------------------------------
+
+    def line(self, line_number: int) -> str:
+        """Decoded line (negative indexes count from the end)."""
+        if line_number < 0:
+            line_number += self.line_count
+        if not 0 <= line_number < self.line_count:
+            raise IndexError(f"line {line_number} out of range")
+        start, end = self.line_span(line_number)
+        return _decode(self._data[start:end])
+
+    def lines(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Decoded lines [start, stop), clamped to the log."""
+        return list(self.iter_lines(start, stop))
+
+    def iter_lines(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        count = self.line_count
+        stop = count if stop is None else min(stop, count)
+        for number in range(max(0, start), stop):
+            line_start, line_end = self.line_span(number)
+            yield _decode(self._data[line_start:line_end])
+
+    def head(self, count: int = 20) -> List[str]:
+        return self.lines(0, count)
+
+    def tail(self, count: int = 20) -> List[str]:
+        total = self.line_count
+        return self.lines(max(0, total - count), total)
+
+    def context(self, line_number: int, before: int = 3, after: int = 3) -> List[str]:
+        """Lines around line_number (inclusive window, clamped)."""
+        return self.lines(line_number - before, line_number + after + 1)
+
+    def text(self, start: int = 0, end: Optional[int] = None) -> str:
+        """Decoded byte range [start, end)."""
+        return _decode(self._data[start:end])
+
+    # -- search -------------------------------------------------------------
+
+    @staticmethod
+    def _compile(pattern: PatternLike, flags: int) -> Pattern:
+        if isinstance(pattern, re.Pattern):
+            if isinstance(pattern.pattern, str):
+                return re.compile(pattern.pattern.encode(ENCODING), pattern.flags & ~re.UNICODE)
+            return pattern
+        if isinstance(pattern, str):
+            pattern = pattern.encode(ENCODING)
+        return re.compile(pattern, flags)
+
+    def _to_match(self, m: 're.Match') -> ConsoleMatch:
+        groups = tuple(
+            _decode(g) if g is not None else None
+            for g in (m.group(0),) + m.groups()
+        )
+        return ConsoleMatch(start=m.start(), end=m.end(), line_number=self.line_at(m.start()), groups=groups)
+
+    def finditer(self, pattern: PatternLike, flags: int = 0,
+                 start: int = 0, end: Optional[int] = None) -> Iterator[ConsoleMatch]:
+        """All matches within byte range [start, end)."""
+        regex = self._compile(pattern, flags)
+        end = self.size if end is None else end
+        for m in regex.finditer(self._data, start, end):
+            yield self._to_match(m)
+
+    def search(self, pattern: PatternLike, flags: int = 0,
+               start: int = 0, end: Optional[int] = None) -> Optional[ConsoleMatch]:
+        """First match within byte range [start, end), or None."""
+        regex = self._compile(pattern, flags)
+        end = self.size if end is None else end
+        m = regex.search(self._data, start, end)
+        return self._to_match(m) if m else None
+
+    def grep(self, pattern: PatternLike, flags: int = 0,
+             start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """(line_number, line) for each line with a match, in order, once per line."""
+        last_line = -1
+        for match in self.finditer(pattern, flags, start, end):
+            if match.line_number != last_line:
+                last_line = match.line_number
+                yield last_line, self.line(last_line)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Console Log Segmentation
+
+One-pass index of a Jenkins/Cypress console log into byte ranges:
+
+- Pipeline stages: ``[Pipeline] { (Name)`` ... ``[Pipeline] // stage``,
+  with nesting, skipped/failed markers and Timestamper times when present
+- Cypress specs: ``Running:  <spec>  (N of M)`` up to the next spec (or the
+  end of its stage), with the counts and duration from the ``(Results)`` box
+
+All markers are matched by a single regex pass over the mapped bytes. The
+resulting ConsoleIndex is saved next to the log as ``console-index.json`` so
+later readers (per-test context, Stage 2 agents, reports) can pull just the
+slice they need with ``ConsoleLog.text(segment.start, segment.end)`` instead
+of scanning the whole log.
+
+Usage:
+    index = ConsoleSegmenter().load_or_build(console, run_dir)
+    spec = index.spec_for('cypress/e2e/cluster/create.cy.js')
+    if spec:
+        excerpt = console.text(spec.start, spec.end)
+"""
+
+import json
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .console_log import ConsoleLog
+
+INDEX_FILENAME = 'console-index.json'
+INDEX_VERSION = 1
+
+# One alternation, one group per marker kind (order matters: see _KINDS)
+_MARKERS = re.compile(
+    rb'\[Pipeline\] \{ \(([^\n]*?)\)[ \t\r]*$'                      # 1 stage open
+    rb'|(\[Pipeline\] // stage)'                                      # 2 stage close
+    rb'|Stage "([^"\n]*)" skipped'                                    # 3 stage skipped
+    rb'|(^(?:\[[^\]\n]*\][ \t]*)?ERROR: |script returned exit code [1-9])'  # 4 failure
+    rb'|Running:[ \t]+(\S+)[ \t]+\(\d+ of \d+\)'                      # 5 spec start
+    rb'|(?:\xe2\x94\x82|\|)[ \t]+(Tests|Passing|Failing|Pending|Skipped|Duration):'  # 6 result key
+    rb'[ \t]+([^\n|]*?)[ \t]*(?:\xe2\x94\x82|\|)'                  # 7 result value
+    rb'|(\(Run Finished\))',                                          # 8 run finished
+    re.MULTILINE,
+)
+_KINDS = {1: 'stage_open', 2: 'stage_close', 3: 'stage_skipped', 4: 'failure',
+          5: 'spec_start', 6: 'result_row', 8: 'run_finished'}
+
+_TIMESTAMP = re.compile(r'^\[?(\d{4}-\d\d-\d\d[T ]\d\d:\d\d:\d\d(?:\.\d+)?)Z?\]?')
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)\s*(hours?|minutes?|seconds?|ms)\b')
+_CLOCK = re.compile(r'^(?:(\d+):)?(\d+):(\d\d)$')
+_DOT_SLASH = re.compile(r'^(?:\./)+')
+_DURATION_UNITS = {'hour': 3600.0, 'minute': 60.0, 'second': 1.0, 'ms': 0.001}
+
+
+def parse_cypress_duration(value: str) -> Optional[float]:
+    """Seconds from a Cypress duration ('1 minute, 2 seconds', '45 seconds', '01:02')."""
+    value = value.strip()
+    clock = _CLOCK.match(value)
+    if clock:
+        hours, minutes, seconds = clock.groups()
+        return int(hours or 0) * 3600.0 + int(minutes) * 60.0 + int(seconds)
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return round(sum(float(n) * _DURATION_UNITS[unit if unit == 'ms' else unit.rstrip('s')]
+                     for n, unit in parts), 3)
+
+
+def _relative(path: str) -> str:
+    return _DOT_SLASH.sub('', path.replace('\\', '/'))
+
+
+def _timestamp(line: str) -> Optional[str]:
+    match = _TIMESTAMP.match(line)
+    return match.group(1) if match else None
+
+
+def _elapsed(started_at: Optional[str], ended_at: Optional[str]) -> Optional[float]:
+    if not started_at or not ended_at:
+        return None
+    try:
+        delta = datetime.fromisoformat(ended_at) - datetime.fromisoformat(started_at)
+    except ValueError:
+        return None
+    return round(delta.total_seconds(), 3)
+
+
+@dataclass
+class ConsoleSegment:
+    """A stage or spec section of the console log."""
+    kind: str                          # 'stage' or 'spec'
+    name: str
+    start: int                         # byte offset of the opening marker line
+    end: int                           # byte offset just past the section
+    start_line: int                    # first line (0-based, inclusive)
+    end_line: int                      # line after the section (exclusive)
+    status: Optional[str] = None       # 'passed', 'failed', 'skipped'; None if unknown
+    parent: Optional[str] = None       # enclosing stage
+    started_at: Optional[str] = None   # Timestamper time of the opening line
+    ended_at: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    tests: Dict[str, int] = field(default_factory=dict)  # spec result counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if v is not None and v != {}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ConsoleSegment':
+        return cls(**data)
+
+
+@dataclass
+class ConsoleIndex:
+    """Stage and spec segments of one console log."""
+    size: int                          # console size the index was built from
+    stages: List[ConsoleSegment] = field(default_factory=list)
+    specs: List[ConsoleSegment] = field(default_factory=list)
+
+    def stage(self, name: str) -> Optional[ConsoleSegment]:
+        return next((s for s in self.stages if s.name == name), None)
+
+    def spec_for(self, test_file: Optional[str]) -> Optional[ConsoleSegment]:
+        """
+        Spec segment for a test file path.
+
+        Cypress prints specs relative to its spec root while stack traces
+        usually carry a repo-relative path, so either may be a suffix of the other.
+        """
+        if not test_file:
+            return None
+        path = _relative(test_file)
+        for spec in self.specs:
+            name = _relative(spec.name)
+            if name == path or path.endswith('/' + name) or name.endswith('/' + path):
+                return spec
+        return None
+
+    def failed_specs(self) -> List[ConsoleSegment]:
+        return [s for s in self.specs if s.status == 'failed']
+
+    def failed_stages(self) -> List[ConsoleSegment]:
+        return [s for s in self.stages if s.status == 'failed']
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': INDEX_VERSION,
+            'size': self.size,
+            'stages': [s.to_dict() for s in self.stages],
+            'specs': [s.to_dict() for s in self.specs],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ConsoleIndex':
+        return cls(
+            size=data['size'],
+            stages=[ConsoleSegment.from_dict(s) for s in data.get('stages', [])],
+            specs=[ConsoleSegment.from_dict(s) for s in data.get('specs', [])],
+        )
+
+    def save(self, path: Union[str, Path]):
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional['ConsoleIndex']:
+        """Load a saved index; None if missing, unreadable, or from another version."""
+        try:
+            data = json.loads(Path(path).read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != INDEX_VERSION:
+            return None
+        try:
+            return cls.from_dict(data)
+        except (KeyError, TypeError):
+            return None
+
+
+class ConsoleSegmenter:
+    """Builds a ConsoleIndex with one regex pass over a ConsoleLog."""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def segment(self, console: ConsoleLog) -> ConsoleIndex:
+        """Index stages and specs of a console log."""
+        index = ConsoleIndex(size=console.size)
+        stack: List[ConsoleSegment] = []
+        spec: Optional[ConsoleSegment] = None
+
+        def line_start(line_number: int) -> int:
+            return console.line_span(line_number)[0]
+
+        def close_spec(end: int):
+            nonlocal spec
+            if spec is not None:
+                self._finish(console, spec, end)
+                spec = None
+
+        for match in console.finditer(_MARKERS):
+            groups = match.groups
+            kind = next(_KINDS[i] for i in _KINDS if groups[i] is not None)
+            line = match.line_number
+
+            if kind == 'stage_open':
+                name = groups[1]
+                # Parallel branches open a block too but are not stages
+                if name.startswith('Branch: '):
+                    continue
+                close_spec(line_start(line))
+                segment = ConsoleSegment(
+                    kind='stage', name=name, start=line_start(line), end=console.size,
+                    start_line=line, end_line=console.line_count,
+                    parent=stack[-1].name if stack else None,
+                    started_at=_timestamp(console.line(line)),
+                )
+                stack.append(segment)
+                index.stages.append(segment)
+            elif kind == 'stage_close':
+                if not stack:
+                    continue
+                segment = stack.pop()
+                close_spec(line_start(line))
+                segment.ended_at = _timestamp(console.line(line))
+                segment.duration_seconds = _elapsed(segment.started_at, segment.ended_at)
+                if segment.status is None:
+                    segment.status = 'passed'
+                self._finish(console, segment, console.line_span(line)[1] + 1)
+            elif kind == 'stage_skipped':
+                target = next((s for s in reversed(stack) if s.name == groups[3]), None)
+                if target is not None:
+                    target.status = 'skipped'
+            elif kind == 'failure':
+                for segment in stack:
+                    if segment.status != 'skipped':
+                        segment.status = 'failed'
+            elif kind == 'spec_start':
+                close_spec(line_start(line))
+                spec = ConsoleSegment(
+                    kind='spec', name=groups[5], start=line_start(line), end=console.size,
+                    start_line=line, end_line=console.line_count,
+                    parent=stack[-1].name if stack else None,
+                    started_at=_timestamp(console.line(line)),
+                )
+                index.specs.append(spec)
+            elif kind == 'result_row' and spec is not None:
+                self._apply_result(spec, groups[6], groups[7])
+                if spec.status == 'failed':
+                    for segment in stack:
+                        if segment.status != 'skipped':
+                            segment.status = 'failed'
+            elif kind == 'run_finished':
+                close_spec(line_start(line))
+
+        close_spec(console.size)
+        self.logger.debug(f"Console index: {len(index.stages)} stages, {len(index.specs)} specs")
+        return index
+
+    def load_or_build(self, console: ConsoleLog, run_dir: Union[str, Path]) -> ConsoleIndex:
+        """
+        Reuse the run directory's console-index.json if it matches this log,
+        otherwise segment the log and (re)write the sidecar.
+        """
+        path = Path(run_dir) / INDEX_FILENAME
+        index = ConsoleIndex.load(path)
+        if index is not None and index.size == console.size:
+            return index
+        index = self.segment(console)
+        index.save(path)
+        return index
+
+    @staticmethod
+    def _finish(console: ConsoleLog, segment: ConsoleSegment, end: int):
+        segment.end = min(end, console.size)
+        segment.end_line = (console.line_count if segment.end >= console.size
+                            else console.line_at(segment.end))
+
+    @staticmethod
+    def _apply_result(spec: ConsoleSegment, key: str, value: str):
+        if key == 'Duration':
+            spec.duration_seconds = parse_cypress_duration(value)
+            return
+        try:
+            spec.tests[key.lower()] = int(value)
+        except ValueError:
+            return  # '-' for an empty column
+        if key == 'Failing':
+            spec.status = 'failed' if spec.tests['failing'] else 'passed'
@@ -31,6 +31,7 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 
 import requests
 
+from src.services.perf_tracing import payload_size, span, traced_run
 from src.services.shared_utils import validate_command_readonly, THRESHOLDS
 from src.services.feature_knowledge_service import FeatureKnowledgeService
 
@@ -567,24 +568,31 @@ class EnvironmentOracleService:
     ) -> Optional[dict]:
         """Make a read-only GET request to the Polarion REST API."""
         url = f"{self._polarion_url}/rest/v1/{endpoint}"
-        try:
-            resp = requests.get(
-                url,
-                params=params,
-                headers={
-                    'Authorization': f'Bearer {self._polarion_token}',
-                    'Accept': 'application/json',
-                },
-                timeout=self.POLARION_TIMEOUT,
-                verify=False,
-            )
-            if resp.status_code != 200:
-                self.logger.debug(f"Polarion GET {endpoint}: HTTP {resp.status_code}")
+        # Span name without work item IDs, so requests aggregate by endpoint
+        name = 'polarion GET ' + '/'.join(endpoint.split('/')[::2][:3])
+        with span(name, kind='polarion') as s:
+            try:
+                resp = requests.get(
+                    url,
+                    params=params,
+                    headers={
+                        'Authorization': f'Bearer {self._polarion_token}',
+                        'Accept': 'application/json',
+                    },
+                    timeout=self.POLARION_TIMEOUT,
+                    verify=False,
+                )
+                s.bytes += payload_size(resp.content)
+                s.attrs['http_status'] = resp.status_code
+                if resp.status_code != 200:
+                    self.logger.debug(f"Polarion GET {endpoint}: HTTP {resp.status_code}")
+                    s.status = 'error'
+                    return None
+                return resp.json()
+            except requests.exceptions.RequestException as e:
+                self.logger.debug(f"Polarion request failed: {e}")
+                s.status = 'error'
                 return None
-            return resp.json()
-        except requests.exceptions.RequestException as e:
-            self.logger.debug(f"Polarion request failed: {e}")
-            return None
 
     @staticmethod
     def _strip_html(html_str: str) -> str:
@@ -1581,7 +1589,7 @@ class EnvironmentOracleService:
             ]
             self.logger.info(f"Oracle login: {' '.join(safe_cmd)}")
 
-            proc = subprocess.run(
+            proc = traced_run(
                 cmd, capture_output=True, text=True, timeout=30
             )
             if proc.returncode == 0:
@@ -1610,7 +1618,7 @@ class EnvironmentOracleService:
         cmd.extend(args)
 
         try:
-            proc = subprocess.run(
+            proc = traced_run(
                 cmd, capture_output=True, text=True, timeout=timeout
             )
             return proc.returncode == 0, proc.stdout, proc.stderr
@@ -1652,7 +1660,7 @@ class EnvironmentOracleService:
         """Detect oc or kubectl CLI binary."""
         for binary in ['oc', 'kubectl']:
             try:
-                result = subprocess.run(
+                result = traced_run(
                     ['which', binary], capture_output=True, text=True, timeout=5
                 )
                 if result.returncode == 0:
@@ -29,6 +29,7 @@ import tempfile
 import time
 from dataclasses import dataclass, asdict
 
+from .perf_tracing import traced_run
 from .shared_utils import TIMEOUTS, validate_command_readonly
 from typing import Dict, Any, List, Optional, Tuple
 
@@ -109,7 +110,7 @@ class EnvironmentValidationService:
         """Detect whether to use oc or kubectl"""
         # Try oc first (OpenShift)
         try:
-            result = subprocess.run(
+            result = traced_run(
                 ['which', 'oc'],
                 capture_output=True,
                 text=True,
@@ -122,7 +123,7 @@ class EnvironmentValidationService:
         
         # Fall back to kubectl
         try:
-            result = subprocess.run(
+            result = traced_run(
                 ['which', 'kubectl'],
                 capture_output=True,
                 text=True,
@@ -208,7 +209,7 @@ class EnvironmentValidationService:
         cmd = self._build_command(args)
 
         try:
-            result = subprocess.run(
+            result = traced_run(
                 cmd,
                 capture_output=True,
                 text=True,
@@ -263,7 +264,7 @@ class EnvironmentValidationService:
             masked_cmd[pwd_idx + 1] = '***'
             self.logger.debug(f"Running: {' '.join(masked_cmd)}")
 
-            result = subprocess.run(
+            result = traced_run(
                 login_cmd,
                 capture_output=True,
                 text=True,
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Failure Clustering
+
+Groups failed tests that fail the same way, so per-failure work runs once per
+distinct failure instead of once per test.
+
+When a hub or backend breaks, hundreds of tests report essentially the same
+error: identical text apart from resource names, ids, timestamps and counts,
+raised from the same code path. A failure fingerprint captures exactly that:
+
+    sha1(failure_type + normalized error text + top user-code frames)
+
+- Error text is normalized: UUIDs, timestamps, IPs, hex ids and numbers are
+  replaced with placeholders, whitespace is collapsed
+- Frames come from StackTraceParser; framework frames are skipped and the
+  first few user-code frames (file:line:function) are kept
+
+Tests only cluster when both the normalized error and the code path match,
+which mirrors the "same spec + error + line" grouping rule used in Stage 2.
+Numbers in frame locations are kept - a different line is a different failure.
+
+Usage:
+    clusters = FailureClusterer(stack_parser).cluster(failed_tests)
+    for cluster in clusters:
+        representative = failed_tests[cluster.representative]
+        ...  # enrich once, fan out to cluster.indices
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .stack_trace_parser import StackTraceParser
+
+TOP_USER_FRAMES = 3
+MAX_SIGNATURE_CHARS = 500
+
+# Order matters: specific shapes before the generic number rule
+_NORMALIZERS = [
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.IGNORECASE), '<uuid>'),
+    (re.compile(r'\b\d{4}-\d\d-\d\d[T ]\d\d:\d\d(?::\d\d(?:\.\d+)?)?(?:Z|[+-]\d\d:?\d\d)?'), '<ts>'),
+    (re.compile(r'\b\d{1,2}:\d\d:\d\d(?:\.\d+)?\b'), '<time>'),
+    (re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}(?::\d+)?\b'), '<ip>'),
+    (re.compile(r'\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{7,64}\b', re.IGNORECASE), '<hex>'),
+    (re.compile(r'\d+(?:\.\d+)?'), '<n>'),
+]
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_error(text: Optional[str]) -> str:
+    """Error text with run-specific values (ids, times, numbers) replaced by placeholders."""
+    if not text:
+        return ''
+    for pattern, placeholder in _NORMALIZERS:
+        text = pattern.sub(placeholder, text)
+    return _WHITESPACE.sub(' ', text).strip()[:MAX_SIGNATURE_CHARS]
+
+
+@dataclass
+class FailureCluster:
+    """Failed tests sharing one failure fingerprint."""
+    cluster_id: str                   # short fingerprint hash
+    signature: str                    # normalized error text
+    failure_type: str
+    top_frames: List[str] = field(default_factory=list)   # 'file:line:function'
+    indices: List[int] = field(default_factory=list)      # positions in failed_tests
+    tests: List[str] = field(default_factory=list)        # test names, same order
+
+    @property
+    def representative(self) -> int:
+        """Index of the first test in the cluster."""
+        return self.indices[0]
+
+    @property
+    def size(self) -> int:
+        return len(self.indices)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'cluster_id': self.cluster_id,
+            'signature': self.signature,
+            'failure_type': self.failure_type,
+            'top_frames': self.top_frames,
+            'test_count': self.size,
+            'tests': self.tests,
+        }
+
+
+class FailureClusterer:
+    """Fingerprints failed tests and groups them into FailureClusters."""
+
+    def __init__(self, stack_parser: Optional[StackTraceParser] = None, top_frames: int = TOP_USER_FRAMES):
+        """
+        Args:
+            stack_parser: Parser for frame extraction (default: a new instance)
+            top_frames: Number of leading user-code frames in the fingerprint
+        """
+        self.logger = logging.getLogger(__name__)
+        self.stack_parser = stack_parser or StackTraceParser()
+        self.top_frames = top_frames
+
+    def top_user_frames(self, stack_trace: Optional[str]) -> List[str]:
+        """Leading non-framework frames of a stack trace, as 'file:line:function'."""
+        if not stack_trace:
+            return []
+        frames = []
+        for frame in self.stack_parser.parse(stack_trace).frames:
+            if frame.is_framework_file:
+                continue
+            frames.append(f"{frame.file_path}:{frame.line_number}:{frame.function_name or ''}")
+            if len(frames) == self.top_frames:
+                break
+        return frames
+
+    def fingerprint(
+        self,
+        error_message: Optional[str],
+        stack_trace: Optional[str],
+        failure_type: Optional[str] = None
+    ) -> Tuple[str, str, List[str]]:
+        """
+        Fingerprint one failure.
+
+        Returns:
+            (cluster_id, normalized error signature, top user frames)
+        """
+        signature = normalize_error(error_message)
+        frames = self.top_user_frames(stack_trace)
+        key = '\n'.join([failure_type or '', signature, *frames])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:12], signature, frames
+
+    def cluster(self, failed_tests: List[Dict[str, Any]]) -> List[FailureCluster]:
+        """
+        Group failed tests by fingerprint.
+
+        Args:
+            failed_tests: Test dicts with test_name, error_message, stack_trace
+                          and failure_type
+
+        Returns:
+            Clusters in order of first appearance; members keep report order
+        """
+        clusters: Dict[str, FailureCluster] = {}
+        # Mass failures often repeat the exact same text - fingerprint it once
+        seen: Dict[Tuple[Any, Any, Any], Tuple[str, str, List[str]]] = {}
+
+        for index, test in enumerate(failed_tests):
+            raw = (test.get('error_message'), test.get('stack_trace'), test.get('failure_type'))
+            if raw not in seen:
+                seen[raw] = self.fingerprint(*raw)
+            cluster_id, signature, frames = seen[raw]
+
+            cluster = clusters.get(cluster_id)
+            if cluster is None:
+                cluster = clusters[cluster_id] = FailureCluster(
+                    cluster_id=cluster_id,
+                    signature=signature,
+                    failure_type=raw[2] or '',
+                    top_frames=frames,
+                )
+            cluster.indices.append(index)
+            cluster.tests.append(test.get('test_name', ''))
+
+        self.logger.info(f"Clustered {len(failed_tests)} failed tests into {len(clusters)} distinct failures")
+        return list(clusters.values())
@@ -3,20 +3,31 @@
 Feedback Service
 
 Collects tester feedback on classification accuracy.
-Stores per-run feedback and maintains a global index for accuracy tracking.
+Stores per-run feedback and maintains global accuracy aggregates.
 
 Storage:
-- Per-run: <run_dir>/feedback.json
-- Global index: runs/feedback-index.json
+- Per-run: <run_dir>/feedback.json (current verdict per test)
+- Global log: runs/feedback-log.jsonl (append-only, one line per change)
+- Aggregates: runs/feedback-index.json (snapshot of the log up to log_offset)
+
+A submission rewrites only its own run's feedback.json and appends to the
+log. Each log line carries the new verdict and the one it replaced, so the
+aggregates (per run, per classification, per feature area, and the
+from -> to confusion counts) are updated by applying deltas. Stats queries
+fold any log lines written since the snapshot and save the result; they never
+scan run directories.
 """
 
 import json
 import logging
+import os
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+AGGREGATES_VERSION = 2
+
 
 @dataclass
 class ClassificationFeedback:
@@ -29,6 +40,7 @@ class ClassificationFeedback:
     feedback_note: Optional[str] = None
     submitted_by: Optional[str] = None
     submitted_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    feature_area: Optional[str] = None
 
 
 @dataclass
@@ -57,6 +69,7 @@ class FeedbackService:
         self.runs_dir = Path(runs_dir)
         self.logger = logging.getLogger(__name__)
         self.index_path = self.runs_dir / 'feedback-index.json'
+        self.log_path = self.runs_dir / 'feedback-log.jsonl'
 
     def _load_run_feedback(self, run_dir: Path) -> Optional[RunFeedback]:
         """Load existing feedback for a run."""
@@ -87,22 +100,171 @@ class FeedbackService:
             json.dumps(asdict(feedback), indent=2, default=str)
         )
 
-    def _load_index(self) -> Dict[str, Any]:
-        """Load the global feedback index."""
-        if not self.index_path.exists():
-            return {'runs': {}, 'updated_at': None}
-        try:
-            return json.loads(self.index_path.read_text())
-        except Exception:
-            return {'runs': {}, 'updated_at': None}
+    # -- feedback log -------------------------------------------------------
 
-    def _save_index(self, index: Dict[str, Any]):
-        """Save the global feedback index."""
+    def _append_log(self, events: List[Dict[str, Any]]):
+        """Append events to the global feedback log in a single write."""
+        if not events:
+            return
+        data = ''.join(json.dumps(e, default=str) + '\n' for e in events)
+        with open(self.log_path, 'a') as f:
+            f.write(data)
+
+    def _test_event(
+        self,
+        run_id: str,
+        test_name: str,
+        feedback: Optional[ClassificationFeedback],
+        previous: Optional[ClassificationFeedback],
+    ) -> Dict[str, Any]:
+        return {
+            'kind': 'test',
+            'run_id': run_id,
+            'test_name': test_name,
+            'feedback': asdict(feedback) if feedback else None,
+            'previous': asdict(previous) if previous else None,
+            'at': datetime.now().isoformat(),
+        }
+
+    def _run_event(self, run_id: str, run_feedback: RunFeedback) -> Dict[str, Any]:
+        return {
+            'kind': 'run',
+            'run_id': run_id,
+            'overall_accuracy': run_feedback.overall_accuracy,
+            'at': datetime.now().isoformat(),
+        }
+
+    def _ensure_log(self):
+        """Create the log, seeded from feedback.json files written before it existed."""
+        if self.log_path.exists():
+            return
         self.runs_dir.mkdir(parents=True, exist_ok=True)
-        index['updated_at'] = datetime.now().isoformat()
-        self.index_path.write_text(
-            json.dumps(index, indent=2, default=str)
-        )
+        events = []
+        for run_dir in sorted(p for p in self.runs_dir.iterdir() if p.is_dir()):
+            feedback = self._load_run_feedback(run_dir)
+            if feedback is None:
+                continue
+            run_id = feedback.run_id or run_dir.name
+            events.extend(
+                self._test_event(run_id, tf.test_name, tf, None)
+                for tf in feedback.test_feedbacks
+            )
+            if feedback.overall_accuracy is not None:
+                events.append(self._run_event(run_id, feedback))
+        if events:
+            self.logger.info(f"Migrated {len(events)} existing feedback entries to {self.log_path.name}")
+        self.log_path.write_text(''.join(json.dumps(e, default=str) + '\n' for e in events))
+
+    # -- aggregates ---------------------------------------------------------
+
+    @staticmethod
+    def _empty_aggregates() -> Dict[str, Any]:
+        return {
+            'version': AGGREGATES_VERSION,
+            'log_offset': 0,
+            'updated_at': None,
+            'totals': {'rated': 0, 'correct': 0},
+            'runs': {},
+            'by_classification': {},
+            'by_feature_area': {},
+            'confusion': {},
+        }
+
+    def _load_aggregates(self) -> Dict[str, Any]:
+        """Aggregates snapshot brought up to date with the feedback log."""
+        aggregates = None
+        if self.index_path.exists():
+            try:
+                aggregates = json.loads(self.index_path.read_text())
+            except Exception:
+                aggregates = None
+        if not isinstance(aggregates, dict) or aggregates.get('version') != AGGREGATES_VERSION:
+            aggregates = self._empty_aggregates()
+
+        if not self.runs_dir.exists():
+            return aggregates
+        self._ensure_log()
+
+        offset = aggregates['log_offset']
+        if self.log_path.stat().st_size < offset:
+            # Log was replaced - rebuild from scratch
+            aggregates, offset = self._empty_aggregates(), 0
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            tail = f.read()
+        applied = 0
+        for line in tail.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break           # partially written
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                self._apply_event(aggregates, json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                self.logger.warning(f"Skipping malformed feedback log entry: {e}")
+                continue
+            applied += 1
+        if offset != aggregates['log_offset']:
+            aggregates['log_offset'] = offset
+            if applied:
+                aggregates['updated_at'] = datetime.now().isoformat()
+            self._save_aggregates(aggregates)
+        return aggregates
+
+    def _save_aggregates(self, aggregates: Dict[str, Any]):
+        """Save the aggregates snapshot (atomically)."""
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        tmp_path.write_text(json.dumps(aggregates, indent=2, default=str))
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _apply_event(aggregates: Dict[str, Any], event: Dict[str, Any]):
+        """Apply one log event to the aggregates."""
+        run = aggregates['runs'].setdefault(event['run_id'], {
+            'total_feedbacks': 0,
+            'correct_count': 0,
+            'incorrect_count': 0,
+            'accuracy': None,
+            'overall_accuracy': None,
+            'submitted_at': None,
+        })
+        run['submitted_at'] = event.get('at')
+
+        if event.get('kind') == 'run':
+            run['overall_accuracy'] = event.get('overall_accuracy')
+            return
+
+        for verdict, sign in ((event.get('previous'), -1), (event.get('feedback'), 1)):
+            if not verdict:
+                continue
+            correct = sign if verdict.get('is_correct', True) else 0
+            run['total_feedbacks'] += sign
+            run['correct_count'] += correct
+            aggregates['totals']['rated'] += sign
+            aggregates['totals']['correct'] += correct
+            for group, key in (
+                ('by_classification', verdict.get('original_classification') or 'UNKNOWN'),
+                ('by_feature_area', verdict.get('feature_area') or 'Unknown'),
+            ):
+                counts = aggregates[group].setdefault(key, {'rated': 0, 'correct': 0})
+                counts['rated'] += sign
+                counts['correct'] += correct
+                if not counts['rated']:
+                    del aggregates[group][key]
+            if not verdict.get('is_correct', True) and verdict.get('correct_classification'):
+                pattern = f"{verdict.get('original_classification')} -> {verdict['correct_classification']}"
+                count = aggregates['confusion'].get(pattern, 0) + sign
+                if count > 0:
+                    aggregates['confusion'][pattern] = count
+                else:
+                    aggregates['confusion'].pop(pattern, None)
+
+        total = run['total_feedbacks']
+        run['incorrect_count'] = total - run['correct_count']
+        run['accuracy'] = run['correct_count'] / total if total > 0 else None
+
+    # -- run lookups --------------------------------------------------------
 
     def _resolve_run_dir(self, run_id: str) -> Path:
         """Resolve run_id to a directory path."""
@@ -118,21 +280,26 @@ class FeedbackService:
             return run_path
         return candidate  # Return even if doesn't exist
 
-    def _get_original_classification(
-        self, run_dir: Path, test_name: str
-    ) -> str:
-        """Get original classification from analysis-results.json."""
+    def _load_test_analysis(self, run_dir: Path) -> Dict[str, Dict[str, Any]]:
+        """per_test_analysis entries from analysis-results.json, by test name."""
         results_path = run_dir / 'analysis-results.json'
         if not results_path.exists():
-            return 'UNKNOWN'
+            return {}
         try:
             data = json.loads(results_path.read_text())
-            for test in data.get('per_test_analysis', []):
-                if test.get('test_name') == test_name:
-                    return test.get('classification', 'UNKNOWN')
+            return {
+                test.get('test_name'): test
+                for test in data.get('per_test_analysis', [])
+            }
         except Exception:
-            pass
-        return 'UNKNOWN'
+            return {}
+
+    def _get_original_classification(
+        self, run_dir: Path, test_name: str
+    ) -> str:
+        """Get original classification from analysis-results.json."""
+        test = self._load_test_analysis(run_dir).get(test_name, {})
+        return test.get('classification', 'UNKNOWN')
 
     def submit_feedback(
         self,
@@ -157,17 +324,19 @@ class FeedbackService:
         Returns:
             The created ClassificationFeedback
         """
+        self._ensure_log()
         run_dir = self._resolve_run_dir(run_id)
-        original = self._get_original_classification(run_dir, test_name)
+        test = self._load_test_analysis(run_dir).get(test_name, {})
 
         feedback_item = ClassificationFeedback(
             test_name=test_name,
             run_id=run_id,
-            original_classification=original,
+            original_classification=test.get('classification', 'UNKNOWN'),
             correct_classification=correct_classification,
             is_correct=is_correct,
             feedback_note=note,
             submitted_by=submitted_by,
+            feature_area=test.get('feature_area'),
         )
 
         # Load or create run feedback
@@ -176,18 +345,18 @@ class FeedbackService:
             run_feedback = RunFeedback(run_id=run_id)
 
         # Update existing or append
-        updated = False
+        previous = None
         for i, existing in enumerate(run_feedback.test_feedbacks):
             if existing.test_name == test_name:
+                previous = existing
                 run_feedback.test_feedbacks[i] = feedback_item
-                updated = True
                 break
-        if not updated:
+        if previous is None:
             run_feedback.test_feedbacks.append(feedback_item)
 
         # Save
         self._save_run_feedback(run_dir, run_feedback)
-        self._update_index(run_id, run_feedback)
+        self._append_log([self._test_event(run_id, test_name, feedback_item, previous)])
 
         self.logger.info(
             f"Feedback submitted for '{test_name}' in {run_id}: "
@@ -206,26 +375,31 @@ class FeedbackService:
         """
         Submit batch feedback for a run.
 
+        Replaces any feedback previously submitted for the run.
+
         Args:
             run_id: Run directory name or path
             feedbacks: List of dicts with test_name, is_correct, etc.
             overall_accuracy: Optional overall accuracy score
             general_notes: Optional general notes
         """
+        self._ensure_log()
         run_dir = self._resolve_run_dir(run_id)
+        tests = self._load_test_analysis(run_dir)
 
         items = []
         for fb in feedbacks:
             test_name = fb['test_name']
-            original = self._get_original_classification(run_dir, test_name)
+            test = tests.get(test_name, {})
             items.append(ClassificationFeedback(
                 test_name=test_name,
                 run_id=run_id,
-                original_classification=original,
+                original_classification=test.get('classification', 'UNKNOWN'),
                 correct_classification=fb.get('correct_classification'),
                 is_correct=fb.get('is_correct', True),
                 feedback_note=fb.get('note'),
                 submitted_by=fb.get('submitted_by'),
+                feature_area=test.get('feature_area'),
             ))
 
         run_feedback = RunFeedback(
@@ -235,40 +409,55 @@ class FeedbackService:
             general_notes=general_notes,
         )
 
+        existing = self._load_run_feedback(run_dir)
+        previous = {tf.test_name: tf for tf in existing.test_feedbacks} if existing else {}
+        events = [
+            self._test_event(run_id, item.test_name, item, previous.pop(item.test_name, None))
+            for item in items
+        ]
+        events.extend(
+            self._test_event(run_id, name, None, old) for name, old in previous.items()
+        )
+        events.append(self._run_event(run_id, run_feedback))
+
         self._save_run_feedback(run_dir, run_feedback)
-        self._update_index(run_id, run_feedback)
+        self._append_log(events)
 
         return run_feedback
 
-    def _update_index(self, run_id: str, run_feedback: RunFeedback):
-        """Update the global feedback index."""
-        index = self._load_index()
+    def set_overall_accuracy(self, run_id: str, overall_accuracy: float) -> RunFeedback:
+        """
+        Record a tester's overall accuracy score for a run.
 
-        total = len(run_feedback.test_feedbacks)
-        correct = sum(1 for f in run_feedback.test_feedbacks if f.is_correct)
-        accuracy = correct / total if total > 0 else None
+        Args:
+            run_id: Run directory name or path
+            overall_accuracy: Score between 0.0 and 1.0
+        """
+        self._ensure_log()
+        run_dir = self._resolve_run_dir(run_id)
+        run_feedback = self._load_run_feedback(run_dir) or RunFeedback(run_id=run_id)
+        run_feedback.overall_accuracy = overall_accuracy
 
-        index['runs'][run_id] = {
-            'total_feedbacks': total,
-            'correct_count': correct,
-            'incorrect_count': total - correct,
-            'accuracy': accuracy,
-            'overall_accuracy': run_feedback.overall_accuracy,
-            'submitted_at': run_feedback.submitted_at,
-        }
+        self._save_run_feedback(run_dir, run_feedback)
+        self._append_log([self._run_event(run_id, run_feedback)])
+
+        return run_feedback
 
-        self._save_index(index)
+    @staticmethod
+    def _accuracy(counts: Dict[str, int]) -> Optional[float]:
+        return counts['correct'] / counts['rated'] if counts['rated'] > 0 else None
 
     def get_accuracy_stats(self) -> Dict[str, Any]:
         """
         Get aggregate accuracy statistics across all runs.
 
         Returns:
-            Dict with total_runs, total_tests, overall_accuracy,
-            per_run_accuracies, and most common misclassifications.
+            Dict with total_runs, total_tests_rated, overall_accuracy,
+            per_run_accuracies, and accuracy by classification and by
+            feature area.
         """
-        index = self._load_index()
-        runs = index.get('runs', {})
+        aggregates = self._load_aggregates()
+        runs = aggregates['runs']
 
         if not runs:
             return {
@@ -278,25 +467,26 @@ class FeedbackService:
                 'per_run_accuracies': {},
             }
 
-        total_correct = 0
-        total_tests = 0
-
-        for run_id, stats in runs.items():
-            total_correct += stats.get('correct_count', 0)
-            total_tests += stats.get('total_feedbacks', 0)
-
-        overall_accuracy = total_correct / total_tests if total_tests > 0 else None
+        totals = aggregates['totals']
 
         return {
             'total_runs': len(runs),
-            'total_tests_rated': total_tests,
-            'total_correct': total_correct,
-            'total_incorrect': total_tests - total_correct,
-            'overall_accuracy': overall_accuracy,
+            'total_tests_rated': totals['rated'],
+            'total_correct': totals['correct'],
+            'total_incorrect': totals['rated'] - totals['correct'],
+            'overall_accuracy': self._accuracy(totals),
             'per_run_accuracies': {
                 run_id: stats.get('accuracy')
                 for run_id, stats in runs.items()
             },
+            'by_classification': {
+                cls: {**counts, 'accuracy': self._accuracy(counts)}
+                for cls, counts in aggregates['by_classification'].items()
+            },
+            'by_feature_area': {
+                area: {**counts, 'accuracy': self._accuracy(counts)}
+                for area, counts in aggregates['by_feature_area'].items()
+            },
         }
 
     def get_misclassification_patterns(self) -> Dict[str, int]:
@@ -306,23 +496,7 @@ class FeedbackService:
         Returns:
             Dict mapping "FROM -> TO" to count.
         """
-        patterns: Dict[str, int] = {}
-
-        # Scan all run directories for feedback
-        if not self.runs_dir.exists():
-            return patterns
-
-        for run_dir in self.runs_dir.iterdir():
-            if not run_dir.is_dir():
-                continue
-            feedback = self._load_run_feedback(run_dir)
-            if feedback is None:
-                continue
-
-            for tf in feedback.test_feedbacks:
-                if not tf.is_correct and tf.correct_classification:
-                    key = f"{tf.original_classification} -> {tf.correct_classification}"
-                    patterns[key] = patterns.get(key, 0) + 1
+        patterns = self._load_aggregates()['confusion']
 
         # Sort by frequency
         return dict(sorted(patterns.items(), key=lambda x: x[1], reverse=True))
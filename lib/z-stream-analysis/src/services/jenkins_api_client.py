@@ -21,11 +21,41 @@ import logging
 import os
 import subprocess
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
-from urllib.parse import urlparse
+from typing import Any, Callable, Dict, Optional, TextIO, Tuple, TypeVar
+from urllib.parse import quote, urlparse
 
-from .shared_utils import TIMEOUTS, build_curl_command
+from .perf_tracing import traced_run
+from .shared_utils import TIMEOUTS, build_curl_command, stream_subprocess_output
 
+T = TypeVar('T')
+
+
+# Jenkins ``tree=`` selectors for field-selective fetches.
+#
+# BUILD_INFO_TREE covers what JenkinsIntelligenceService._process_build_info reads.
+# TEST_REPORT_TREE covers what _process_test_report reads: counts plus per-case
+# identity/status. errorDetails/errorStackTrace are null for passing cases, so
+# only failed cases add payload, and per-case stdout/stderr (the bulk of large
+# Cypress reports) is never transferred.
+BUILD_INFO_TREE = (
+    'result,timestamp,duration,building,displayName,fullDisplayName,'
+    'actions[parameters[name,value]],artifacts[fileName]'
+)
+TEST_REPORT_TREE = (
+    'duration,passCount,failCount,skipCount,'
+    'suites[cases[className,name,status,duration,errorDetails,errorStackTrace]]'
+)
+
+
+def with_tree(api_url: str, tree: Optional[str]) -> str:
+    """
+    Append a Jenkins ``tree=`` field selector to an api/json URL.
+
+    Brackets are percent-encoded so curl does not treat them as URL globs.
+    """
+    if not tree:
+        return api_url
+    return f"{api_url}?tree={quote(tree, safe=',')}"
 
 class JenkinsAPIClient:
     """
@@ -236,7 +266,7 @@ class JenkinsAPIClient:
         )
 
         try:
-            result = subprocess.run(
+            result = traced_run(
                 cmd,
                 capture_output=True,
                 text=True,
@@ -307,12 +337,18 @@ class JenkinsAPIClient:
 
         return base_url, job_path, build_number
 
-    def get_build_info(self, jenkins_url: str) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    def get_build_info(
+        self,
+        jenkins_url: str,
+        tree: Optional[str] = None
+    ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
         """
         Get build information from a Jenkins build URL.
 
         Args:
             jenkins_url: Full Jenkins build URL
+            tree: Optional Jenkins ``tree=`` selector to fetch only the listed
+                fields (e.g. ``'number,result,building'``)
 
         Returns:
             Tuple of (success, build_info_dict, error_message)
@@ -325,7 +361,7 @@ class JenkinsAPIClient:
         build_num = build_number or 'lastBuild'
         api_url = f"{base_url}/job/{job_path}/{build_num}/api/json"
 
-        return self._make_request(api_url)
+        return self._make_request(with_tree(api_url, tree))
 
     def get_console_output(
         self,
@@ -363,12 +399,18 @@ class JenkinsAPIClient:
 
         return success, output, error
 
-    def get_test_report(self, jenkins_url: str) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
+    def get_test_report(
+        self,
+        jenkins_url: str,
+        tree: Optional[str] = None
+    ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
         """
         Get test report from a Jenkins build.
 
         Args:
             jenkins_url: Full Jenkins build URL
+            tree: Optional Jenkins ``tree=`` selector. Pass TEST_REPORT_TREE to
+                skip per-case stdout/stderr on large suites.
 
         Returns:
             Tuple of (success, test_report_dict, error_message)
@@ -381,7 +423,55 @@ class JenkinsAPIClient:
         build_num = build_number or 'lastBuild'
         api_url = f"{base_url}/job/{job_path}/{build_num}/testReport/api/json"
 
-        return self._make_request(api_url, timeout=TIMEOUTS.TEST_REPORT_FETCH)
+        return self._make_request(
+            with_tree(api_url, tree),
+            timeout=TIMEOUTS.TEST_REPORT_FETCH
+        )
+
+    def stream_test_report(
+        self,
+        jenkins_url: str,
+        consumer: Callable[[TextIO], T],
+        tree: Optional[str] = None
+    ) -> Tuple[bool, Optional[T], Optional[str]]:
+        """
+        Stream a build's test report to consumer without buffering it whole.
+
+        Args:
+            jenkins_url: Full Jenkins build URL
+            consumer: Called with the response body as a text stream (e.g. a
+                parser built on jenkins_report_stream.iter_test_report). It
+                should raise ValueError on non-JSON (HTML error page) input.
+            tree: Optional Jenkins ``tree=`` selector
+
+        Returns:
+            Tuple of (success, consumer_result, error_message)
+        """
+        if not self.is_authenticated:
+            return False, None, "No credentials configured"
+
+        base_url, job_path, build_number = self.parse_build_url(jenkins_url)
+
+        if not job_path:
+            return False, None, "Could not parse job path from URL"
+
+        build_num = build_number or 'lastBuild'
+        api_url = f"{base_url}/job/{job_path}/{build_num}/testReport/api/json"
+        timeout = TIMEOUTS.TEST_REPORT_FETCH
+
+        cmd = build_curl_command(
+            url=with_tree(api_url, tree),
+            username=self._username,
+            token=self._api_token,
+            timeout=timeout,
+            verify_ssl=self.verify_ssl
+        )
+        success, result, error = stream_subprocess_output(
+            cmd, consumer, timeout=timeout + TIMEOUTS.SUBPROCESS_BUFFER
+        )
+        if not success:
+            return False, None, f"Test report stream failed: {error}"
+        return True, result, None
 
 
 # Singleton instance
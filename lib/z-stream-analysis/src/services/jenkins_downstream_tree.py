@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Jenkins Downstream Tree Crawler
+
+Walks the downstream job tree of a top-level Jenkins pipeline build using
+JenkinsAPIClient. Top-level z-stream pipelines fan out to dozens of jobs, so:
+- Each build is fetched with a minimal ``tree=`` selector (no full api/json)
+- Children are expanded breadth-first, one level at a time, over a bounded
+  thread pool
+- Finished builds are immutable and cached (process-wide, optionally on disk)
+
+The result is a compact DownstreamBuild tree. `failed_test_builds()` lists the
+leaf builds that carry failing test reports, which is what batch gathering
+needs.
+
+Downstream builds are discovered from, in order:
+1. ``subBuilds`` (MultiJob / Parameterized Trigger)
+2. ``actions[].triggeredBuilds`` (Parameterized Trigger BuildInfoExporterAction)
+3. ``Starting building: <job> #<n>`` lines in the console log (Pipeline ``build``
+   step) - only for builds without a test report, which are never leaves worth
+   scanning.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urljoin
+
+from .jenkins_api_client import JenkinsAPIClient, get_jenkins_api_client
+
+
+# Only the fields the crawler reads; keeps each response to a few hundred bytes.
+BUILD_TREE = (
+    'number,url,result,building,duration,timestamp,fullDisplayName,'
+    'subBuilds[jobName,buildNumber,url],'
+    'actions[_class,failCount,skipCount,totalCount,triggeredBuilds[url]]'
+)
+
+STARTED_BUILD_PATTERN = re.compile(r'Starting building:\s+(.+?)\s+#(\d+)')
+
+TEST_RESULT_ACTION_MARKERS = ('TestResultAction', 'AggregatedTestResultAction')
+
+
+@dataclass
+class DownstreamBuild:
+    """One build in a downstream tree."""
+    url: str
+    job_name: str
+    build_number: Optional[int] = None
+    result: Optional[str] = None
+    building: bool = False
+    duration_ms: int = 0
+    timestamp: int = 0
+    depth: int = 0
+    fail_count: Optional[int] = None
+    total_count: Optional[int] = None
+    error: Optional[str] = None
+    children: List['DownstreamBuild'] = field(default_factory=list)
+
+    @property
+    def has_test_report(self) -> bool:
+        return self.total_count is not None
+
+    def walk(self) -> Iterator['DownstreamBuild']:
+        """Yield this build and all descendants (pre-order)."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def failed_test_builds(self) -> List['DownstreamBuild']:
+        """Builds whose test report has failures - the inputs for batch gathering."""
+        return [b for b in self.walk() if b.has_test_report and (b.fail_count or 0) > 0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'url': self.url,
+            'job_name': self.job_name,
+            'build_number': self.build_number,
+            'result': self.result,
+            'building': self.building,
+            'duration_ms': self.duration_ms,
+            'timestamp': self.timestamp,
+            'depth': self.depth,
+        }
+        if self.has_test_report:
+            data['fail_count'] = self.fail_count
+            data['total_count'] = self.total_count
+        if self.error:
+            data['error'] = self.error
+        data['children'] = [c.to_dict() for c in self.children]
+        return data
+
+
+class DownstreamTreeCrawler:
+    """
+    Breadth-first crawler for Jenkins downstream build trees.
+
+    Usage:
+        crawler = DownstreamTreeCrawler(max_workers=8, max_depth=5)
+        tree = crawler.crawl('https://jenkins.example.com/job/pipeline/123/')
+        for build in tree.failed_test_builds():
+            print(build.url, build.fail_count)
+    """
+
+    # Finished builds never change; share them across crawler instances.
+    _finished_cache: Dict[str, Dict[str, Any]] = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(
+        self,
+        api_client: Optional[JenkinsAPIClient] = None,
+        max_workers: int = 8,
+        max_depth: int = 5,
+        cache_dir: Optional[str] = None,
+        scan_console: bool = True,
+    ):
+        """
+        Args:
+            api_client: Jenkins client (default: shared singleton)
+            max_workers: Maximum concurrent Jenkins requests
+            max_depth: Maximum downstream depth to expand (root is depth 0)
+            cache_dir: Optional directory for a persistent finished-build cache
+            scan_console: Fall back to console log parsing for Pipeline builds
+        """
+        self.logger = logging.getLogger(__name__)
+        self.api_client = api_client or get_jenkins_api_client()
+        self.max_workers = max(1, max_workers)
+        self.max_depth = max_depth
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.scan_console = scan_console
+        self.cache_hits = 0
+        self.cache_misses = 0
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        return url.rstrip('/') + '/'
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if not self.cache_dir:
+            return None
+        return self.cache_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            entry = self._finished_cache.get(key)
+        if entry is None:
+            path = self._disk_path(key)
+            if path and path.exists():
+                try:
+                    entry = json.loads(path.read_text())
+                except (OSError, json.JSONDecodeError):
+                    entry = None
+                if entry is not None:
+                    with self._cache_lock:
+                        self._finished_cache[key] = entry
+        return entry
+
+    def _cache_put(self, key: str, entry: Dict[str, Any]):
+        with self._cache_lock:
+            self._finished_cache[key] = entry
+        path = self._disk_path(key)
+        if path:
+            try:
+                path.write_text(json.dumps(entry))
+            except OSError as e:
+                self.logger.debug(f"Could not persist build cache entry: {e}")
+
+    def _console_child_urls(self, build_url: str) -> List[str]:
+        """Discover Pipeline ``build`` step children from the console log."""
+        success, console, error = self.api_client.get_console_output(build_url)
+        if not success or not console:
+            self.logger.debug(f"Console scan skipped for {build_url}: {error}")
+            return []
+
+        base_url, _, _ = self.api_client.parse_build_url(build_url)
+        urls = []
+        for match in STARTED_BUILD_PATTERN.finditer(console):
+            # Folder paths print as "folder » job"
+            parts = [quote(p.strip()) for p in match.group(1).split('»') if p.strip()]
+            if parts:
+                urls.append(f"{base_url}/job/{'/job/'.join(parts)}/{match.group(2)}/")
+        return urls
+
+    def _child_urls(self, build_url: str, data: Dict[str, Any], has_test_report: bool) -> List[str]:
+        urls = []
+        for sub in data.get('subBuilds') or []:
+            if sub.get('url'):
+                urls.append(urljoin(self._jenkins_root(build_url), sub['url']))
+        for action in data.get('actions') or []:
+            for triggered in (action or {}).get('triggeredBuilds') or []:
+                if triggered.get('url'):
+                    urls.append(triggered['url'])
+        if not urls and not has_test_report and self.scan_console:
+            urls = self._console_child_urls(build_url)
+        # Preserve discovery order, drop duplicates
+        return list(dict.fromkeys(self._normalize_url(u) for u in urls))
+
+    def _jenkins_root(self, build_url: str) -> str:
+        base_url, _, _ = self.api_client.parse_build_url(build_url)
+        return self._normalize_url(self.api_client.base_url or base_url)
+
+    def _fetch_entry(self, build_url: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Fetch build data + child URLs, from cache when the build has finished."""
+        key = self._normalize_url(build_url)
+        cached = self._cache_get(key)
+        with self._cache_lock:
+            if cached is not None:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        if cached is not None:
+            return cached, None
+
+        success, data, error = self.api_client.get_build_info(build_url, tree=BUILD_TREE)
+        if not success or not data:
+            return None, error or 'empty response'
+
+        has_test_report = any(
+            any(m in (a or {}).get('_class', '') for m in TEST_RESULT_ACTION_MARKERS)
+            for a in data.get('actions') or []
+        )
+        entry = {
+            'data': {k: v for k, v in data.items() if k not in ('actions', 'subBuilds')},
+            'tests': self._test_counts(data) if has_test_report else None,
+            'child_urls': self._child_urls(build_url, data, has_test_report),
+        }
+        if not data.get('building') and data.get('result'):
+            self._cache_put(key, entry)
+        return entry, None
+
+    @staticmethod
+    def _test_counts(data: Dict[str, Any]) -> Dict[str, int]:
+        for action in data.get('actions') or []:
+            if action and 'totalCount' in action:
+                return {
+                    'fail_count': action.get('failCount', 0),
+                    'total_count': action.get('totalCount', 0),
+                }
+        return {'fail_count': 0, 'total_count': 0}
+
+    def _build_node(self, build_url: str, depth: int) -> Tuple[DownstreamBuild, List[str]]:
+        _, job_path, build_number = self.api_client.parse_build_url(build_url)
+        node = DownstreamBuild(
+            url=self._normalize_url(build_url),
+            job_name=job_path.replace('/job/', '/') or build_url,
+            build_number=int(build_number) if build_number else None,
+            depth=depth,
+        )
+        try:
+            entry, error = self._fetch_entry(build_url)
+        except Exception as e:
+            entry, error = None, str(e)
+        if entry is None:
+            node.error = error
+            return node, []
+
+        data = entry['data']
+        node.result = data.get('result')
+        node.building = bool(data.get('building'))
+        node.duration_ms = data.get('duration', 0) or 0
+        node.timestamp = data.get('timestamp', 0) or 0
+        if data.get('number') is not None:
+            node.build_number = data['number']
+        if entry.get('tests'):
+            node.fail_count = entry['tests']['fail_count']
+            node.total_count = entry['tests']['total_count']
+        return node, entry['child_urls']
+
+    def crawl(self, build_url: str) -> DownstreamBuild:
+        """
+        Build the downstream tree rooted at build_url.
+
+        Each level is fetched concurrently; children keep their discovery order
+        so the output is deterministic. A build reachable from several parents
+        appears once, under the first parent that discovered it.
+        """
+        root, root_children = self._build_node(build_url, 0)
+        seen = {root.url}
+        frontier = [(root, root_children)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while frontier:
+                scheduled = []
+                for parent, child_urls in frontier:
+                    if parent.depth >= self.max_depth:
+                        continue
+                    for url in child_urls:
+                        if url in seen:
+                            continue
+                        seen.add(url)
+                        scheduled.append(
+                            (parent, pool.submit(self._build_node, url, parent.depth + 1))
+                        )
+
+                frontier = []
+                for parent, future in scheduled:
+                    child, grandchildren = future.result()
+                    parent.children.append(child)
+                    frontier.append((child, grandchildren))
+
+        total = len(seen)
+        self.logger.info(
+            f"Downstream tree: {total} builds, "
+            f"cache {self.cache_hits} hits / {self.cache_misses} misses"
+        )
+        return root
+
+
+def crawl_downstream_tree(build_url: str, **kwargs) -> DownstreamBuild:
+    """Convenience wrapper around DownstreamTreeCrawler.crawl()."""
+    return DownstreamTreeCrawler(**kwargs).crawl(build_url)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Jenkins Evidence Store
+
+Per-run, fetch-once holder for the Jenkins payloads of a single build:
+processed build info, the console log (as a shared, mmap-backed ConsoleLog),
+and the parsed test report.
+
+A finished build's payloads never change, yet several consumers need them:
+JenkinsIntelligenceService.analyze_jenkins_url(), the DataGatherer steps and
+the two-agent framework. Passing one JenkinsEvidenceStore to all of them
+means each payload is fetched and parsed exactly once per run.
+
+Usage:
+    evidence = JenkinsEvidenceStore(jenkins_url, console_path=run_dir / 'console-log.txt')
+    intelligence = service.analyze_jenkins_url(jenkins_url, evidence=evidence)
+    console = evidence.console()     # ConsoleLog over console-log.txt
+    report = evidence.test_report()  # already parsed, no refetch
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
+
+from .console_log import ConsoleLog
+from .perf_tracing import note_cache, span
+
+if TYPE_CHECKING:
+    from .jenkins_intelligence_service import JenkinsIntelligenceService, TestReport
+
+
+_MISSING = object()
+
+
+class JenkinsEvidenceStore:
+    """
+    Memoized Jenkins evidence for one build URL.
+
+    Each payload is loaded on first access through the owning
+    JenkinsIntelligenceService (API client first, curl fallback) and reused
+    afterwards. Loads are serialized per payload, so concurrent consumers wait
+    for the first fetch instead of issuing their own. Failed loads are cached
+    as empty results, matching what the service returns.
+    """
+
+    def __init__(
+        self,
+        jenkins_url: str,
+        jenkins_service: Optional['JenkinsIntelligenceService'] = None,
+        console_path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            jenkins_url: Jenkins build URL this store belongs to
+            jenkins_service: Service used for fetching (default: a new instance)
+            console_path: Where the console log lives (or will be saved) for this run.
+                          If the file already exists it is read instead of refetched.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.jenkins_url = jenkins_url
+        if jenkins_service is None:
+            from .jenkins_intelligence_service import JenkinsIntelligenceService
+            jenkins_service = JenkinsIntelligenceService()
+        self.jenkins_service = jenkins_service
+        self.console_path: Optional[Path] = Path(console_path) if console_path else None
+        self.fetch_counts: Dict[str, int] = {}
+        self._values: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _get(self, key: str, loader: Callable[[], Any]) -> Any:
+        value = self._values.get(key, _MISSING)
+        if value is not _MISSING:
+            note_cache('jenkins', True)
+            return value
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            value = self._values.get(key, _MISSING)
+            if value is _MISSING:
+                note_cache('jenkins', False)
+                with span(f'jenkins.{key}', kind='jenkins'):
+                    value = loader()
+                self.fetch_counts[key] = self.fetch_counts.get(key, 0) + 1
+                self._values[key] = value
+            else:
+                note_cache('jenkins', True)
+        return value
+
+    def build_info(self) -> Dict[str, Any]:
+        """Processed build info (result, timestamp, parameters, artifacts, ...)."""
+        return self._get('build_info', lambda: self.jenkins_service._fetch_build_info(self.jenkins_url))
+
+    def console(self) -> ConsoleLog:
+        """
+        The run's shared ConsoleLog.
+
+        With a console_path, the log is written there once and memory-mapped,
+        so no consumer holds the full text. Without one it stays in memory.
+        An empty ConsoleLog means the log was unavailable.
+        """
+        return self._get('console', self._load_console)
+
+    def console_log(self) -> str:
+        """Full console log text ('' when unavailable). Prefer console()."""
+        return self.console().text()
+
+    def test_report(self) -> Optional['TestReport']:
+        """Parsed test report, or None when the build has none."""
+        return self._get(
+            'test_report', lambda: self.jenkins_service._fetch_and_analyze_test_report(self.jenkins_url)
+        )
+
+    def _load_console(self) -> ConsoleLog:
+        if self.console_path and self.console_path.exists():
+            self.logger.debug(f"Console log loaded from {self.console_path}")
+            return ConsoleLog(self.console_path)
+        text = self.jenkins_service._fetch_console_log(self.jenkins_url)
+        if text and self.console_path:
+            self.console_path.write_text(text, encoding='utf-8', errors='replace')
+            return ConsoleLog(self.console_path)
+        return ConsoleLog.from_text(text or '')
+
+    def save_console(self) -> Optional[Path]:
+        """
+        Make sure the console log is on disk at console_path.
+
+        Returns:
+            The file path, or None if there is no console log to save
+        """
+        if self.console_path is None:
+            raise ValueError("No console_path configured for this evidence store")
+        console = self.console()
+        if not console:
+            return None
+        if console.path is None:
+            self.console_path.write_text(console.text(), encoding='utf-8', errors='replace')
+        return self.console_path
@@ -16,7 +16,7 @@ import logging
 import re
 import subprocess
 from dataclasses import dataclass, asdict
-from typing import Callable, Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, List, Optional, TextIO, Tuple, Union
 from urllib.parse import urlparse
 
 # Import stack trace parser
@@ -26,8 +26,15 @@ from .stack_trace_parser import StackTraceParser
 from .shared_utils import (
     get_jenkins_credentials,
     build_curl_command,
+    stream_subprocess_output,
     TIMEOUTS,
 )
+from .jenkins_report_stream import iter_test_report
+from .jenkins_evidence_store import JenkinsEvidenceStore
+from .console_log import ConsoleLog
+from .perf_tracing import traced_run
+
+from .jenkins_api_client import BUILD_INFO_TREE, TEST_REPORT_TREE, with_tree
 
 # Import Jenkins API client (lazy import to avoid circular dependencies)
 _api_client = None
@@ -181,7 +188,8 @@ class JenkinsIntelligenceService:
         else:
             self.logger.warning("No Jenkins authentication configured. Some Jenkins instances may reject requests.")
         
-    def analyze_jenkins_url(self, jenkins_url: str, skip_console_fetch: bool = False) -> JenkinsIntelligence:
+    def analyze_jenkins_url(self, jenkins_url: str, skip_console_fetch: bool = False,
+                            evidence: Optional[JenkinsEvidenceStore] = None) -> JenkinsIntelligence:
         """
         Main method to analyze Jenkins pipeline failure
 
@@ -189,14 +197,20 @@ class JenkinsIntelligenceService:
             jenkins_url: Jenkins build URL
             skip_console_fetch: If True, skip fetching console log during metadata extraction.
                                Use this when console log is fetched separately (e.g., by gather.py).
+            evidence: Per-run evidence store. Payloads it already holds are reused and
+                      anything fetched here is kept in it for later consumers.
 
         Returns:
             JenkinsIntelligence: Complete analysis result with per-test-case analysis
         """
         self.logger.info(f"Starting Jenkins intelligence analysis for: {jenkins_url}")
+        if evidence is None:
+            evidence = JenkinsEvidenceStore(jenkins_url, self)
 
         # Extract metadata
-        metadata = self._extract_jenkins_metadata(jenkins_url, skip_console_fetch=skip_console_fetch)
+        metadata = self._extract_jenkins_metadata(
+            jenkins_url, skip_console_fetch=skip_console_fetch, evidence=evidence
+        )
 
         # Analyze failure patterns from console log (only if we have it)
         if skip_console_fetch or not metadata.console_log_snippet:
@@ -210,7 +224,7 @@ class JenkinsIntelligenceService:
             failure_analysis = self._analyze_failure_patterns(metadata.console_log_snippet)
         
         # Fetch and analyze test report for per-test-case analysis
-        test_report = self._fetch_and_analyze_test_report(jenkins_url)
+        test_report = evidence.test_report()
         
         # If we have test report, enhance failure analysis
         if test_report and test_report.failed_tests:
@@ -244,14 +258,18 @@ class JenkinsIntelligenceService:
             test_report=test_report
         )
     
-    def _extract_jenkins_metadata(self, jenkins_url: str, skip_console_fetch: bool = False) -> JenkinsMetadata:
+    def _extract_jenkins_metadata(self, jenkins_url: str, skip_console_fetch: bool = False,
+                                  evidence: Optional[JenkinsEvidenceStore] = None) -> JenkinsMetadata:
         """Extract basic metadata from Jenkins build.
 
         Args:
             jenkins_url: Jenkins build URL
             skip_console_fetch: If True, skip fetching console log (saves a network call
                                when console log is fetched separately by gather.py)
+            evidence: Per-run evidence store to fetch through (default: a new one)
         """
+        if evidence is None:
+            evidence = JenkinsEvidenceStore(jenkins_url, self)
         parsed_url = urlparse(jenkins_url)
 
         # Parse job name and build number from URL
@@ -268,11 +286,11 @@ class JenkinsIntelligenceService:
 
         # Get console log (optional) and build info
         if skip_console_fetch:
-            console_log = ""
+            console = ConsoleLog.from_text("")
             self.logger.debug("Skipping console log fetch (will be fetched separately)")
         else:
-            console_log = self._fetch_console_log(jenkins_url)
-        build_info = self._fetch_build_info(jenkins_url)
+            console = evidence.console()
+        build_info = evidence.build_info()
         
         return JenkinsMetadata(
             build_url=jenkins_url,
@@ -281,10 +299,10 @@ class JenkinsIntelligenceService:
             build_result=build_info.get('result', 'UNKNOWN'),
             timestamp=build_info.get('timestamp', ''),
             parameters=build_info.get('parameters', {}),
-            console_log_snippet=console_log[:2000],  # First 2KB for analysis
+            console_log_snippet=console.text(0, 8000)[:2000],  # First 2K chars for analysis
             artifacts=build_info.get('artifacts', []),
             branch=self._extract_branch_from_parameters(build_info.get('parameters', {})),
-            commit_sha=self._extract_commit_from_console(console_log)
+            commit_sha=self._extract_commit_from_console(console)
         )
     
     def _extract_build_number(self, jenkins_url: str) -> int:
@@ -339,14 +357,18 @@ class JenkinsIntelligenceService:
                 elif error:
                     self.logger.debug(f"Console fetch error: {error}")
             elif fetch_type == 'build_info':
-                success, result, error = self.api_client.get_build_info(jenkins_url)
+                success, result, error = self.api_client.get_build_info(
+                    jenkins_url, tree=BUILD_INFO_TREE
+                )
                 if success and result:
                     self.logger.debug("Build info fetched via API client")
                     return result
                 elif error:
                     self.logger.debug(f"Build info fetch error: {error}")
             elif fetch_type == 'test_report':
-                success, result, error = self.api_client.get_test_report(jenkins_url)
+                success, result, error = self.api_client.get_test_report(
+                    jenkins_url, tree=TEST_REPORT_TREE
+                )
                 if success and result:
                     self.logger.debug("Test report fetched via API client")
                     return result
@@ -373,7 +395,7 @@ class JenkinsIntelligenceService:
             cmd = self._build_curl_command(console_url, timeout=TIMEOUTS.CONSOLE_LOG_FETCH)
             self.logger.debug(f"Fetching console log from: {console_url}")
             
-            result = subprocess.run(
+            result = traced_run(
                 cmd,
                 capture_output=True,
                 text=True,
@@ -408,13 +430,15 @@ class JenkinsIntelligenceService:
             return self._process_build_info(api_result)
         
         # Fall back to curl
-        api_url = f"{jenkins_url.rstrip('/')}/api/json"
+        api_url = with_tree(
+            f"{jenkins_url.rstrip('/')}/api/json", BUILD_INFO_TREE
+        )
         
         try:
             cmd = self._build_curl_command(api_url)
             self.logger.debug(f"Fetching build info from: {api_url}")
             
-            result = subprocess.run(
+            result = traced_run(
                 cmd,
                 capture_output=True,
                 text=True,
@@ -467,74 +491,114 @@ class JenkinsIntelligenceService:
         """
         Fetch test report and analyze each failed test case individually.
         Uses API client if available, falls back to curl.
+
+        The report is parsed as a stream (see _process_test_report_stream), so
+        passing cases are counted and discarded rather than held in memory.
         """
         self.logger.info("Fetching test report for per-test-case analysis...")
 
         # Try API client first if available
-        api_result = self._try_api_fetch(jenkins_url, 'test_report')
-        if api_result:
-            self.logger.info("Test report fetched via Jenkins API client")
-            return self._process_test_report(api_result)
-        
+        if self.api_available and self.api_client:
+            try:
+                success, report, error = self.api_client.stream_test_report(
+                    jenkins_url, self._process_test_report_stream, tree=TEST_REPORT_TREE
+                )
+                if success and report:
+                    self.logger.info("Test report fetched via Jenkins API client")
+                    return report
+                elif error:
+                    self.logger.debug(f"Test report fetch error: {error}")
+            except Exception as e:
+                self.logger.warning(f"API client fetch failed for test_report: {e}")
+
         # Fall back to curl
-        test_report_url = f"{jenkins_url.rstrip('/')}/testReport/api/json"
-        
-        try:
-            cmd = self._build_curl_command(test_report_url)
-            self.logger.debug(f"Fetching test report from: {test_report_url}")
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=TIMEOUTS.TEST_REPORT_FETCH
-            )
-            
-            if result.returncode == 0 and result.stdout:
-                # Check for HTML response or 404
-                if result.stdout.strip().startswith('<') or 'Not Found' in result.stdout:
-                    self.logger.info("No test report available for this build")
-                    return None
-                
-                data = json.loads(result.stdout)
-                return self._process_test_report(data)
-            else:
-                self.logger.info("No test report available or failed to fetch")
-                return None
-                
-        except (subprocess.TimeoutExpired, json.JSONDecodeError) as e:
-            self.logger.warning(f"Error fetching test report: {str(e)}")
-            return None
-        except Exception as e:
-            self.logger.debug(f"Test report not available: {str(e)}")
-            return None
-    
+        test_report_url = with_tree(
+            f"{jenkins_url.rstrip('/')}/testReport/api/json", TEST_REPORT_TREE
+        )
+
+        cmd = self._build_curl_command(test_report_url, timeout=TIMEOUTS.TEST_REPORT_FETCH)
+        self.logger.debug(f"Fetching test report from: {test_report_url}")
+
+        success, report, error = stream_subprocess_output(
+            cmd,
+            self._process_test_report_stream,
+            timeout=TIMEOUTS.TEST_REPORT_FETCH + TIMEOUTS.SUBPROCESS_BUFFER
+        )
+        if success and report:
+            return report
+
+        # HTML (404 / login page) and empty bodies surface as parse errors
+        self.logger.info(f"No test report available or failed to fetch: {error}")
+        return None
+
     def _process_test_report(self, data: Dict[str, Any]) -> TestReport:
         """Process raw test report JSON into TestReport with analyzed failures."""
+        cases = (case for suite in data.get('suites', []) for case in suite.get('cases', []))
+        failed_tests, status_counts = self._collect_test_failures(cases)
+        return self._assemble_test_report(data, failed_tests, status_counts)
+
+    def _process_test_report_stream(self, stream: TextIO) -> TestReport:
+        """
+        Process a test report read incrementally from a text stream.
+
+        Walks suites[].cases[] one case at a time. Passed/skipped cases only
+        bump counters; TestCaseFailure objects are built for failed cases only,
+        so peak memory tracks the number of failures, not the suite size.
+
+        Raises:
+            ValueError: If the stream is not a JSON test report
+        """
+        summary: Dict[str, Any] = {}
+
+        def cases():
+            for kind, value in iter_test_report(stream):
+                if kind == 'case':
+                    yield value
+                else:
+                    summary.update(value)
+
+        failed_tests, status_counts = self._collect_test_failures(cases())
+        return self._assemble_test_report(summary, failed_tests, status_counts)
+
+    def _collect_test_failures(
+        self, cases: Iterable[Dict[str, Any]]
+    ) -> Tuple[List[TestCaseFailure], Dict[str, int]]:
+        """Analyze failed/regression cases; tally every case by status."""
         failed_tests = []
-        total_duration = data.get('duration', 0)
-        
-        # Extract counts
-        total_tests = data.get('passCount', 0) + data.get('failCount', 0) + data.get('skipCount', 0)
-        passed_count = data.get('passCount', 0)
-        failed_count = data.get('failCount', 0)
-        skipped_count = data.get('skipCount', 0)
-        
-        # Process each suite
-        for suite in data.get('suites', []):
-            for case in suite.get('cases', []):
-                status = case.get('status', 'UNKNOWN')
-                
-                # Only analyze failed or regression tests
-                if status in ['FAILED', 'REGRESSION']:
-                    test_failure = self._analyze_single_test_failure(case)
-                    failed_tests.append(test_failure)
-        
+        status_counts: Dict[str, int] = {}
+        for case in cases:
+            status = case.get('status', 'UNKNOWN')
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+            # Only analyze failed or regression tests
+            if status in ['FAILED', 'REGRESSION']:
+                failed_tests.append(self._analyze_single_test_failure(case))
+        return failed_tests, status_counts
+
+    def _assemble_test_report(
+        self,
+        summary: Dict[str, Any],
+        failed_tests: List[TestCaseFailure],
+        status_counts: Dict[str, int],
+    ) -> TestReport:
+        """Build TestReport from top-level counts, falling back to the case tally."""
+        total_duration = summary.get('duration', 0)
+
+        # Jenkins' own counts are authoritative; the tally covers reports without them
+        passed_count = summary.get(
+            'passCount', status_counts.get('PASSED', 0) + status_counts.get('FIXED', 0)
+        )
+        failed_count = summary.get(
+            'failCount', status_counts.get('FAILED', 0) + status_counts.get('REGRESSION', 0)
+        )
+        skipped_count = summary.get('skipCount', status_counts.get('SKIPPED', 0))
+        total_tests = passed_count + failed_count + skipped_count
+
         # Calculate pass rate
         pass_rate = (passed_count / total_tests * 100) if total_tests > 0 else 0.0
-        
+
         self.logger.info(f"Test report: {total_tests} total, {failed_count} failed, {passed_count} passed")
-        
+
         return TestReport(
             total_tests=total_tests,
             passed_count=passed_count,
@@ -544,7 +608,7 @@ class JenkinsIntelligenceService:
             failed_tests=failed_tests,
             duration=total_duration
         )
-    
+
     def _analyze_single_test_failure(self, case: Dict[str, Any]) -> TestCaseFailure:
         """
         Analyze a single test case failure and classify it.
@@ -845,8 +909,8 @@ class JenkinsIntelligenceService:
 
         return self._extract_first_matching_parameter(parameters, branch_params, clean_branch)
     
-    def _extract_commit_from_console(self, console_log: str) -> Optional[str]:
-        """Extract commit SHA from console log"""
+    def _extract_commit_from_console(self, console_log: Union[str, ConsoleLog]) -> Optional[str]:
+        """Extract commit SHA from console log (text or shared ConsoleLog)"""
         # Look for git commit patterns
         commit_patterns = [
             r'commit\s+([a-f0-9]{7,40})',
@@ -855,7 +919,10 @@ class JenkinsIntelligenceService:
         ]
         
         for pattern in commit_patterns:
-            match = re.search(pattern, console_log, re.IGNORECASE)
+            if isinstance(console_log, ConsoleLog):
+                match = console_log.search(pattern, re.IGNORECASE)
+            else:
+                match = re.search(pattern, console_log, re.IGNORECASE)
             if match:
                 return match.group(1)
         
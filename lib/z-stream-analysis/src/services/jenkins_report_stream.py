@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Streaming Jenkins Test Report Reader
+
+Walks a Jenkins ``testReport/api/json`` document incrementally, yielding one
+test case at a time instead of materializing the whole report. Only the
+structure ``{..., "suites": [{..., "cases": [ {case}, ... ]}, ...]}`` is
+navigated; every other value (top-level counts, suite metadata) is decoded
+whole with ``json.JSONDecoder.raw_decode``.
+
+Peak memory is bounded by the largest single case, not the size of the suite.
+Pure stdlib - no ijson dependency.
+
+Usage:
+    with open('test-report.json') as f:
+        for kind, value in iter_test_report(f):
+            if kind == 'case':
+                ...  # one case dict
+            elif kind == 'summary':
+                ...  # top-level fields (passCount, failCount, duration, ...)
+"""
+
+import json
+from typing import Any, Dict, Iterator, TextIO, Tuple
+
+READ_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_START = '-0123456789'
+_NUMBER_CHARS = '+-.eE0123456789'
+
+
+class _StreamReader:
+    """Minimal pull reader over a text stream with a sliding buffer."""
+
+    def __init__(self, stream: TextIO, read_size: int = READ_SIZE):
+        self.stream = stream
+        self.read_size = read_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Read more input. Returns False at end of stream."""
+        if self.eof:
+            return False
+        # Drop consumed input so the buffer only holds the unparsed tail
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        chunk = self.stream.read(max(self.read_size, min_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in test report stream, found '{found or 'EOF'}'")
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """Decode one complete JSON value at the current position."""
+        if self.peek() in _NUMBER_START:
+            self._buffer_number()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Value is incomplete. Grow the buffer geometrically so a huge
+                # value costs O(n) re-parsing overall, not O(n^2).
+                if not self._fill(min_size=len(self.buffer) - self.pos):
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def _buffer_number(self):
+        """Ensure a number's terminating delimiter is buffered (it may span chunks)."""
+        scan = self.pos
+        while True:
+            while scan < len(self.buffer) and self.buffer[scan] in _NUMBER_CHARS:
+                scan += 1
+            if scan < len(self.buffer):
+                return
+            offset = scan - self.pos
+            if not self._fill():
+                return
+            scan = self.pos + offset
+
+    def read_key(self) -> str:
+        key = self.decode_value()
+        if not isinstance(key, str):
+            raise ValueError("Expected object key in test report stream")
+        self.expect(':')
+        return key
+
+    def object_keys(self) -> Iterator[str]:
+        """Iterate keys of the object just opened; caller consumes each value."""
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            yield self.read_key()
+            sep = self.peek()
+            self.pos += 1
+            if sep == '}':
+                return
+            if sep != ',':
+                raise ValueError(f"Malformed object in test report stream near '{sep}'")
+
+    def array_items(self) -> Iterator[None]:
+        """Iterate items of the array just opened; caller consumes each item."""
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield None
+            sep = self.peek()
+            self.pos += 1
+            if sep == ']':
+                return
+            if sep != ',':
+                raise ValueError(f"Malformed array in test report stream near '{sep}'")
+
+
+def iter_test_report(stream: TextIO, read_size: int = READ_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream a Jenkins test report.
+
+    Yields:
+        ('case', case_dict) for every case in suites[].cases[], in document order,
+        then ('summary', dict) with all top-level fields except ``suites``.
+
+    Raises:
+        ValueError: If the stream is not a JSON object (e.g. an HTML login page)
+    """
+    reader = _StreamReader(stream, read_size)
+    if reader.peek() != '{':
+        raise ValueError("Test report is not a JSON object")
+    reader.expect('{')
+
+    summary: Dict[str, Any] = {}
+    for key in reader.object_keys():
+        if key != 'suites' or reader.peek() != '[':
+            summary[key] = reader.decode_value()
+            continue
+        reader.expect('[')
+        for _ in reader.array_items():
+            reader.expect('{')
+            for suite_key in reader.object_keys():
+                if suite_key != 'cases' or reader.peek() != '[':
+                    reader.decode_value()
+                    continue
+                reader.expect('[')
+                for _ in reader.array_items():
+                    yield 'case', reader.decode_value()
+
+    yield 'summary', summary
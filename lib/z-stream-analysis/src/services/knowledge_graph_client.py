@@ -28,6 +28,8 @@ from base64 import b64encode
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Any
 
+from .perf_tracing import note_cache, span
+
 
 @dataclass
 class ComponentInfo:
@@ -194,8 +196,11 @@ class KnowledgeGraphClient:
                 method='POST',
             )
 
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                body = json.loads(resp.read().decode('utf-8'))
+            with span('kg.query', kind='kg') as s:
+                with urllib.request.urlopen(req, timeout=10) as resp:
+                    raw = resp.read()
+                s.bytes += len(raw)
+            body = json.loads(raw.decode('utf-8'))
 
             # Check for errors
             if body.get('errors'):
@@ -242,7 +247,9 @@ class KnowledgeGraphClient:
             return []
 
         cache_key = f"deps:{component}"
-        if cache_key in self._dependency_cache:
+        hit = cache_key in self._dependency_cache
+        note_cache('kg', hit)
+        if hit:
             return self._dependency_cache[cache_key]
 
         escaped = self._escape_regex(component)
@@ -277,7 +284,9 @@ class KnowledgeGraphClient:
             return []
 
         cache_key = f"dependents:{component}"
-        if cache_key in self._dependency_cache:
+        hit = cache_key in self._dependency_cache
+        note_cache('kg', hit)
+        if hit:
             return self._dependency_cache[cache_key]
 
         escaped = self._escape_regex(component)
@@ -364,7 +373,9 @@ class KnowledgeGraphClient:
         if not self.available:
             return None
 
-        if component in self._component_cache:
+        hit = component in self._component_cache
+        note_cache('kg', hit)
+        if hit:
             return self._component_cache[component]
 
         escaped = self._escape_regex(component)
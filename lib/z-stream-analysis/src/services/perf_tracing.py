@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Performance Tracing
+
+Lightweight spans for finding out where a pipeline run spends its time.
+
+A span times one unit of work: a gather step, a subprocess (oc, git, curl,
+gh, ...), an HTTP request, a Knowledge Graph or Polarion query. Spans nest
+through a context variable, so a subprocess started inside a gather step
+becomes a child of that step. Each span records its duration, bytes
+transferred and cache hits/misses, plus the stage bound with
+bind_context() when it started.
+
+Finished spans are:
+- logged to pipeline.log.jsonl at DEBUG with the span under "span", and
+  log records emitted inside a span carry its "span_id"
+- kept in memory by the process-wide PerfRecorder, which writes
+  perf-summary.json (totals per stage, kind and name, plus every span for
+  the timeline in the HTML report's Performance tab)
+
+Tracing is always on; an unobserved span costs two perf_counter() calls
+and one list append.
+
+Usage:
+    from src.services.perf_tracing import span, traced_run, note_cache
+
+    with span('clone_repositories', kind='step'):
+        result = traced_run(['git', 'clone', url, dest], capture_output=True)
+
+    with span('kg.query', kind='kg') as s:
+        body = resp.read()
+        s.bytes += len(body)
+
+    get_recorder().write_summary(run_dir, total_seconds=elapsed)
+"""
+
+import itertools
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+from urllib.parse import urlparse
+
+from src.logging_config import bind_context, get_context
+
+PERF_SUMMARY_FILENAME = 'perf-summary.json'
+# Spans kept for the timeline; later spans still count towards the totals
+MAX_RECORDED_SPANS = 5000
+# Entries in the summary's slowest / by_name lists
+TOP_N = 20
+
+# Tools whose first positional argument names the operation (oc get, git clone)
+_SUBCOMMAND_TOOLS = {'oc', 'kubectl', 'git', 'gh', 'podman', 'docker', 'helm'}
+# Options of those tools that take a separate value
+_VALUE_OPTIONS = {'-C', '-c', '-n', '--namespace', '--kubeconfig', '--context',
+                  '--server', '--token', '-R', '--repo', '-o', '--output'}
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('perf_span', default=None)
+
+
+@dataclass
+class Span:
+    """One timed unit of work. start is seconds since the recorder was reset."""
+    id: int
+    name: str
+    kind: str
+    parent_id: Optional[int]
+    stage: str
+    start: float
+    duration: float = 0.0
+    bytes: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    status: str = 'ok'
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {
+            'id': self.id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'stage': self.stage,
+            'start': round(self.start, 4),
+            'duration': round(self.duration, 4),
+            'bytes': self.bytes,
+            'status': self.status,
+        }
+        if self.cache_hits or self.cache_misses:
+            entry['cache'] = {'hits': self.cache_hits, 'misses': self.cache_misses}
+        if self.attrs:
+            entry['attrs'] = self.attrs
+        return entry
+
+
+def _new_totals() -> Dict[str, Any]:
+    return {'count': 0, 'seconds': 0.0, 'bytes': 0, 'errors': 0}
+
+
+class PerfRecorder:
+    """Collects finished spans for one run and summarizes them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new run: forget all spans and restart the clock."""
+        with self._lock:
+            self.origin = time.perf_counter()
+            self.started_at = datetime.now(timezone.utc).isoformat()
+            self._ids = itertools.count(1)
+            self._spans: List[Span] = []
+            self._totals: Dict[str, Dict[str, Any]] = {}
+            self._cache: Dict[str, Dict[str, int]] = {}
+            self.dropped = 0
+
+    def open(self, name: str, kind: str, attrs: Dict[str, Any]) -> Span:
+        parent = _current_span.get()
+        return Span(
+            id=next(self._ids),
+            name=name,
+            kind=kind,
+            parent_id=parent.id if parent else None,
+            stage=get_context()['stage'],
+            start=time.perf_counter() - self.origin,
+            attrs=attrs,
+        )
+
+    def finish(self, span: Span) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(span.kind, _new_totals())
+            totals['count'] += 1
+            totals['seconds'] += span.duration
+            totals['bytes'] += span.bytes
+            totals['errors'] += span.status != 'ok'
+            if len(self._spans) < MAX_RECORDED_SPANS:
+                self._spans.append(span)
+            else:
+                self.dropped += 1
+
+    def note_cache(self, kind: str, hit: bool) -> None:
+        with self._lock:
+            counts = self._cache.setdefault(kind, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self, total_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Summarize the run.
+
+        Args:
+            total_seconds: Wall time of the run (default: time since reset())
+
+        Returns:
+            Dict with by_stage, by_kind, by_name, steps, slowest and spans
+        """
+        spans = self.spans()
+        if total_seconds is None:
+            total_seconds = time.perf_counter() - self.origin
+        with self._lock:
+            by_kind = {kind: dict(totals) for kind, totals in self._totals.items()}
+            cache = {kind: dict(counts) for kind, counts in self._cache.items()}
+        for kind, totals in by_kind.items():
+            totals['seconds'] = round(totals['seconds'], 3)
+            if kind in cache:
+                totals['cache'] = cache.pop(kind)
+        for kind, counts in cache.items():
+            by_kind[kind] = {**_new_totals(), 'cache': counts}
+
+        children: Dict[int, float] = {}
+        by_name: Dict[tuple, Dict[str, Any]] = {}
+        by_stage: Dict[str, float] = {}
+        for s in spans:
+            if s.parent_id is not None:
+                children[s.parent_id] = children.get(s.parent_id, 0.0) + s.duration
+            else:
+                by_stage[s.stage] = by_stage.get(s.stage, 0.0) + s.duration
+            totals = by_name.setdefault((s.kind, s.name), {'name': s.name, 'kind': s.kind, **_new_totals()})
+            totals['count'] += 1
+            totals['seconds'] += s.duration
+            totals['bytes'] += s.bytes
+            totals['errors'] += s.status != 'ok'
+        for totals in by_name.values():
+            totals['seconds'] = round(totals['seconds'], 3)
+
+        steps = [
+            {
+                'name': s.name,
+                'stage': s.stage,
+                'start': round(s.start, 3),
+                'duration': round(s.duration, 3),
+                # Time not covered by traced subprocesses / requests / sub-steps
+                'self_seconds': round(max(s.duration - children.get(s.id, 0.0), 0.0), 3),
+            }
+            for s in spans if s.kind == 'step'
+        ]
+        traced = sum(by_stage.values())
+        return {
+            'version': 1,
+            'run_id': get_context()['run_id'],
+            'started_at': self.started_at,
+            'total_seconds': round(total_seconds, 3),
+            'untraced_seconds': round(max(total_seconds - traced, 0.0), 3),
+            'span_count': sum(t['count'] for t in by_kind.values()),
+            'spans_dropped': self.dropped,
+            'by_stage': {stage: round(sec, 3) for stage, sec in by_stage.items()},
+            'by_kind': by_kind,
+            'by_name': sorted(by_name.values(), key=lambda t: -t['seconds'])[:TOP_N],
+            'steps': steps,
+            'slowest': [s.to_dict() for s in sorted(
+                (s for s in spans if s.kind != 'step'), key=lambda s: -s.duration)[:TOP_N]],
+            'spans': [s.to_dict() for s in sorted(spans, key=lambda s: s.start)],
+        }
+
+    def write_summary(self, run_dir: Union[str, Path],
+                      total_seconds: Optional[float] = None) -> Path:
+        """Write perf-summary.json into run_dir and return its path."""
+        path = Path(run_dir) / PERF_SUMMARY_FILENAME
+        summary = self.summary(total_seconds)
+        path.write_text(json.dumps(summary, indent=2, default=str))
+        logger.info(f"Perf summary: {summary['span_count']} spans, "
+                    f"{summary['untraced_seconds']:.1f}s of {summary['total_seconds']:.1f}s untraced")
+        return path
+
+
+_recorder = PerfRecorder()
+
+
+def get_recorder() -> PerfRecorder:
+    """The process-wide recorder."""
+    return _recorder
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span in this context, if any."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, kind: str = 'internal', **attrs) -> Iterator[Span]:
+    """
+    Time a block of work as a child of the current span.
+
+    Add to span.bytes / span.attrs inside the block. An exception marks
+    the span as an error and propagates.
+    """
+    s = _recorder.open(name, kind, attrs)
+    parent_log_id = get_context()['span_id']
+    token = _current_span.set(s)
+    bind_context(span_id=s.id)
+    t0 = time.perf_counter()
+    try:
+        yield s
+    except BaseException as e:
+        s.status = 'error'
+        s.attrs['error'] = type(e).__name__
+        raise
+    finally:
+        s.duration = time.perf_counter() - t0
+        _current_span.reset(token)
+        bind_context(span_id=parent_log_id)
+        _recorder.finish(s)
+        logger.debug(f"span {kind} {name} {s.duration:.3f}s", extra={'span': s.to_dict()})
+
+
+def note_cache(kind: str, hit: bool) -> None:
+    """Count a cache lookup, on the current span and in the run totals."""
+    s = _current_span.get()
+    if s is not None:
+        if hit:
+            s.cache_hits += 1
+        else:
+            s.cache_misses += 1
+    _recorder.note_cache(kind, hit)
+
+
+def payload_size(value: Any) -> int:
+    """Length of captured str/bytes output; 0 for anything else (None, streams)."""
+    return len(value) if isinstance(value, (str, bytes)) else 0
+
+
+def command_label(cmd: Union[str, List[str]]) -> str:
+    """Short, credential-free span name for a command: 'oc get', 'git clone', 'curl'."""
+    parts = cmd.split() if isinstance(cmd, str) else [str(c) for c in cmd]
+    if not parts:
+        return '?'
+    tool = os.path.basename(parts[0])
+    if tool not in _SUBCOMMAND_TOOLS:
+        return tool
+    args = iter(parts[1:])
+    for arg in args:
+        if arg in _VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith('-'):
+            return f"{tool} {arg}"
+    return tool
+
+
+def _command_attrs(cmd: Union[str, List[str]]) -> Dict[str, Any]:
+    parts = cmd.split() if isinstance(cmd, str) else [str(c) for c in cmd]
+    if parts and os.path.basename(parts[0]) == 'curl':
+        for arg in parts[1:]:
+            if arg.startswith(('http://', 'https://')):
+                return {'host': urlparse(arg).hostname}
+    return {}
+
+
+def traced_run(cmd: Union[str, List[str]], *args, **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run() inside a 'subprocess' span.
+
+    Records the exit code and the size of captured output. Arguments and
+    exceptions are passed through unchanged.
+    """
+    with span(command_label(cmd), kind='subprocess', **_command_attrs(cmd)) as s:
+        result = subprocess.run(cmd, *args, **kwargs)
+        s.bytes += payload_size(result.stdout) + payload_size(result.stderr)
+        if isinstance(result.returncode, int):
+            s.attrs['exit_code'] = result.returncode
+        return result
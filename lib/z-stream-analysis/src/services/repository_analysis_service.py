@@ -16,6 +16,7 @@ from pathlib import Path
 from typing import Dict, Optional, Tuple
 
 # Import centralized configuration
+from .perf_tracing import traced_run
 from .shared_utils import REPOS, TIMEOUTS
 
 
@@ -73,7 +74,7 @@ class RepositoryAnalysisService:
     def _get_head_commit(self, repo_path: Path) -> Optional[str]:
         """Get the HEAD commit SHA"""
         try:
-            result = subprocess.run(
+            result = traced_run(
                 ['git', 'rev-parse', 'HEAD'],
                 cwd=repo_path,
                 capture_output=True,
@@ -124,7 +125,7 @@ class RepositoryAnalysisService:
             self.logger.info(f"Cloning repository to: {target_path}")
             self.logger.debug(f"Clone command: {' '.join(cmd)}")
 
-            result = subprocess.run(
+            result = traced_run(
                 cmd,
                 capture_output=True,
                 text=True,
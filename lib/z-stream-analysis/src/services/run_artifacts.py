@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Run Artifacts
+
+Reads and writes a run's gathered data (core-data) in one of two formats:
+
+- json:   core-data.json, pretty-printed (default; what agents read and edit)
+- packed: core-data.pack, every top-level section (metadata, test_report,
+          cluster_oracle, ...) compressed on its own and concatenated. The
+          offset table lives in manifest.json under
+          files["core-data.pack"].sections, so a consumer that needs only
+          test_report reads and decompresses only that section.
+
+Sections are compressed with zstd when the optional `zstandard` package is
+installed and gzip otherwise; the codec is recorded in the manifest.
+
+When both files exist the newer one wins, so a core-data.json exported
+from a pack and then enriched by an agent is what later stages read.
+`export_json()` and `pack()` convert between the two.
+
+Usage:
+    artifacts = RunArtifacts(run_dir)
+    report = artifacts.section('test_report')              # one section
+    data = artifacts.load('metadata', 'jenkins')           # several
+    core = artifacts.load()                                # everything
+"""
+
+import gzip
+import json
+import logging
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .shared_utils import MaskingJSONEncoder, SensitiveDataMasker
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CORE_DATA_FILENAME = 'core-data.json'
+PACKED_FILENAME = 'core-data.pack'
+MANIFEST_FILENAME = 'manifest.json'
+ARTIFACT_FORMATS = ('json', 'packed')
+CODECS = ('zstd', 'gzip')
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def default_codec() -> str:
+    """zstd if the zstandard package is installed, else gzip."""
+    return 'zstd' if zstandard is not None else 'gzip'
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("codec 'zstd' requires the zstandard package")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == 'gzip':
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    """Decompress one section; corrupt data raises ValueError."""
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("codec 'zstd' requires the zstandard package")
+        try:
+            return zstandard.ZstdDecompressor().decompress(data)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Corrupt zstd section: {e}") from e
+    if codec == 'gzip':
+        try:
+            return gzip.decompress(data)
+        except (OSError, EOFError, zlib.error) as e:
+            raise ValueError(f"Corrupt gzip section: {e}") from e
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+class RunArtifacts:
+    """Format-aware access to one run directory's core data."""
+
+    def __init__(self, run_dir: Union[str, Path]):
+        self.run_dir = Path(run_dir)
+        self.json_path = self.run_dir / CORE_DATA_FILENAME
+        self.pack_path = self.run_dir / PACKED_FILENAME
+        self.manifest_path = self.run_dir / MANIFEST_FILENAME
+        self.logger = logging.getLogger(__name__)
+        self._json_data: Optional[Dict[str, Any]] = None
+        self._pack_entry: Optional[Dict[str, Any]] = None
+
+    # -- format detection ---------------------------------------------------
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    def pack_entry(self) -> Optional[Dict[str, Any]]:
+        """
+        Manifest entry (codec + offset table) of a current core-data.pack.
+
+        None when there is no pack, its table is missing or does not match
+        the file, or core-data.json is newer.
+        """
+        if self._pack_entry is not None:
+            return self._pack_entry
+        try:
+            pack_stat = self.pack_path.stat()
+        except OSError:
+            return None
+        try:
+            if self.json_path.stat().st_mtime_ns > pack_stat.st_mtime_ns:
+                return None
+        except OSError:
+            pass
+        entry = self._read_manifest().get('files', {}).get(PACKED_FILENAME)
+        if not isinstance(entry, dict) or entry.get('size') != pack_stat.st_size:
+            self.logger.warning(f"{PACKED_FILENAME} does not match its manifest offset table, ignoring it")
+            return None
+        self._pack_entry = entry
+        return entry
+
+    @property
+    def format(self) -> Optional[str]:
+        """'packed', 'json', or None if the run has no core data."""
+        if self.pack_entry() is not None:
+            return 'packed'
+        return 'json' if self.json_path.exists() else None
+
+    def exists(self) -> bool:
+        return self.format is not None
+
+    def sections(self) -> List[str]:
+        """Top-level section names in file order."""
+        entry = self.pack_entry()
+        if entry is not None:
+            return list(entry['sections'])
+        data = self._load_json()
+        return list(data) if data else []
+
+    # -- reading ------------------------------------------------------------
+
+    def _load_json(self) -> Optional[Dict[str, Any]]:
+        if self._json_data is None and self.json_path.exists():
+            with open(self.json_path) as f:
+                self._json_data = json.load(f)
+        return self._json_data
+
+    def _read_sections(self, entry: Dict[str, Any], names: List[str]) -> Dict[str, Any]:
+        codec = entry.get('codec', 'gzip')
+        table = entry['sections']
+        result = {}
+        with open(self.pack_path, 'rb') as f:
+            for name in sorted((n for n in names if n in table), key=lambda n: table[n]['offset']):
+                f.seek(table[name]['offset'])
+                raw = _decompress(f.read(table[name]['length']), codec)
+                result[name] = json.loads(raw)
+        return {name: result[name] for name in names if name in result}
+
+    def load(self, *names: str) -> Optional[Dict[str, Any]]:
+        """
+        Core data, or only the named top-level sections of it.
+
+        Missing sections are left out. Returns None if the run has no core data.
+        """
+        entry = self.pack_entry()
+        if entry is not None:
+            return self._read_sections(entry, list(names) or list(entry['sections']))
+        data = self._load_json()
+        if data is None:
+            return None
+        if not names:
+            return data
+        return {name: data[name] for name in names if name in data}
+
+    def section(self, name: str, default: Any = None) -> Any:
+        """One top-level section (default if absent)."""
+        data = self.load(name)
+        return data.get(name, default) if data else default
+
+    # -- writing ------------------------------------------------------------
+
+    def write(self, core_data: Dict[str, Any], artifact_format: str = 'json',
+              codec: Optional[str] = None,
+              masker: Optional[SensitiveDataMasker] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Write core data in the given format.
+
+        With a masker, credentials are masked while the data is encoded
+        (see MaskingJSONEncoder); core_data itself is left untouched.
+
+        Returns:
+            Manifest 'files' entries for what was written (for packed output
+            this includes the codec and offset table; the caller saves them)
+        """
+        if artifact_format not in ARTIFACT_FORMATS:
+            raise ValueError(f"Unknown artifact format: {artifact_format}")
+        self._json_data = None
+        self._pack_entry = None
+        encoder = {'cls': MaskingJSONEncoder, 'masker': masker} if masker else {}
+        if artifact_format == 'json':
+            with open(self.json_path, 'w') as f:
+                json.dump(core_data, f, indent=2, default=str, **encoder)
+            if self.pack_path.exists():
+                self.pack_path.unlink()
+            return {CORE_DATA_FILENAME: self.json_entry()}
+
+        codec = codec or default_codec()
+        sections = {}
+        offset = 0
+        tmp_path = self.pack_path.with_name(self.pack_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            for name, value in core_data.items():
+                raw = json.dumps(value, separators=(',', ':'), default=str, **encoder).encode('utf-8')
+                blob = _compress(raw, codec)
+                f.write(blob)
+                sections[name] = {'offset': offset, 'length': len(blob), 'raw_size': len(raw)}
+                offset += len(blob)
+        tmp_path.replace(self.pack_path)
+        if self.json_path.exists():
+            self.json_path.unlink()
+        return {PACKED_FILENAME: self.packed_entry(codec, sections, offset)}
+
+    @staticmethod
+    def json_entry() -> Dict[str, Any]:
+        return {
+            'description': 'Primary analysis data (metadata, jenkins, test_report, console_log, environment, feature_knowledge)',
+            'required': True,
+            'load_first': True
+        }
+
+    @staticmethod
+    def packed_entry(codec: str, sections: Dict[str, Dict[str, int]], size: int) -> Dict[str, Any]:
+        return {
+            'description': ('Primary analysis data, one compressed section per top-level key. '
+                            'Run `python -m src.scripts.gather --export-json <run_dir>` for core-data.json'),
+            'required': True,
+            'load_first': True,
+            'codec': codec,
+            'size': size,
+            'sections': sections,
+        }
+
+    def _update_manifest(self, entries: Dict[str, Dict[str, Any]], drop: Optional[str] = None):
+        manifest = self._read_manifest()
+        others = {
+            name: entry for name, entry in manifest.get('files', {}).items()
+            if name != drop and name not in entries
+        }
+        manifest['files'] = {**entries, **others}
+        self.manifest_path.write_text(json.dumps(manifest, indent=2, default=str))
+
+    def export_json(self) -> Path:
+        """Write core-data.json from the pack (the pack is kept)."""
+        data = self.load()
+        if data is None:
+            raise FileNotFoundError(f"No core data in {self.run_dir}")
+        self.json_path.write_text(json.dumps(data, indent=2, default=str))
+        self._pack_entry = None
+        self._update_manifest({CORE_DATA_FILENAME: self.json_entry()})
+        return self.json_path
+
+    def pack(self, codec: Optional[str] = None) -> Path:
+        """Replace core-data.json with core-data.pack and record its offset table."""
+        data = self._load_json()
+        if data is None:
+            raise FileNotFoundError(f"No {CORE_DATA_FILENAME} in {self.run_dir}")
+        entries = self.write(data, 'packed', codec)
+        self._update_manifest(entries, drop=CORE_DATA_FILENAME)
+        return self.pack_path
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Run History Index
+
+Cross-run store of test failures, for trend, recurrence and flakiness
+questions that would otherwise mean re-reading every run under runs/.
+
+Each completed run (one with analysis-results.json) is ingested once into
+runs/run-history.db (SQLite):
+
+- runs: run id, job, build, build result, timestamp, test counts
+- test_failures: one row per failed test per run with feature area,
+  failure type, failure fingerprint, classification and confidence
+
+Failed tests come from core-data.json (failure type, failure_cluster
+fingerprint) joined by name with per_test_analysis from analysis-results.json
+(classification, confidence, feature area). Runs whose core-data.json
+predates failure clustering are fingerprinted with FailureClusterer. Packed
+runs (core-data.pack) are read section by section, so only metadata,
+jenkins and test_report are decompressed.
+
+A run is re-ingested only when one of those files changes, so
+refresh() costs one stat per run directory. A run whose directory is
+deleted (e.g. by the storage manager's retention) keeps its rows and is
+marked removed, so pruning old run directories does not shrink the
+history window; forget_removed() drops those rows on request. Queries
+look at the last N builds of a job; a build analyzed more than once counts
+through its newest run. A run where a test did not fail counts as a run where it
+passed, since only failures are recorded.
+
+Usage:
+    with RunHistoryIndex('./runs') as history:
+        history.refresh()
+        stats = history.flakiness('test_cluster_create', job='clc-e2e-pipeline')
+        if stats.is_flaky:
+            ...
+        history.recurrence(fingerprint, job='clc-e2e-pipeline')
+"""
+
+import json
+import logging
+import sqlite3
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .failure_clustering import FailureClusterer
+from .run_artifacts import RunArtifacts
+
+HISTORY_DB_FILENAME = 'run-history.db'
+SCHEMA_VERSION = 2
+DEFAULT_LAST_RUNS = 30
+# A test is flaky when it failed in some but not all recent runs and
+# switched between failing and passing at least this many times
+FLAKY_MIN_FLIPS = 2
+
+_SOURCE_FILES = ('analysis-results.json', 'core-data.json', 'core-data.pack')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    job TEXT,
+    build INTEGER,
+    build_result TEXT,
+    jenkins_url TEXT,
+    timestamp TEXT,
+    total_tests INTEGER,
+    failed_count INTEGER,
+    source_mtime_ns INTEGER,
+    ingested_at TEXT,
+    removed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS test_failures (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    test_name TEXT NOT NULL,
+    feature_area TEXT,
+    failure_type TEXT,
+    fingerprint TEXT,
+    classification TEXT,
+    confidence REAL,
+    build INTEGER,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_job_time ON runs(job, timestamp);
+CREATE INDEX IF NOT EXISTS idx_failures_test ON test_failures(test_name, run_id);
+CREATE INDEX IF NOT EXISTS idx_failures_fingerprint ON test_failures(fingerprint, run_id);
+CREATE INDEX IF NOT EXISTS idx_failures_run ON test_failures(run_id);
+"""
+
+
+@dataclass
+class FlakinessStats:
+    """Failure history of one test over a job's recent runs."""
+    test_name: str
+    runs_considered: int
+    failures: int
+    flips: int = 0                      # fail <-> pass changes, oldest to newest
+    fingerprints: int = 0               # distinct failure fingerprints
+    classifications: Dict[str, int] = field(default_factory=dict)
+    last_failed_run: Optional[str] = None
+
+    @property
+    def failure_rate(self) -> Optional[float]:
+        return self.failures / self.runs_considered if self.runs_considered else None
+
+    @property
+    def is_flaky(self) -> bool:
+        return 0 < self.failures < self.runs_considered and self.flips >= FLAKY_MIN_FLIPS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), 'failure_rate': self.failure_rate, 'is_flaky': self.is_flaky}
+
+
+@dataclass
+class FingerprintRecurrence:
+    """How often one failure fingerprint appeared in a job's recent runs."""
+    fingerprint: str
+    runs_considered: int
+    runs_failed: int
+    test_count: int = 0                 # distinct tests that failed this way
+    first_seen: Optional[str] = None    # run timestamps
+    last_seen: Optional[str] = None
+    classifications: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RunHistoryIndex:
+    """SQLite-backed history of test failures across runs."""
+
+    def __init__(self, runs_dir: Union[str, Path] = './runs', db_path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            runs_dir: Directory holding run directories
+            db_path: Database file (default: runs_dir/run-history.db)
+        """
+        self.runs_dir = Path(runs_dir)
+        self.db_path = Path(db_path) if db_path else self.runs_dir / HISTORY_DB_FILENAME
+        self.logger = logging.getLogger(__name__)
+        self._clusterer: Optional[FailureClusterer] = None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self._init_schema()
+
+    def _init_schema(self):
+        version = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            version = row['value'] if row else None
+        except sqlite3.OperationalError:
+            pass
+        if version is not None and version != str(SCHEMA_VERSION):
+            # Derived data only - rebuild from the run directories
+            self.logger.info(f"Run history schema {version} is outdated, rebuilding")
+            self.conn.executescript(
+                'DROP TABLE IF EXISTS test_failures; DROP TABLE IF EXISTS runs; DROP TABLE IF EXISTS meta;'
+            )
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+            )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'RunHistoryIndex':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- ingestion ----------------------------------------------------------
+
+    @staticmethod
+    def _source_mtime_ns(run_dir: Path) -> Optional[int]:
+        """Latest mtime of the run's source files; None if the run is not complete."""
+        mtimes = []
+        for name in _SOURCE_FILES:
+            try:
+                mtimes.append((run_dir / name).stat().st_mtime_ns)
+            except OSError:
+                if name == 'analysis-results.json':
+                    return None
+        return max(mtimes)
+
+    def refresh(self) -> int:
+        """
+        Ingest new or changed runs and mark deleted ones as removed.
+
+        Returns:
+            Number of runs (re)ingested
+        """
+        if not self.runs_dir.exists():
+            return 0
+        known = {
+            row['run_id']: (row['source_mtime_ns'], row['removed_at'])
+            for row in self.conn.execute('SELECT run_id, source_mtime_ns, removed_at FROM runs')
+        }
+        ingested = 0
+        present = set()
+        for run_dir in self.runs_dir.iterdir():
+            if not run_dir.is_dir():
+                continue
+            mtime_ns = self._source_mtime_ns(run_dir)
+            if mtime_ns is None:
+                continue
+            present.add(run_dir.name)
+            mtime_known, _ = known.get(run_dir.name, (None, None))
+            if mtime_known != mtime_ns and self.ingest_run(run_dir, mtime_ns=mtime_ns):
+                ingested += 1
+        removed = [r for r, (_, removed_at) in known.items() if r not in present and removed_at is None]
+        restored = [r for r, (_, removed_at) in known.items() if r in present and removed_at is not None]
+        if removed or restored:
+            with self.conn:
+                self.conn.executemany('UPDATE runs SET removed_at = ? WHERE run_id = ?',
+                                      [(datetime.now().isoformat(), r) for r in removed])
+                self.conn.executemany('UPDATE runs SET removed_at = NULL WHERE run_id = ?',
+                                      [(r,) for r in restored])
+        if ingested or removed:
+            self.logger.info(f"Run history: ingested {ingested} run(s), {len(removed)} marked removed")
+        return ingested
+
+    def removed_runs(self) -> List[str]:
+        """Run ids whose directories were deleted but whose history is kept."""
+        return [row['run_id'] for row in self.conn.execute(
+            'SELECT run_id FROM runs WHERE removed_at IS NOT NULL ORDER BY timestamp'
+        )]
+
+    def forget_removed(self) -> int:
+        """
+        Drop the history of runs whose directories were deleted.
+
+        Call refresh() first so recent deletions are known.
+
+        Returns:
+            Number of runs forgotten
+        """
+        with self.conn:
+            cursor = self.conn.execute('DELETE FROM runs WHERE removed_at IS NOT NULL')
+        if cursor.rowcount:
+            self.logger.info(f"Run history: forgot {cursor.rowcount} removed run(s)")
+        return cursor.rowcount
+
+    def ingest_run(self, run_dir: Union[str, Path], mtime_ns: Optional[int] = None) -> bool:
+        """
+        Add (or replace) one completed run.
+
+        Returns:
+            False if the run has no analysis-results.json or cannot be read
+        """
+        run_dir = Path(run_dir)
+        if mtime_ns is None:
+            mtime_ns = self._source_mtime_ns(run_dir)
+            if mtime_ns is None:
+                return False
+        try:
+            analysis = json.loads((run_dir / 'analysis-results.json').read_text())
+            core = RunArtifacts(run_dir).load('metadata', 'jenkins', 'test_report') or {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not ingest run {run_dir.name}: {e}")
+            return False
+
+        run = self._run_row(run_dir, analysis, core, mtime_ns)
+        failures = [
+            (run['run_id'], *row, run['build'], run['timestamp'])
+            for row in self._failure_rows(analysis, core)
+        ]
+        run['failed_count'] = run['failed_count'] or len(failures)
+        with self.conn:
+            self.conn.execute('DELETE FROM runs WHERE run_id = ?', (run['run_id'],))
+            self.conn.execute(
+                f"INSERT INTO runs ({', '.join(run)}) VALUES ({', '.join('?' * len(run))})",
+                list(run.values()),
+            )
+            self.conn.executemany(
+                'INSERT INTO test_failures (run_id, test_name, feature_area, failure_type, fingerprint, '
+                'classification, confidence, build, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                failures,
+            )
+        return True
+
+    @staticmethod
+    def _run_row(run_dir: Path, analysis: Dict[str, Any], core: Dict[str, Any], mtime_ns: int) -> Dict[str, Any]:
+        meta = analysis.get('analysis_metadata', {})
+        jenkins = core.get('jenkins', {})
+        core_meta = core.get('metadata', {})
+        summary = core.get('test_report', {}).get('summary', {})
+        jenkins_url = core_meta.get('jenkins_url') or meta.get('jenkins_url') or ''
+        job = jenkins.get('job_name')
+        build = _int_or_none(jenkins.get('build_number'))
+        if not job and '/job/' in jenkins_url:
+            # .../job/<folder>/job/<pipeline>/<build>/
+            job = jenkins_url.split('/job/')[-1].split('/')[0]
+            build = build or _int_or_none(jenkins_url.rstrip('/').rsplit('/', 1)[-1])
+        timestamp = (
+            core_meta.get('gathered_at') or meta.get('analyzed_at')
+            or datetime.fromtimestamp(mtime_ns / 1e9).isoformat()
+        )
+        return {
+            'run_id': run_dir.name,
+            'job': job,
+            'build': build,
+            'build_result': jenkins.get('build_result') or meta.get('build_result'),
+            'jenkins_url': jenkins_url,
+            'timestamp': timestamp,
+            'total_tests': summary.get('total_tests'),
+            'failed_count': summary.get('failed_count'),
+            'source_mtime_ns': mtime_ns,
+            'ingested_at': datetime.now().isoformat(),
+        }
+
+    def _failure_rows(self, analysis: Dict[str, Any], core: Dict[str, Any]) -> List[Tuple]:
+        """(test_name, feature_area, failure_type, fingerprint, classification, confidence) per failed test."""
+        analyzed = {t.get('test_name'): t for t in analysis.get('per_test_analysis', []) if t.get('test_name')}
+        rows = []
+        seen = set()
+        for test in core.get('test_report', {}).get('failed_tests', []):
+            name = test.get('test_name')
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            fingerprint = test.get('failure_cluster') or self._fingerprint(test)
+            result = analyzed.get(name, {})
+            rows.append((
+                name, result.get('feature_area'), test.get('failure_type'), fingerprint,
+                result.get('classification'), result.get('confidence'),
+            ))
+        # Analyzed tests missing from core-data (legacy runs)
+        for name, result in analyzed.items():
+            if name not in seen:
+                rows.append((
+                    name, result.get('feature_area'), result.get('failure_type'), None,
+                    result.get('classification'), result.get('confidence'),
+                ))
+        return rows
+
+    def _fingerprint(self, test: Dict[str, Any]) -> Optional[str]:
+        if not test.get('error_message') and not test.get('stack_trace'):
+            return None
+        if self._clusterer is None:
+            self._clusterer = FailureClusterer()
+        return self._clusterer.fingerprint(
+            test.get('error_message'), test.get('stack_trace'), test.get('failure_type')
+        )[0]
+
+    # -- queries ------------------------------------------------------------
+
+    def recent_runs(self, job: Optional[str] = None, last_runs: int = DEFAULT_LAST_RUNS,
+                    exclude_build: Optional[Union[int, str]] = None) -> List[str]:
+        """
+        Run ids of the last N builds (of one job), oldest first.
+
+        A build analyzed more than once counts once, through its newest run,
+        so re-runs of one build do not crowd older builds out of the window.
+
+        Args:
+            job: Jenkins job name (None: any job)
+            last_runs: Number of builds in the window
+            exclude_build: Build number to leave out (e.g. the one being analyzed)
+        """
+        where, params = [], []
+        exclude_build = _int_or_none(exclude_build)
+        if job is not None:
+            where.append('job = ?')
+            params.append(job)
+        if exclude_build is not None:
+            where.append('(build IS NULL OR build != ?)')
+            params.append(exclude_build)
+        rows = self.conn.execute(
+            'SELECT run_id FROM ('
+            '  SELECT run_id, timestamp, ROW_NUMBER() OVER ('
+            '    PARTITION BY job, COALESCE(build, run_id) ORDER BY timestamp DESC, run_id DESC'
+            '  ) AS newest FROM runs'
+            f'  {"WHERE " + " AND ".join(where) if where else ""}'
+            ') WHERE newest = 1 ORDER BY timestamp DESC, run_id DESC LIMIT ?',
+            (*params, last_runs),
+        )
+        return [row['run_id'] for row in rows][::-1]
+
+    def _set_window(self, run_ids: List[str]):
+        """Load run ids (with their position) into the temp table queries join on."""
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS window_runs (run_id TEXT PRIMARY KEY, pos INTEGER)')
+        self.conn.execute('DELETE FROM window_runs')
+        self.conn.executemany('INSERT INTO window_runs VALUES (?, ?)', [(r, i) for i, r in enumerate(run_ids)])
+
+    def _failures_in(self, column: str, values: List[str], run_ids: List[str]) -> List[sqlite3.Row]:
+        """Failure rows of the window runs whose column is one of values, oldest run first."""
+        if not values or not run_ids:
+            return []
+        self._set_window(run_ids)
+        rows = []
+        # Stay below SQLite's bound-parameter limit
+        for i in range(0, len(values), 500):
+            batch = values[i:i + 500]
+            rows.extend(self.conn.execute(
+                f'SELECT f.*, w.pos FROM test_failures f JOIN window_runs w ON w.run_id = f.run_id '
+                f'WHERE f.{column} IN ({", ".join("?" * len(batch))}) ORDER BY w.pos',
+                batch,
+            ))
+        return sorted(rows, key=lambda row: row['pos'])
+
+    def flakiness_many(
+        self,
+        test_names: Iterable[str],
+        job: Optional[str] = None,
+        last_runs: int = DEFAULT_LAST_RUNS,
+        exclude_build: Optional[Union[int, str]] = None,
+    ) -> Dict[str, FlakinessStats]:
+        """
+        Failure history of several tests over the last N runs of a job.
+
+        Args:
+            test_names: Tests to look up
+            job: Jenkins job name (None: last N runs of any job)
+            last_runs: Size of the run window
+            exclude_build: Build number left out of the window
+
+        Returns:
+            FlakinessStats per test name (tests that never failed included)
+        """
+        names = list(dict.fromkeys(test_names))
+        run_ids = self.recent_runs(job, last_runs, exclude_build)
+        positions: Dict[str, List[int]] = {name: [] for name in names}
+        stats = {name: FlakinessStats(test_name=name, runs_considered=len(run_ids), failures=0) for name in names}
+        fingerprints: Dict[str, set] = {name: set() for name in names}
+
+        for row in self._failures_in('test_name', names, run_ids):
+            name = row['test_name']
+            if positions[name] and positions[name][-1] == row['pos']:
+                continue
+            positions[name].append(row['pos'])
+            entry = stats[name]
+            entry.failures += 1
+            entry.last_failed_run = row['run_id']
+            if row['fingerprint']:
+                fingerprints[name].add(row['fingerprint'])
+            if row['classification']:
+                entry.classifications[row['classification']] = entry.classifications.get(row['classification'], 0) + 1
+
+        for name, entry in stats.items():
+            failed = set(positions[name])
+            states = [pos in failed for pos in range(len(run_ids))]
+            entry.flips = sum(1 for a, b in zip(states, states[1:]) if a != b)
+            entry.fingerprints = len(fingerprints[name])
+        return stats
+
+    def flakiness(self, test_name: str, job: Optional[str] = None,
+                  last_runs: int = DEFAULT_LAST_RUNS) -> FlakinessStats:
+        """Failure history of one test over the last N runs of a job."""
+        return self.flakiness_many([test_name], job, last_runs)[test_name]
+
+    def flaky_tests(self, job: Optional[str] = None, last_runs: int = DEFAULT_LAST_RUNS,
+                    min_failures: int = 2) -> List[FlakinessStats]:
+        """Flaky tests in the last N runs of a job, most flips first."""
+        run_ids = self.recent_runs(job, last_runs)
+        if not run_ids:
+            return []
+        self._set_window(run_ids)
+        names = [
+            row['test_name'] for row in self.conn.execute(
+                'SELECT f.test_name FROM test_failures f JOIN window_runs w ON w.run_id = f.run_id '
+                'GROUP BY f.test_name HAVING COUNT(DISTINCT f.run_id) >= ?',
+                (min_failures,),
+            )
+        ]
+        flaky = [s for s in self.flakiness_many(names, job, last_runs).values() if s.is_flaky]
+        return sorted(flaky, key=lambda s: (-s.flips, -s.failures, s.test_name))
+
+    def recurrence(self, fingerprint: str, job: Optional[str] = None,
+                   last_runs: int = DEFAULT_LAST_RUNS,
+                   exclude_build: Optional[Union[int, str]] = None) -> FingerprintRecurrence:
+        """How many of the last N runs of a job failed with this fingerprint."""
+        run_ids = self.recent_runs(job, last_runs, exclude_build)
+        result = FingerprintRecurrence(fingerprint=fingerprint, runs_considered=len(run_ids), runs_failed=0)
+        runs, tests = set(), set()
+        for row in self._failures_in('fingerprint', [fingerprint], run_ids):
+            if row['run_id'] not in runs:
+                runs.add(row['run_id'])
+                result.first_seen = result.first_seen or row['timestamp']
+                result.last_seen = row['timestamp']
+            tests.add(row['test_name'])
+            if row['classification']:
+                result.classifications[row['classification']] = result.classifications.get(row['classification'], 0) + 1
+        result.runs_failed = len(runs)
+        result.test_count = len(tests)
+        return result
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Run Storage Manager
+
+Keeps runs/ within bounds. Run directories hold full repository clones
+(repos/automation, repos/console, repos/kubevirt-plugin) and console logs,
+and nothing removes them except the per-run repos/ cleanup in Stage 3.
+
+Retention policies, each optional:
+
+- keep_last:       keep only the newest N runs of each job
+- max_age_days:    delete runs older than this
+- repos_keep_last: keep repos/ only in the newest N runs of each job
+- max_bytes:       after everything else, delete the oldest runs until
+                   runs/ fits the budget (the newest run of a job is kept)
+
+Deduplication hard-links identical large files (console-log.txt of
+re-analyzed builds, unchanged repository files and git packs) to one copy
+in a content-addressed store, runs/.blobs/<sha256[:2]>/<sha256>.<mode>.
+Files are grouped by size first, so only files that could have a twin are
+hashed, and files already linked to the store cost one stat. Blobs no run
+links to any more are removed by collect_garbage().
+
+Only console-log.txt and repos/ are deduplicated. They are written once
+during Stage 1, and git replaces files rather than rewriting them in place,
+so sharing an inode is safe. JSON artifacts are never linked.
+
+Runs touched within the last ACTIVE_GRACE_SECONDS are treated as in
+progress and left alone.
+
+Usage:
+    manager = RunStorageManager('./runs', dry_run=True)
+    report = manager.apply(keep_last=10, repos_keep_last=2, dedup=True,
+                           max_bytes=200 * 1024**3)
+    print(report.bytes_reclaimed)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from stat import S_ISREG
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+STORE_DIRNAME = '.blobs'
+# A subdirectory of runs/ is a run directory if it holds any of these
+RUN_MARKERS = ('run-metadata.json', 'manifest.json', 'core-data.json', 'core-data.pack',
+               'analysis-results.json')
+DEDUP_TARGETS = ('console-log.txt', 'repos')
+DEFAULT_DEDUP_MIN_BYTES = 16 * 1024
+ACTIVE_GRACE_SECONDS = 3600
+
+# {YYYY-MM-DD}_{HH-MM-SS}_{job_name}, as created by DataGatherer
+_RUN_NAME = re.compile(r'^(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})_(.+)$')
+_SIZE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024**2, 'G': 1024**3, 'T': 1024**4}
+
+
+def parse_size(value: str) -> int:
+    """'500M', '1.5G', '2T' or a plain byte count, as bytes."""
+    match = _SIZE.match(value)
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    """Human-readable byte count (binary units)."""
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def _disk_bytes(stat: os.stat_result) -> int:
+    return stat.st_blocks * 512 if hasattr(stat, 'st_blocks') else stat.st_size
+
+
+@dataclass
+class RunInfo:
+    """A run directory with the job and start time parsed from its name."""
+    name: str
+    path: Path
+    job: str
+    started: float          # epoch seconds
+    active: bool = False    # modified within ACTIVE_GRACE_SECONDS
+
+
+@dataclass
+class StorageReport:
+    """What a storage pass did (or would do, in a dry run)."""
+    dry_run: bool = False
+    runs_deleted: List[str] = field(default_factory=list)
+    repos_pruned: List[str] = field(default_factory=list)
+    files_deduplicated: int = 0
+    bytes_deduplicated: int = 0
+    blobs_collected: int = 0
+    bytes_reclaimed: int = 0        # total, including deduplication
+    usage_before: int = 0
+    usage_after: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class RunStorageManager:
+    """Retention and deduplication for a runs/ directory."""
+
+    def __init__(self, runs_dir: Union[str, Path] = './runs', dry_run: bool = False):
+        self.runs_dir = Path(runs_dir)
+        self.store_dir = self.runs_dir / STORE_DIRNAME
+        self.dry_run = dry_run
+        self.logger = logging.getLogger(__name__)
+
+    # -- discovery ----------------------------------------------------------
+
+    def runs(self, now: Optional[float] = None) -> List[RunInfo]:
+        """Run directories, oldest first."""
+        now = time.time() if now is None else now
+        runs = []
+        if not self.runs_dir.is_dir():
+            return runs
+        for path in self.runs_dir.iterdir():
+            if path.name.startswith('.') or not path.is_dir() or path.is_symlink():
+                continue
+            if not any((path / marker).exists() for marker in RUN_MARKERS):
+                continue
+            match = _RUN_NAME.match(path.name)
+            if match:
+                started = datetime.strptime(match.group(1), '%Y-%m-%d_%H-%M-%S').timestamp()
+                job = match.group(2)
+            else:
+                started, job = path.stat().st_mtime, path.name
+            runs.append(RunInfo(path.name, path, job, started,
+                                active=now - self._last_modified(path) < ACTIVE_GRACE_SECONDS))
+        return sorted(runs, key=lambda r: (r.started, r.name))
+
+    @staticmethod
+    def _last_modified(path: Path) -> float:
+        """
+        Newest mtime of the files directly in a run directory.
+
+        Directory mtimes are not used: deduplication replaces files, which
+        touches their directories but not the files' own mtimes.
+        """
+        latest = 0.0
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        latest = max(latest, entry.stat(follow_symlinks=False).st_mtime)
+                except OSError:
+                    continue
+        return latest
+
+    def _remaining_runs(self, report: StorageReport, now: Optional[float] = None) -> List[RunInfo]:
+        """Runs not deleted by an earlier step (in a dry run they are still on disk)."""
+        return [run for run in self.runs(now) if run.name not in report.runs_deleted]
+
+    @staticmethod
+    def _by_job(runs: List[RunInfo]) -> Dict[str, List[RunInfo]]:
+        """Runs grouped by job, newest first."""
+        jobs = defaultdict(list)
+        for run in reversed(runs):
+            jobs[run.job].append(run)
+        return jobs
+
+    # -- sizes --------------------------------------------------------------
+
+    @staticmethod
+    def _walk_files(root: Path) -> Iterator[Tuple[Path, os.stat_result]]:
+        """Regular files under root (or root itself), without following symlinks."""
+        paths = [root] if not root.is_dir() else (
+            Path(dirpath) / name for dirpath, _, names in os.walk(root) for name in names
+        )
+        for path in paths:
+            try:
+                stat = os.lstat(path)
+            except OSError:
+                continue
+            if S_ISREG(stat.st_mode):
+                yield path, stat
+
+    def disk_usage(self, root: Optional[Path] = None) -> int:
+        """Bytes on disk under root (default runs/), counting hard-linked files once."""
+        seen: Set[Tuple[int, int]] = set()
+        total = 0
+        for _, stat in self._walk_files(root or self.runs_dir):
+            key = (stat.st_dev, stat.st_ino)
+            if key not in seen:
+                seen.add(key)
+                total += _disk_bytes(stat)
+        return total
+
+    def _store_inodes(self) -> Set[Tuple[int, int]]:
+        return {(stat.st_dev, stat.st_ino) for _, stat in self._walk_files(self.store_dir)}
+
+    def exclusive_size(self, root: Path, store_inodes: Optional[Set[Tuple[int, int]]] = None) -> int:
+        """
+        Bytes freed by deleting root (after garbage collection).
+
+        Counts files no other run links to: single-link files, and files
+        whose only other link is their blob in the store.
+        """
+        store_inodes = self._store_inodes() if store_inodes is None else store_inodes
+        total = 0
+        for _, stat in self._walk_files(root):
+            in_store = (stat.st_dev, stat.st_ino) in store_inodes
+            if stat.st_nlink == 1 or (stat.st_nlink == 2 and in_store):
+                total += _disk_bytes(stat)
+        return total
+
+    # -- retention ----------------------------------------------------------
+
+    def plan_retention(self, keep_last: Optional[int] = None, max_age_days: Optional[float] = None,
+                       now: Optional[float] = None) -> List[RunInfo]:
+        """Runs that keep_last / max_age_days would delete, oldest first."""
+        now = time.time() if now is None else now
+        runs = self.runs(now)
+        doomed = set()
+        if keep_last is not None:
+            for job_runs in self._by_job(runs).values():
+                doomed.update(run.name for run in job_runs[keep_last:])
+        if max_age_days is not None:
+            cutoff = now - max_age_days * 86400
+            doomed.update(run.name for run in runs if run.started < cutoff)
+        return [run for run in runs if run.name in doomed and not run.active]
+
+    def _delete(self, path: Path, report: StorageReport, store_inodes: Set[Tuple[int, int]]) -> int:
+        """Remove a run or its repos/; returns the bytes this frees."""
+        freed = self.exclusive_size(path, store_inodes)
+        if not self.dry_run:
+            shutil.rmtree(path)
+        report.bytes_reclaimed += freed
+        return freed
+
+    def prune_repos(self, keep_last: int, report: StorageReport, now: Optional[float] = None):
+        """Remove repos/ from all but the newest keep_last runs of each job."""
+        store_inodes = self._store_inodes()
+        for job_runs in self._by_job(self._remaining_runs(report, now)).values():
+            for run in job_runs[keep_last:]:
+                repos = run.path / 'repos'
+                if run.active or not repos.is_dir():
+                    continue
+                self._delete(repos, report, store_inodes)
+                report.repos_pruned.append(run.name)
+
+    def enforce_budget(self, max_bytes: int, report: StorageReport, now: Optional[float] = None):
+        """Delete the oldest runs until runs/ fits max_bytes; the newest run of each job is kept."""
+        if self.dry_run:
+            # Nothing was removed yet; start from what earlier steps would free
+            usage = report.usage_before - report.bytes_reclaimed
+        else:
+            usage = self.disk_usage()
+        runs = self._remaining_runs(report, now)
+        newest = {job_runs[0].name for job_runs in self._by_job(runs).values()}
+        store_inodes = self._store_inodes()
+        for run in runs:
+            if usage <= max_bytes:
+                break
+            if run.active or run.name in newest:
+                continue
+            usage -= self._delete(run.path, report, store_inodes)
+            report.runs_deleted.append(run.name)
+        if usage > max_bytes:
+            self.logger.warning(
+                f"runs/ is {format_size(usage)} after pruning, over the {format_size(max_bytes)} budget"
+            )
+
+    # -- deduplication ------------------------------------------------------
+
+    def _blob_path(self, digest: str, mode: int) -> Path:
+        return self.store_dir / digest[:2] / f"{digest}.{mode:o}"
+
+    @staticmethod
+    def _hash(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def deduplicate(self, report: StorageReport, min_bytes: int = DEFAULT_DEDUP_MIN_BYTES,
+                    now: Optional[float] = None):
+        """Hard-link identical console logs and repository files to one stored copy."""
+        store_sizes: Set[int] = set()
+        store_inodes: Set[Tuple[int, int]] = set()
+        for _, stat in self._walk_files(self.store_dir):
+            store_sizes.add(stat.st_size)
+            store_inodes.add((stat.st_dev, stat.st_ino))
+
+        by_size: Dict[int, List[Tuple[Path, os.stat_result]]] = defaultdict(list)
+        for run in self._remaining_runs(report, now):
+            if run.active:
+                continue
+            for target in DEDUP_TARGETS:
+                if target == 'repos' and run.name in report.repos_pruned:
+                    continue
+                if not (run.path / target).exists():
+                    continue
+                for path, stat in self._walk_files(run.path / target):
+                    if stat.st_size >= min_bytes and (stat.st_dev, stat.st_ino) not in store_inodes:
+                        by_size[stat.st_size].append((path, stat))
+
+        for size, files in by_size.items():
+            if len(files) < 2 and size not in store_sizes:
+                continue
+            groups = defaultdict(list)
+            for path, stat in files:
+                try:
+                    groups[(self._hash(path), stat.st_mode & 0o7777)].append((path, stat))
+                except OSError as e:
+                    self.logger.warning(f"Could not hash {path}: {e}")
+            for (digest, mode), group in groups.items():
+                self._link_group(self._blob_path(digest, mode), group, report)
+
+    def _link_group(self, blob: Path, group: List[Tuple[Path, os.stat_result]], report: StorageReport):
+        if not blob.exists():
+            if len(group) < 2:
+                return
+            # The first copy becomes the stored blob; the rest link to it
+            path, _ = group.pop(0)
+            if not self.dry_run:
+                try:
+                    blob.parent.mkdir(parents=True, exist_ok=True)
+                    os.link(path, blob)
+                except OSError as e:
+                    self.logger.warning(f"Could not store {path}: {e}")
+                    return
+        for path, stat in group:
+            if stat.st_nlink == 1:
+                report.bytes_deduplicated += _disk_bytes(stat)
+            report.files_deduplicated += 1
+            if self.dry_run:
+                continue
+            tmp = path.with_name(f".{path.name}.dedup")
+            try:
+                os.link(blob, tmp)
+                os.replace(tmp, path)
+            except OSError as e:
+                self.logger.warning(f"Could not link {path} to {blob.name}: {e}")
+                tmp.unlink(missing_ok=True)
+
+    def collect_garbage(self, report: StorageReport):
+        """Remove stored blobs that no run links to any more."""
+        if not self.store_dir.is_dir():
+            return
+        for path, stat in list(self._walk_files(self.store_dir)):
+            if stat.st_nlink > 1:
+                continue
+            report.blobs_collected += 1
+            report.bytes_reclaimed += _disk_bytes(stat)
+            if not self.dry_run:
+                path.unlink()
+        if not self.dry_run:
+            for prefix in self.store_dir.iterdir():
+                if prefix.is_dir() and not any(prefix.iterdir()):
+                    prefix.rmdir()
+
+    # -- all policies -------------------------------------------------------
+
+    def apply(self, keep_last: Optional[int] = None, max_age_days: Optional[float] = None,
+              repos_keep_last: Optional[int] = None, dedup: bool = False,
+              min_dedup_bytes: int = DEFAULT_DEDUP_MIN_BYTES,
+              max_bytes: Optional[int] = None, now: Optional[float] = None) -> StorageReport:
+        """
+        Apply the given policies in order: retention, repos/ pruning,
+        deduplication, garbage collection, then the size budget.
+
+        In a dry run bytes_reclaimed is an estimate; otherwise it is the
+        measured drop in disk usage.
+        """
+        report = StorageReport(dry_run=self.dry_run, usage_before=self.disk_usage())
+
+        store_inodes = self._store_inodes()
+        for run in self.plan_retention(keep_last, max_age_days, now):
+            self._delete(run.path, report, store_inodes)
+            report.runs_deleted.append(run.name)
+        if repos_keep_last is not None:
+            self.prune_repos(repos_keep_last, report, now)
+        if dedup:
+            self.deduplicate(report, min_dedup_bytes, now)
+            report.bytes_reclaimed += report.bytes_deduplicated
+        self.collect_garbage(report)
+        if max_bytes is not None:
+            self.enforce_budget(max_bytes, report, now)
+            self.collect_garbage(report)
+
+        if self.dry_run:
+            report.usage_after = max(0, report.usage_before - report.bytes_reclaimed)
+        else:
+            report.usage_after = self.disk_usage()
+            report.bytes_reclaimed = report.usage_before - report.usage_after
+        return report
@@ -9,9 +9,15 @@ import base64
 import json
 import logging
 import os
+import re
+import signal
 import subprocess
+import threading
 from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, TextIO, Tuple
+
+from .perf_tracing import command_label, traced_run, span
 
 
 # =============================================================================
@@ -149,6 +155,9 @@ class ThresholdConfig:
     MAX_SELECTORS_PER_FILE: int = 50        # Max selectors to extract per file
     GIT_SHALLOW_CLONE_DEPTH: int = 500      # Depth for shallow clones (500 for better history coverage)
 
+    # Per-test failure processing (mass-failure runs)
+    MAX_TEST_FILE_READERS: int = 8          # Threads for reading distinct test files
+
 
 # Global thresholds instance
 THRESHOLDS = ThresholdConfig()
@@ -181,7 +190,7 @@ def run_subprocess(
     logger = logging.getLogger(__name__)
 
     try:
-        result = subprocess.run(
+        result = traced_run(
             cmd,
             capture_output=capture_output,
             text=True,
@@ -204,6 +213,99 @@ def run_subprocess(
         return False, "", str(e)
 
 
+def stream_subprocess_output(
+    cmd: List[str],
+    consumer: Callable[[TextIO], Any],
+    timeout: int = 60,
+) -> Tuple[bool, Any, str]:
+    """
+    Execute a command and hand its stdout to consumer as a text stream.
+
+    Unlike run_subprocess, the output is never held in memory as one string,
+    so consumers can parse multi-MB responses incrementally.
+
+    Args:
+        cmd: Command and arguments as list
+        consumer: Called with the stdout stream; its return value is passed back
+        timeout: Kill the process after this many seconds
+
+    Returns:
+        Tuple of (success, consumer_result, error_message)
+    """
+    with span(command_label(cmd), kind='subprocess', streamed=True) as s:
+        success, result, error = _stream_subprocess(cmd, consumer, timeout)
+        s.status = 'ok' if success else 'error'
+        return success, result, error
+
+
+def _stream_subprocess(
+    cmd: List[str],
+    consumer: Callable[[TextIO], Any],
+    timeout: int,
+) -> Tuple[bool, Any, str]:
+    logger = logging.getLogger(__name__)
+
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace',
+        )
+    except FileNotFoundError:
+        logger.error(f"Command not found: {cmd[0]}")
+        return False, None, f"Command not found: {cmd[0]}"
+
+    # stderr is drained on its own thread: a child that fills the stderr pipe
+    # while we are still reading stdout would otherwise block forever.
+    stderr_chunks: List[str] = []
+    drain = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+    drain.start()
+
+    timed_out = threading.Event()
+
+    def on_timeout():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, on_timeout)
+    timer.start()
+    try:
+        try:
+            result = consumer(proc.stdout)
+            # Discard whatever the consumer left unread so the child can exit
+            while proc.stdout.read(65536):
+                pass
+        except Exception as e:
+            proc.kill()
+            if timed_out.is_set():
+                # The consumer hit a truncated stream because the timer killed the child
+                return False, None, f"Timeout after {timeout} seconds"
+            return False, None, str(e)
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        drain.join()
+        proc.stdout.close()
+        proc.stderr.close()
+
+    if timed_out.is_set():
+        return False, None, f"Timeout after {timeout} seconds"
+    if returncode < 0:
+        try:
+            name = signal.Signals(-returncode).name
+        except ValueError:
+            name = f"signal {-returncode}"
+        return False, None, f"killed by {name}"
+    if returncode != 0:
+        return False, None, f"exit code {returncode}: {''.join(stderr_chunks)}"
+    return True, result, ''
+
+
 def build_curl_command(
     url: str,
     username: Optional[str] = None,
@@ -493,43 +595,246 @@ def mask_sensitive_value(value: str, visible_chars: int = 3) -> str:
     return f"{value[:visible_chars]}***MASKED***"
 
 
+class SensitiveDataMasker:
+    """
+    Single-pass credential masking for gathered data.
+
+    The key patterns are compiled into one regex, and the decision for each
+    distinct key is memoized, since the same keys repeat across every test,
+    parameter and artifact entry.
+
+    mask() copies only the containers on the path to a masked value.
+    Unchanged subtrees are shared with the input, so masking does not
+    duplicate the tree. To write files without any copy, serialize with
+    MaskingJSONEncoder, which masks values as they are encoded.
+
+    Values under a sensitive key are masked: strings keep their first
+    characters, dicts are masked recursively and anything else is replaced.
+    Lists are descended into at any depth, including lists of lists.
+
+    With scan_values=True, strings under any key are also scanned for
+    inline credentials such as "password=...", "token: ..." or
+    "Bearer ...". This is off by default because it also matches prose
+    such as "secret: my-secret".
+    """
+
+    def __init__(self, patterns: Optional[List[str]] = None, scan_values: bool = False,
+                 key_cache_size: int = 4096):
+        self.patterns = tuple(p.lower() for p in (SENSITIVE_PATTERNS if patterns is None else patterns))
+        self.scan_values = scan_values
+        alternation = '|'.join(re.escape(p) for p in self.patterns)
+        self._key_re = re.compile(alternation, re.IGNORECASE) if self.patterns else None
+        self._value_re = re.compile(
+            rf'([\w.-]*(?:{alternation})[\w.-]*["\']?\s*[=:]\s*["\']?)([^\s"\'&,;]+)'
+            r'|(\bbearer\s+)([^\s"\'&,;]+)',
+            re.IGNORECASE,
+        ) if self.patterns else None
+        self.is_sensitive_key = lru_cache(maxsize=key_cache_size)(self._match_key)
+
+    def _match_key(self, key: Any) -> bool:
+        """True if the key contains any sensitive pattern."""
+        return bool(self._key_re and isinstance(key, str) and self._key_re.search(key))
+
+    @staticmethod
+    def _mask_match(match: 're.Match') -> str:
+        if match.group(1) is not None:
+            return match.group(1) + mask_sensitive_value(match.group(2))
+        return match.group(3) + mask_sensitive_value(match.group(4))
+
+    def mask_string(self, value: str) -> str:
+        """Mask inline credentials in a string; returns value itself if none are found."""
+        if not self._value_re:
+            return value
+        masked, count = self._value_re.subn(self._mask_match, value)
+        return masked if count else value
+
+    def mask_sensitive(self, value: Any) -> Any:
+        """Masked form of a value stored under a sensitive key."""
+        if isinstance(value, str):
+            return mask_sensitive_value(value)
+        if isinstance(value, dict):
+            return self.mask(value)
+        return '***MASKED***'
+
+    def mask(self, data: Any) -> Any:
+        """
+        Masked view of data.
+
+        Returns data itself when nothing below it needs masking; otherwise
+        new containers on the path to each masked value, sharing the rest.
+        """
+        if isinstance(data, dict):
+            result = None
+            for key, value in data.items():
+                new = self.mask_sensitive(value) if self.is_sensitive_key(key) else self.mask(value)
+                if new is not value:
+                    if result is None:
+                        result = dict(data)
+                    result[key] = new
+            return data if result is None else result
+        if isinstance(data, (list, tuple)):
+            result = None
+            for i, item in enumerate(data):
+                new = self.mask(item)
+                if new is not item:
+                    if result is None:
+                        result = list(data)
+                    result[i] = new
+            return data if result is None else result
+        if self.scan_values and isinstance(data, str):
+            return self.mask_string(data)
+        return data
+
+
+@lru_cache(maxsize=None)
+def _cached_masker(patterns: Optional[Tuple[str, ...]], scan_values: bool) -> SensitiveDataMasker:
+    return SensitiveDataMasker(list(patterns) if patterns is not None else None, scan_values)
+
+
+def get_masker(patterns: Optional[List[str]] = None, scan_values: bool = False) -> SensitiveDataMasker:
+    """Shared masker for a pattern list, so memoized key decisions are reused across calls."""
+    return _cached_masker(tuple(patterns) if patterns is not None else None, scan_values)
+
+
+class MaskingJSONEncoder(json.JSONEncoder):
+    """
+    JSON encoder that masks sensitive data while serializing.
+
+        json.dump(data, f, cls=MaskingJSONEncoder, masker=masker, indent=2, default=str)
+
+    The output is the same as encoding masker.mask(data), but no masked copy
+    of the tree is built. Chunks are produced lazily, so json.dump streams
+    them to the file. This is a pure-Python encoder, which is what json
+    uses anyway whenever indent is set. Circular references are not
+    detected.
+    """
+
+    def __init__(self, *args, masker: Optional[SensitiveDataMasker] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.masker = masker or get_masker()
+
+    def _float(self, value: float) -> str:
+        if value != value:
+            text = 'NaN'
+        elif value in (float('inf'), float('-inf')):
+            text = 'Infinity' if value > 0 else '-Infinity'
+        else:
+            return float.__repr__(value)
+        if not self.allow_nan:
+            raise ValueError(f"Out of range float values are not JSON compliant: {value!r}")
+        return text
+
+    def _key(self, key: Any) -> Optional[str]:
+        if isinstance(key, str):
+            return key
+        if isinstance(key, float):
+            return self._float(key)
+        if key is True:
+            return 'true'
+        if key is False:
+            return 'false'
+        if key is None:
+            return 'null'
+        if isinstance(key, int):
+            return int.__repr__(key)
+        if self.skipkeys:
+            return None
+        raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
+    def iterencode(self, o: Any, _one_shot: bool = False):
+        masker = self.masker
+        encode_str = json.encoder.encode_basestring_ascii if self.ensure_ascii else json.encoder.encode_basestring
+        indent = ' ' * self.indent if isinstance(self.indent, int) else self.indent
+        item_separator, key_separator = self.item_separator, self.key_separator
+
+        def opening(bracket: str, level: int) -> Tuple[str, str, int]:
+            if indent is None:
+                return bracket, item_separator, level
+            level += 1
+            newline = '\n' + indent * level
+            return bracket + newline, item_separator + newline, level
+
+        def encode(value: Any, level: int):
+            if isinstance(value, str):
+                yield encode_str(masker.mask_string(value) if masker.scan_values else value)
+            elif value is None:
+                yield 'null'
+            elif value is True:
+                yield 'true'
+            elif value is False:
+                yield 'false'
+            elif isinstance(value, int):
+                yield int.__repr__(value)
+            elif isinstance(value, float):
+                yield self._float(value)
+            elif isinstance(value, dict):
+                yield from encode_dict(value, level)
+            elif isinstance(value, (list, tuple)):
+                yield from encode_list(value, level)
+            else:
+                yield from encode(self.default(value), level)
+
+        def encode_list(values, level: int):
+            if not values:
+                yield '[]'
+                return
+            start, separator, inner = opening('[', level)
+            yield start
+            for i, value in enumerate(values):
+                if i:
+                    yield separator
+                yield from encode(value, inner)
+            if indent is not None:
+                yield '\n' + indent * level
+            yield ']'
+
+        def encode_dict(data, level: int):
+            if not data:
+                yield '{}'
+                return
+            start, separator, inner = opening('{', level)
+            yield start
+            items = sorted(data.items()) if self.sort_keys else data.items()
+            first = True
+            for key, value in items:
+                text = self._key(key)
+                if text is None:
+                    continue
+                if not first:
+                    yield separator
+                first = False
+                yield encode_str(text)
+                yield key_separator
+                if masker.is_sensitive_key(key) and not isinstance(value, dict):
+                    # Dicts are masked key by key as they are encoded
+                    yield encode_str(masker.mask_sensitive(value))
+                else:
+                    yield from encode(value, inner)
+            if indent is not None:
+                yield '\n' + indent * level
+            yield '}'
+
+        return encode(o, 0)
+
+
 def mask_sensitive_dict(
     data: Dict[str, Any],
     patterns: Optional[List[str]] = None,
+    scan_values: bool = False,
 ) -> Dict[str, Any]:
     """
     Recursively mask sensitive values in a dictionary.
 
+    Unchanged subtrees are shared with data rather than copied (see
+    SensitiveDataMasker). To mask while writing a file, use
+    MaskingJSONEncoder instead.
+
     Args:
         data: Dictionary to process
         patterns: Sensitive key patterns (default: SENSITIVE_PATTERNS)
+        scan_values: Also mask inline credentials inside string values
 
     Returns:
         Dictionary with masked values
     """
-    if patterns is None:
-        patterns = SENSITIVE_PATTERNS
-
-    result = {}
-    for key, value in data.items():
-        key_lower = key.lower()
-
-        if any(p in key_lower for p in patterns):
-            if isinstance(value, str):
-                result[key] = mask_sensitive_value(value)
-            elif isinstance(value, dict):
-                result[key] = mask_sensitive_dict(value, patterns)
-            else:
-                result[key] = '***MASKED***'
-        elif isinstance(value, dict):
-            result[key] = mask_sensitive_dict(value, patterns)
-        elif isinstance(value, list):
-            result[key] = [
-                mask_sensitive_dict(item, patterns) if isinstance(item, dict)
-                else item
-                for item in value
-            ]
-        else:
-            result[key] = value
-
-    return result
+    return get_masker(patterns, scan_values).mask(data)
@@ -10,12 +10,22 @@ Handles various stack trace formats:
 - Node.js standard: at Context.eval (/path/file.js:123:45)
 - Anonymous functions: at Object.<anonymous> (file.js:10:5)
 - Async/await: at async Context.eval (file.ts:50:3)
+
+Parsing is memoized: whole traces in a bounded LRU keyed by a hash of the
+trace, and individual lines in a second LRU, so the node_modules/Cypress frames
+shared by most failures are matched once. Frames are immutable and share
+interned file paths and function names, so cached results are safe to reuse.
 """
 
+import hashlib
 import logging
 import re
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 
 # Import shared utilities to avoid code duplication
 from .shared_utils import (
@@ -25,9 +35,22 @@ from .shared_utils import (
 )
 
 
-@dataclass
+TRACE_CACHE_SIZE = 2048    # parsed traces kept per parser
+LINE_CACHE_SIZE = 16384    # parsed lines kept per parser
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=4096)
+def _classify_path(file_path: str) -> Tuple[bool, bool, bool]:
+    """(is_test_file, is_framework_file, is_support_file) for a path."""
+    # Use centralized pattern detection from shared_utils
+    return _is_test_file(file_path), _is_framework_file(file_path), _is_support_file(file_path)
+
+
+@dataclass(frozen=True, slots=True)
 class StackFrame:
-    """Represents a single frame in a stack trace."""
+    """Represents a single frame in a stack trace (immutable; shared by the parse caches)."""
     file_path: str
     line_number: int
     column_number: Optional[int] = None
@@ -39,10 +62,10 @@ class StackFrame:
 
     def __post_init__(self):
         """Determine file type after initialization using shared utilities."""
-        # Use centralized pattern detection from shared_utils
-        self.is_test_file = _is_test_file(self.file_path)
-        self.is_framework_file = _is_framework_file(self.file_path)
-        self.is_support_file = _is_support_file(self.file_path)
+        is_test, is_framework, is_support = _classify_path(self.file_path)
+        object.__setattr__(self, 'is_test_file', is_test)
+        object.__setattr__(self, 'is_framework_file', is_framework)
+        object.__setattr__(self, 'is_support_file', is_support)
 
 
 @dataclass
@@ -59,6 +82,43 @@ class ParsedStackTrace:
     user_code_frames: int = 0
 
 
+class _LRUCache:
+    """Bounded, thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Cached value, or _MISSING."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data), 'maxsize': self.maxsize}
+
+
 class StackTraceParser:
     """
     Parser for JavaScript/TypeScript stack traces.
@@ -120,13 +180,24 @@ class StackTraceParser:
         re.compile(r'(?P<type>expected)\s+(?P<message>.+?to\s+.+)', re.IGNORECASE),
     ]
 
-    def __init__(self):
+    def __init__(self, trace_cache_size: int = TRACE_CACHE_SIZE, line_cache_size: int = LINE_CACHE_SIZE):
+        """
+        Args:
+            trace_cache_size: Parsed traces to keep (LRU)
+            line_cache_size: Parsed lines to keep (LRU)
+        """
         self.logger = logging.getLogger(__name__)
+        self._trace_cache = _LRUCache(trace_cache_size)
+        self._line_cache = _LRUCache(line_cache_size)
 
     def parse(self, stack_trace: str) -> ParsedStackTrace:
         """
         Parse a stack trace string into structured format.
 
+        Repeated traces are served from the LRU cache. Each call returns its
+        own ParsedStackTrace (and frames list); the frames themselves are
+        shared, immutable StackFrames.
+
         Args:
             stack_trace: Raw stack trace string
 
@@ -136,6 +207,44 @@ class StackTraceParser:
         if not stack_trace:
             return ParsedStackTrace(raw_trace="")
 
+        key = hashlib.blake2b(stack_trace.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        cached = self._trace_cache.get(key)
+        if cached is _MISSING:
+            cached = self._parse_trace(stack_trace)
+            self._trace_cache.put(key, cached)
+        return replace(cached, frames=list(cached.frames))
+
+    def parse_many(self, stack_traces: Iterable[Optional[str]]) -> List[ParsedStackTrace]:
+        """
+        Parse a batch of stack traces, in order.
+
+        Identical traces in the batch (common when one outage fails many tests)
+        are parsed once; near-identical ones reuse cached lines.
+        """
+        results = []
+        batch: Dict[str, ParsedStackTrace] = {}
+        for stack_trace in stack_traces:
+            if not stack_trace:
+                results.append(ParsedStackTrace(raw_trace=""))
+                continue
+            parsed = batch.get(stack_trace)
+            if parsed is None:
+                parsed = batch[stack_trace] = self.parse(stack_trace)
+                results.append(parsed)
+            else:
+                results.append(replace(parsed, frames=list(parsed.frames)))
+        return results
+
+    def cache_info(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters and sizes of the trace and line caches."""
+        return {'traces': self._trace_cache.info(), 'lines': self._line_cache.info()}
+
+    def clear_cache(self):
+        self._trace_cache.clear()
+        self._line_cache.clear()
+
+    def _parse_trace(self, stack_trace: str) -> ParsedStackTrace:
+        """Uncached parse of a non-empty trace."""
         result = ParsedStackTrace(raw_trace=stack_trace)
 
         # Extract error type and message
@@ -196,7 +305,7 @@ class StackTraceParser:
             frame = self._parse_line(line)
             if frame:
                 # Create unique key for deduplication
-                location_key = f"{frame.file_path}:{frame.line_number}"
+                location_key = (frame.file_path, frame.line_number)
                 if location_key not in seen_locations:
                     seen_locations.add(location_key)
                     frames.append(frame)
@@ -204,7 +313,15 @@ class StackTraceParser:
         return frames
 
     def _parse_line(self, line: str) -> Optional[StackFrame]:
-        """Parse a single line to extract stack frame info."""
+        """Parse a single line to extract stack frame info (memoized per line)."""
+        frame = self._line_cache.get(line)
+        if frame is _MISSING:
+            frame = self._match_line(line)
+            self._line_cache.put(line, frame)
+        return frame
+
+    def _match_line(self, line: str) -> Optional[StackFrame]:
+        """Run PATTERNS against one line."""
         for pattern in self.PATTERNS:
             match = pattern.search(line)
             if match:
@@ -231,10 +348,10 @@ class StackTraceParser:
 
                 func_name = groups.get('func')
                 if func_name:
-                    func_name = self._clean_function_name(func_name)
+                    func_name = sys.intern(self._clean_function_name(func_name))
 
                 return StackFrame(
-                    file_path=file_path,
+                    file_path=sys.intern(file_path),
                     line_number=line_num,
                     column_number=col_num,
                     function_name=func_name,
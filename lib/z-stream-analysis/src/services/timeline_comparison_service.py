@@ -24,6 +24,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
 # Import centralized configuration
+from .perf_tracing import traced_run
 from .shared_utils import REPOS, TIMEOUTS, THRESHOLDS
 
 
@@ -271,7 +272,7 @@ class TimelineComparisonService:
             patterns_searched.append(pattern)
 
             try:
-                result = subprocess.run(
+                result = traced_run(
                     ['git', 'grep', '-l', pattern, '--', 'src/'],
                     cwd=self.console_path,
                     capture_output=True,
@@ -318,7 +319,7 @@ class TimelineComparisonService:
                 pattern = pattern_template.format(element_id=element_id)
                 try:
                     # Search for pattern in git history
-                    result = subprocess.run(
+                    result = traced_run(
                         ['git', 'log', '-1', '--format=%H|%ai|%s', '-S', pattern, '--', 'src/'],
                         cwd=self.console_path,
                         capture_output=True,
@@ -347,7 +348,7 @@ class TimelineComparisonService:
         for pattern_template in self.ELEMENT_SEARCH_PATTERNS[:3]:
             pattern = pattern_template.format(element_id=element_id)
             try:
-                result = subprocess.run(
+                result = traced_run(
                     ['git', 'log', '-1', '--format=%H|%ai|%s', '-S', pattern, '--', 'src/'],
                     cwd=self.console_path,
                     capture_output=True,
@@ -391,7 +392,7 @@ class TimelineComparisonService:
 
         try:
             # Search for selector in automation repo
-            result = subprocess.run(
+            result = traced_run(
                 ['git', 'grep', '-l', selector, '--', 'cypress/'],
                 cwd=self.automation_path,
                 capture_output=True,
@@ -405,7 +406,7 @@ class TimelineComparisonService:
                 timeline.file_path = files[0]
 
             # Get git history for selector
-            result = subprocess.run(
+            result = traced_run(
                 ['git', 'log', '-1', '--format=%H|%ai|%s', '-S', selector, '--', 'cypress/'],
                 cwd=self.automation_path,
                 capture_output=True,
@@ -639,7 +640,7 @@ class TimelineComparisonService:
             True if branch exists, False otherwise
         """
         try:
-            result = subprocess.run(
+            result = traced_run(
                 ['git', 'ls-remote', '--heads', self.CONSOLE_REPO_URL, branch],
                 capture_output=True,
                 text=True,
@@ -680,7 +681,7 @@ class TimelineComparisonService:
 
             self.logger.info(f"Cloning console repo branch '{branch}' to: {target_path}")
 
-            result = subprocess.run(
+            result = traced_run(
                 cmd,
                 capture_output=True,
                 text=True,
@@ -737,7 +738,7 @@ class TimelineComparisonService:
         self.logger.info(f"Scanning last {lookback_commits} commits for selector changes...")
 
         try:
-            result = subprocess.run(
+            result = traced_run(
                 ['git', 'diff', f'HEAD~{lookback_commits}..HEAD', '--', 'src/'],
                 cwd=self.console_path,
                 capture_output=True,
@@ -965,7 +966,7 @@ class TimelineComparisonService:
             True if branch exists, False otherwise
         """
         try:
-            result = subprocess.run(
+            result = traced_run(
                 ['git', 'ls-remote', '--heads', self.KUBEVIRT_REPO_URL, branch],
                 capture_output=True,
                 text=True,
@@ -1006,7 +1007,7 @@ class TimelineComparisonService:
 
             self.logger.info(f"Cloning kubevirt-plugin repo branch '{branch}' to: {target_path}")
 
-            result = subprocess.run(
+            result = traced_run(
                 cmd,
                 capture_output=True,
                 text=True,
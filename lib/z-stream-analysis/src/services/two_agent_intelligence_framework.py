@@ -12,6 +12,7 @@ from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 
 from .jenkins_intelligence_service import JenkinsIntelligenceService, JenkinsIntelligence
+from .jenkins_evidence_store import JenkinsEvidenceStore
 from .environment_validation_service import EnvironmentValidationService
 from .repository_analysis_service import RepositoryAnalysisService
 
@@ -76,12 +77,15 @@ class InvestigationIntelligenceAgent:
         self.env_validation_service = EnvironmentValidationService(kubeconfig_path)
         self.repo_analysis_service = RepositoryAnalysisService(repo_base_path)
         
-    def investigate_pipeline_failure(self, jenkins_url: str) -> InvestigationResult:
+    def investigate_pipeline_failure(self, jenkins_url: str,
+                                     evidence: Optional[JenkinsEvidenceStore] = None) -> InvestigationResult:
         """
         Comprehensive evidence gathering phase
         
         Args:
             jenkins_url: Jenkins build URL to investigate
+            evidence: Per-run evidence store (e.g. the DataGatherer's), so payloads
+                      already fetched for this run are not fetched again
             
         Returns:
             InvestigationResult: Complete investigation package
@@ -89,8 +93,11 @@ class InvestigationIntelligenceAgent:
         start_time = time.time()
         self.logger.info(f"Starting investigation phase for: {jenkins_url}")
         
+        if evidence is None:
+            evidence = JenkinsEvidenceStore(jenkins_url, self.jenkins_service)
+        
         # Step 1: Jenkins Intelligence Analysis
-        jenkins_intelligence = self.jenkins_service.analyze_jenkins_url(jenkins_url)
+        jenkins_intelligence = self.jenkins_service.analyze_jenkins_url(jenkins_url, evidence=evidence)
         
         # Step 2: Environment Validation Testing
         environment_validation = self._validate_environment(jenkins_intelligence)
@@ -822,12 +829,14 @@ class TwoAgentIntelligenceFramework:
         self.investigation_agent = InvestigationIntelligenceAgent()
         self.solution_agent = SolutionIntelligenceAgent()
         
-    def analyze_pipeline_failure(self, jenkins_url: str) -> ComprehensiveAnalysis:
+    def analyze_pipeline_failure(self, jenkins_url: str,
+                                 evidence: Optional[JenkinsEvidenceStore] = None) -> ComprehensiveAnalysis:
         """
         Execute complete 2-agent analysis pipeline
         
         Args:
             jenkins_url: Jenkins build URL to analyze
+            evidence: Optional per-run evidence store shared with other consumers
             
         Returns:
             ComprehensiveAnalysis: Complete analysis with classification and solutions
@@ -837,7 +846,7 @@ class TwoAgentIntelligenceFramework:
         
         # Phase 1: Investigation Intelligence Agent
         self.logger.info("Phase 1: Investigation Intelligence - Evidence gathering")
-        investigation_result = self.investigation_agent.investigate_pipeline_failure(jenkins_url)
+        investigation_result = self.investigation_agent.investigate_pipeline_failure(jenkins_url, evidence=evidence)
         
         # Phase 2: Solution Intelligence Agent  
         self.logger.info("Phase 2: Solution Intelligence - Analysis and solution generation")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AgentOrchestrator concurrency.
+
+The Jenkins, environment and repository services are replaced with stubs
+whose blocking calls sleep, so tests exercise scheduling rather than curl,
+oc or git.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import types
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# agent_orchestrator imports services.evidence_validation_engine, which is not
+# part of this tree; provide a stand-in so the module can be imported.
+_engine = types.ModuleType('services.evidence_validation_engine')
+_engine.EvidenceValidationEngine = lambda: SimpleNamespace(
+    validate_technical_claims=lambda claims, investigation: claims,
+    to_dict=lambda validation: {'claims': list(validation)},
+)
+with patch.dict(sys.modules, {'services.evidence_validation_engine': _engine}):
+    from src.agents import agent_orchestrator
+    from src.agents.agent_orchestrator import (
+        AgentContext,
+        AgentOrchestrator,
+        InvestigationAgentAdapter,
+        run_agent_analysis,
+    )
+
+
+BLOCKING_SECONDS = 0.3
+
+
+class StubJenkinsService:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.threads = []
+
+    def analyze_jenkins_url(self, url):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(BLOCKING_SECONDS)
+        if self.fail:
+            raise RuntimeError('jenkins unreachable')
+        return SimpleNamespace(metadata=SimpleNamespace(branch='release-2.15', job_name='clc-e2e'))
+
+    def to_dict(self, intel):
+        return {'metadata': {'build_result': 'UNSTABLE', 'branch': intel.metadata.branch}}
+
+
+class StubEnvironmentService:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def validate_environment(self, namespaces=None):
+        time.sleep(BLOCKING_SECONDS)
+        if self.fail:
+            raise RuntimeError('oc login failed')
+        return SimpleNamespace(cluster_connectivity=True)
+
+    def to_dict(self, validation):
+        return {'cluster_connectivity': validation.cluster_connectivity}
+
+
+class StubRepositoryService:
+    def __init__(self):
+        self.calls = []
+
+    def analyze_repository(self, branch=None, job_name=None):
+        self.calls.append((branch, job_name))
+        time.sleep(BLOCKING_SECONDS)
+        return SimpleNamespace(repository_cloned=True, branch=branch)
+
+    def to_dict(self, analysis):
+        return {'repository_cloned': analysis.repository_cloned, 'branch': analysis.branch}
+
+
+def _context(url='https://jenkins.example.com/job/clc-e2e/42/'):
+    return AgentContext(
+        investigation_id='inv-1', jenkins_url=url, session_id='s-1', timestamp='2026-01-01T00:00:00'
+    )
+
+
+@pytest.fixture
+def stub_services():
+    """Patch the service classes the investigation adapter constructs."""
+    services = SimpleNamespace(
+        jenkins=StubJenkinsService(), env=StubEnvironmentService(), repo=StubRepositoryService()
+    )
+    with patch.object(agent_orchestrator, 'JenkinsIntelligenceService', lambda: services.jenkins), \
+            patch.object(agent_orchestrator, 'EnvironmentValidationService', lambda path: services.env), \
+            patch.object(agent_orchestrator, 'RepositoryAnalysisService', lambda path: services.repo):
+        yield services
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = AgentOrchestrator(max_concurrent_analyses=2)
+    yield orchestrator
+    orchestrator.shutdown()
+
+
+class TestInvestigationAdapter:
+    """Tests for blocking calls and phase concurrency."""
+
+    def test_blocking_calls_leave_the_loop_responsive(self, stub_services, orchestrator):
+        async def run():
+            ticks = 0
+            done = False
+
+            async def ticker():
+                nonlocal ticks
+                while not done:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.ensure_future(ticker())
+            adapter = InvestigationAgentAdapter(_context(), executor=orchestrator.executor)
+            result = await adapter.execute_investigation()
+            done = True
+            await ticking
+            return result, ticks
+
+        result, ticks = asyncio.run(run())
+        assert result.status == 'success'
+        # Two sequential rounds of blocking calls; a blocked loop would tick about once
+        assert ticks >= 10
+        assert all(name.startswith('agent-orchestrator') for name in stub_services.jenkins.threads)
+
+    def test_jenkins_and_environment_phases_overlap(self, stub_services, orchestrator):
+        adapter = InvestigationAgentAdapter(_context(), executor=orchestrator.executor)
+        started = time.monotonic()
+        asyncio.run(adapter.execute_investigation())
+        # Jenkins and environment overlap, repository waits for Jenkins: two rounds, not three
+        assert time.monotonic() - started < BLOCKING_SECONDS * 2.8
+
+    def test_failing_phase_does_not_cancel_siblings(self, stub_services, orchestrator):
+        stub_services.env.fail = True
+        adapter = InvestigationAgentAdapter(_context(), executor=orchestrator.executor)
+        result = asyncio.run(adapter.execute_investigation())
+        assert result.errors == ['Environment validation: oc login failed']
+        assert result.result['jenkins_analysis']['metadata']['branch'] == 'release-2.15'
+        assert result.result['repository_intelligence']['repository_cloned'] is True
+        assert stub_services.repo.calls == [('release-2.15', 'clc-e2e')]
+
+    def test_repository_phase_runs_without_jenkins_metadata(self, stub_services, orchestrator):
+        stub_services.jenkins.fail = True
+        adapter = InvestigationAgentAdapter(_context(), executor=orchestrator.executor)
+        result = asyncio.run(adapter.execute_investigation())
+        assert result.errors == ['Jenkins analysis: jenkins unreachable']
+        assert stub_services.repo.calls == [(None, None)]
+        assert result.result['environment_assessment'] == {'cluster_connectivity': True}
+
+
+class TestAnalyzeMany:
+    """Tests for AgentOrchestrator.analyze_many."""
+
+    def test_results_in_input_order_including_failures(self, orchestrator):
+        delays = {'a': 0.2, 'b': 0.0, 'c': 0.1}
+
+        async def fake_analysis(url):
+            await asyncio.sleep(delays[url])
+            if url == 'b':
+                raise RuntimeError('console log unavailable')
+            return {'jenkins_url': url, 'overall_classification': 'PRODUCT_BUG'}
+
+        with patch.object(orchestrator, 'analyze_pipeline_failure', fake_analysis):
+            results = asyncio.run(orchestrator.analyze_many(['a', 'b', 'c']))
+
+        assert [r['jenkins_url'] for r in results] == ['a', 'b', 'c']
+        assert results[1] == {'jenkins_url': 'b', 'status': 'error', 'error': 'console log unavailable'}
+        assert results[0]['overall_classification'] == 'PRODUCT_BUG'
+
+    def test_concurrency_is_bounded(self, orchestrator):
+        running = peak = 0
+
+        async def fake_analysis(url):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return {'jenkins_url': url}
+
+        with patch.object(orchestrator, 'analyze_pipeline_failure', fake_analysis):
+            results = asyncio.run(orchestrator.analyze_many([str(i) for i in range(6)]))
+
+        assert len(results) == 6
+        assert peak == 2
+
+    def test_full_analysis_with_stub_services(self, stub_services, orchestrator):
+        urls = ['https://jenkins.example.com/job/clc-e2e/1/', 'https://jenkins.example.com/job/clc-e2e/2/']
+        results = asyncio.run(orchestrator.analyze_many(urls))
+        assert [r['jenkins_url'] for r in results] == urls
+        assert all(r['investigation_result']['status'] == 'success' for r in results)
+
+
+class TestRunAgentAnalysis:
+    """Tests for the synchronous entry point."""
+
+    @pytest.fixture
+    def executors(self):
+        """Record each orchestrator's executor as it is shut down."""
+        seen = []
+        original = AgentOrchestrator.shutdown
+
+        def shutdown(self):
+            seen.append(self.executor)
+            original(self)
+
+        with patch.object(AgentOrchestrator, 'shutdown', shutdown):
+            yield seen
+
+    def test_executor_is_shut_down(self, executors):
+        async def fake_analysis(self, url):
+            return {'jenkins_url': url}
+
+        with patch.object(AgentOrchestrator, 'analyze_pipeline_failure', fake_analysis):
+            assert run_agent_analysis(['a', 'b']) == [{'jenkins_url': 'a'}, {'jenkins_url': 'b'}]
+
+        assert len(executors) == 1
+        assert executors[0]._shutdown
+
+    def test_executor_is_shut_down_when_analysis_raises(self, executors):
+        async def fake_analysis(self, url):
+            raise RuntimeError('boom')
+
+        with patch.object(AgentOrchestrator, 'analyze_pipeline_failure', fake_analysis):
+            with pytest.raises(RuntimeError):
+                run_agent_analysis('a')
+
+        assert len(executors) == 1
+        assert executors[0]._shutdown
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the report build cache.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.reports import build_cache
+from src.reports.build_cache import CACHE_FILENAME, ReportBuildCache, code_version
+from src.scripts.report import ReportFormatter
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+
+
+def _bump(path):
+    """Move a file's mtime forward without changing its content."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def run_dir(tmp_path):
+    run = tmp_path / 'runs' / 'job_1'
+    run.mkdir(parents=True)
+    _write(run / 'core-data.json', {'metadata': {'jenkins_url': 'https://jenkins/job/clc/5/'},
+                                    'test_report': {'failed_tests': []}})
+    _write(run / 'analysis-results.json', {
+        'analysis_metadata': {'jenkins_url': 'https://jenkins/job/clc/5/'},
+        'summary': {'by_classification': {'PRODUCT_BUG': 2}},
+        'per_test_analysis': [
+            {'test_name': f'test {i}', 'classification': 'PRODUCT_BUG', 'confidence': 0.9,
+             'feature_area': 'CLC'}
+            for i in range(2)
+        ],
+    })
+    return run
+
+
+class TestReportBuildCache:
+    """Tests for ReportBuildCache."""
+
+    def test_output_fresh_until_input_changes(self, run_dir):
+        out = run_dir / 'SUMMARY.txt'
+        out.write_text('summary')
+        cache = ReportBuildCache(run_dir)
+        cache.record('summary', out, cache.inputs('core-data.json'))
+        cache.save()
+
+        cache = ReportBuildCache(run_dir)
+        assert cache.is_fresh('summary', out, cache.inputs('core-data.json'))
+
+        _write(run_dir / 'core-data.json', {'metadata': {}})
+        cache = ReportBuildCache(run_dir)
+        assert not cache.is_fresh('summary', out, cache.inputs('core-data.json'))
+
+    def test_edited_or_missing_output_is_stale(self, run_dir):
+        out = run_dir / 'SUMMARY.txt'
+        out.write_text('summary')
+        cache = ReportBuildCache(run_dir)
+        inputs = cache.inputs('core-data.json')
+        cache.record('summary', out, inputs)
+
+        out.write_text('hand edited')
+        assert not cache.is_fresh('summary', out, inputs)
+        out.unlink()
+        assert not cache.is_fresh('summary', out, inputs)
+
+    def test_touch_without_change_keeps_fingerprint(self, run_dir):
+        cache = ReportBuildCache(run_dir)
+        before = cache.fingerprint('core-data.json')
+
+        _bump(run_dir / 'core-data.json')
+
+        assert cache.fingerprint('core-data.json') == before
+        assert cache.fingerprint('missing.json') is None
+
+    def test_report_stage_log_lines_ignored(self, run_dir):
+        log = run_dir / 'pipeline.log.jsonl'
+        log.write_text(json.dumps({'stage': 'gather', 'message': 'a'}) + '\n')
+        before = ReportBuildCache(run_dir).fingerprint('pipeline.log.jsonl')
+
+        with open(log, 'a') as f:
+            f.write(json.dumps({'stage': 'report', 'message': 'b'}) + '\n')
+
+        assert ReportBuildCache(run_dir).fingerprint('pipeline.log.jsonl') == before
+
+    def test_fragments_reused_and_pruned(self, run_dir):
+        cache = ReportBuildCache(run_dir)
+        assert cache.fragment('md-test', [1, 'a'], lambda: ['A']) == ['A']
+        assert cache.fragment('md-test', [2, 'b'], lambda: ['B']) == ['B']
+        cache.save()
+
+        cache = ReportBuildCache(run_dir)
+        assert cache.fragment('md-test', [1, 'a'], lambda: pytest.fail('rebuilt')) == ['A']
+        cache.save()
+
+        data = json.loads((run_dir / CACHE_FILENAME).read_text())
+        assert len(data['fragments']['md-test']) == 1
+
+    def test_disabled(self, run_dir):
+        out = run_dir / 'SUMMARY.txt'
+        out.write_text('summary')
+        cache = ReportBuildCache(run_dir)
+        cache.record('summary', out, {})
+        cache.save()
+
+        cache = ReportBuildCache(run_dir, enabled=False)
+        assert not cache.is_fresh('summary', out, {})
+
+    def test_code_change_drops_cache(self, run_dir, monkeypatch):
+        cache = ReportBuildCache(run_dir)
+        cache.fragment('md-test', 1, lambda: 'A')
+        cache.save()
+
+        monkeypatch.setattr('src.reports.build_cache._code_version', 'other')
+        cache = ReportBuildCache(run_dir)
+        assert cache.fragment('md-test', 1, lambda: 'B') == 'B'
+
+    def test_code_version_covers_service_modules(self, tmp_path, monkeypatch):
+        services = tmp_path / 'services'
+        services.mkdir()
+        (services / 'run_artifacts.py').write_text('VERSION = 1\n')
+        monkeypatch.setattr(build_cache, '_APP_ROOT', tmp_path)
+        monkeypatch.setattr(build_cache, '_CODE_TREES', [(services, '*.py')])
+        monkeypatch.setattr(build_cache, '_CODE_FILES', [])
+        monkeypatch.setattr(build_cache, '_code_version', None)
+        before = code_version()
+
+        (services / 'run_artifacts.py').write_text('VERSION = 2\n')
+        monkeypatch.setattr(build_cache, '_code_version', None)
+
+        assert code_version() != before
+
+
+class TestFormatAllIncremental:
+    """ReportFormatter.format_all() reuses unchanged outputs."""
+
+    def _format(self, run_dir, **kwargs):
+        formatter = ReportFormatter(run_dir, validate_schema=False, **kwargs)
+        formatter.format_all()
+        return formatter.build_cache
+
+    def test_second_run_rebuilds_nothing(self, run_dir):
+        first = self._format(run_dir)
+        assert set(first.rebuilt) == {'markdown', 'json', 'summary', 'html'}
+
+        second = self._format(run_dir)
+        assert second.rebuilt == []
+        assert set(second.reused) == {'markdown', 'json', 'summary', 'html'}
+
+    def test_changed_test_rerenders_one_fragment(self, run_dir, monkeypatch):
+        self._format(run_dir)
+        results = json.loads((run_dir / 'analysis-results.json').read_text())
+        results['per_test_analysis'][1]['classification'] = 'AUTOMATION_BUG'
+        _write(run_dir / 'analysis-results.json', results)
+
+        built = []
+        original = ReportFormatter._format_test_entry
+        monkeypatch.setattr(ReportFormatter, '_format_test_entry',
+                            lambda self, i, test: built.append(i) or original(self, i, test))
+        cache = self._format(run_dir)
+
+        assert 'markdown' in cache.rebuilt
+        assert built == [2]
+        assert 'AUTOMATION BUG' in (run_dir / 'Detailed-Analysis.md').read_text()
+
+    def test_rebuild_flag_ignores_cache(self, run_dir):
+        self._format(run_dir)
+
+        cache = self._format(run_dir, use_cache=False)
+
+        assert set(cache.rebuilt) == {'markdown', 'json', 'summary', 'html'}
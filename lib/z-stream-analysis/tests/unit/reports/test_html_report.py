@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit tests for single-file and paged HTML report output.
+"""
+
+import json
+import re
+
+import pytest
+
+from src.reports import html_report
+from src.reports.html_report import PAGED_DATA_DIR, generate_html_report
+
+
+def _test(i, cls='PRODUCT_BUG'):
+    return {
+        'test_name': f'test {i} </script>', 'classification': cls, 'confidence': 0.9,
+        'feature_area': 'CLC', 'root_cause': f'cause {i}',
+    }
+
+
+@pytest.fixture
+def run_dir(tmp_path):
+    run = tmp_path / 'runs' / 'job_1'
+    run.mkdir(parents=True)
+    tests = [_test(i, 'PRODUCT_BUG' if i % 2 else 'AUTOMATION_BUG') for i in range(30)]
+    (run / 'analysis-results.json').write_text(json.dumps({
+        'analysis_metadata': {'jenkins_url': 'https://jenkins/job/clc/5/', 'gathered_at': '2026-01-01T00:00:00'},
+        'summary': {'by_classification': {'PRODUCT_BUG': 15, 'AUTOMATION_BUG': 15}},
+        'per_test_analysis': tests,
+    }))
+    with open(run / 'pipeline.log.jsonl', 'w') as f:
+        for i in range(12):
+            f.write(json.dumps({'timestamp': '2026-01-01T00:00:01', 'level': 'info',
+                                'logger': 'gather', 'message': f'gather step {i}', 'stage': 'gather'}) + '\n')
+    return run
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    events = [{'timestamp': '2025-12-31T23:00:00', 'event': 'tool_call', 'tool': 'Bash', 'input': {'command': 'echo before-run'}}]
+    events += [{'timestamp': '2026-01-01T00:00:05', 'event': 'tool_call', 'tool': 'Read',
+                'input': {'file_path': f'/f{i}'}} for i in range(7)]
+    path.write_text(''.join(json.dumps(e) + '\n' for e in events))
+    return path
+
+
+def _chunks(run_dir, section):
+    items = []
+    for chunk in sorted((run_dir / PAGED_DATA_DIR).glob(f'{section}-*.js')):
+        match = re.fullmatch(r'zsaChunk\("([\w-]+)",(\d+),(.*)\);\n', chunk.read_text(), re.S)
+        assert match.group(1) == section
+        items.extend(json.loads(match.group(3)))
+    return items
+
+
+def _manifest(html):
+    data = re.search(r'const reportPages = (.*);\n', html).group(1)
+    return json.loads(data.replace('<\\/', '</'))
+
+
+class TestSingleFileReport:
+    """Tests for the default self-contained report."""
+
+    def test_cards_and_rows_inline(self, run_dir, trace_file):
+        path = generate_html_report(run_dir, trace_file, paginated=False)
+
+        html = path.read_text()
+        assert html.count('class="test-card"') == 30
+        assert html.count('gather step') == 12
+        assert '/f6' in html and 'before-run' not in html
+        assert '7 entries' in html
+        assert '<!--slot:' not in html
+        assert not (run_dir / PAGED_DATA_DIR).exists()
+        assert not (run_dir / 'analysis-report.html.tmp').exists()
+
+    def test_report_stage_logs_left_out(self, run_dir, trace_file):
+        with open(run_dir / 'pipeline.log.jsonl', 'a') as f:
+            f.write(json.dumps({'timestamp': '2026-01-01T00:00:09', 'level': 'info', 'logger': 'report',
+                                'message': 'rendering report', 'stage': 'report'}) + '\n')
+
+        html = generate_html_report(run_dir, trace_file, paginated=False).read_text()
+
+        assert 'rendering report' not in html
+        assert html.count('gather step') == 12
+
+    def test_replaces_stale_chunks(self, run_dir, trace_file):
+        generate_html_report(run_dir, trace_file, paginated=True)
+
+        generate_html_report(run_dir, trace_file, paginated=False)
+
+        assert not (run_dir / PAGED_DATA_DIR).exists()
+
+
+class TestPagedReport:
+    """Tests for the paged report with JSON chunks."""
+
+    def test_shell_has_no_cards(self, run_dir, trace_file):
+        html = generate_html_report(run_dir, trace_file, paginated=True).read_text()
+
+        assert 'class="test-card"' not in html
+        assert 'gather step' not in html
+        assert '</script>"' not in html  # test names are escaped in the manifest
+
+    def test_manifest_and_chunks(self, run_dir, trace_file, monkeypatch):
+        monkeypatch.setattr(html_report, 'TEST_CHUNK_SIZE', 8)
+        html = generate_html_report(run_dir, trace_file, paginated=True).read_text()
+
+        manifest = _manifest(html)
+        assert manifest['dir'] == PAGED_DATA_DIR
+        assert manifest['tests'][1] == ['PRODUCT_BUG', 'CLC', 'test 1 </script>']
+        assert manifest['sections']['tests'] == {'count': 30, 'chunk_size': 8, 'chunks': 4}
+        assert manifest['sections']['log-gather']['count'] == 12
+        assert manifest['sections']['log-trace']['count'] == 7
+        assert manifest['sections']['log-oracle'] == {'count': 0, 'chunk_size': html_report.ROW_CHUNK_SIZE, 'chunks': 0}
+
+        cards = _chunks(run_dir, 'tests')
+        assert [cls for cls, _ in cards[:2]] == ['AUTOMATION_BUG', 'PRODUCT_BUG']
+        assert 'id="test-29"' in cards[29][1]
+        assert [kind for kind, _ in _chunks(run_dir, 'log-trace')] == ['trace-call'] * 7
+        assert _chunks(run_dir, 'log-gather')[0][0] == 'log-info'
+
+    def test_auto_mode_pages_large_runs(self, run_dir, trace_file, monkeypatch):
+        assert 'reportPages' not in generate_html_report(run_dir, trace_file).read_text()
+
+        monkeypatch.setattr(html_report, 'PAGED_TEST_THRESHOLD', 10)
+        assert 'reportPages' in generate_html_report(run_dir, trace_file).read_text()
+
+
+class TestTraceDiscovery:
+    """Trace files are found through the trace index."""
+
+    def test_discovers_trace_for_run_window(self, run_dir, trace_file):
+        traces = run_dir.parent.parent / '.claude' / 'traces'
+        traces.mkdir(parents=True)
+        trace_file.rename(traces / 'session-1.jsonl')
+        (traces / 'sessions.jsonl').write_text('{"session_id": "session-1", "timestamp": "2027-01-01T00:00:00"}\n')
+
+        assert html_report._find_trace_file(run_dir) == traces / 'session-1.jsonl'
+        html = generate_html_report(run_dir, paginated=False).read_text()
+
+        assert '7 entries' in html and 'before-run' not in html
+        assert (traces / 'trace-index.json').exists()
+
+        key = html_report._trace_window_key(run_dir, traces / 'session-1.jsonl')
+        assert key[0] == str(traces / 'session-1.jsonl')
+        assert key[2:] == [0, (traces / 'session-1.jsonl').stat().st_size]
+
+
+class TestPerformanceTab:
+    """Tests for the timeline built from perf-summary.json."""
+
+    def test_timeline_and_span_logs(self, run_dir, trace_file):
+        spans = [
+            {'id': 1, 'parent_id': None, 'name': 'clone_repositories', 'kind': 'step', 'stage': 'gather',
+             'start': 0.0, 'duration': 8.0, 'bytes': 0, 'status': 'ok'},
+            {'id': 2, 'parent_id': 1, 'name': 'git clone', 'kind': 'subprocess', 'stage': 'gather',
+             'start': 0.5, 'duration': 7.0, 'bytes': 2048, 'status': 'error'},
+        ]
+        (run_dir / 'perf-summary.json').write_text(json.dumps({
+            'total_seconds': 10.0, 'untraced_seconds': 2.0, 'span_count': 2,
+            'by_kind': {'subprocess': {'count': 1, 'seconds': 7.0, 'bytes': 2048, 'errors': 1},
+                        'kg': {'count': 0, 'seconds': 0.0, 'bytes': 0, 'errors': 0,
+                               'cache': {'hits': 3, 'misses': 1}}},
+            'by_name': [{'name': 'git clone', 'kind': 'subprocess', 'count': 1, 'seconds': 7.0, 'bytes': 2048}],
+            'steps': [{'name': 'clone_repositories', 'stage': 'gather', 'duration': 8.0, 'self_seconds': 1.0}],
+            'spans': spans,
+        }))
+        with open(run_dir / 'pipeline.log.jsonl', 'a') as f:
+            f.write(json.dumps({'timestamp': '2026-01-01T00:00:02', 'level': 'debug', 'logger': 'perf',
+                                'message': 'span subprocess git clone', 'stage': 'gather', 'span': spans[1]}) + '\n')
+
+        html = generate_html_report(run_dir, trace_file, paginated=False).read_text()
+
+        bars = re.findall(r'<div class="perf-bar[^"]*" style="left:([\d.]+)%;width:([\d.]+)%;top:(\d+)px', html)
+        assert bars == [('0.000', '80.000', '0'), ('5.000', '70.000', '22')]
+        assert 'perf-error' in html
+        assert '3/4 cached' in html
+        assert 'span subprocess git clone' not in html
+        assert html.count('gather step') == 12
+
+    def test_run_without_summary(self, run_dir, trace_file):
+        html = generate_html_report(run_dir, trace_file, paginated=False).read_text()
+
+        assert 'No perf-summary.json in this run' in html
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the agent trace index.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.reports import trace_index
+from src.reports.trace_index import (
+    INDEX_FILENAME,
+    TraceIndex,
+    parse_ts,
+    run_window,
+)
+
+
+def _event(minute, second=0, session='s1', **extra):
+    return {'timestamp': f'2026-01-01T10:{minute:02d}:{second:02d}', 'event': 'tool_call',
+            'session_id': session, **extra}
+
+
+def _write(path, events, mode='w'):
+    with open(path, mode) as f:
+        for e in events:
+            f.write(json.dumps(e) + '\n')
+
+
+@pytest.fixture
+def traces(tmp_path):
+    traces = tmp_path / '.claude' / 'traces'
+    traces.mkdir(parents=True)
+    _write(traces / 'early.jsonl', [_event(m, session='early') for m in range(0, 10)])
+    _write(traces / 'run.jsonl', [_event(m, s, session='run') for m in range(20, 40) for s in (0, 30)])
+    (traces / 'sessions.jsonl').write_text(json.dumps({'session_id': 'run', 'timestamp': '2026-01-01T10:30:00'}) + '\n')
+    return traces
+
+
+@pytest.fixture(autouse=True)
+def small_stride(monkeypatch):
+    monkeypatch.setattr(trace_index, 'OFFSET_STRIDE', 4)
+
+
+class TestTraceIndex:
+    """Tests for TraceIndex updates and lookups."""
+
+    def test_indexes_trace_files_only(self, traces):
+        index = TraceIndex(traces).refresh()
+
+        assert sorted(index.entries) == ['early.jsonl', 'run.jsonl']
+        run = index.entries['run.jsonl']
+        assert run.session_id == 'run'
+        assert (run.first_ts, run.last_ts) == (parse_ts('2026-01-01T10:20:00'), parse_ts('2026-01-01T10:39:30'))
+        assert run.events == 40
+        assert len(run.offsets) == 10
+
+    def test_find_picks_largest_overlap(self, traces):
+        index = TraceIndex(traces)
+
+        found = index.find(parse_ts('2026-01-01T10:05:00'), parse_ts('2026-01-01T10:25:00'))
+
+        assert found == traces / 'run.jsonl'
+
+    def test_find_falls_back_to_latest(self, traces):
+        index = TraceIndex(traces)
+
+        assert index.find(parse_ts('2026-01-02T00:00:00'), None) == traces / 'run.jsonl'
+
+    def test_read_events_only_in_window(self, traces):
+        index = TraceIndex(traces)
+
+        events = index.read_events(traces / 'run.jsonl', parse_ts('2026-01-01T10:30:00'),
+                                   parse_ts('2026-01-01T10:33:30') - trace_index.WINDOW_GRACE_SECONDS)
+
+        assert [e['timestamp'][11:] for e in events] == [
+            '10:30:00', '10:30:30', '10:31:00', '10:31:30',
+            '10:32:00', '10:32:30', '10:33:00', '10:33:30',
+        ]
+
+    def test_read_events_seeks_past_earlier_lines(self, traces):
+        index = TraceIndex(traces)
+        begin, stop = index.window(traces / 'run.jsonl', parse_ts('2026-01-01T10:35:00'), None)
+
+        assert 0 < begin < stop == (traces / 'run.jsonl').stat().st_size
+
+    def test_untimestamped_events_are_kept(self, traces):
+        _write(traces / 'run.jsonl', [{'event': 'stop'}], mode='a')
+
+        events = TraceIndex(traces).read_events(traces / 'run.jsonl', parse_ts('2026-01-01T10:39:00'))
+
+        assert [e['event'] for e in events] == ['tool_call', 'tool_call', 'stop']
+
+    def test_round_trip_reuses_unchanged_files(self, traces, monkeypatch):
+        TraceIndex(traces).refresh().save()
+        assert (traces / INDEX_FILENAME).exists()
+
+        index = TraceIndex(traces)
+        monkeypatch.setattr(index, '_scan', None)   # a rescan would fail
+        index.refresh()
+
+        assert index.entries['run.jsonl'].events == 40
+
+    def test_appended_file_scans_only_the_tail(self, traces):
+        TraceIndex(traces).refresh().save()
+        path = traces / 'run.jsonl'
+        size = path.stat().st_size
+        _write(path, [_event(50, session='run')], mode='a')
+        path.write_bytes(path.read_bytes() + b'{"timestamp": "2026-01-01T10:5')   # partial line
+
+        index = TraceIndex(traces)
+        scanned = []
+        original = index._scan
+        index._scan = lambda p, e: (scanned.append(e.scanned), original(p, e))
+        entry = index.entry(path)
+
+        assert scanned == [size]
+        assert entry.events == 41
+        assert entry.last_ts == parse_ts('2026-01-01T10:50:00')
+        assert entry.scanned < path.stat().st_size
+
+    def test_replaced_and_deleted_files(self, traces):
+        TraceIndex(traces).refresh().save()
+        _write(traces / 'run.jsonl', [_event(55, session='other')])
+        (traces / 'early.jsonl').unlink()
+
+        index = TraceIndex(traces).refresh()
+
+        assert list(index.entries) == ['run.jsonl']
+        assert (index.entries['run.jsonl'].session_id, index.entries['run.jsonl'].events) == ('other', 1)
+
+    def test_other_index_versions_are_ignored(self, traces):
+        (traces / INDEX_FILENAME).write_text('{"version": 0, "files": {"x.jsonl": {}}}')
+
+        assert TraceIndex(traces).entries == {}
+
+
+class TestRunWindow:
+    """Tests for run_window()."""
+
+    def test_log_start_to_analysis_written(self, tmp_path):
+        _write(tmp_path / 'pipeline.log.jsonl', [
+            {'timestamp': '2026-01-01T10:00:00+00:00', 'stage': 'gather'},
+            {'timestamp': '2026-01-01T10:05:00+00:00', 'stage': 'oracle'},
+        ])
+        (tmp_path / 'analysis-results.json').write_text('{}')
+        os.utime(tmp_path / 'analysis-results.json', (1767262800, 1767262800))
+
+        assert run_window(tmp_path) == (parse_ts('2026-01-01T10:00:00Z'), 1767262800)
+
+    def test_without_analysis_ends_at_last_log_line(self, tmp_path):
+        _write(tmp_path / 'pipeline.log.jsonl', [
+            {'timestamp': '2026-01-01T10:00:00Z'}, {'timestamp': '2026-01-01T10:05:00Z'},
+        ])
+
+        assert run_window(tmp_path) == (parse_ts('2026-01-01T10:00:00Z'), parse_ts('2026-01-01T10:05:00Z'))
+
+    def test_empty_run(self, tmp_path):
+        assert run_window(tmp_path) == (None, None)
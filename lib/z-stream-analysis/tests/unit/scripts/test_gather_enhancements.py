@@ -11,6 +11,7 @@ Tests functionality including:
 These tests focus on the enhancement methods added to DataGatherer.
 """
 
+import json
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch
@@ -21,6 +22,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from src.scripts.gather import DataGatherer
 from src.services.feature_area_service import FeatureAreaService
+from src.services.shared_utils import get_masker
 
 
 class TestStackTracePreParsing:
@@ -252,6 +254,8 @@ class TestConsoleLogCredentialFallback:
             gatherer.verbose = False
             gatherer.logger = Mock()
             gatherer.gathered_data = {}
+            gatherer.evidence = None
+            gatherer._run_console = None
             return gatherer
 
     def test_extracts_kubeadmin_format1(self, gatherer, tmp_path):
@@ -393,6 +397,8 @@ class TestLoginToClusterFallback:
             gatherer.verbose = False
             gatherer.logger = Mock()
             gatherer.gathered_data = {'jenkins': {'parameters': {}}}
+            gatherer.evidence = None
+            gatherer._run_console = None
             gatherer.env_service = Mock()
             gatherer.env_service.cli = 'oc'
             gatherer.cluster_investigation_service = Mock()
@@ -447,3 +453,41 @@ class TestLoginToClusterFallback:
         access = gatherer.gathered_data['cluster_access']
         assert access['has_credentials'] is False
         assert access['kubeconfig_path'] is None
+
+
+class TestSaveCombinedDataMasking:
+    """Tests for masking credentials while core-data.json is written."""
+
+    @pytest.fixture
+    def gatherer(self):
+        with patch.object(DataGatherer, '__init__', lambda x, **kwargs: None):
+            gatherer = DataGatherer()
+            gatherer.logger = Mock()
+            gatherer.artifact_format = 'json'
+            gatherer.artifact_codec = None
+            gatherer.gathered_data = {
+                'metadata': {},
+                'jenkins': {'parameters': {'CYPRESS_OPTIONS_HUB_PASSWORD': 'secretPass'}},
+                'cluster_access': {'username': 'kubeadmin', 'password': 'secretPass'},
+                'console_log': {'key_errors': ['oc login -p x --password=secretPass']},
+            }
+            return gatherer
+
+    def test_output_masked_in_memory_data_untouched(self, gatherer, tmp_path):
+        gatherer.masker = get_masker()
+
+        gatherer._save_combined_data(tmp_path)
+
+        core = json.loads((tmp_path / 'core-data.json').read_text())
+        assert core['jenkins']['parameters']['CYPRESS_OPTIONS_HUB_PASSWORD'] == 'sec***MASKED***'
+        assert core['cluster_access'] == {'username': 'kubeadmin', 'password': 'sec***MASKED***'}
+        assert core['console_log']['key_errors'] == ['oc login -p x --password=secretPass']
+        assert gatherer.gathered_data['cluster_access']['password'] == 'secretPass'
+
+    def test_mask_values_scans_strings(self, gatherer, tmp_path):
+        gatherer.masker = get_masker(scan_values=True)
+
+        gatherer._save_combined_data(tmp_path)
+
+        core = json.loads((tmp_path / 'core-data.json').read_text())
+        assert core['console_log']['key_errors'] == ['oc login -p x --password=sec***MASKED***']
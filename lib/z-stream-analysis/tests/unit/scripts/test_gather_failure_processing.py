@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Tests for per-test failure processing in mass-failure runs."""
+
+import json
+import logging
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.scripts.gather import DataGatherer
+from src.services.component_extractor import ComponentExtractor
+from src.services.run_history import RunHistoryIndex
+from src.services.stack_trace_parser import StackTraceParser
+
+
+TRACE = (
+    "AssertionError: Timed out retrying after 4000ms: Expected to find element: #cluster-{i}\n"
+    "    at Context.eval (cypress/e2e/cluster/create{n}.cy.js:{i}:10)\n"
+    "    at node_modules/cypress/runner.js:100:3"
+)
+
+
+@pytest.fixture
+def gatherer():
+    with patch.object(DataGatherer, '__init__', lambda x, **kwargs: None):
+        gatherer = DataGatherer()
+    gatherer.logger = logging.getLogger(__name__)
+    gatherer.stack_parser = StackTraceParser()
+    gatherer.component_extractor = ComponentExtractor()
+    gatherer.console_index = None
+    return gatherer
+
+
+class TestExtractCompleteTestContext:
+    """Per-test context extraction with shared test-file reads."""
+
+    @pytest.fixture
+    def run_dir(self, tmp_path):
+        spec = tmp_path / 'repos' / 'automation' / 'cypress' / 'e2e'
+        spec.mkdir(parents=True)
+        (spec / 'create.cy.js').write_text("it('creates', () => {})\n")
+        (spec / 'destroy.cy.js').write_text("it('destroys', () => {})\n")
+        return tmp_path
+
+    def _failed_test(self, test_file, error_message, failure_type='assertion'):
+        return {
+            'test_name': test_file,
+            'error_message': error_message,
+            'failure_type': failure_type,
+            'parsed_stack_trace': {'test_file': test_file},
+        }
+
+    def test_reads_each_file_once_and_keeps_order(self, gatherer, run_dir):
+        gatherer.gathered_data = {'test_report': {'failed_tests': [
+            self._failed_test('cypress/e2e/create.cy.js', 'expected 0 to equal 5'),
+            self._failed_test('cypress/e2e/destroy.cy.js', '500 Internal Server Error', 'server_error'),
+            self._failed_test('cypress/e2e/create.cy.js', 'element not found', 'element_not_found'),
+        ]}}
+
+        with patch.object(DataGatherer, '_read_test_file', autospec=True,
+                          side_effect=DataGatherer._read_test_file) as read:
+            gatherer._extract_complete_test_context(run_dir)
+
+        assert sorted(call.args[2] for call in read.call_args_list) == [
+            'cypress/e2e/create.cy.js', 'cypress/e2e/destroy.cy.js',
+        ]
+        contexts = [t['extracted_context'] for t in gatherer.gathered_data['test_report']['failed_tests']]
+        assert [c['test_file']['path'] for c in contexts] == [
+            'cypress/e2e/create.cy.js', 'cypress/e2e/destroy.cy.js', 'cypress/e2e/create.cy.js',
+        ]
+        assert contexts[0]['test_file'] is not contexts[2]['test_file']
+        assert [c['failure_mode_category'] for c in contexts] == [
+            'data_incorrect', 'server_error', 'element_missing',
+        ]
+        assert contexts[0]['assertion_analysis']['assertion_type'] == 'count_mismatch'
+        assert contexts[1]['assertion_analysis'] is None
+
+    def test_missing_automation_repo(self, gatherer, tmp_path):
+        gatherer.gathered_data = {'test_report': {'failed_tests': [
+            self._failed_test('cypress/e2e/create.cy.js', 'boom'),
+        ]}}
+
+        gatherer._extract_complete_test_context(tmp_path)
+
+        assert gatherer.gathered_data['test_report']['failed_tests'][0]['extracted_context']['test_file'] is None
+
+
+class TestGatherTestReportClusters:
+    """Step 3 clusters identical failures and enriches each cluster once."""
+
+    def _report(self):
+        failed = [
+            SimpleNamespace(
+                test_name=f'test {i}', class_name='clc', status='FAILED', duration=1.0,
+                error_message=f'search-api returned 503 for cluster-{i}',
+                stack_trace=TRACE.format(i=7, n=0), failure_type='server_error',
+            )
+            for i in range(4)
+        ]
+        failed.append(SimpleNamespace(
+            test_name='other', class_name='grc', status='FAILED', duration=1.0,
+            error_message='expected 0 to equal 5', stack_trace=TRACE.format(i=9, n=1),
+            failure_type='assertion',
+        ))
+        return SimpleNamespace(total_tests=10, passed_count=5, failed_count=5, skipped_count=0,
+                               pass_rate=50.0, duration=10.0, failed_tests=failed)
+
+    def test_components_extracted_once_per_cluster(self, gatherer, tmp_path):
+        gatherer.gathered_data = {'errors': []}
+        gatherer._get_evidence = lambda url, run_dir: SimpleNamespace(test_report=self._report)
+
+        with patch.object(DataGatherer, '_extract_components_from_failure', autospec=True,
+                          side_effect=DataGatherer._extract_components_from_failure) as extract:
+            gatherer._gather_test_report('https://jenkins/job/x/1/', tmp_path)
+
+        report = gatherer.gathered_data['test_report']
+        assert extract.call_count == 2
+        assert report['failure_clusters']['total_clusters'] == 2
+        assert report['failure_clusters']['clusters'][0]['tests'] == [f'test {i}' for i in range(4)]
+
+        tests = report['failed_tests']
+        assert len({t['failure_cluster'] for t in tests[:4]}) == 1
+        assert tests[4]['failure_cluster'] != tests[0]['failure_cluster']
+        assert tests[0]['detected_components'] == tests[3]['detected_components']
+        assert tests[0]['detected_components'] is not tests[3]['detected_components']
+        assert tests[0]['detected_components'][0]['name'] == 'search-api'
+        assert all(t['parsed_stack_trace']['test_file'] for t in tests)
+        assert (tmp_path / 'test-report.json').exists()
+
+
+class TestAttachFailureHistory:
+    """Failed tests get their record from runs/run-history.db."""
+
+    def _gathered(self):
+        return {
+            'jenkins': {'job_name': 'clc-e2e-pipeline'},
+            'test_report': {'failed_tests': [
+                {'test_name': 'a', 'failure_cluster': 'fp-1'},
+                {'test_name': 'b', 'failure_cluster': 'fp-1'},
+            ]},
+        }
+
+    def test_skipped_without_history(self, gatherer, tmp_path):
+        gatherer.output_dir = tmp_path
+        gatherer.gathered_data = self._gathered()
+
+        gatherer._attach_failure_history()
+
+        assert 'failure_history' not in gatherer.gathered_data['test_report']['failed_tests'][0]
+        assert not (tmp_path / 'run-history.db').exists()
+
+    def _write_runs(self, tmp_path, builds):
+        """builds: [(run directory, build number)], oldest first."""
+        for day, (name, build) in enumerate(builds, 1):
+            run = tmp_path / name
+            run.mkdir()
+            (run / 'analysis-results.json').write_text(json.dumps({'per_test_analysis': [
+                {'test_name': 'a', 'classification': 'FLAKY'}]}))
+            (run / 'core-data.json').write_text(json.dumps({
+                'metadata': {'gathered_at': f'2026-01-0{day}T00:00:00'},
+                'jenkins': {'job_name': 'clc-e2e-pipeline', 'build_number': build},
+                'test_report': {'failed_tests': [{'test_name': 'a', 'failure_cluster': 'fp-1'}]},
+            }))
+        RunHistoryIndex(tmp_path).close()
+
+    def test_attaches_flakiness_and_recurrence(self, gatherer, tmp_path):
+        self._write_runs(tmp_path, [('run-1', 1), ('run-2', 2)])
+        gatherer.output_dir = tmp_path
+        gatherer.gathered_data = self._gathered()
+
+        gatherer._attach_failure_history()
+
+        a, b = gatherer.gathered_data['test_report']['failed_tests']
+        assert a['failure_history']['failures'] == 2
+        assert a['failure_history']['classifications'] == {'FLAKY': 2}
+        assert (b['failure_history']['failures'], b['failure_history']['fingerprint_runs_failed']) == (0, 2)
+
+    def test_current_build_is_not_its_own_history(self, gatherer, tmp_path):
+        # Two earlier analyses of build 2, the build being gathered now
+        self._write_runs(tmp_path, [('run-1', 1), ('run-2', 2), ('run-2-b', 2)])
+        gatherer.output_dir = tmp_path
+        gatherer.gathered_data = self._gathered()
+        gatherer.gathered_data['jenkins']['build_number'] = 2
+
+        gatherer._attach_failure_history()
+
+        a, _ = gatherer.gathered_data['test_report']['failed_tests']
+        assert (a['failure_history']['runs_considered'], a['failure_history']['failures']) == (1, 1)
+        assert a['failure_history']['fingerprint_runs_failed'] == 1
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the storage CLI argument checks.
+"""
+
+import pytest
+
+from src.scripts import storage
+
+
+def _main(monkeypatch, tmp_path, *argv):
+    monkeypatch.setattr('sys.argv', ['storage.py', '--runs-dir', str(tmp_path), '--dry-run', *argv])
+    storage.main()
+
+
+class TestArguments:
+    """Out-of-range retention values are rejected before anything runs."""
+
+    @pytest.mark.parametrize('argv', [
+        ('--keep-last', '0'),
+        ('--keep-last', '-3'),
+        ('--keep-last', 'ten'),
+        ('--repos-keep-last', '-1'),
+        ('--max-age-days', '0'),
+        ('--max-age-days', '-7'),
+        ('--max-age-days', 'nan'),
+        ('--max-age-days', 'inf'),
+    ])
+    def test_rejected(self, monkeypatch, tmp_path, capsys, argv):
+        with pytest.raises(SystemExit) as exc:
+            _main(monkeypatch, tmp_path, *argv)
+
+        assert exc.value.code == 2
+        assert f'argument {argv[0]}' in capsys.readouterr().err
+
+    def test_boundaries_accepted(self, monkeypatch, tmp_path):
+        _main(monkeypatch, tmp_path, '--keep-last', '1', '--repos-keep-last', '0', '--max-age-days', '0.5')
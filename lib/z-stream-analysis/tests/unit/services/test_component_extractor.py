@@ -7,6 +7,7 @@ and console logs for Knowledge Graph integration.
 
 import pytest
 from src.services.component_extractor import ComponentExtractor, ExtractedComponent
+from src.services.console_log import ConsoleLog
 
 
 class TestComponentExtractorBasics:
@@ -344,3 +345,86 @@ class TestEdgeCases:
         assert 'search-api' in components
         assert 'grc-policy-propagator' in components
         assert 'hive' in components
+
+
+class TestLongestMatch:
+    """Test that the longest known name wins at a position."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.extractor = ComponentExtractor()
+
+    def test_longer_name_sharing_prefix(self):
+        """Test that 'klusterlet-agent' is not reported as 'klusterlet'."""
+        components = self.extractor.extract_from_error("klusterlet-agent crashloop, klusterlet ok")
+        assert components == ['klusterlet-agent', 'klusterlet']
+
+    def test_shorter_name_when_suffix_unknown(self):
+        """Test that an unknown suffix falls back to the shorter name."""
+        components = self.extractor.extract_from_error("hive-foo failed, hive-operator degraded")
+        assert components == ['hive', 'hive-operator']
+
+
+class TestScanConsoleLog:
+    """Test the single-pass console log scan."""
+
+    LOG = (
+        "INFO: search-api initialized\n"
+        "ERROR: search-api returned 500\n"
+        "Failed: grc-policy-propagator and search-api unreachable\n"
+        "DEBUG: SEARCH-API retry\n"
+    )
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.extractor = ComponentExtractor()
+
+    def test_counts_and_offsets(self):
+        """Test per-component counts and byte offsets."""
+        scan = self.extractor.scan_console_log(self.LOG)
+        search = scan.occurrences['search-api']
+
+        assert search.count == 4
+        assert search.error_line_count == 2
+        assert search.first_line == 0
+        assert search.subsystem == 'Search'
+        assert [self.LOG.encode()[o:o + 10].lower() for o in search.offsets] == [b'search-api'] * 4
+
+    def test_error_line_context(self):
+        """Test that error lines are kept once per line."""
+        scan = self.extractor.scan_console_log(self.LOG)
+
+        assert scan.occurrences['search-api'].error_lines == [
+            (1, 'ERROR: search-api returned 500'),
+            (2, 'Failed: grc-policy-propagator and search-api unreachable'),
+        ]
+
+    def test_components_in_first_appearance_order(self):
+        """Test component ordering with and without the error filter."""
+        log = "INFO: hive ready\nERROR: search-api down\nERROR: hive down\n"
+        scan = self.extractor.scan_console_log(log)
+
+        assert scan.components(error_lines_only=False) == ['hive', 'search-api']
+        assert scan.components(error_lines_only=True) == ['search-api', 'hive']
+
+    def test_histogram_most_frequent_first(self):
+        """Test histogram ordering and serialization."""
+        data = self.extractor.scan_console_log(self.LOG).to_dict()
+
+        assert data['histogram'] == {'search-api': 4, 'grc-policy-propagator': 1}
+        assert data['total_hits'] == 5
+        assert data['components'][0]['error_lines'][0] == [1, 'ERROR: search-api returned 500']
+
+    def test_accepts_console_log(self):
+        """Test scanning a ConsoleLog directly."""
+        scan = self.extractor.scan_console_log(ConsoleLog.from_text(self.LOG))
+
+        assert scan.histogram() == {'search-api': 4, 'grc-policy-propagator': 1}
+        assert self.extractor.extract_from_console_log(ConsoleLog.from_text(self.LOG)) == [
+            'search-api', 'grc-policy-propagator',
+        ]
+
+    def test_empty(self):
+        """Test empty input."""
+        assert self.extractor.scan_console_log('').occurrences == {}
+        assert self.extractor.extract_from_console_log(None) == []
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the memory-mapped ConsoleLog.
+"""
+
+import re
+
+import pytest
+
+from src.services.console_log import ConsoleLog
+
+
+TEXT = (
+    'Started by upstream project "zstream-top" build number 45\n'
+    'Checking out Revision 0a1b2c3d4e5f (origin/release-2.16)\n'
+    '[Pipeline] stage (Run tests)\n'
+    '  1) creates cluster: AssertionError: Timed out retrying after 4000ms\n'
+    'Ünïcödé line with error\n'
+    'Finished: UNSTABLE\n'
+)
+
+
+@pytest.fixture(params=['file', 'memory'])
+def log(request, tmp_path):
+    if request.param == 'memory':
+        yield ConsoleLog.from_text(TEXT)
+        return
+    path = tmp_path / 'console-log.txt'
+    path.write_text(TEXT, encoding='utf-8')
+    with ConsoleLog(path) as console:
+        yield console
+
+
+class TestConsoleLogLines:
+    """Line index and random access."""
+
+    def test_line_numbering_matches_split(self, log):
+        expected = TEXT.split('\n')
+        assert log.line_count == len(expected)
+        assert log.lines() == expected
+
+    def test_random_access_and_negative_index(self, log):
+        assert log.line(1).startswith('Checking out Revision')
+        assert log.line(-2) == 'Finished: UNSTABLE'
+        with pytest.raises(IndexError):
+            log.line(100)
+
+    def test_head_tail_and_context(self, log):
+        assert log.head(1) == [TEXT.split('\n')[0]]
+        assert log.tail(2) == ['Finished: UNSTABLE', '']
+        assert log.context(0, before=3, after=1) == TEXT.split('\n')[:2]
+
+    def test_multibyte_text_decodes(self, log):
+        assert log.line(4) == 'Ünïcödé line with error'
+
+
+class TestConsoleLogSearch:
+    """Regex search over byte ranges."""
+
+    def test_search_returns_decoded_groups_and_line(self, log):
+        match = log.search(r'Checking out Revision [a-f0-9]+ \(origin/([^\)]+)\)')
+
+        assert match.group(1) == 'release-2.16'
+        assert match.line_number == 1
+
+    def test_search_respects_byte_range(self, log):
+        start, end = log.line_span(3)
+
+        assert log.search(r'Revision', start=start, end=end) is None
+        assert log.search(r'Timed out', start=start, end=end).line_number == 3
+
+    def test_grep_yields_each_line_once(self, log):
+        hits = list(log.grep(r'e', re.IGNORECASE, end=log.line_span(1)[1]))
+
+        assert [n for n, _ in hits] == [0, 1]
+
+    def test_compiled_str_pattern_is_accepted(self, log):
+        pattern = re.compile(r'finished: (\w+)', re.IGNORECASE)
+
+        assert log.search(pattern).group(1) == 'UNSTABLE'
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'console-log.txt'
+    path.write_text('')
+
+    with ConsoleLog(path) as log:
+        assert not log
+        assert log.line_count == 1
+        assert log.search('anything') is None
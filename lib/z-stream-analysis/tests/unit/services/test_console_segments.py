@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Unit tests for console log segmentation.
+"""
+
+import pytest
+
+from src.services.console_log import ConsoleLog
+from src.services.console_segments import (
+    INDEX_FILENAME,
+    ConsoleIndex,
+    ConsoleSegmenter,
+    parse_cypress_duration,
+)
+
+
+CONSOLE = """\
+Started by upstream project "zstream-top" build number 45
+[Pipeline] Start of Pipeline
+[Pipeline] stage
+[2024-05-01T10:00:00.000Z] [Pipeline] { (Checkout)
+[2024-05-01T10:00:01.000Z] Checking out Revision abc123
+[Pipeline] }
+[2024-05-01T10:00:05.500Z] [Pipeline] // stage
+[Pipeline] stage
+[2024-05-01T10:00:06.000Z] [Pipeline] { (Test)
+[Pipeline] parallel
+[Pipeline] { (Branch: chrome)
+
+====================================================================================================
+
+  Running:  cluster/create.cy.js                                                            (1 of 2)
+
+  create cluster
+    ✓ creates aws cluster (12000ms)
+    1) creates gcp cluster
+
+  1 passing (1m)
+  1 failing
+
+  1) create cluster
+       creates gcp cluster:
+     AssertionError: Timed out retrying after 4000ms: Expected to find element: #cluster
+
+  (Results)
+
+  ┌────────────────────────────────────────────────────────────────────────────────────────────────┐
+  │ Tests:        2                                                                                │
+  │ Passing:      1                                                                                │
+  │ Failing:      1                                                                                │
+  │ Pending:      0                                                                                │
+  │ Skipped:      0                                                                                │
+  │ Duration:     1 minute, 2 seconds                                                              │
+  │ Spec Ran:     cluster/create.cy.js                                                             │
+  └────────────────────────────────────────────────────────────────────────────────────────────────┘
+
+  Running:  cluster/destroy.cy.js                                                           (2 of 2)
+
+    ✓ destroys cluster (3000ms)
+
+  (Results)
+
+  ┌────────────────────────────────────────────────────────────────────────────────────────────────┐
+  │ Tests:        1                                                                                │
+  │ Passing:      1                                                                                │
+  │ Failing:      0                                                                                │
+  │ Duration:     3 seconds                                                                        │
+  └────────────────────────────────────────────────────────────────────────────────────────────────┘
+
+  (Run Finished)
+
+[Pipeline] }
+[Pipeline] // parallel
+ERROR: script returned exit code 1
+[2024-05-01T10:01:30.000Z] [Pipeline] // stage
+[Pipeline] stage
+[Pipeline] { (Publish)
+Stage "Publish" skipped due to earlier failure(s)
+[Pipeline] }
+[Pipeline] // stage
+[Pipeline] End of Pipeline
+Finished: FAILURE
+"""
+
+
+@pytest.fixture
+def console():
+    return ConsoleLog.from_text(CONSOLE)
+
+
+@pytest.fixture
+def index(console):
+    return ConsoleSegmenter().segment(console)
+
+
+class TestConsoleSegmenter:
+    """Tests for ConsoleSegmenter.segment()."""
+
+    def test_stages_in_order_with_status(self, index):
+        assert [(s.name, s.status) for s in index.stages] == [
+            ('Checkout', 'passed'), ('Test', 'failed'), ('Publish', 'skipped'),
+        ]
+
+    def test_stage_byte_range_covers_open_to_close(self, index, console):
+        checkout = index.stage('Checkout')
+
+        text = console.text(checkout.start, checkout.end)
+        assert text.startswith('[2024-05-01T10:00:00.000Z] [Pipeline] { (Checkout)')
+        assert text.endswith('[Pipeline] // stage\n')
+        assert console.lines(checkout.start_line, checkout.end_line) == text.splitlines()
+
+    def test_stage_timing_from_timestamps(self, index):
+        assert index.stage('Checkout').duration_seconds == 5.5
+        assert index.stage('Test').duration_seconds == 84.0
+        assert index.stage('Publish').duration_seconds is None
+
+    def test_parallel_branches_are_not_stages(self, index):
+        assert all(not s.name.startswith('Branch:') for s in index.stages)
+
+    def test_specs_with_results(self, index):
+        create, destroy = index.specs
+
+        assert (create.name, create.status, create.parent) == ('cluster/create.cy.js', 'failed', 'Test')
+        assert create.tests == {'tests': 2, 'passing': 1, 'failing': 1, 'pending': 0, 'skipped': 0}
+        assert create.duration_seconds == 62.0
+        assert (destroy.status, destroy.duration_seconds) == ('passed', 3.0)
+
+    def test_spec_slice_ends_at_next_spec(self, index, console):
+        create, destroy = index.specs
+
+        assert create.end == destroy.start
+        text = console.text(create.start, create.end)
+        assert 'creates gcp cluster' in text
+        assert 'destroys cluster' not in text
+        assert '(Run Finished)' not in console.text(destroy.start, destroy.end)
+
+    def test_failed_specs(self, index):
+        assert [s.name for s in index.failed_specs()] == ['cluster/create.cy.js']
+
+    def test_unterminated_spec_runs_to_end_of_log(self):
+        console = ConsoleLog.from_text('  Running:  a.cy.js   (1 of 1)\n  partial output')
+
+        spec = ConsoleSegmenter().segment(console).specs[0]
+
+        assert (spec.end, spec.end_line, spec.status) == (console.size, console.line_count, None)
+
+    def test_empty_log(self):
+        index = ConsoleSegmenter().segment(ConsoleLog.from_text(''))
+
+        assert index.stages == [] and index.specs == []
+
+
+class TestConsoleIndex:
+    """Tests for ConsoleIndex lookup and persistence."""
+
+    @pytest.mark.parametrize('test_file', [
+        'cluster/create.cy.js',
+        'cypress/e2e/cluster/create.cy.js',
+        './cluster/create.cy.js',
+    ])
+    def test_spec_for_matches_path_suffixes(self, index, test_file):
+        assert index.spec_for(test_file).name == 'cluster/create.cy.js'
+
+    def test_spec_for_unknown(self, index):
+        assert index.spec_for('other/create.cy.js') is None
+        assert index.spec_for(None) is None
+
+    def test_round_trip(self, index, tmp_path):
+        path = tmp_path / INDEX_FILENAME
+        index.save(path)
+
+        loaded = ConsoleIndex.load(path)
+
+        assert loaded == index
+
+    def test_load_rejects_other_versions(self, tmp_path):
+        path = tmp_path / INDEX_FILENAME
+        path.write_text('{"version": 0, "size": 1}')
+
+        assert ConsoleIndex.load(path) is None
+        assert ConsoleIndex.load(tmp_path / 'missing.json') is None
+
+    def test_load_or_build_reuses_matching_sidecar(self, console, tmp_path):
+        segmenter = ConsoleSegmenter()
+        built = segmenter.load_or_build(console, tmp_path)
+        assert (tmp_path / INDEX_FILENAME).exists()
+
+        segmenter.segment = None  # a rebuild would fail
+        assert segmenter.load_or_build(console, tmp_path) == built
+
+    def test_load_or_build_rebuilds_for_changed_log(self, console, tmp_path):
+        ConsoleSegmenter().load_or_build(ConsoleLog.from_text('other log'), tmp_path)
+
+        index = ConsoleSegmenter().load_or_build(console, tmp_path)
+
+        assert index.size == console.size
+        assert len(index.specs) == 2
+
+
+class TestParseCypressDuration:
+    """Tests for parse_cypress_duration()."""
+
+    @pytest.mark.parametrize('value,expected', [
+        ('1 minute, 2 seconds', 62.0),
+        ('45 seconds', 45.0),
+        ('2 hours, 1 minute, 3 seconds', 7263.0),
+        ('831ms', 0.831),
+        ('01:02', 62.0),
+        ('1:00:05', 3605.0),
+        ('n/a', None),
+    ])
+    def test_formats(self, value, expected):
+        assert parse_cypress_duration(value) == expected
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for failure fingerprinting and clustering.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from src.services.failure_clustering import FailureClusterer, normalize_error
+from src.services.stack_trace_parser import StackTraceParser
+
+
+def _trace(spec='cluster/create.cy.js', line=42):
+    return (
+        "AssertionError: Timed out\n"
+        f"    at Context.eval (cypress/e2e/{spec}:{line}:10)\n"
+        "    at cy.getCluster (cypress/support/commands.js:120:5)\n"
+        "    at node_modules/cypress/runner.js:100:3"
+    )
+
+
+def _test(name, error, trace, failure_type='timeout'):
+    return {'test_name': name, 'error_message': error, 'stack_trace': trace, 'failure_type': failure_type}
+
+
+class TestNormalizeError:
+    """Tests for normalize_error()."""
+
+    @pytest.mark.parametrize('text,expected', [
+        ('Timed out retrying after 4000ms', 'Timed out retrying after <n>ms'),
+        ('cluster clc-aws-1713 not found', 'cluster clc-aws-<n> not found'),
+        ('uid 3f2b8c1e-9d4a-4f6b-8e2a-1c5d7e9f0a3b missing', 'uid <uuid> missing'),
+        ('at 2024-05-01T10:00:00.123Z: failed', 'at <ts>: failed'),
+        ('connect to 10.0.12.4:6443 refused', 'connect to <ip> refused'),
+        ('commit 9fceb02d0ae598e95dc970b74767f19372d61af8 broke it', 'commit <hex> broke it'),
+        ('a   b\n\tc', 'a b c'),
+    ])
+    def test_placeholders(self, text, expected):
+        assert normalize_error(text) == expected
+
+    def test_words_that_look_like_hex_are_kept(self):
+        assert normalize_error('deadbeef accepted') == 'deadbeef accepted'
+
+    def test_empty(self):
+        assert normalize_error(None) == ''
+
+
+class TestFailureClusterer:
+    """Tests for FailureClusterer."""
+
+    @pytest.fixture
+    def clusterer(self):
+        return FailureClusterer(StackTraceParser())
+
+    def test_top_user_frames_skip_framework(self, clusterer):
+        frames = clusterer.top_user_frames(_trace())
+
+        assert frames[0].startswith('cypress/e2e/cluster/create.cy.js:42:')
+        assert not any('node_modules' in f for f in frames)
+
+    def test_same_failure_with_different_ids_clusters(self, clusterer):
+        tests = [
+            _test('a', 'Expected to find element: #cluster-1 after 4000ms', _trace()),
+            _test('b', 'Expected to find element: #cluster-27 after 4000ms', _trace()),
+        ]
+
+        clusters = clusterer.cluster(tests)
+
+        assert len(clusters) == 1
+        assert clusters[0].indices == [0, 1]
+        assert clusters[0].tests == ['a', 'b']
+        assert clusters[0].signature == 'Expected to find element: #cluster-<n> after <n>ms'
+
+    def test_different_code_path_splits(self, clusterer):
+        tests = [
+            _test('a', 'Expected to find element: #create', _trace(line=42)),
+            _test('b', 'Expected to find element: #create', _trace(line=57)),
+            _test('c', 'Expected to find element: #create', _trace(line=42), failure_type='element_not_found'),
+        ]
+
+        assert len(clusterer.cluster(tests)) == 3
+
+    def test_clusters_in_first_appearance_order(self, clusterer):
+        tests = [
+            _test('a', 'error A', _trace()),
+            _test('b', 'error B', _trace()),
+            _test('c', 'error A', _trace()),
+        ]
+
+        clusters = clusterer.cluster(tests)
+
+        assert [c.tests for c in clusters] == [['a', 'c'], ['b']]
+        assert [c.representative for c in clusters] == [0, 1]
+
+    def test_identical_failures_are_parsed_once(self):
+        parser = Mock(wraps=StackTraceParser())
+        tests = [_test(str(i), 'Request failed with status 503', _trace()) for i in range(50)]
+
+        clusters = FailureClusterer(parser).cluster(tests)
+
+        assert parser.parse.call_count == 1
+        assert clusters[0].size == 50
+
+    def test_to_dict(self, clusterer):
+        cluster = clusterer.cluster([_test('a', 'boom 1', _trace())])[0]
+
+        data = cluster.to_dict()
+
+        assert data['test_count'] == 1
+        assert data['tests'] == ['a']
+        assert data['cluster_id'] == cluster.cluster_id
+        assert len(data['cluster_id']) == 12
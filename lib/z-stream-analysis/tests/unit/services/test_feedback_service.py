@@ -302,6 +302,9 @@ class TestIndexManagement:
             test_name='test_policy_create',
             is_correct=True,
         )
+        # Submissions only append to the log; the index is folded on read
+        assert (tmp_runs / 'feedback-log.jsonl').exists()
+        service.get_accuracy_stats()
 
         index_path = tmp_runs / 'feedback-index.json'
         assert index_path.exists()
@@ -317,6 +320,7 @@ class TestIndexManagement:
         service.submit_feedback('job_20260113_153000', 'test_search_query', False,
                                 correct_classification='PRODUCT_BUG')
         service.submit_feedback('job_20260113_153000', 'test_cluster_create', True)
+        service.get_accuracy_stats()
 
         index = json.loads((tmp_runs / 'feedback-index.json').read_text())
         run_stats = index['runs']['job_20260113_153000']
@@ -325,3 +329,94 @@ class TestIndexManagement:
         assert run_stats['correct_count'] == 2
         assert run_stats['incorrect_count'] == 1
         assert abs(run_stats['accuracy'] - 0.6667) < 0.01
+
+
+class TestFeedbackLog:
+    """Test the append-only feedback log and incrementally maintained aggregates."""
+
+    def _log_lines(self, runs_dir):
+        return (runs_dir / 'feedback-log.jsonl').read_text().splitlines()
+
+    def test_submission_appends_one_line(self, tmp_runs):
+        service = FeedbackService(runs_dir=str(tmp_runs))
+
+        service.submit_feedback('job_20260113_153000', 'test_policy_create', True)
+        service.submit_feedback('job_20260113_153000', 'test_search_query', False,
+                                correct_classification='PRODUCT_BUG')
+
+        lines = [json.loads(l) for l in self._log_lines(tmp_runs)]
+        assert [l['test_name'] for l in lines] == ['test_policy_create', 'test_search_query']
+        assert lines[1]['previous'] is None
+
+    def test_resubmission_replaces_previous_verdict(self, tmp_runs):
+        service = FeedbackService(runs_dir=str(tmp_runs))
+
+        service.submit_feedback('job_20260113_153000', 'test_search_query', False,
+                                correct_classification='PRODUCT_BUG')
+        service.get_accuracy_stats()
+        service.submit_feedback('job_20260113_153000', 'test_search_query', True)
+
+        stats = service.get_accuracy_stats()
+        assert (stats['total_tests_rated'], stats['overall_accuracy']) == (1, 1.0)
+        assert service.get_misclassification_patterns() == {}
+
+    def test_batch_retracts_tests_it_no_longer_covers(self, tmp_runs):
+        service = FeedbackService(runs_dir=str(tmp_runs))
+        service.submit_feedback('job_20260113_153000', 'test_search_query', False,
+                                correct_classification='PRODUCT_BUG')
+
+        service.submit_run_feedback('job_20260113_153000', [
+            {'test_name': 'test_policy_create', 'is_correct': True},
+        ], overall_accuracy=0.9)
+
+        stats = service.get_accuracy_stats()
+        assert (stats['total_tests_rated'], stats['total_correct']) == (1, 1)
+        assert service.get_misclassification_patterns() == {}
+        index = json.loads((tmp_runs / 'feedback-index.json').read_text())
+        assert index['runs']['job_20260113_153000']['overall_accuracy'] == 0.9
+
+    def test_accuracy_by_classification_and_feature_area(self, tmp_runs):
+        run_dir = tmp_runs / 'job_20260113_153000'
+        analysis = json.loads((run_dir / 'analysis-results.json').read_text())
+        for test, area in zip(analysis['per_test_analysis'], ['GRC', 'Search', 'CLC']):
+            test['feature_area'] = area
+        (run_dir / 'analysis-results.json').write_text(json.dumps(analysis))
+        service = FeedbackService(runs_dir=str(tmp_runs))
+
+        service.submit_feedback('job_20260113_153000', 'test_policy_create', True)
+        service.submit_feedback('job_20260113_153000', 'test_search_query', False,
+                                correct_classification='PRODUCT_BUG')
+        service.submit_feedback('job_20260113_153000', 'test_cluster_create', True)
+
+        stats = service.get_accuracy_stats()
+        assert stats['by_classification']['AUTOMATION_BUG'] == {'rated': 2, 'correct': 1, 'accuracy': 0.5}
+        assert stats['by_classification']['INFRASTRUCTURE']['accuracy'] == 1.0
+        assert stats['by_feature_area']['Search'] == {'rated': 1, 'correct': 0, 'accuracy': 0.0}
+
+    def test_stats_fold_only_new_log_lines(self, tmp_runs, monkeypatch):
+        service = FeedbackService(runs_dir=str(tmp_runs))
+        service.submit_feedback('job_20260113_153000', 'test_policy_create', True)
+        service.get_accuracy_stats()
+        service.submit_feedback('job_20260113_153000', 'test_cluster_create', True)
+
+        applied = []
+        original = FeedbackService._apply_event
+        monkeypatch.setattr(FeedbackService, '_apply_event',
+                            staticmethod(lambda agg, e: (applied.append(e['test_name']), original(agg, e))))
+        monkeypatch.setattr(FeedbackService, '_load_run_feedback', None)  # no run directory scans
+
+        assert service.get_accuracy_stats()['total_tests_rated'] == 2
+        assert applied == ['test_cluster_create']
+
+    def test_existing_run_feedback_is_migrated(self, tmp_runs):
+        feedback = RunFeedback(run_id='job_20260113_153000', test_feedbacks=[
+            ClassificationFeedback(test_name='test_search_query', run_id='job_20260113_153000',
+                                   original_classification='AUTOMATION_BUG',
+                                   correct_classification='PRODUCT_BUG', is_correct=False),
+        ])
+        FeedbackService(runs_dir=str(tmp_runs))._save_run_feedback(tmp_runs / 'job_20260113_153000', feedback)
+
+        service = FeedbackService(runs_dir=str(tmp_runs))
+
+        assert service.get_misclassification_patterns() == {'AUTOMATION_BUG -> PRODUCT_BUG': 1}
+        assert len(self._log_lines(tmp_runs)) == 1
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for JenkinsAPIClient field-selective (tree=) fetches.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.services.jenkins_api_client import (
+    BUILD_INFO_TREE,
+    TEST_REPORT_TREE,
+    JenkinsAPIClient,
+    with_tree,
+)
+from src.services.jenkins_intelligence_service import JenkinsIntelligenceService
+
+
+BUILD_URL = 'https://jenkins.example.com/job/qe/job/clc-e2e-pipeline/3313/'
+
+
+@pytest.fixture
+def client():
+    return JenkinsAPIClient(username='user', api_token='token', base_url='https://jenkins.example.com')
+
+
+class TestWithTree:
+    """Tests for the tree= URL helper."""
+
+    def test_no_tree_leaves_url_unchanged(self):
+        assert with_tree('https://j/api/json', None) == 'https://j/api/json'
+
+    def test_brackets_are_percent_encoded(self):
+        url = with_tree('https://j/api/json', 'suites[cases[name,status]]')
+
+        assert url == 'https://j/api/json?tree=suites%5Bcases%5Bname,status%5D%5D'
+        assert '[' not in url
+
+
+class TestTreeFilteredRequests:
+    """Tests that get_build_info / get_test_report forward the selector."""
+
+    def test_get_test_report_full_by_default(self, client):
+        with patch.object(client, '_make_request', return_value=(True, {}, None)) as req:
+            client.get_test_report(BUILD_URL)
+
+        assert req.call_args.args[0].endswith('/3313/testReport/api/json')
+
+    def test_get_test_report_with_tree(self, client):
+        with patch.object(client, '_make_request', return_value=(True, {}, None)) as req:
+            client.get_test_report(BUILD_URL, tree=TEST_REPORT_TREE)
+
+        url = req.call_args.args[0]
+        assert '/job/qe/job/clc-e2e-pipeline/3313/testReport/api/json?tree=' in url
+        assert 'stdout' not in url
+
+    def test_get_build_info_with_tree(self, client):
+        with patch.object(client, '_make_request', return_value=(True, {}, None)) as req:
+            client.get_build_info(BUILD_URL, tree=BUILD_INFO_TREE)
+
+        assert '/3313/api/json?tree=result,timestamp' in req.call_args.args[0]
+
+
+class TestSelectorsCoverProcessing:
+    """The selectors must include every field the intelligence service reads."""
+
+    def test_test_report_tree_feeds_process_test_report(self):
+        service = JenkinsIntelligenceService(use_api_client=False)
+        # Shape of a TEST_REPORT_TREE response: no stdout, nulls for passing cases
+        data = {
+            'duration': 12.5, 'passCount': 1, 'failCount': 1, 'skipCount': 0,
+            'suites': [{'cases': [
+                {'className': 'a', 'name': 'passes', 'status': 'PASSED', 'duration': 1.0,
+                 'errorDetails': None, 'errorStackTrace': None},
+                {'className': 'a', 'name': 'fails', 'status': 'FAILED', 'duration': 2.0,
+                 'errorDetails': 'Timed out retrying after 4000ms', 'errorStackTrace': 'Error\n    at x (a.js:1:1)'},
+            ]}],
+        }
+
+        report = service._process_test_report(data)
+
+        assert report.total_tests == 2
+        assert [t.test_name for t in report.failed_tests] == ['fails']
+        assert report.failed_tests[0].failure_type == 'timeout'
+
+    @pytest.mark.parametrize('field', ['className', 'name', 'status', 'duration',
+                                       'errorDetails', 'errorStackTrace'])
+    def test_case_fields_selected(self, field):
+        assert field in TEST_REPORT_TREE
+
+    @pytest.mark.parametrize('field', ['result', 'timestamp', 'parameters[name,value]',
+                                       'artifacts[fileName]', 'building'])
+    def test_build_info_fields_selected(self, field):
+        assert field in BUILD_INFO_TREE
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Jenkins downstream tree crawler.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from src.services.jenkins_api_client import JenkinsAPIClient
+from src.services.jenkins_downstream_tree import (
+    BUILD_TREE,
+    DownstreamBuild,
+    DownstreamTreeCrawler,
+)
+
+
+JENKINS = 'https://jenkins.example.com'
+ROOT = f'{JENKINS}/job/zstream-top/45/'
+CLC = f'{JENKINS}/job/clc-e2e-pipeline/3313/'
+GRC = f'{JENKINS}/job/folder/job/grc-e2e/77/'
+
+TEST_ACTION = 'hudson.tasks.junit.TestResultAction'
+
+
+def _build(number, result='FAILURE', building=False, actions=None, sub_builds=None):
+    data = {
+        'number': number,
+        'result': result,
+        'building': building,
+        'duration': 1000,
+        'timestamp': 1700000000000,
+        'actions': actions or [],
+    }
+    if sub_builds is not None:
+        data['subBuilds'] = sub_builds
+    return data
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache():
+    DownstreamTreeCrawler._finished_cache.clear()
+    yield
+    DownstreamTreeCrawler._finished_cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    """Mock client that still uses the real URL parser."""
+    client = Mock()
+    real = JenkinsAPIClient.__new__(JenkinsAPIClient)
+    client.parse_build_url.side_effect = real.parse_build_url
+    client.base_url = None
+
+    builds = {
+        ROOT: _build(45, sub_builds=[
+            {'jobName': 'clc-e2e-pipeline', 'buildNumber': 3313, 'url': 'job/clc-e2e-pipeline/3313/'},
+        ]),
+        CLC: _build(3313, actions=[
+            {'_class': TEST_ACTION, 'failCount': 4, 'skipCount': 0, 'totalCount': 120},
+        ]),
+        GRC: _build(77, result='SUCCESS', actions=[
+            {'_class': TEST_ACTION, 'failCount': 0, 'skipCount': 1, 'totalCount': 30},
+        ]),
+    }
+    builds[ROOT]['actions'] = [{'triggeredBuilds': [{'url': GRC}]}]
+
+    def get_build_info(url, tree=None):
+        data = builds.get(url)
+        return (True, data, None) if data else (False, None, 'Resource not found (404)')
+
+    client.get_build_info.side_effect = get_build_info
+    client.get_console_output.return_value = (True, '', None)
+    return client
+
+
+class TestDownstreamTreeCrawler:
+    """Tests for DownstreamTreeCrawler.crawl()."""
+
+    def test_builds_tree_from_sub_builds_and_triggered_builds(self, api_client):
+        tree = DownstreamTreeCrawler(api_client=api_client).crawl(ROOT)
+
+        assert [c.url for c in tree.children] == [CLC, GRC]
+        assert all(c.depth == 1 for c in tree.children)
+        assert tree.children[0].fail_count == 4
+        assert tree.children[0].total_count == 120
+
+    def test_uses_minimal_tree_selector(self, api_client):
+        DownstreamTreeCrawler(api_client=api_client).crawl(ROOT)
+
+        for call in api_client.get_build_info.call_args_list:
+            assert call.kwargs['tree'] == BUILD_TREE
+
+    def test_failed_test_builds_drive_batch_gathering(self, api_client):
+        tree = DownstreamTreeCrawler(api_client=api_client).crawl(ROOT)
+
+        assert [b.url for b in tree.failed_test_builds()] == [CLC]
+
+    def test_finished_builds_are_cached_across_crawls(self, api_client):
+        DownstreamTreeCrawler(api_client=api_client).crawl(ROOT)
+        first_calls = api_client.get_build_info.call_count
+
+        crawler = DownstreamTreeCrawler(api_client=api_client)
+        crawler.crawl(ROOT)
+
+        assert api_client.get_build_info.call_count == first_calls
+        assert crawler.cache_hits == 3
+        assert crawler.cache_misses == 0
+
+    def test_running_builds_are_not_cached(self, api_client):
+        api_client.get_build_info.side_effect = None
+        api_client.get_build_info.return_value = (True, _build(45, result=None, building=True), None)
+
+        DownstreamTreeCrawler(api_client=api_client).crawl(ROOT)
+        DownstreamTreeCrawler(api_client=api_client).crawl(ROOT)
+
+        assert api_client.get_build_info.call_count == 2
+
+    def test_disk_cache_survives_process_cache_reset(self, api_client, tmp_path):
+        DownstreamTreeCrawler(api_client=api_client, cache_dir=str(tmp_path)).crawl(ROOT)
+        DownstreamTreeCrawler._finished_cache.clear()
+        api_client.get_build_info.reset_mock()
+
+        tree = DownstreamTreeCrawler(api_client=api_client, cache_dir=str(tmp_path)).crawl(ROOT)
+
+        api_client.get_build_info.assert_not_called()
+        assert len(tree.children) == 2
+
+    def test_max_depth_limits_expansion(self, api_client):
+        tree = DownstreamTreeCrawler(api_client=api_client, max_depth=0).crawl(ROOT)
+
+        assert tree.children == []
+
+    def test_console_fallback_for_pipeline_build_step(self, api_client):
+        api_client.get_build_info.side_effect = None
+        api_client.get_build_info.return_value = (True, _build(45), None)
+        api_client.get_console_output.return_value = (
+            True,
+            'Scheduling project: folder » grc-e2e\n'
+            'Starting building: folder » grc-e2e #77\n',
+            None,
+        )
+
+        tree = DownstreamTreeCrawler(api_client=api_client, max_depth=1).crawl(ROOT)
+
+        assert [c.url for c in tree.children] == [GRC]
+
+    def test_fetch_error_recorded_on_node(self, api_client):
+        tree = DownstreamTreeCrawler(api_client=api_client).crawl(f'{JENKINS}/job/missing/1/')
+
+        assert tree.error == 'Resource not found (404)'
+        assert tree.children == []
+
+
+class TestDownstreamBuild:
+    """Tests for the DownstreamBuild tree structure."""
+
+    def test_to_dict_is_compact_and_nested(self):
+        leaf = DownstreamBuild(url=CLC, job_name='clc-e2e-pipeline', build_number=3313,
+                               depth=1, fail_count=2, total_count=10)
+        root = DownstreamBuild(url=ROOT, job_name='zstream-top', build_number=45, children=[leaf])
+
+        data = root.to_dict()
+
+        assert 'fail_count' not in data
+        assert data['children'][0]['fail_count'] == 2
+        assert data['children'][0]['children'] == []
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-run Jenkins evidence store.
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.services.jenkins_evidence_store import JenkinsEvidenceStore
+from src.services.jenkins_intelligence_service import JenkinsIntelligenceService
+from src.services.jenkins_intelligence_service import TestReport as JenkinsTestReport
+
+
+URL = 'https://jenkins.example.com/job/clc-e2e-pipeline/3313/'
+
+
+def _report():
+    return JenkinsTestReport(total_tests=3, passed_count=2, failed_count=1, skipped_count=0,
+                      pass_rate=66.7, failed_tests=[], duration=12.0)
+
+
+@pytest.fixture
+def service():
+    svc = Mock(spec=JenkinsIntelligenceService)
+    svc._fetch_build_info.return_value = {'result': 'UNSTABLE', 'parameters': {}}
+    svc._fetch_console_log.return_value = 'Started by timer\nFinished: UNSTABLE\n'
+    svc._fetch_and_analyze_test_report.return_value = _report()
+    return svc
+
+
+class TestJenkinsEvidenceStore:
+    """Tests for JenkinsEvidenceStore."""
+
+    def test_each_payload_fetched_once(self, service):
+        store = JenkinsEvidenceStore(URL, service)
+
+        for _ in range(3):
+            store.build_info()
+            store.console_log()
+            store.test_report()
+
+        service._fetch_build_info.assert_called_once_with(URL)
+        service._fetch_console_log.assert_called_once_with(URL)
+        service._fetch_and_analyze_test_report.assert_called_once_with(URL)
+        assert store.fetch_counts == {'build_info': 1, 'console': 1, 'test_report': 1}
+
+    def test_missing_test_report_is_cached(self, service):
+        service._fetch_and_analyze_test_report.return_value = None
+        store = JenkinsEvidenceStore(URL, service)
+
+        assert store.test_report() is None
+        assert store.test_report() is None
+        service._fetch_and_analyze_test_report.assert_called_once()
+
+    def test_concurrent_consumers_share_one_fetch(self, service):
+        started = threading.Event()
+
+        def slow_fetch(url):
+            started.wait(1)
+            return 'log'
+
+        service._fetch_console_log.side_effect = slow_fetch
+        store = JenkinsEvidenceStore(URL, service)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(store.console_log())) for _ in range(4)]
+        for t in threads:
+            t.start()
+        started.set()
+        for t in threads:
+            t.join()
+
+        assert results == ['log'] * 4
+        service._fetch_console_log.assert_called_once()
+
+    def test_save_console_and_reload_from_handle(self, service, tmp_path):
+        path = tmp_path / 'console-log.txt'
+        store = JenkinsEvidenceStore(URL, service, console_path=path)
+
+        assert store.save_console() == path
+        assert path.read_text() == service._fetch_console_log.return_value
+
+        # A later consumer of the same run reads the file instead of refetching
+        service._fetch_console_log.reset_mock()
+        reloaded = JenkinsEvidenceStore(URL, service, console_path=path)
+        assert reloaded.console_log() == path.read_text()
+        service._fetch_console_log.assert_not_called()
+
+    def test_save_console_skips_empty_log(self, service, tmp_path):
+        service._fetch_console_log.return_value = ''
+        store = JenkinsEvidenceStore(URL, service, console_path=tmp_path / 'console-log.txt')
+
+        assert store.save_console() is None
+        assert not (tmp_path / 'console-log.txt').exists()
+
+
+class TestAnalyzeWithEvidence:
+    """analyze_jenkins_url() fetches through the shared store."""
+
+    def test_test_report_reused_by_later_consumers(self):
+        service = JenkinsIntelligenceService(use_api_client=False)
+        service._fetch_build_info = Mock(return_value={'result': 'UNSTABLE', 'parameters': {}})
+        service._fetch_console_log = Mock(return_value='')
+        service._fetch_and_analyze_test_report = Mock(return_value=_report())
+        store = JenkinsEvidenceStore(URL, service)
+
+        intelligence = service.analyze_jenkins_url(URL, skip_console_fetch=True, evidence=store)
+
+        assert store.test_report() is intelligence.test_report
+        service._fetch_and_analyze_test_report.assert_called_once()
+        service._fetch_console_log.assert_not_called()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit tests for streaming Jenkins test report parsing.
+"""
+
+import io
+import json
+import sys
+
+import pytest
+
+from src.services.jenkins_intelligence_service import JenkinsIntelligenceService
+from src.services.jenkins_report_stream import iter_test_report
+from src.services.shared_utils import stream_subprocess_output
+
+
+REPORT = {
+    'duration': 812.5,
+    'failCount': 2,
+    'passCount': 3,
+    'skipCount': 1,
+    'suites': [
+        {
+            'name': 'clc-create',
+            'duration': 400.25,
+            'cases': [
+                {'className': 'clc.create', 'name': 'creates aws cluster',
+                 'status': 'PASSED', 'duration': 120.125},
+                {'className': 'clc.create', 'name': 'creates gcp cluster',
+                 'status': 'FAILED', 'duration': 98765.4321,
+                 'errorDetails': 'Timed out retrying after 4000ms: Expected to find element: #cluster',
+                 'errorStackTrace': 'AssertionError: Timed out\n    at Context.eval (cypress/e2e/create.cy.js:42:10)'},
+                {'className': 'clc.create', 'name': 'skipped case',
+                 'status': 'SKIPPED', 'duration': 0},
+            ],
+        },
+        {
+            'name': 'clc-destroy',
+            'cases': [
+                {'className': 'clc.destroy', 'name': 'destroys cluster "a\\b"',
+                 'status': 'REGRESSION', 'duration': 1.5,
+                 'errorDetails': 'Expected 200 but got 500', 'errorStackTrace': None},
+                {'className': 'clc.destroy', 'name': 'ok', 'status': 'FIXED', 'duration': 3},
+                {'className': 'clc.destroy', 'name': 'ok 2', 'status': 'PASSED', 'duration': 4},
+            ],
+        },
+    ],
+}
+
+
+def _stream(data, indent=None):
+    return io.StringIO(json.dumps(data, indent=indent))
+
+
+class TestIterTestReport:
+    """Tests for iter_test_report()."""
+
+    @pytest.mark.parametrize('read_size', [1, 3, 7, 64 * 1024])
+    def test_yields_every_case_then_summary(self, read_size):
+        events = list(iter_test_report(_stream(REPORT, indent=2), read_size=read_size))
+
+        cases = [v for k, v in events if k == 'case']
+        expected = [c for s in REPORT['suites'] for c in s['cases']]
+        assert cases == expected
+        assert events[-1] == ('summary', {k: v for k, v in REPORT.items() if k != 'suites'})
+
+    def test_numbers_split_across_chunks(self):
+        # Place a number right at a chunk boundary
+        text = '{"duration": 1234567.891, "suites": []}'
+        events = list(iter_test_report(io.StringIO(text), read_size=16))
+
+        assert events == [('summary', {'duration': 1234567.891})]
+
+    def test_empty_suites(self):
+        events = list(iter_test_report(io.StringIO('{"suites": [{"cases": []}, {}]}')))
+
+        assert events == [('summary', {})]
+
+    def test_html_response_raises_value_error(self):
+        with pytest.raises(ValueError):
+            list(iter_test_report(io.StringIO('<html><body>404 Not Found</body></html>')))
+
+    def test_truncated_report_raises_value_error(self):
+        text = json.dumps(REPORT)[:200]
+        with pytest.raises(ValueError):
+            list(iter_test_report(io.StringIO(text), read_size=32))
+
+
+class TestProcessTestReportStream:
+    """Streaming and dict-based report processing must agree."""
+
+    @pytest.fixture
+    def service(self):
+        return JenkinsIntelligenceService()
+
+    def test_stream_matches_dict_processing(self, service):
+        from_dict = service._process_test_report(REPORT)
+        from_stream = service._process_test_report_stream(_stream(REPORT))
+
+        assert from_stream.total_tests == from_dict.total_tests == 6
+        assert from_stream.failed_count == from_dict.failed_count == 2
+        assert from_stream.pass_rate == from_dict.pass_rate
+        assert from_stream.duration == from_dict.duration
+        assert [t.test_name for t in from_stream.failed_tests] == \
+            [t.test_name for t in from_dict.failed_tests]
+        assert [t.failure_type for t in from_stream.failed_tests] == \
+            [t.failure_type for t in from_dict.failed_tests]
+
+    def test_counts_fall_back_to_case_tally(self, service):
+        report = {'suites': REPORT['suites']}
+
+        result = service._process_test_report_stream(_stream(report))
+
+        assert result.passed_count == 3
+        assert result.failed_count == 2
+        assert result.skipped_count == 1
+
+
+class TestStreamSubprocessOutput:
+    """Tests for running a command and handing its stdout to a consumer."""
+
+    @staticmethod
+    def _python(code):
+        return [sys.executable, '-c', code]
+
+    def test_large_stderr_does_not_block(self):
+        cmd = self._python("import sys; sys.stderr.write('e' * 500000); print('[1, 2]')")
+
+        success, result, error = stream_subprocess_output(cmd, json.load, timeout=30)
+
+        assert (success, result, error) == (True, [1, 2], '')
+
+    def test_nonzero_exit_reports_stderr(self):
+        cmd = self._python("import sys; sys.stderr.write('e' * 200000 + 'boom'); sys.exit(3)")
+
+        success, _, error = stream_subprocess_output(cmd, lambda f: f.read(), timeout=30)
+
+        assert not success
+        assert error.startswith('exit code 3: ') and error.endswith('boom')
+
+    def test_signal_death_is_not_a_timeout(self):
+        cmd = self._python("import os, signal; os.kill(os.getpid(), signal.SIGTERM)")
+
+        success, _, error = stream_subprocess_output(cmd, lambda f: f.read(), timeout=30)
+
+        assert not success
+        assert error == 'killed by SIGTERM'
+
+    def test_timeout(self):
+        cmd = self._python("import time; time.sleep(30)")
+
+        success, _, error = stream_subprocess_output(cmd, lambda f: f.read(), timeout=0.5)
+
+        assert (success, error) == (False, 'Timeout after 0.5 seconds')
+
+    def test_consumer_may_stop_early(self):
+        cmd = self._python("print('first'); print('x' * 1000000)")
+
+        success, result, _ = stream_subprocess_output(cmd, lambda f: f.readline().strip(), timeout=30)
+
+        assert (success, result) == (True, 'first')
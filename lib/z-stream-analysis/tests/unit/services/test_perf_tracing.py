@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Unit tests for performance spans and perf-summary.json.
+"""
+
+import json
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from src.logging_config import bind_context, get_context
+from src.services.perf_tracing import (
+    PERF_SUMMARY_FILENAME,
+    command_label,
+    current_span,
+    get_recorder,
+    note_cache,
+    span,
+    traced_run,
+)
+
+
+@pytest.fixture(autouse=True)
+def recorder():
+    bind_context(stage='gather')
+    recorder = get_recorder()
+    recorder.reset()
+    yield recorder
+    bind_context(stage='init', span_id=0)
+
+
+class TestSpans:
+    """Tests for nesting, context and error handling."""
+
+    def test_nesting_and_log_context(self, recorder):
+        with span('clone_repositories', kind='step') as outer:
+            assert get_context()['span_id'] == outer.id
+            with span('git clone', kind='subprocess') as inner:
+                inner.bytes += 10
+                assert current_span() is inner
+            assert get_context()['span_id'] == outer.id
+        assert get_context()['span_id'] == 0
+        assert current_span() is None
+
+        spans = {s.name: s for s in recorder.spans()}
+        assert spans['git clone'].parent_id == spans['clone_repositories'].id
+        assert spans['clone_repositories'].parent_id is None
+        assert spans['git clone'].stage == 'gather'
+
+    def test_exception_marks_error_and_propagates(self, recorder):
+        with pytest.raises(ValueError):
+            with span('kg.query', kind='kg'):
+                raise ValueError('boom')
+
+        [s] = recorder.spans()
+        assert (s.status, s.attrs['error']) == ('error', 'ValueError')
+
+    def test_cache_counts_on_span_and_totals(self, recorder):
+        with span('jenkins.build_info', kind='jenkins') as s:
+            note_cache('jenkins', False)
+        note_cache('jenkins', True)
+
+        assert (s.cache_hits, s.cache_misses) == (0, 1)
+        assert recorder.summary()['by_kind']['jenkins']['cache'] == {'hits': 1, 'misses': 1}
+
+
+class TestTracedRun:
+    """Tests for the subprocess.run wrapper."""
+
+    def test_records_bytes_and_exit_code(self, recorder):
+        completed = subprocess.CompletedProcess(['oc'], 1, stdout='abc', stderr='de')
+        with patch('subprocess.run', return_value=completed) as run:
+            result = traced_run(['oc', '--kubeconfig', '/k', 'get', 'pods'], capture_output=True, text=True)
+
+        assert result is completed
+        run.assert_called_once_with(['oc', '--kubeconfig', '/k', 'get', 'pods'], capture_output=True, text=True)
+        [s] = recorder.spans()
+        assert (s.name, s.kind, s.bytes, s.attrs['exit_code']) == ('oc get', 'subprocess', 5, 1)
+
+    def test_labels_do_not_leak_arguments(self):
+        assert command_label(['git', '-C', '/repo', 'log', '--oneline']) == 'git log'
+        assert command_label(['curl', '-u', 'user:token', 'https://jenkins/x']) == 'curl'
+        assert command_label('gh pr list') == 'gh pr'
+        assert command_label([]) == '?'
+
+    def test_curl_records_host_only(self, recorder):
+        with patch('subprocess.run', return_value=subprocess.CompletedProcess([], 0, stdout=b'xy')):
+            traced_run(['curl', '-u', 'user:token', 'https://user:pw@jenkins.example.com/job/1/api/json'])
+
+        [s] = recorder.spans()
+        assert s.attrs['host'] == 'jenkins.example.com'
+        assert s.bytes == 2
+
+
+class TestSummary:
+    """Tests for perf-summary.json."""
+
+    def test_summary_file(self, recorder, tmp_path):
+        with span('test_report', kind='step'):
+            with span('curl', kind='subprocess') as s:
+                s.bytes = 100
+        bind_context(stage='oracle')
+        with span('environment_oracle', kind='step'):
+            pass
+
+        path = recorder.write_summary(tmp_path, total_seconds=5.0)
+
+        summary = json.loads(path.read_text())
+        assert path.name == PERF_SUMMARY_FILENAME
+        assert set(summary['by_stage']) == {'gather', 'oracle'}
+        assert summary['by_kind']['subprocess']['bytes'] == 100
+        assert summary['span_count'] == 3
+        assert [st['name'] for st in summary['steps']] == ['test_report', 'environment_oracle']
+        assert summary['slowest'][0]['name'] == 'curl'
+        assert summary['untraced_seconds'] <= 5.0
+        assert [s['name'] for s in summary['spans']] == ['test_report', 'curl', 'environment_oracle']
+
+    def test_span_cap_keeps_totals(self, recorder, monkeypatch):
+        monkeypatch.setattr('src.services.perf_tracing.MAX_RECORDED_SPANS', 2)
+        for _ in range(5):
+            with span('oc get', kind='subprocess'):
+                pass
+
+        summary = recorder.summary()
+        assert len(summary['spans']) == 2
+        assert summary['spans_dropped'] == 3
+        assert summary['by_kind']['subprocess']['count'] == 5
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Unit tests for json / packed run artifacts.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.services import run_artifacts
+from src.services.run_artifacts import (
+    CORE_DATA_FILENAME,
+    MANIFEST_FILENAME,
+    PACKED_FILENAME,
+    RunArtifacts,
+)
+
+CORE_DATA = {
+    'metadata': {'jenkins_url': 'https://jenkins/job/x/1/', 'status': 'complete'},
+    'test_report': {'failed_tests': [{'test_name': 't1', 'stack_trace': 'at foo\n' * 200}]},
+    'cluster_oracle': {'feature_health': {'score': 0.5}},
+    'errors': [],
+}
+
+
+def _write_packed(run_dir, data=CORE_DATA, codec='gzip'):
+    entries = RunArtifacts(run_dir).write(data, 'packed', codec)
+    (run_dir / MANIFEST_FILENAME).write_text(json.dumps({'version': '4.0.0', 'files': entries}))
+    return entries[PACKED_FILENAME]
+
+
+def _bump_mtime(path, seconds=5):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+class TestPackedFormat:
+    """Tests for writing and lazily reading core-data.pack."""
+
+    def test_offset_table(self, tmp_path):
+        entry = _write_packed(tmp_path)
+
+        assert not (tmp_path / CORE_DATA_FILENAME).exists()
+        assert list(entry['sections']) == list(CORE_DATA)
+        assert entry['codec'] == 'gzip'
+        assert entry['size'] == (tmp_path / PACKED_FILENAME).stat().st_size
+        test_report = entry['sections']['test_report']
+        assert test_report['length'] < test_report['raw_size']
+
+    def test_round_trip(self, tmp_path):
+        _write_packed(tmp_path)
+        artifacts = RunArtifacts(tmp_path)
+
+        assert artifacts.format == 'packed'
+        assert artifacts.load() == CORE_DATA
+        assert artifacts.sections() == list(CORE_DATA)
+
+    def test_load_decompresses_only_requested_sections(self, tmp_path, monkeypatch):
+        _write_packed(tmp_path)
+        decompressed = []
+        original = run_artifacts._decompress
+        monkeypatch.setattr(run_artifacts, '_decompress',
+                            lambda data, codec: decompressed.append(data) or original(data, codec))
+
+        data = RunArtifacts(tmp_path).load('cluster_oracle', 'missing')
+
+        assert data == {'cluster_oracle': CORE_DATA['cluster_oracle']}
+        assert len(decompressed) == 1
+
+    def test_section_default(self, tmp_path):
+        _write_packed(tmp_path)
+
+        assert RunArtifacts(tmp_path).section('cluster_landscape', {}) == {}
+
+    @pytest.mark.skipif(run_artifacts.zstandard is None, reason='zstandard not installed')
+    def test_zstd_codec(self, tmp_path):
+        _write_packed(tmp_path, codec='zstd')
+
+        assert RunArtifacts(tmp_path).load('test_report') == {'test_report': CORE_DATA['test_report']}
+
+    def test_unknown_format_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            RunArtifacts(tmp_path).write(CORE_DATA, 'yaml')
+
+
+class TestFormatSelection:
+    """Tests for choosing between core-data.json and core-data.pack."""
+
+    def test_json_run(self, tmp_path):
+        RunArtifacts(tmp_path).write(CORE_DATA)
+        artifacts = RunArtifacts(tmp_path)
+
+        assert artifacts.format == 'json'
+        assert artifacts.load('metadata') == {'metadata': CORE_DATA['metadata']}
+
+    def test_empty_run(self, tmp_path):
+        artifacts = RunArtifacts(tmp_path)
+
+        assert (artifacts.format, artifacts.load(), artifacts.exists()) == (None, None, False)
+
+    def test_pack_with_stale_table_is_ignored(self, tmp_path):
+        _write_packed(tmp_path)
+        with open(tmp_path / PACKED_FILENAME, 'ab') as f:
+            f.write(b'garbage')
+
+        assert RunArtifacts(tmp_path).load() is None
+
+    def test_newer_json_wins(self, tmp_path):
+        _write_packed(tmp_path)
+        enriched = {**CORE_DATA, 'metadata': {'status': 'enriched'}}
+        (tmp_path / CORE_DATA_FILENAME).write_text(json.dumps(enriched))
+        _bump_mtime(tmp_path / CORE_DATA_FILENAME)
+
+        assert RunArtifacts(tmp_path).section('metadata') == {'status': 'enriched'}
+
+
+class TestConversion:
+    """Tests for export_json() and pack()."""
+
+    def test_export_keeps_pack_and_lists_both(self, tmp_path):
+        _write_packed(tmp_path)
+
+        RunArtifacts(tmp_path).export_json()
+
+        assert json.loads((tmp_path / CORE_DATA_FILENAME).read_text()) == CORE_DATA
+        assert (tmp_path / PACKED_FILENAME).exists()
+        files = json.loads((tmp_path / MANIFEST_FILENAME).read_text())['files']
+        assert set(files) == {CORE_DATA_FILENAME, PACKED_FILENAME}
+
+    def test_pack_replaces_json_and_updates_manifest(self, tmp_path):
+        RunArtifacts(tmp_path).write(CORE_DATA)
+        (tmp_path / MANIFEST_FILENAME).write_text(json.dumps({
+            'version': '4.0.0', 'files': {CORE_DATA_FILENAME: {'description': 'x'}, 'console-index.json': {}},
+        }))
+
+        RunArtifacts(tmp_path).pack('gzip')
+
+        assert not (tmp_path / CORE_DATA_FILENAME).exists()
+        files = json.loads((tmp_path / MANIFEST_FILENAME).read_text())['files']
+        assert list(files) == [PACKED_FILENAME, 'console-index.json']
+        assert RunArtifacts(tmp_path).load() == CORE_DATA
+
+    def test_export_without_data(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            RunArtifacts(tmp_path).export_json()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the cross-run failure history index.
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from src.services.run_artifacts import RunArtifacts
+from src.services.run_history import HISTORY_DB_FILENAME, RunHistoryIndex
+
+
+def _write_run(runs_dir, name, build, failures, job='clc-e2e-pipeline', with_core=True, gathered_at=None):
+    """failures: {test_name: (fingerprint, classification)}"""
+    run_dir = runs_dir / name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / 'analysis-results.json').write_text(json.dumps({
+        'analysis_metadata': {'jenkins_url': f'https://jenkins/job/qe/job/{job}/{build}/'},
+        'per_test_analysis': [
+            {'test_name': test, 'classification': cls, 'confidence': 0.8, 'feature_area': 'CLC'}
+            for test, (_, cls) in failures.items()
+        ],
+    }))
+    if with_core:
+        (run_dir / 'core-data.json').write_text(json.dumps({
+            'metadata': {'gathered_at': gathered_at or f'2026-01-{build:02d}T10:00:00'},
+            'jenkins': {'job_name': job, 'build_number': build, 'build_result': 'UNSTABLE'},
+            'test_report': {
+                'summary': {'total_tests': 10, 'failed_count': len(failures)},
+                'failed_tests': [
+                    {'test_name': test, 'failure_type': 'timeout', 'failure_cluster': fp,
+                     'error_message': 'Timed out', 'stack_trace': ''}
+                    for test, (fp, _) in failures.items()
+                ],
+            },
+        }))
+    return run_dir
+
+
+@pytest.fixture
+def runs_dir(tmp_path):
+    runs = tmp_path / 'runs'
+    # 'flaky' fails every other run; 'broken' fails every run; 'once' fails once
+    for build in range(1, 7):
+        failures = {'broken': ('fp-broken', 'PRODUCT_BUG')}
+        if build % 2:
+            failures['flaky'] = ('fp-timeout', 'FLAKY')
+        if build == 6:
+            failures['once'] = ('fp-timeout', 'AUTOMATION_BUG')
+        _write_run(runs, f'run-{build}', build, failures)
+    _write_run(runs, 'other-job', 9, {'flaky': ('fp-timeout', 'NO_BUG')}, job='grc-e2e-pipeline')
+    (runs / 'in-progress').mkdir()
+    return runs
+
+
+@pytest.fixture
+def history(runs_dir):
+    index = RunHistoryIndex(runs_dir)
+    index.refresh()
+    yield index
+    index.close()
+
+
+class TestIngestion:
+    """Tests for refresh() and ingest_run()."""
+
+    def test_ingests_completed_runs_only(self, history, runs_dir):
+        assert (runs_dir / HISTORY_DB_FILENAME).exists()
+        assert history.recent_runs(last_runs=100) == [f'run-{b}' for b in range(1, 7)] + ['other-job']
+
+    def test_run_columns(self, history):
+        row = history.conn.execute("SELECT * FROM runs WHERE run_id = 'run-3'").fetchone()
+
+        assert (row['job'], row['build'], row['build_result']) == ('clc-e2e-pipeline', 3, 'UNSTABLE')
+        assert (row['total_tests'], row['failed_count']) == (10, 2)
+
+    def test_refresh_skips_unchanged_runs(self, history, monkeypatch):
+        monkeypatch.setattr(history, 'ingest_run', None)  # any ingestion would fail
+
+        assert history.refresh() == 0
+
+    def test_refresh_picks_up_changes_and_removals(self, history, runs_dir):
+        run_dir = _write_run(runs_dir, 'run-6', 6, {'broken': ('fp-broken', 'INFRASTRUCTURE')})
+        stat = (run_dir / 'analysis-results.json').stat()
+        os.utime(run_dir / 'analysis-results.json', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        (runs_dir / 'other-job' / 'analysis-results.json').unlink()
+
+        assert history.refresh() == 1
+
+        assert history.flakiness('once', job='clc-e2e-pipeline').failures == 0
+        # The removed run keeps its history until it is explicitly forgotten
+        assert history.removed_runs() == ['other-job']
+        assert 'other-job' in history.recent_runs(last_runs=100)
+
+        assert history.forget_removed() == 1
+        assert 'other-job' not in history.recent_runs(last_runs=100)
+        assert history.conn.execute(
+            "SELECT COUNT(*) FROM test_failures WHERE run_id = 'other-job'").fetchone()[0] == 0
+
+    def test_pruned_runs_stay_in_the_window(self, history, runs_dir):
+        for build in (1, 2, 3):
+            shutil.rmtree(runs_dir / f'run-{build}')
+
+        history.refresh()
+
+        stats = history.flakiness('flaky', job='clc-e2e-pipeline')
+        assert (stats.runs_considered, stats.failures) == (6, 3)
+
+        _write_run(runs_dir, 'run-1', 1, {'broken': ('fp-broken', 'PRODUCT_BUG')})
+        history.refresh()
+        assert history.removed_runs() == ['run-2', 'run-3']
+
+    def test_legacy_run_is_fingerprinted_from_analysis(self, tmp_path):
+        runs = tmp_path / 'runs'
+        _write_run(runs, 'legacy', 4, {'a': ('unused', 'PRODUCT_BUG')}, with_core=False)
+
+        with RunHistoryIndex(runs) as history:
+            history.refresh()
+            row = history.conn.execute('SELECT * FROM runs').fetchone()
+
+            assert (row['job'], row['build']) == ('clc-e2e-pipeline', 4)
+            assert history.flakiness('a').failures == 1
+
+    def test_packed_run(self, tmp_path):
+        runs = tmp_path / 'runs'
+        run_dir = _write_run(runs, 'packed', 5, {'a': ('fp-a', 'PRODUCT_BUG')})
+        RunArtifacts(run_dir).pack('gzip')
+
+        with RunHistoryIndex(runs) as history:
+            history.refresh()
+
+            assert history.recurrence('fp-a').runs_failed == 1
+
+
+class TestQueries:
+    """Tests for flakiness and recurrence queries."""
+
+    def test_flaky_test(self, history):
+        stats = history.flakiness('flaky', job='clc-e2e-pipeline')
+
+        assert (stats.runs_considered, stats.failures, stats.flips) == (6, 3, 5)
+        assert stats.failure_rate == 0.5
+        assert stats.is_flaky
+        assert stats.classifications == {'FLAKY': 3}
+        assert stats.last_failed_run == 'run-5'
+
+    def test_consistent_failure_is_not_flaky(self, history):
+        stats = history.flakiness('broken', job='clc-e2e-pipeline')
+
+        assert (stats.failures, stats.flips, stats.is_flaky) == (6, 0, False)
+
+    def test_window_limits_runs(self, history):
+        stats = history.flakiness('flaky', job='clc-e2e-pipeline', last_runs=2)
+
+        assert (stats.runs_considered, stats.failures) == (2, 1)
+
+    def test_reanalyzed_build_counts_once(self, history, runs_dir):
+        # Build 5 analyzed again a week later: 'flaky' passed this time
+        _write_run(runs_dir, 'run-5-again', 5, {'broken': ('fp-broken', 'PRODUCT_BUG')},
+                   gathered_at='2026-01-12T10:00:00')
+        history.refresh()
+
+        window = history.recent_runs(job='clc-e2e-pipeline')
+        assert len(window) == 6
+        assert 'run-5' not in window and window[-1] == 'run-5-again'
+        assert history.recent_runs(job='clc-e2e-pipeline', last_runs=6)[0] == 'run-1'
+        stats = history.flakiness('flaky', job='clc-e2e-pipeline')
+        assert (stats.runs_considered, stats.failures) == (6, 2)
+
+    def test_exclude_build(self, history):
+        assert history.recent_runs(job='clc-e2e-pipeline', exclude_build='6') == [
+            f'run-{b}' for b in range(1, 6)
+        ]
+        stats = history.flakiness_many(['once'], job='clc-e2e-pipeline', exclude_build=6)['once']
+        assert (stats.runs_considered, stats.failures) == (5, 0)
+        assert history.recurrence('fp-timeout', job='clc-e2e-pipeline', exclude_build=6).runs_failed == 3
+
+    def test_unknown_test(self, history):
+        stats = history.flakiness('never-failed', job='clc-e2e-pipeline')
+
+        assert (stats.failures, stats.failure_rate, stats.is_flaky) == (0, 0.0, False)
+
+    def test_flaky_tests(self, history):
+        assert [s.test_name for s in history.flaky_tests(job='clc-e2e-pipeline')] == ['flaky']
+
+    def test_recurrence(self, history):
+        result = history.recurrence('fp-timeout', job='clc-e2e-pipeline')
+
+        assert (result.runs_considered, result.runs_failed, result.test_count) == (6, 4, 2)
+        assert (result.first_seen, result.last_seen) == ('2026-01-01T10:00:00', '2026-01-06T10:00:00')
+        assert result.classifications == {'FLAKY': 3, 'AUTOMATION_BUG': 1}
+
+    def test_recurrence_across_jobs(self, history):
+        assert history.recurrence('fp-timeout').runs_failed == 5
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Unit tests for run-directory retention and deduplication.
+"""
+
+import os
+import time
+
+import pytest
+
+from src.services.run_storage import (
+    STORE_DIRNAME,
+    RunStorageManager,
+    StorageReport,
+    parse_size,
+)
+
+NOW = time.mktime((2026, 3, 31, 12, 0, 0, 0, 0, -1))
+CONSOLE = b'console line\n' * 4096        # ~52 KB, shared by re-analyzed builds
+PACK = b'git pack' * 8192
+
+
+def _make_run(runs_dir, day, job, console=CONSOLE, repos=True):
+    run = runs_dir / f"2026-03-{day:02d}_10-00-00_{job}"
+    (run / 'repos' / 'automation' / '.git').mkdir(parents=True)
+    (run / 'manifest.json').write_text('{}')
+    (run / 'console-log.txt').write_bytes(console)
+    if repos:
+        (run / 'repos' / 'automation' / '.git' / 'pack').write_bytes(PACK)
+        (run / 'repos' / 'automation' / 'small.js').write_text('x')
+    # Old enough not to count as in progress
+    old = NOW - 86400
+    for path in [run, *run.rglob('*')]:
+        os.utime(path, (old, old))
+    return run
+
+
+@pytest.fixture
+def runs_dir(tmp_path):
+    runs = tmp_path / 'runs'
+    for day in (1, 2, 3, 4):
+        _make_run(runs, day, 'clc-e2e')
+    _make_run(runs, 5, 'grc-e2e', console=b'other\n' * 9000)
+    (runs / 'run-history.db').write_bytes(b'')
+    (runs / 'not-a-run').mkdir()
+    return runs
+
+
+def _names_full(runs_dir):
+    return sorted(p.name for p in runs_dir.iterdir()
+                  if p.is_dir() and not p.name.startswith('.') and p.name != 'not-a-run')
+
+
+def _names(runs_dir):
+    """Run names without the time of day."""
+    return [name[:10] + name[19:] for name in _names_full(runs_dir)]
+
+
+class TestDiscovery:
+    """Tests for run discovery and sizes."""
+
+    def test_runs_are_parsed_and_sorted(self, runs_dir):
+        runs = RunStorageManager(runs_dir).runs(now=NOW)
+
+        assert [(r.job, r.name[:10]) for r in runs] == [
+            ('clc-e2e', '2026-03-01'), ('clc-e2e', '2026-03-02'), ('clc-e2e', '2026-03-03'),
+            ('clc-e2e', '2026-03-04'), ('grc-e2e', '2026-03-05'),
+        ]
+        assert not any(r.active for r in runs)
+
+    def test_recently_modified_run_is_active(self, runs_dir):
+        run = _make_run(runs_dir, 6, 'clc-e2e')
+        (run / 'analysis-results.json').write_text('{}')
+
+        runs = RunStorageManager(runs_dir).runs()
+
+        assert [r.active for r in runs][-1] is True
+
+    def test_parse_size(self):
+        assert parse_size('200G') == 200 * 1024**3
+        assert parse_size('1.5MiB') == int(1.5 * 1024**2)
+        assert parse_size('4096') == 4096
+        with pytest.raises(ValueError):
+            parse_size('lots')
+
+    def test_empty_report(self):
+        assert StorageReport(dry_run=True).to_dict()['runs_deleted'] == []
+
+
+class TestRetention:
+    """Tests for keep-last, age-out, repos pruning and the size budget."""
+
+    def test_keep_last_per_job(self, runs_dir):
+        report = RunStorageManager(runs_dir).apply(keep_last=2, now=NOW)
+
+        assert _names(runs_dir) == ['2026-03-03_clc-e2e', '2026-03-04_clc-e2e', '2026-03-05_grc-e2e']
+        assert len(report.runs_deleted) == 2
+        assert report.bytes_reclaimed > 0
+        assert report.usage_after < report.usage_before
+
+    def test_max_age(self, runs_dir):
+        RunStorageManager(runs_dir).apply(max_age_days=27.5, now=NOW)
+
+        assert _names(runs_dir) == ['2026-03-04_clc-e2e', '2026-03-05_grc-e2e']
+
+    def test_dry_run_changes_nothing(self, runs_dir):
+        report = RunStorageManager(runs_dir, dry_run=True).apply(keep_last=1, dedup=True, now=NOW)
+
+        assert len(_names(runs_dir)) == 5
+        assert not (runs_dir / STORE_DIRNAME).exists()
+        assert len(report.runs_deleted) == 3
+        assert report.bytes_reclaimed > 0
+
+    def test_dry_run_skips_runs_it_deletes(self, runs_dir):
+        policies = dict(keep_last=2, repos_keep_last=1, dedup=True, now=NOW)
+        preview = RunStorageManager(runs_dir, dry_run=True).apply(**policies)
+
+        report = RunStorageManager(runs_dir).apply(**policies)
+
+        assert preview.runs_deleted == report.runs_deleted
+        assert preview.repos_pruned == report.repos_pruned
+        assert len(report.repos_pruned) == 1
+        assert preview.files_deduplicated == report.files_deduplicated
+
+    def test_repos_keep_last(self, runs_dir):
+        report = RunStorageManager(runs_dir).apply(repos_keep_last=1, now=NOW)
+
+        with_repos = sorted(p.parent.name[:10] for p in runs_dir.glob('*/repos'))
+        assert with_repos == ['2026-03-04', '2026-03-05']
+        assert len(report.repos_pruned) == 3
+        assert len(_names(runs_dir)) == 5
+
+    def test_budget_deletes_oldest_but_keeps_newest_per_job(self, runs_dir):
+        RunStorageManager(runs_dir).apply(max_bytes=1, now=NOW)
+
+        assert _names(runs_dir) == ['2026-03-04_clc-e2e', '2026-03-05_grc-e2e']
+
+
+class TestDeduplication:
+    """Tests for content-addressed hard-linking."""
+
+    def test_identical_files_share_one_inode(self, runs_dir):
+        manager = RunStorageManager(runs_dir)
+        before = manager.disk_usage()
+
+        report = manager.apply(dedup=True, now=NOW)
+
+        logs = list(runs_dir.glob('*clc-e2e/console-log.txt'))
+        assert len({p.stat().st_ino for p in logs}) == 1
+        assert logs[0].stat().st_nlink == 5           # four runs + the stored blob
+        assert logs[0].read_bytes() == CONSOLE
+        # The small file is below the threshold; the unique grc log has no twin
+        assert (runs_dir / _names_full(runs_dir)[0] / 'repos/automation/small.js').stat().st_nlink == 1
+        assert (runs_dir / _names_full(runs_dir)[-1] / 'console-log.txt').stat().st_nlink == 1
+        assert report.files_deduplicated == 3 + 4     # logs and packs, minus each first copy
+        assert report.usage_after < before
+
+    def test_second_pass_is_a_no_op(self, runs_dir):
+        manager = RunStorageManager(runs_dir)
+        manager.apply(dedup=True, now=NOW)
+
+        report = manager.apply(dedup=True, now=NOW)
+
+        assert report.files_deduplicated == 0
+
+    def test_new_run_links_to_existing_blob(self, runs_dir):
+        manager = RunStorageManager(runs_dir)
+        manager.apply(dedup=True, now=NOW)
+        run = _make_run(runs_dir, 7, 'clc-e2e', repos=False)
+
+        report = manager.apply(dedup=True, now=NOW)
+
+        assert report.files_deduplicated == 1
+        assert (run / 'console-log.txt').stat().st_nlink == 6
+
+    def test_deleted_runs_free_their_blobs(self, runs_dir):
+        manager = RunStorageManager(runs_dir)
+        manager.apply(dedup=True, now=NOW)
+
+        report = manager.apply(keep_last=0, now=NOW)
+
+        assert _names(runs_dir) == []
+        assert report.blobs_collected == 2
+        assert not any((runs_dir / STORE_DIRNAME).iterdir())
+
+    def test_exclusive_size_ignores_shared_files(self, runs_dir):
+        manager = RunStorageManager(runs_dir)
+        manager.apply(dedup=True, now=NOW)
+        run = runs_dir / _names_full(runs_dir)[0]
+
+        assert manager.exclusive_size(run) < manager.disk_usage(run)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Unit tests for credential masking in shared_utils.
+"""
+
+import json
+
+import pytest
+
+from src.services.shared_utils import (
+    MaskingJSONEncoder,
+    SensitiveDataMasker,
+    get_masker,
+    mask_sensitive_dict,
+)
+
+DATA = {
+    'jenkins': {
+        'parameters': {'CLUSTER_PASSWORD': 'hunter22', 'API_TOKEN': 'sha256~abc', 'BRANCH': 'main'},
+        'artifacts': [['kubeconfig', {'private_key': 'pem'}], [1, 2.5, None, True]],
+    },
+    'console_log': {'key_errors': ['oc login -u admin --password=hunter22 failed', 'Authorization: Bearer abc.def']},
+    'cluster_access': {'credentials': {'username': 'kubeadmin', 'password': 'pw'}, 'token_expiry': 3600},
+    'test_report': {'failed_tests': [{'test_name': 'should create secret: my-secret'}]},
+    'counts': {1: 'one', 2: 'two'},
+    'empty': {},
+}
+
+
+class TestSensitiveDataMasker:
+    """Tests for key-based and value-based masking."""
+
+    def test_masks_sensitive_keys_at_any_depth(self):
+        masked = get_masker().mask(DATA)
+
+        params = masked['jenkins']['parameters']
+        assert params == {'CLUSTER_PASSWORD': 'hun***MASKED***', 'API_TOKEN': 'sha***MASKED***', 'BRANCH': 'main'}
+        assert masked['jenkins']['artifacts'][0][1] == {'private_key': '***MASKED***'}
+        assert masked['cluster_access']['credentials'] == {'username': 'kubeadmin', 'password': '***MASKED***'}
+        assert masked['cluster_access']['token_expiry'] == '***MASKED***'
+
+    def test_unchanged_subtrees_are_shared_and_input_untouched(self):
+        masked = get_masker().mask(DATA)
+
+        assert masked is not DATA
+        assert masked['test_report'] is DATA['test_report']
+        assert masked['jenkins']['artifacts'][1] is DATA['jenkins']['artifacts'][1]
+        assert DATA['jenkins']['parameters']['CLUSTER_PASSWORD'] == 'hunter22'
+
+    def test_nothing_to_mask_returns_input(self):
+        data = {'a': [{'b': 1}], 'c': 'text'}
+
+        assert get_masker().mask(data) is data
+
+    def test_key_decisions_are_memoized(self):
+        masker = SensitiveDataMasker()
+        masker.mask([{'password': 'x', 'name': 'y'}] * 50)
+
+        info = masker.is_sensitive_key.cache_info()
+        assert (info.misses, info.hits) == (2, 98)
+
+    def test_value_scanning_is_opt_in(self):
+        plain = get_masker().mask(DATA)['console_log']['key_errors']
+        scanned = get_masker(scan_values=True).mask(DATA)['console_log']['key_errors']
+
+        assert plain == DATA['console_log']['key_errors']
+        assert scanned == ['oc login -u admin --password=hun***MASKED*** failed',
+                           'Authorization: Bearer abc***MASKED***']
+
+    def test_custom_patterns(self):
+        assert mask_sensitive_dict({'session': 'abcdef', 'password': 'x'}, ['session']) == {
+            'session': 'abc***MASKED***', 'password': 'x'}
+
+
+class TestMaskingJSONEncoder:
+    """Tests for masking during serialization."""
+
+    @pytest.mark.parametrize('scan_values', [False, True])
+    @pytest.mark.parametrize('options', [{'indent': 2}, {}, {'separators': (',', ':'), 'sort_keys': True}])
+    def test_matches_encoding_a_masked_copy(self, scan_values, options):
+        masker = get_masker(scan_values=scan_values)
+
+        encoded = json.dumps(DATA, cls=MaskingJSONEncoder, masker=masker, default=str, **options)
+
+        assert encoded == json.dumps(masker.mask(DATA), default=str, **options)
+
+    def test_default_and_streaming_dump(self, tmp_path):
+        path = tmp_path / 'out.json'
+        with open(path, 'w') as f:
+            json.dump({'when': object, 'secret': 'abcdef'}, f, cls=MaskingJSONEncoder, default=str)
+
+        assert json.loads(path.read_text()) == {'when': "<class 'object'>", 'secret': 'abc***MASKED***'}
+
+    def test_nan_follows_allow_nan(self):
+        assert json.dumps([float('nan')], cls=MaskingJSONEncoder) == '[NaN]'
+        with pytest.raises(ValueError):
+            json.dumps([float('inf')], cls=MaskingJSONEncoder, allow_nan=False)
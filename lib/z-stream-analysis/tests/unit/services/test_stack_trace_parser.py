@@ -338,3 +338,72 @@ class TestAssertionValueExtraction:
         result = self.parser.extract_assertion_values(long_error)
         if result:
             assert len(result['raw_assertion']) <= 200
+
+
+class TestParserCaching:
+    """Tests for trace/line memoization and parse_many()."""
+
+    TRACE = """AssertionError: Timed out retrying
+    at Context.eval (cypress/e2e/cluster/create.cy.js:42:10)
+    at cy.getCluster (cypress/support/commands.js:120:5)
+    at node_modules/cypress/runner.js:100:3"""
+
+    def setup_method(self):
+        self.parser = StackTraceParser()
+
+    def test_repeated_trace_hits_cache(self):
+        first = self.parser.parse(self.TRACE)
+        second = self.parser.parse(self.TRACE)
+
+        assert self.parser.cache_info()['traces']['hits'] == 1
+        assert second == first
+        # Callers get their own result objects; frames are shared
+        assert second is not first
+        assert second.frames is not first.frames
+        assert second.frames[0] is first.frames[0]
+
+    def test_shared_lines_parsed_once(self):
+        self.parser.parse(self.TRACE)
+        self.parser.parse(self.TRACE.replace('create.cy.js:42', 'create.cy.js:57'))
+
+        lines = self.parser.cache_info()['lines']
+        assert lines['misses'] == 5  # 4 lines + the one changed line
+        assert lines['hits'] == 3
+
+    def test_cached_result_matches_uncached(self):
+        uncached = StackTraceParser(trace_cache_size=0, line_cache_size=0)
+
+        assert self.parser.parse(self.TRACE) == uncached.parse(self.TRACE)
+        assert self.parser.parse(self.TRACE) == uncached.parse(self.TRACE)
+
+    def test_trace_cache_is_bounded(self):
+        parser = StackTraceParser(trace_cache_size=2)
+        for line in (1, 2, 3):
+            parser.parse(self.TRACE.replace(':42:', f':{line}:'))
+
+        assert parser.cache_info()['traces']['size'] == 2
+
+    def test_parse_many_keeps_order(self):
+        other = "Error: boom\n    at cypress/e2e/other.cy.js:7:1"
+
+        results = self.parser.parse_many([self.TRACE, None, other, self.TRACE])
+
+        assert [r.error_type for r in results] == ['AssertionError', 'Unknown', 'Error', 'AssertionError']
+        assert results[0] is not results[3]
+        assert results[1].raw_trace == ""
+
+    def test_frames_are_immutable_and_interned(self):
+        a = self.parser.parse(self.TRACE).frames[0]
+        b = self.parser.parse(self.TRACE.replace(':42:10', ':43:10')).frames[0]
+
+        with pytest.raises(AttributeError):
+            a.line_number = 1
+        assert a.file_path is b.file_path
+        assert not hasattr(a, '__dict__')
+
+    def test_clear_cache(self):
+        self.parser.parse(self.TRACE)
+        self.parser.clear_cache()
+
+        assert self.parser.cache_info()['traces']['size'] == 0
+        assert self.parser.cache_info()['lines']['size'] == 0
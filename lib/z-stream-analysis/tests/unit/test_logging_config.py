@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the queued JSONL logging pipeline.
+"""
+
+import json
+import logging
+import threading
+
+import pytest
+
+from src import logging_config
+from src.logging_config import bind_context, configure_logging, shutdown_logging
+
+
+@pytest.fixture(autouse=True)
+def fresh_logging(monkeypatch):
+    """Give each test its own pipeline and restore the root logger afterwards."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    monkeypatch.setattr(logging_config, '_configured', False)
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    bind_context(run_id='', stage='init')
+
+
+def _read(run_dir):
+    with open(run_dir / 'pipeline.log.jsonl') as f:
+        return [json.loads(line) for line in f]
+
+
+class TestQueuedJSONL:
+    """Tests for records written through the listener thread."""
+
+    def test_context_is_captured_on_the_logging_thread(self, tmp_path):
+        configure_logging(run_dir=tmp_path)
+        bind_context(run_id='job_1', stage='gather')
+        log = logging.getLogger('src.services.test')
+
+        def worker():
+            bind_context(run_id='job_1', stage='oracle')
+            log.debug('from worker %d', 1)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        log.info('from main')
+        shutdown_logging()
+
+        entries = {e['message']: e for e in _read(tmp_path)}
+        assert entries['from worker 1']['stage'] == 'oracle'
+        assert entries['from main']['stage'] == 'gather'
+        assert entries['from main']['run_id'] == 'job_1'
+        assert entries['from main']['level'] == 'info'
+
+    def test_exception_is_rendered(self, tmp_path):
+        configure_logging(run_dir=tmp_path)
+        try:
+            raise ValueError('bad input')
+        except ValueError:
+            logging.getLogger('x').exception('failed')
+        shutdown_logging()
+
+        [entry] = _read(tmp_path)
+        assert 'ValueError: bad input' in entry['exception']
+
+    def test_same_run_dir_is_attached_once(self, tmp_path):
+        configure_logging(run_dir=tmp_path)
+        configure_logging(run_dir=tmp_path, verbose=True)
+        logging.getLogger('x').warning('once')
+        shutdown_logging()
+
+        assert len(_read(tmp_path)) == 1
+
+    def test_plain_json_without_orjson(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(logging_config, 'orjson', None)
+        configure_logging(run_dir=tmp_path)
+        logging.getLogger('x').info('plain')
+        shutdown_logging()
+
+        assert '"stage": "init"' in (tmp_path / 'pipeline.log.jsonl').read_text()
+
+
+class TestDropPolicy:
+    """Tests for the bounded queue."""
+
+    def test_low_severity_records_are_dropped_and_reported(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(logging_config, 'QUEUE_SIZE', 5)
+        monkeypatch.setattr(logging_config, 'BLOCK_TIMEOUT', 5)
+        configure_logging(run_dir=tmp_path)
+        handler = logging_config._file_handlers[str((tmp_path / 'pipeline.log.jsonl').resolve())]
+        gate = threading.Event()
+        emit = handler.emit
+        monkeypatch.setattr(handler, 'emit', lambda record: gate.wait() and emit(record))
+        log = logging.getLogger('x')
+
+        for i in range(20):
+            log.debug('noise %d', i)
+        threading.Timer(0.2, gate.set).start()
+        log.error('kept')
+        shutdown_logging()
+
+        messages = [e['message'] for e in _read(tmp_path)]
+        assert 'kept' in messages
+        dropped = [m for m in messages if m.startswith('Dropped')]
+        assert len(dropped) == 1
+        kept_noise = [m for m in messages if m.startswith('noise')]
+        assert int(dropped[0].split()[1]) == 20 - len(kept_noise)
@@ -5,10 +5,19 @@ Resilient MCP proxy for ACM Search.
 Proxies to stolostron/acm-mcp-server (https://github.com/stolostron/acm-mcp-server)
 which provides the ACM Search PostgreSQL MCP server deployed on-cluster.
 
-When the cluster is reachable: execs into mcp-remote (zero overhead passthrough).
+When the cluster is reachable: stays resident and holds one persistent SSE
+session to the on-cluster server. Tool calls are multiplexed over that session
+(several can be in flight at once) and results of the idempotent lookup tools
+(query_database, describe_table, list_tables) are cached for a short TTL.
+Hit/miss counters are exposed through the proxy_cache_stats tool.
 When unreachable or not deployed: serves a stub MCP that returns structured
 "cluster unreachable" errors so agents can detect the state and fall back to oc CLI.
 
+Environment:
+  ACM_SEARCH_CACHE_TTL    Result cache TTL in seconds (default 60, 0 disables)
+  ACM_SEARCH_PROXY_MODE   Set to "exec" to hand off to mcp-remote instead of
+                          staying resident (fallback)
+
 Copyright Red Hat, Inc.
 SPDX-License-Identifier: Apache-2.0
 
@@ -20,15 +29,38 @@ Usage in .mcp.json:
   }
 """
 
+import http.client
+import itertools
 import json
 import os
+import re
 import sys
+import threading
+import time
+import urllib.parse
 import urllib.request
 import ssl
+from concurrent.futures import Future, ThreadPoolExecutor
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 MARKER_FILE = os.path.join(SCRIPT_DIR, ".acm-search-config.json")
 CONNECT_TIMEOUT = 5
+CALL_TIMEOUT = 85
+MAX_INFLIGHT = 8
+
+
+def _env_seconds(name, default):
+    """Float from the environment; a malformed value falls back to default."""
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+CACHE_TTL = _env_seconds("ACM_SEARCH_CACHE_TTL", 60.0)
+CACHE_MAX_ENTRIES = 256
+CACHEABLE_TOOLS = {"query_database", "describe_table", "list_tables"}
+READ_ONLY_SQL = re.compile(r"^\s*(select|with|explain|show)\b", re.IGNORECASE)
 
 TOOLS = [
     {
@@ -122,6 +154,12 @@ TOOLS = [
     },
 ]
 
+STATS_TOOL = {
+    "name": "proxy_cache_stats",
+    "description": "Report acm-search-proxy result cache hit/miss counters and in-flight call count",
+    "inputSchema": {"type": "object", "properties": {}},
+}
+
 
 def read_marker():
     """Read deployment config from marker file. Returns dict or None."""
@@ -132,11 +170,17 @@ def read_marker():
         return None
 
 
-def check_sse_reachable(url):
-    """Quick connectivity check to the SSE endpoint. Returns True if reachable."""
+def insecure_ssl_context():
+    """Route certificates are self-signed; skip verification like mcp-remote does."""
     ctx = ssl.create_default_context()
     ctx.check_hostname = False
     ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+def check_sse_reachable(url):
+    """Quick connectivity check to the SSE endpoint. Returns True if reachable."""
+    ctx = insecure_ssl_context()
     try:
         req = urllib.request.Request(url, method="GET")
         urllib.request.urlopen(req, timeout=CONNECT_TIMEOUT, context=ctx)
@@ -165,31 +209,25 @@ def exec_mcp_remote(config):
 
 
 def read_message():
-    """Read a JSON-RPC message using Content-Length framing."""
-    headers = {}
+    """Read one JSON-RPC message (MCP stdio: one JSON object per line)."""
     while True:
         line = sys.stdin.buffer.readline()
         if not line:
             return None
-        line_str = line.decode("utf-8").rstrip("\r\n")
-        if line_str == "":
-            break
-        if ":" in line_str:
-            key, value = line_str.split(":", 1)
-            headers[key.strip().lower()] = value.strip()
-    length = int(headers.get("content-length", 0))
-    if length == 0:
-        return None
-    body = sys.stdin.buffer.read(length)
-    return json.loads(body.decode("utf-8"))
+        line = line.strip()
+        if line:
+            return json.loads(line.decode("utf-8"))
+
+
+_stdout_lock = threading.Lock()
 
 
 def write_message(msg):
-    """Write a JSON-RPC message with Content-Length framing."""
-    body = json.dumps(msg).encode("utf-8")
-    header = f"Content-Length: {len(body)}\r\n\r\n".encode("utf-8")
-    sys.stdout.buffer.write(header + body)
-    sys.stdout.buffer.flush()
+    """Write one JSON-RPC message as a single line."""
+    body = json.dumps(msg, separators=(",", ":")).encode("utf-8") + b"\n"
+    with _stdout_lock:
+        sys.stdout.buffer.write(body)
+        sys.stdout.buffer.flush()
 
 
 def make_response(req_id, result):
@@ -243,6 +281,315 @@ def run_stub(reason):
             write_message(make_error(req_id, -32601, f"Method not found: {method}"))
 
 
+# ── Resident proxy: persistent SSE session + result cache ─────────
+
+
+class ResultCache:
+    """Short-TTL cache for idempotent search tool results.
+
+    Agents frequently re-run the same fleet-wide SQL during one investigation;
+    serving those from memory saves a round trip to the hub's search-postgres.
+    """
+
+    def __init__(self, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def key(self, tool_name, arguments):
+        """Cache key for a tool call, or None if the call must not be cached."""
+        if self.ttl <= 0 or tool_name not in CACHEABLE_TOOLS:
+            return None
+        arguments = arguments or {}
+        if tool_name == "query_database" and not READ_ONLY_SQL.match(arguments.get("sql", "")):
+            return None
+        return json.dumps([tool_name, arguments], sort_keys=True)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl,
+            }
+
+
+class SSESession:
+    """One persistent MCP SSE session to the on-cluster server.
+
+    Requests are POSTed to the endpoint announced by the server; responses come
+    back on the event stream and are routed to waiting callers by JSON-RPC id,
+    so many calls can share the session concurrently. Upstream ids are assigned
+    here, which keeps them unique regardless of what the client sends.
+    """
+
+    def __init__(self, sse_url, token, on_message):
+        self.sse_url = sse_url
+        self.token = token
+        self.on_message = on_message
+        self.init_messages = []
+        self._ssl = insecure_ssl_context()
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._local = threading.local()
+        self._endpoint = None
+        self._ready = threading.Event()
+        self._closed = threading.Event()
+        self._closed.set()
+
+    def _connection(self, url, timeout):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme == "https":
+            return http.client.HTTPSConnection(parts.netloc, timeout=timeout, context=self._ssl)
+        return http.client.HTTPConnection(parts.netloc, timeout=timeout)
+
+    @staticmethod
+    def _path(url):
+        parts = urllib.parse.urlsplit(url)
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def _headers(self, **extra):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        headers.update(extra)
+        return headers
+
+    def connect(self, timeout=CONNECT_TIMEOUT):
+        """Open the event stream and wait for the endpoint event. Returns True on success."""
+        conn = self._connection(self.sse_url, timeout)
+        try:
+            conn.request("GET", self._path(self.sse_url),
+                         headers=self._headers(Accept="text/event-stream"))
+            sock = conn.sock
+            resp = conn.getresponse()
+            if resp.status != 200:
+                conn.close()
+                log(f"SSE connect failed: HTTP {resp.status}")
+                return False
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            log(f"SSE connect failed: {exc}")
+            return False
+        # The stream idles between events; only the handshake is time-bounded.
+        sock.settimeout(None)
+        self._ready.clear()
+        self._closed.clear()
+        threading.Thread(target=self._read_loop, args=(conn, resp), daemon=True).start()
+        if not self._ready.wait(timeout):
+            log("SSE connect failed: no endpoint event")
+            conn.close()
+            return False
+        return True
+
+    def _read_loop(self, conn, resp):
+        event, data = "message", []
+        try:
+            while True:
+                raw = resp.readline()
+                if not raw:
+                    break
+                line = raw.decode("utf-8").rstrip("\r\n")
+                if line == "":
+                    if data:
+                        self._dispatch(event, "\n".join(data))
+                    event, data = "message", []
+                elif line.startswith(":"):
+                    continue
+                else:
+                    field, _, value = line.partition(":")
+                    value = value[1:] if value.startswith(" ") else value
+                    if field == "event":
+                        event = value
+                    elif field == "data":
+                        data.append(value)
+        except (OSError, http.client.HTTPException, ValueError) as exc:
+            log(f"SSE stream error: {exc}")
+        finally:
+            conn.close()
+            self._closed.set()
+            self._local = threading.local()
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for future in pending.values():
+                future.set_exception(ConnectionError("SSE stream closed"))
+
+    def _dispatch(self, event, data):
+        if event == "endpoint":
+            self._endpoint = urllib.parse.urljoin(self.sse_url, data)
+            self._ready.set()
+            return
+        if event != "message":
+            return
+        try:
+            msg = json.loads(data)
+        except ValueError:
+            log(f"ignoring malformed SSE message: {data[:200]}")
+            return
+        if "id" in msg and ("result" in msg or "error" in msg):
+            with self._lock:
+                future = self._pending.pop(msg["id"], None)
+            if future is not None:
+                future.set_result(msg)
+                return
+        # Server-initiated notifications/requests go straight to the client.
+        self.on_message(msg)
+
+    def _post(self, msg):
+        body = json.dumps(msg).encode("utf-8")
+        headers = self._headers(**{"Content-Type": "application/json"})
+        for attempt in (1, 2):
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = self._connection(self._endpoint, CALL_TIMEOUT)
+            try:
+                conn.request("POST", self._path(self._endpoint), body, headers)
+                resp = conn.getresponse()
+                resp.read()
+            except (ConnectionError, http.client.RemoteDisconnected):
+                # Idle keep-alive connection dropped by the route; reopen once.
+                conn.close()
+                self._local.conn = None
+                if attempt == 2:
+                    raise
+                continue
+            if resp.status >= 400:
+                raise ConnectionError(f"POST {resp.status} {resp.reason}")
+            return
+
+    def ensure_connected(self):
+        """Reconnect after a dropped stream, replaying the client's handshake."""
+        if not self._closed.is_set():
+            return
+        with self._connect_lock:
+            if not self._closed.is_set():
+                return
+            log("SSE session lost, reconnecting")
+            if not self.connect():
+                raise ConnectionError("ACM Search SSE endpoint unreachable")
+            for msg in self.init_messages:
+                if "id" in msg:
+                    self._call(msg, CONNECT_TIMEOUT * 2)
+                else:
+                    self._post(msg)
+
+    def _call(self, msg, timeout):
+        upstream_id = next(self._ids)
+        future = Future()
+        with self._lock:
+            self._pending[upstream_id] = future
+        try:
+            self._post({**msg, "id": upstream_id})
+            return future.result(timeout)
+        finally:
+            with self._lock:
+                self._pending.pop(upstream_id, None)
+
+    def request(self, msg, timeout=CALL_TIMEOUT):
+        """Send a JSON-RPC request upstream and block until its response arrives."""
+        self.ensure_connected()
+        return self._call(msg, timeout)
+
+    def notify(self, msg):
+        self.ensure_connected()
+        self._post(msg)
+
+    @property
+    def inflight(self):
+        with self._lock:
+            return len(self._pending)
+
+
+class ResidentProxy:
+    """Bridges stdio JSON-RPC to an SSESession, answering cacheable calls locally."""
+
+    def __init__(self, session, cache=None):
+        self.session = session
+        self.cache = cache or ResultCache()
+        self.pool = ThreadPoolExecutor(max_workers=MAX_INFLIGHT, thread_name_prefix="acm-search")
+
+    def serve(self):
+        try:
+            while True:
+                msg = read_message()
+                if msg is None:
+                    break
+                if msg.get("method") in ("initialize", "notifications/initialized"):
+                    self.session.init_messages.append(msg)
+                if msg.get("id") is None or "method" not in msg:
+                    # Notifications, and responses to server-initiated requests
+                    # (posted as-is, original id), are sent inline in order.
+                    self._notify(msg)
+                else:
+                    self.pool.submit(self._handle, msg)
+        finally:
+            self.pool.shutdown(wait=True)
+            log(f"cache stats: {json.dumps(self.cache.stats())}")
+
+    def _notify(self, msg):
+        try:
+            self.session.notify(msg)
+        except (OSError, http.client.HTTPException) as exc:
+            log(f"dropped {msg.get('method') or 'response ' + str(msg.get('id'))}: {exc}")
+
+    def _handle(self, msg):
+        req_id = msg["id"]
+        method = msg.get("method", "")
+        key = None
+
+        if method == "tools/call":
+            params = msg.get("params", {})
+            tool_name = params.get("name")
+            if tool_name == STATS_TOOL["name"]:
+                stats = {**self.cache.stats(), "inflight": self.session.inflight}
+                write_message(make_response(req_id, {
+                    "content": [{"type": "text", "text": json.dumps(stats, indent=2)}],
+                }))
+                return
+            key = self.cache.key(tool_name, params.get("arguments"))
+            if key is not None:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    write_message(make_response(req_id, cached))
+                    return
+
+        try:
+            reply = self.session.request(msg)
+        except Exception as exc:
+            write_message(make_error(req_id, -32603, f"ACM Search upstream error: {exc}"))
+            return
+
+        result = reply.get("result")
+        if method == "tools/list" and isinstance(result, dict):
+            result.setdefault("tools", []).append(STATS_TOOL)
+        if key is not None and isinstance(result, dict) and not result.get("isError"):
+            self.cache.put(key, result)
+        reply["id"] = req_id
+        write_message(reply)
+
+
 def log(msg):
     print(f"[acm-search-proxy] {msg}", file=sys.stderr)
 
@@ -261,9 +608,18 @@ def main():
         run_stub("marker file missing sse_url")
         return
 
-    if check_sse_reachable(sse_url):
-        log(f"cluster reachable ({cluster}), handing off to mcp-remote")
-        exec_mcp_remote(config)
+    if os.environ.get("ACM_SEARCH_PROXY_MODE") == "exec":
+        if check_sse_reachable(sse_url):
+            log(f"cluster reachable ({cluster}), handing off to mcp-remote")
+            exec_mcp_remote(config)
+        else:
+            run_stub(f"cluster unreachable: {cluster}")
+        return
+
+    session = SSESession(sse_url, config.get("token", ""), on_message=write_message)
+    if session.connect():
+        log(f"cluster reachable ({cluster}), serving resident SSE session")
+        ResidentProxy(session).serve()
     else:
         run_stub(f"cluster unreachable: {cluster}")
 
@@ -11,18 +11,32 @@ for deeper CI/CD failure investigation specific to ACM pipelines.
 Upstream: https://github.com/redhat-community-ai-tools/jenkins-mcp
 PR with fixes: https://github.com/redhat-community-ai-tools/jenkins-mcp/pull/13
 
+Scripts run as asyncio subprocesses, so concurrent tool calls overlap instead
+of queueing behind each other. Output for numbered builds that have finished
+is memoized for JENKINS_ACM_TOOLS_CACHE_TTL seconds; permalinks such as
+lastBuild/ are never cached because they move to newer builds.
+
 Usage: python jenkins-acm-tools.py
 """
 
 import asyncio
+import base64
+import json
 import os
-import subprocess
+import ssl
 import sys
 import tempfile
+import time
+import urllib.request
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
 JENKINS_TOOLS_DIR = os.environ.get("JENKINS_TOOLS_DIR", "")
+MAX_CONCURRENT_TOOLS = int(os.environ.get("JENKINS_ACM_TOOLS_CONCURRENCY", "8"))
+RESULT_CACHE_SIZE = 128
+RESULT_CACHE_TTL = float(os.environ.get("JENKINS_ACM_TOOLS_CACHE_TTL", "3600"))
+STATUS_TIMEOUT = 15
 
 # Import the upstream server's mcp instance and credentials
 jenkins_mcp_dir = os.path.join(os.path.dirname(__file__), ".external", "jenkins-mcp")
@@ -41,7 +55,7 @@ def _check_tools_dir() -> Optional[str]:
     return None
 
 
-def _run_tool(args: list[str], timeout: int = 120) -> str:
+def _tool_env() -> dict:
     url, user, token = get_jenkins_context()
     env = os.environ.copy()
     env.update({
@@ -50,15 +64,112 @@ def _run_tool(args: list[str], timeout: int = 120) -> str:
         "JENKINS_URL": url,
         "JENKINS_API_TOKEN": token,
     })
+    return env
+
+
+_tool_slots: Optional[asyncio.Semaphore] = None
+
+
+async def _run_tool(args: list[str], timeout: int = 120) -> str:
+    """Run a jenkins-tools script without blocking the event loop."""
+    global _tool_slots
+    if _tool_slots is None:
+        _tool_slots = asyncio.Semaphore(MAX_CONCURRENT_TOOLS)
+    async with _tool_slots:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=_tool_env(),
+            )
+        except FileNotFoundError as exc:
+            return f"Error: script not found - {exc}"
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return f"Error: timed out after {timeout}s"
+        except BaseException:
+            # Cancelled (client went away, server shutting down): don't orphan the child.
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+    out = stdout.decode("utf-8", errors="replace")
+    if proc.returncode != 0:
+        err = stderr.decode("utf-8", errors="replace")
+        return f"Error (exit {proc.returncode}):\n{err}\n{out}"
+    return out
+
+
+# ── Memoization for finished builds ──────────────────────────────
+
+_result_cache: "OrderedDict[tuple, tuple[float, str]]" = OrderedDict()
+
+
+def _job_build_url(job_path: str, build_number: Optional[int]) -> Optional[str]:
+    """Build URL for job_path/build_number, or None when 'latest' was requested."""
+    if build_number is None:
+        return None
+    url, _, _ = get_jenkins_context()
+    jobs = "/job/".join(part for part in job_path.strip("/").split("/") if part)
+    return f"{url.rstrip('/')}/job/{jobs}/{build_number}/"
+
+
+def _fetch_build_finished(build_url: str) -> bool:
+    url, user, token = get_jenkins_context()
+    api_url = f"{build_url.rstrip('/')}/api/json?tree=building,result"
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    req = urllib.request.Request(api_url)
+    if user and token:
+        creds = base64.b64encode(f"{user}:{token}".encode()).decode()
+        req.add_header("Authorization", f"Basic {creds}")
     try:
-        proc = subprocess.run(args, capture_output=True, text=True, timeout=timeout, env=env)
-        if proc.returncode != 0:
-            return f"Error (exit {proc.returncode}):\n{proc.stderr}\n{proc.stdout}"
-        return proc.stdout
-    except subprocess.TimeoutExpired:
-        return f"Error: timed out after {timeout}s"
-    except FileNotFoundError as exc:
-        return f"Error: script not found - {exc}"
+        with urllib.request.urlopen(req, timeout=STATUS_TIMEOUT, context=ctx) as resp:
+            data = json.load(resp)
+    except Exception:
+        return False
+    return not data.get("building", True) and data.get("result") is not None
+
+
+def _numbered_build_url(build_url: str) -> Optional[str]:
+    """build_url when it names a numbered build, None for permalinks (lastBuild, ...)."""
+    last = build_url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+    return build_url if last.isdigit() else None
+
+
+async def _build_finished(build_url: Optional[str]) -> bool:
+    if not build_url:
+        return False
+    return await asyncio.to_thread(_fetch_build_finished, build_url)
+
+
+async def _run_tool_cached(key: tuple, build_url: Optional[str], args: list[str], timeout: int) -> str:
+    """_run_tool, memoized for RESULT_CACHE_TTL when the referenced build has completed.
+
+    In-progress builds, permalinks and 'latest build' requests always run
+    fresh, and error output is never cached.
+    """
+    build_url = _numbered_build_url(build_url) if build_url else None
+    hit = _result_cache.get(key)
+    if hit is not None:
+        stored_at, output = hit
+        if time.monotonic() - stored_at < RESULT_CACHE_TTL:
+            _result_cache.move_to_end(key)
+            return output
+        del _result_cache[key]
+    if not build_url:
+        return await _run_tool(args, timeout)
+    finished, output = await asyncio.gather(_build_finished(build_url), _run_tool(args, timeout))
+    if finished and not output.startswith("Error"):
+        _result_cache[key] = (time.monotonic(), output)
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    return output
 
 
 @mcp.tool()
@@ -86,7 +197,8 @@ async def analyze_pipeline(
         "--max-depth", str(max_depth),
         "--console-lines", str(console_lines),
     ]
-    return await asyncio.to_thread(_run_tool, args, 180)
+    key = ("analyze_pipeline", build_url, max_depth, console_lines)
+    return await _run_tool_cached(key, build_url, args, 180)
 
 
 @mcp.tool()
@@ -112,7 +224,8 @@ async def get_downstream_tree(
         "--format", output_format,
         "--max-depth", str(max_depth),
     ]
-    return await asyncio.to_thread(_run_tool, args, 120)
+    key = ("get_downstream_tree", build_url, max_depth, output_format)
+    return await _run_tool_cached(key, build_url, args, 120)
 
 
 @mcp.tool()
@@ -140,7 +253,8 @@ async def get_test_results(
     ]
     if build_number is not None:
         args.extend(["--build", str(build_number)])
-    return await asyncio.to_thread(_run_tool, args, 120)
+    key = ("get_test_results", job_path, build_number, mode)
+    return await _run_tool_cached(key, _job_build_url(job_path, build_number), args, 120)
 
 
 @mcp.tool()
@@ -171,7 +285,8 @@ async def analyze_test_results(
     if build_number is not None:
         fetch_args.extend(["--build", str(build_number)])
 
-    fetched = await asyncio.to_thread(_run_tool, fetch_args, 120)
+    key = ("get_test_results", job_path, build_number, "summary")
+    fetched = await _run_tool_cached(key, _job_build_url(job_path, build_number), fetch_args, 120)
     if fetched.startswith("Error"):
         return fetched
 
@@ -188,7 +303,7 @@ async def analyze_test_results(
         ]
         if failures_only:
             analyze_args.append("--failures-only")
-        return await asyncio.to_thread(_run_tool, analyze_args, 60)
+        return await _run_tool(analyze_args, 60)
     finally:
         os.unlink(tmp.name)
 
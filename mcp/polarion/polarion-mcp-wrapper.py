@@ -11,6 +11,11 @@ Enhancements over base polarion-mcp:
 - get_test_steps: Fetch test step content (step text + expected results)
 - get_test_case_summary: Get setup, description, and step titles in one call
 - Increased timeout for large requests (30s vs 8s)
+- Bulk writes: test records are uploaded in chunks over a bounded thread pool,
+  with per-record error attribution
+- Auto-pagination: list tools can fetch every page in one call, prefetching
+  pages concurrently once meta.total is known, with field projection and a
+  compact summary mode
 
 Copyright Red Hat, Inc.
 SPDX-License-Identifier: Apache-2.0
@@ -23,6 +28,7 @@ import sys
 import json
 import re
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 # Suppress SSL warnings
@@ -62,6 +68,204 @@ requests.get = _patched_get
 requests.post = _patched_post
 
 
+# Bulk write tuning (records per POST, concurrent requests per tool call)
+UPLOAD_CHUNK_SIZE = int(os.getenv("POLARION_UPLOAD_CHUNK_SIZE", "50"))
+MAX_CONCURRENCY = int(os.getenv("POLARION_MAX_CONCURRENCY", "4"))
+
+_POINTER_INDEX = re.compile(r'^/data/(\d+)')
+
+
+PAGE_SIZE_MAX = 100  # Polarion REST caps page[size] at 100
+
+
+def _parse_fields(fields, field_map):
+    """
+    Resolve a comma-separated output field list against field_map.
+
+    field_map maps output keys to Polarion attribute names. Returns the
+    selected output keys (all keys when fields is empty) or raises ValueError
+    naming the unknown fields.
+    """
+    if not fields:
+        return list(field_map)
+    selected = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = [f for f in selected if f not in field_map]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; available: {', '.join(field_map)}")
+    return selected
+
+
+def _project(item, field_map, selected, defaults=None):
+    """Flatten a JSON:API resource to {"id", *selected} using field_map."""
+    attrs = item.get('attributes', {})
+    defaults = defaults or {}
+    row = {"id": item.get('id', '').split('/')[-1]}
+    for key in selected:
+        row[key] = attrs.get(field_map[key], defaults.get(key, ''))
+    return row
+
+
+def _count_by(rows, key):
+    counts = {}
+    for row in rows:
+        value = row.get(key) or 'unknown'
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def _fetch_all_pages(session, url, params, headers, max_items=0, max_concurrency=0):
+    """
+    GET every page of a Polarion collection.
+
+    Page 1 is fetched first. When it carries meta.total, the remaining pages
+    are requested concurrently over a bounded pool; otherwise pages are read
+    sequentially until a short page. max_items > 0 stops early.
+
+    Returns (items, total, error). error is set when a page fails; items then
+    holds the pages read before the failure.
+    """
+    def get_page(number):
+        resp = session.get(
+            url, params={**params, 'page[size]': PAGE_SIZE_MAX, 'page[number]': number},
+            headers=headers, timeout=30
+        )
+        if resp.status_code != 200:
+            return None, None, f"HTTP {resp.status_code}: {resp.text[:300]}"
+        body = resp.json()
+        return body.get('data', []), body.get('meta', {}).get('total'), None
+
+    items, total, error = get_page(1)
+    if error:
+        return [], 0, error
+
+    if total is not None:
+        target = min(total, max_items) if max_items else total
+        last_page = -(-target // PAGE_SIZE_MAX)
+        pages = _map_bounded(get_page, list(range(2, last_page + 1)), max_concurrency or MAX_CONCURRENCY)
+        for page_items, _, page_error in pages:
+            if page_error:
+                error = page_error
+                break
+            items.extend(page_items)
+    else:
+        number = 1
+        page_items = items
+        while len(page_items) == PAGE_SIZE_MAX and not (max_items and len(items) >= max_items):
+            number += 1
+            page_items, _, error = get_page(number)
+            if error:
+                break
+            items.extend(page_items)
+        total = len(items)
+
+    if max_items:
+        items = items[:max_items]
+    return items, total, error
+
+
+def _chunks(items, size):
+    """Split items into consecutive lists of at most size elements."""
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _map_bounded(fn, items, max_workers):
+    """Apply fn to every item over a bounded thread pool, preserving input order."""
+    if len(items) <= 1 or max_workers <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+def _error_detail(response):
+    return f"HTTP {response.status_code} - {response.text[:200]}"
+
+
+def _is_validation_error(response):
+    """True for 4xx: Polarion refused the request without writing any of it."""
+    return 400 <= response.status_code < 500
+
+
+def _rejected_indices(response):
+    """
+    Map a JSON:API error response to indices in the request's data array.
+
+    Polarion reports per-item problems as errors[].source.pointer values like
+    "/data/3/relationships/testCase". Returns {index: message}; empty when the
+    errors cannot be attributed to individual items.
+    """
+    try:
+        errors = response.json().get('errors', [])
+    except ValueError:
+        return {}
+    rejected = {}
+    for err in errors:
+        match = _POINTER_INDEX.match(((err or {}).get('source') or {}).get('pointer', ''))
+        if not match:
+            return {}
+        detail = err.get('detail') or err.get('title') or 'rejected'
+        rejected[int(match.group(1))] = f"HTTP {response.status_code} - {str(detail)[:200]}"
+    return rejected
+
+
+def _post_data(session, url, items, headers):
+    """POST items as a JSON:API data array. Returns (response, None) or (None, error)."""
+    try:
+        return session.post(url, json={'data': items}, headers=headers, timeout=30), None
+    except requests.RequestException as e:
+        return None, f"request failed - {e}"
+
+
+def _post_bulk(session, url, items, headers):
+    """
+    POST items as one JSON:API data array, attributing any failure per item.
+
+    Returns a list of None (written) or an error string, aligned with items.
+    When Polarion rejects the request as invalid (4xx), items named in
+    errors[].source.pointer are marked failed and the rest are resubmitted
+    once as a batch. If the failure cannot be attributed, items are posted
+    one at a time so each gets its own status. Server errors (5xx) and
+    transport failures (connection error, timeout) are not retried, since
+    Polarion may already have written the request; every item it carried
+    is marked failed.
+    """
+    resp, error = _post_data(session, url, items, headers)
+    if error:
+        return [error] * len(items)
+    if resp.status_code in (200, 201, 204):
+        return [None] * len(items)
+    if len(items) == 1 or not _is_validation_error(resp):
+        return [_error_detail(resp)] * len(items)
+
+    outcome = [None] * len(items)
+    remaining = list(range(len(items)))
+    rejected = _rejected_indices(resp)
+    if rejected and len(rejected) < len(items):
+        for idx, message in rejected.items():
+            if idx < len(outcome):
+                outcome[idx] = message
+        remaining = [i for i in remaining if i not in rejected]
+        retry, error = _post_data(session, url, [items[i] for i in remaining], headers)
+        if error:
+            for idx in remaining:
+                outcome[idx] = error
+            return outcome
+        if retry.status_code in (200, 201, 204):
+            return outcome
+        if not _is_validation_error(retry):
+            for idx in remaining:
+                outcome[idx] = _error_detail(retry)
+            return outcome
+
+    for idx in remaining:
+        single, error = _post_data(session, url, [items[idx]], headers)
+        if error:
+            outcome[idx] = error
+        elif single.status_code not in (200, 201, 204):
+            outcome[idx] = _error_detail(single)
+    return outcome
+
+
 def _register_enhanced_tools():
     """Register additional tools on the existing MCP server instance."""
     from polarion_mcp.server import mcp, polarion_client
@@ -274,8 +478,66 @@ def _register_enhanced_tools():
     # READ TOOLS - Test Runs and Plans
     # ===================================================================
 
+    TEST_RUN_FIELDS = {
+        "title": "title", "status": "status", "created": "created",
+        "updated": "updated", "is_template": "isTemplate",
+    }
+    PLAN_FIELDS = {
+        "name": "name", "status": "status", "created": "created",
+        "due_date": "dueDate", "start_date": "startDate",
+    }
+    RECORD_FIELDS = {
+        "test_case": "testCaseURI", "result": "result",
+        "executed": "executed", "comment": "comment",
+    }
+
+    def _list_collection(project_id, collection, field_map, key, query, limit, page_number,
+                         fetch_all, max_results, fields, summary, defaults=None):
+        """Shared page/auto-paginate/summary flow behind the list tools."""
+        # Summary mode only counts statuses, so fetch nothing else
+        selected = ['status'] if summary else _parse_fields(fields, field_map)
+        api_url = f"{POLARION_BASE_URL}/rest/v1/projects/{project_id}/{collection}"
+        params = {f'fields[{collection}]': ','.join(['id'] + [field_map[f] for f in selected])}
+        if query:
+            params['query'] = query
+        hdrs = polarion_client._headers()
+
+        if fetch_all or summary:
+            items, total, error = _fetch_all_pages(
+                polarion_client.session, api_url, params, hdrs, max_items=max_results
+            )
+            if error and not items:
+                return {"status": "error", "message": error}
+            result = {"status": "success" if not error else "partial", "project_id": project_id, "total": total}
+            if error:
+                result["error"] = error
+        else:
+            params.update({'page[size]': min(limit, PAGE_SIZE_MAX), 'page[number]': page_number})
+            response = polarion_client.session.get(api_url, params=params, headers=hdrs, timeout=30)
+            if response.status_code != 200:
+                return {"status": "error", "message": f"HTTP {response.status_code}: {response.text[:300]}"}
+            data = response.json()
+            items = data.get('data', [])
+            result = {
+                "status": "success",
+                "project_id": project_id,
+                "total": data.get('meta', {}).get('total', len(items)),
+                "page": page_number,
+                "page_size": min(limit, PAGE_SIZE_MAX),
+            }
+
+        rows = [_project(item, field_map, selected, defaults) for item in items]
+        result["count"] = len(rows)
+        if summary:
+            result["by_status"] = _count_by(rows, 'status')
+        else:
+            result[key] = rows
+        return result
+
     @mcp.tool()
-    def list_polarion_test_runs(project_id: str, query: str = "", limit: int = 20, page_number: int = 1) -> str:
+    def list_polarion_test_runs(project_id: str, query: str = "", limit: int = 20, page_number: int = 1,
+                                fetch_all: bool = False, max_results: int = 0, fields: str = "",
+                                summary: bool = False) -> str:
         """
         <purpose>List and filter test runs in a Polarion project</purpose>
 
@@ -284,6 +546,7 @@ def _register_enhanced_tools():
         - List test runs by status (finished, inprogress, open)
         - Search test runs by title or other criteria
         - Get an overview of test execution for a project
+        - Fetch every test run of a release in one call (fetch_all=True)
         </when_to_use>
 
         <parameters>
@@ -292,59 +555,29 @@ def _register_enhanced_tools():
           Examples: "status:finished", "plannedin.KEY:ACM_2_16", "title:ServerFoundation"
         - limit: Optional. Max results per page (default 20, max 100)
         - page_number: Optional. Page number for pagination (default 1)
+        - fetch_all: Optional. Return all matching runs; ignores limit/page_number (default False)
+        - max_results: Optional. With fetch_all/summary, stop after this many runs (default 0 = no cap)
+        - fields: Optional. Comma-separated output fields to return (id is always included).
+          Available: title, status, created, updated, is_template (default: all)
+        - summary: Optional. Return only run counts by status instead of the runs (implies fetch_all; fields is ignored)
         </parameters>
 
-        <output>List of test runs with ID, title, status, and dates</output>
+        <output>List of test runs with ID, title, status, and dates, or counts by status in summary mode</output>
         """
         try:
             polarion_client._ensure_token()
-            api_url = f"{POLARION_BASE_URL}/rest/v1/projects/{project_id}/testruns"
-
-            params = {
-                'page[size]': min(limit, 100),
-                'page[number]': page_number,
-                'fields[testruns]': 'id,title,status,created,updated,isTemplate'
-            }
-            if query:
-                params['query'] = query
-
-            response = polarion_client.session.get(
-                api_url, params=params, headers=polarion_client._headers(), timeout=30
+            result = _list_collection(
+                project_id, 'testruns', TEST_RUN_FIELDS, 'test_runs', query, limit, page_number,
+                fetch_all, max_results, fields, summary, defaults={"is_template": False}
             )
-
-            if response.status_code != 200:
-                return json.dumps({"status": "error", "message": f"HTTP {response.status_code}: {response.text[:300]}"})
-
-            data = response.json()
-            runs = []
-            for item in data.get('data', []):
-                attrs = item.get('attributes', {})
-                runs.append({
-                    "id": item.get('id', '').split('/')[-1],
-                    "title": attrs.get('title', ''),
-                    "status": attrs.get('status', ''),
-                    "created": attrs.get('created', ''),
-                    "updated": attrs.get('updated', ''),
-                    "is_template": attrs.get('isTemplate', False)
-                })
-
-            total = data.get('meta', {}).get('total', len(runs))
-
-            return json.dumps({
-                "status": "success",
-                "project_id": project_id,
-                "total": total,
-                "page": page_number,
-                "page_size": min(limit, 100),
-                "count": len(runs),
-                "test_runs": runs
-            }, indent=2)
+            return json.dumps(result, indent=2)
 
         except Exception as e:
             return json.dumps({"status": "error", "message": f"Failed to list test runs: {str(e)}"})
 
     @mcp.tool()
-    def get_polarion_test_run_info(project_id: str, test_run_id: str, include_records: bool = False) -> str:
+    def get_polarion_test_run_info(project_id: str, test_run_id: str, include_records: bool = False,
+                                   record_fields: str = "", max_records: int = 0) -> str:
         """
         <purpose>Get detailed test run info including pass/fail/blocked statistics</purpose>
 
@@ -357,7 +590,11 @@ def _register_enhanced_tools():
         <parameters>
         - project_id: Required. Project ID (e.g., "RHACM4K")
         - test_run_id: Required. Test run ID (e.g., "ACM-TestRun-2024-01")
-        - include_records: Optional. Include individual test case results (default False)
+        - include_records: Optional. Include individual test case results (default False).
+          Without it only the result field is fetched, so statistics stay cheap on large runs.
+        - record_fields: Optional. Comma-separated record fields to return with include_records.
+          Available: test_case, result, executed, comment (default: all)
+        - max_records: Optional. Stop after this many records (default 0 = all)
         </parameters>
 
         <output>Test run details with statistics and optional test records</output>
@@ -389,25 +626,18 @@ def _register_enhanced_tools():
                 "finished_on": attrs.get('finishedOn', ''),
             }
 
-            # Get test records for statistics (paginate, max 100 per page)
-            records_url = f"{base}/testrecords"
-            records_data = []
-            page = 1
-            while True:
-                rec_resp = polarion_client.session.get(
-                    records_url,
-                    params={'page[size]': 100, 'page[number]': page, 'fields[testrecords]': 'result,comment,executed,testCaseURI'},
-                    headers=polarion_client._headers(), timeout=30
-                )
-                if rec_resp.status_code != 200:
-                    break
-                page_data = rec_resp.json().get('data', [])
-                if not page_data:
-                    break
-                records_data.extend(page_data)
-                if len(page_data) < 100:
-                    break
-                page += 1
+            # Get test records for statistics. Summary-only calls fetch just
+            # the result field; pages after the first are prefetched concurrently.
+            selected = _parse_fields(record_fields, RECORD_FIELDS) if include_records else []
+            if 'result' not in selected:
+                selected.append('result')
+            records_data, _, records_error = _fetch_all_pages(
+                polarion_client.session, f"{base}/testrecords",
+                {'fields[testrecords]': ','.join(RECORD_FIELDS[f] for f in selected)},
+                polarion_client._headers(), max_items=max_records
+            )
+            if records_error:
+                result['records_error'] = records_error
 
             if records_data:
                 stats = {"passed": 0, "failed": 0, "blocked": 0, "other": 0, "total": 0}
@@ -429,12 +659,9 @@ def _register_enhanced_tools():
                         stats['other'] += 1
 
                     if include_records:
-                        records.append({
-                            "test_case": rec_attrs.get('testCaseURI', ''),
-                            "result": result_id,
-                            "executed": rec_attrs.get('executed', ''),
-                            "comment": rec_attrs.get('comment', '')
-                        })
+                        record = {key: rec_attrs.get(RECORD_FIELDS[key], '') for key in selected}
+                        record['result'] = result_id
+                        records.append(record)
 
                 stats['pass_rate'] = round(stats['passed'] / stats['total'] * 100, 1) if stats['total'] > 0 else 0.0
                 result['statistics'] = stats
@@ -448,7 +675,9 @@ def _register_enhanced_tools():
             return json.dumps({"status": "error", "message": f"Failed to get test run: {str(e)}"})
 
     @mcp.tool()
-    def list_polarion_plans(project_id: str, query: str = "", status: str = "", limit: int = 20, page_number: int = 1) -> str:
+    def list_polarion_plans(project_id: str, query: str = "", status: str = "", limit: int = 20, page_number: int = 1,
+                            fetch_all: bool = False, max_results: int = 0, fields: str = "",
+                            summary: bool = False) -> str:
         """
         <purpose>List and search test plans in a Polarion project</purpose>
 
@@ -465,13 +694,17 @@ def _register_enhanced_tools():
         - status: Optional. Filter by status: "open" or "closed"
         - limit: Optional. Max results per page (default 20, max 100)
         - page_number: Optional. Page number for pagination (default 1)
+        - fetch_all: Optional. Return all matching plans; ignores limit/page_number (default False)
+        - max_results: Optional. With fetch_all/summary, stop after this many plans (default 0 = no cap)
+        - fields: Optional. Comma-separated output fields to return (id is always included).
+          Available: name, status, created, due_date, start_date (default: all)
+        - summary: Optional. Return only plan counts by status instead of the plans (implies fetch_all; fields is ignored)
         </parameters>
 
-        <output>List of plans with ID, name, status, and dates</output>
+        <output>List of plans with ID, name, status, and dates, or counts by status in summary mode</output>
         """
         try:
             polarion_client._ensure_token()
-            api_url = f"{POLARION_BASE_URL}/rest/v1/projects/{project_id}/plans"
 
             query_parts = []
             if query:
@@ -479,46 +712,15 @@ def _register_enhanced_tools():
             if status:
                 query_parts.append(f'status:{status}')
 
-            params = {
-                'page[size]': min(limit, 100),
-                'page[number]': page_number,
-                'fields[plans]': 'id,name,status,created,updated,dueDate,startDate'
-            }
-            if query_parts:
-                params['query'] = ' AND '.join(query_parts)
-
-            response = polarion_client.session.get(
-                api_url, params=params, headers=polarion_client._headers(), timeout=30
+            result = _list_collection(
+                project_id, 'plans', PLAN_FIELDS, 'plans', ' AND '.join(query_parts), limit, page_number,
+                fetch_all, max_results, fields, summary
             )
-
-            if response.status_code != 200:
-                return json.dumps({"status": "error", "message": f"HTTP {response.status_code}: {response.text[:300]}"})
-
-            data = response.json()
-            plans = []
-            for item in data.get('data', []):
-                attrs = item.get('attributes', {})
-                plan_id = item.get('id', '').split('/')[-1]
-                plans.append({
-                    "id": plan_id,
-                    "name": attrs.get('name', plan_id),
-                    "status": attrs.get('status', ''),
-                    "created": attrs.get('created', ''),
-                    "due_date": attrs.get('dueDate', ''),
-                    "start_date": attrs.get('startDate', ''),
-                })
-
-            total = data.get('meta', {}).get('total', len(plans))
-
-            return json.dumps({
-                "status": "success",
-                "project_id": project_id,
-                "total": total,
-                "page": page_number,
-                "page_size": min(limit, 100),
-                "count": len(plans),
-                "plans": plans
-            }, indent=2)
+            # Plans without a name display their ID
+            for plan in result.get('plans', []):
+                if 'name' in plan and not plan['name']:
+                    plan['name'] = plan['id']
+            return json.dumps(result, indent=2)
 
         except Exception as e:
             return json.dumps({"status": "error", "message": f"Failed to list plans: {str(e)}"})
@@ -670,7 +872,7 @@ def _register_enhanced_tools():
             return json.dumps({"status": "error", "message": f"Failed to update setup: {str(e)}"})
 
     @mcp.tool()
-    def update_polarion_test_steps(project_id: str, work_item_id: str, steps_json: str) -> str:
+    def update_polarion_test_steps(project_id: str, work_item_id: str, steps_json: str, max_concurrency: int = 0) -> str:
         """
         <purpose>Create or update test steps on a Polarion test case</purpose>
 
@@ -686,13 +888,14 @@ def _register_enhanced_tools():
         - work_item_id: Required. Work item ID (e.g., "RHACM4K-61733")
         - steps_json: Required. JSON array of steps, each with "step_html" and "expected_result_html".
           Example: [{"step_html": "<p><b>Step Title</b></p><p>Details</p>", "expected_result_html": "<p>Expected</p>"}]
+        - max_concurrency: Optional. PATCH requests in flight at once (default: POLARION_MAX_CONCURRENCY or 4)
         </parameters>
 
         <output>Success/failure with count of steps written</output>
 
         <behavior>
         - If NO steps exist: Creates all steps via POST (bulk creation).
-        - If steps ALREADY exist: PATCHes each existing step in-place (1-indexed).
+        - If steps ALREADY exist: PATCHes each existing step in-place (1-indexed), several at a time.
           If new count > existing: updates existing steps, reports extras could not be added.
           If new count < existing: updates provided steps, extra existing steps remain unchanged.
           If counts match: all steps updated.
@@ -758,11 +961,9 @@ def _register_enhanced_tools():
 
             else:
                 # STEPS EXIST: PATCH each step in-place (1-indexed)
-                updated = 0
-                errors = []
                 patchable = min(len(steps), existing_count)
 
-                for idx in range(patchable):
+                def patch_step(idx):
                     step = steps[idx]
                     step_index = idx + 1  # Polarion test steps are 1-indexed
 
@@ -785,9 +986,15 @@ def _register_enhanced_tools():
                     )
 
                     if patch_resp.status_code in (200, 204):
-                        updated += 1
-                    else:
-                        errors.append(f"Step {step_index}: HTTP {patch_resp.status_code} - {patch_resp.text[:200]}")
+                        return None
+                    return f"Step {step_index}: {_error_detail(patch_resp)}"
+
+                # Steps are independent resources, so PATCHes are pipelined
+                outcomes = _map_bounded(
+                    patch_step, list(range(patchable)), max_concurrency or MAX_CONCURRENCY
+                )
+                errors = [o for o in outcomes if o is not None]
+                updated = patchable - len(errors)
 
                 result = {
                     "status": "success" if not errors else "partial",
@@ -914,7 +1121,7 @@ def _register_enhanced_tools():
             return json.dumps({"status": "error", "message": f"Failed to create test run: {str(e)}"})
 
     @mcp.tool()
-    def upload_polarion_test_results(project_id: str, test_run_id: str, results_json: str) -> str:
+    def upload_polarion_test_results(project_id: str, test_run_id: str, results_json: str, chunk_size: int = 0, max_concurrency: int = 0) -> str:
         """
         <purpose>Upload test execution results to an existing Polarion test run</purpose>
 
@@ -930,9 +1137,18 @@ def _register_enhanced_tools():
         - results_json: Required. JSON array of results:
           [{"test_case_id": "RHACM4K-61726", "result": "passed", "comment": "optional"}]
           Valid results: "passed", "failed", "blocked"
+        - chunk_size: Optional. Records per POST (default: POLARION_UPLOAD_CHUNK_SIZE or 50)
+        - max_concurrency: Optional. Chunks in flight at once (default: POLARION_MAX_CONCURRENCY or 4)
         </parameters>
 
-        <output>Upload summary with success/failure count</output>
+        <output>Upload summary with success/failure count and the test case IDs that failed</output>
+
+        <behavior>
+        Records are sent in chunks as one "data" array per POST. If Polarion
+        rejects a chunk, the failing records are identified from the error
+        pointers (or by posting the chunk record-by-record) so that valid
+        records in the same chunk are still written.
+        </behavior>
 
         <warning>WRITE operation - adds/updates test records in a test run.</warning>
         """
@@ -949,8 +1165,10 @@ def _register_enhanced_tools():
             except json.JSONDecodeError as e:
                 return json.dumps({"status": "error", "message": f"Invalid results_json: {e}"})
 
-            uploaded = 0
             errors = []
+            records = []
+            record_tc_ids = []
+            executed = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
 
             for res in results:
                 tc_id = res.get('test_case_id', '')
@@ -966,41 +1184,50 @@ def _register_enhanced_tools():
 
                 attrs = {
                     'result': result_val,
-                    'executed': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+                    'executed': executed
                 }
 
                 if comment:
                     attrs['comment'] = {'type': 'text/html', 'value': f'<p>{comment}</p>'}
 
-                payload = {
-                    'data': [{
-                        'type': 'testrecords',
-                        'attributes': attrs,
-                        'relationships': {
-                            'testCase': {
-                                'data': {
-                                    'type': 'workitems',
-                                    'id': full_tc_id
-                                }
+                records.append({
+                    'type': 'testrecords',
+                    'attributes': attrs,
+                    'relationships': {
+                        'testCase': {
+                            'data': {
+                                'type': 'workitems',
+                                'id': full_tc_id
                             }
                         }
-                    }]
-                }
+                    }
+                })
+                record_tc_ids.append(tc_id)
 
-                resp = polarion_client.session.post(
-                    api_url, json=payload, headers=hdrs, timeout=30
-                )
+            chunks = _chunks(records, chunk_size or UPLOAD_CHUNK_SIZE)
+            outcomes = _map_bounded(
+                lambda chunk: _post_bulk(polarion_client.session, api_url, chunk, hdrs),
+                chunks,
+                max_concurrency or MAX_CONCURRENCY,
+            )
 
-                if resp.status_code in (200, 201, 204):
+            uploaded = 0
+            failed_ids = []
+            flat = [outcome for chunk_outcome in outcomes for outcome in chunk_outcome]
+            for tc_id, error in zip(record_tc_ids, flat):
+                if error is None:
                     uploaded += 1
                 else:
-                    errors.append(f"{tc_id}: HTTP {resp.status_code} - {resp.text[:200]}")
+                    failed_ids.append(tc_id)
+                    errors.append(f"{tc_id}: {error}")
 
             return json.dumps({
                 "status": "success" if not errors else "partial",
                 "test_run_id": test_run_id,
                 "uploaded": uploaded,
                 "total": len(results),
+                "requests": len(chunks),
+                "failed_test_case_ids": failed_ids,
                 "errors": errors if errors else [],
                 "message": f"Uploaded {uploaded}/{len(results)} test results"
             }, indent=2)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Unit tests for acm-search-proxy.py stdio handling.
+
+MCP stdio transport is newline-delimited JSON: one JSON-RPC message per line.
+"""
+
+import importlib.util
+import io
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROXY_PATH = Path(__file__).resolve().parent.parent / "acm-search-proxy.py"
+
+
+def _load_proxy():
+    spec = importlib.util.spec_from_file_location("acm_search_proxy", PROXY_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+proxy = _load_proxy()
+
+
+def _lines(*messages):
+    return "".join(json.dumps(m) + "\n" for m in messages).encode("utf-8")
+
+
+def _request(req_id, method, **params):
+    return {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params}
+
+
+class FakeSession:
+    """Stands in for SSESession; answers every request with its echoed arguments."""
+
+    inflight = 0
+
+    def __init__(self):
+        self.init_messages = []
+        self.requests = []
+        self.notifications = []
+
+    def request(self, msg):
+        self.requests.append(msg)
+        if msg["method"] == "tools/list":
+            return {"jsonrpc": "2.0", "id": 99, "result": {"tools": []}}
+        arguments = msg["params"].get("arguments", {})
+        return {"jsonrpc": "2.0", "id": 99,
+                "result": {"content": [{"type": "text", "text": json.dumps(arguments)}]}}
+
+    def notify(self, msg):
+        self.notifications.append(msg)
+
+
+@pytest.fixture
+def stdio(monkeypatch, capsysbinary):
+    """Feed stdin and collect the replies written to stdout."""
+
+    def feed(data):
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+    def replies():
+        raw = capsysbinary.readouterr().out.decode("utf-8")
+        assert not raw or raw.endswith("\n")
+        return [json.loads(line) for line in raw.splitlines()]
+
+    return feed, replies
+
+
+class TestFraming:
+    """Tests for read_message / write_message."""
+
+    def test_reads_one_message_per_line_and_skips_blank_lines(self, stdio):
+        feed, _ = stdio
+        feed(b'{"id": 1}\n\r\n\n{"id": 2}')
+
+        assert proxy.read_message() == {"id": 1}
+        assert proxy.read_message() == {"id": 2}
+        assert proxy.read_message() is None
+
+    def test_writes_single_line(self, stdio):
+        _, replies = stdio
+        proxy.write_message({"id": 1, "result": {"text": "a\nb"}})
+        proxy.write_message({"id": 2, "result": {}})
+
+        first, second = replies()
+        assert (first["id"], second["id"]) == (1, 2)
+        assert first["result"]["text"] == "a\nb"
+
+
+class TestResidentProxy:
+    """Drives ResidentProxy.serve() over line-delimited stdio."""
+
+    def test_handshake_and_calls(self, stdio):
+        feed, replies = stdio
+        session = FakeSession()
+        query = {"name": "query_database", "arguments": {"sql": "SELECT 1"}}
+        feed(_lines(
+            _request(1, "initialize"),
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            _request(2, "tools/list"),
+            _request(3, "tools/call", **query),
+        ))
+        proxy.ResidentProxy(session, proxy.ResultCache(ttl=60)).serve()
+
+        by_id = {r["id"]: r for r in replies()}
+        assert set(by_id) == {1, 2, 3}
+        assert [m["method"] for m in session.init_messages] == ["initialize", "notifications/initialized"]
+        assert [m["method"] for m in session.notifications] == ["notifications/initialized"]
+        tools = [t["name"] for t in by_id[2]["result"]["tools"]]
+        assert proxy.STATS_TOOL["name"] in tools
+        assert json.loads(by_id[3]["result"]["content"][0]["text"]) == {"sql": "SELECT 1"}
+
+    def test_repeated_query_is_served_from_cache(self, stdio):
+        feed, replies = stdio
+        session = FakeSession()
+        query = {"name": "query_database", "arguments": {"sql": "SELECT 1"}}
+        cache = proxy.ResultCache(ttl=60)
+        feed(_lines(_request(1, "tools/call", **query)))
+        proxy.ResidentProxy(session, cache).serve()
+        feed(_lines(_request(2, "tools/call", **query),
+                    _request(3, "tools/call", name=proxy.STATS_TOOL["name"], arguments={})))
+        proxy.ResidentProxy(session, cache).serve()
+
+        by_id = {r["id"]: r for r in replies()}
+        assert len(session.requests) == 1
+        assert by_id[2]["result"] == by_id[1]["result"]
+        stats = json.loads(by_id[3]["result"]["content"][0]["text"])
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_upstream_error_is_reported_per_request(self, stdio):
+        feed, replies = stdio
+        session = FakeSession()
+        session.request = lambda msg: (_ for _ in ()).throw(ConnectionError("SSE stream closed"))
+        feed(_lines(_request(7, "tools/call", name="list_tables", arguments={})))
+        proxy.ResidentProxy(session).serve()
+
+        [reply] = replies()
+        assert reply["id"] == 7
+        assert "SSE stream closed" in reply["error"]["message"]
+
+
+    def test_client_response_is_forwarded_without_waiting(self, stdio):
+        feed, replies = stdio
+        session = FakeSession()
+        response = {"jsonrpc": "2.0", "id": "srv-1", "result": {"roots": []}}
+        feed(_lines(response))
+
+        proxy.ResidentProxy(session).serve()
+
+        assert session.notifications == [response]
+        assert session.requests == []
+        assert replies() == []
+
+
+class TestConfig:
+    """Tests for environment parsing at import time."""
+
+    def test_malformed_cache_ttl_falls_back(self, monkeypatch):
+        monkeypatch.setenv("ACM_SEARCH_CACHE_TTL", "1m")
+
+        assert _load_proxy().CACHE_TTL == 60.0
+
+
+class TestStubMode:
+    """Runs the script as a subprocess with no deployment marker."""
+
+    def test_stub_answers_line_delimited_requests(self, tmp_path):
+        script = tmp_path / PROXY_PATH.name
+        shutil.copy(PROXY_PATH, script)
+        stdin = _lines(
+            _request(1, "initialize"),
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            _request(2, "tools/list"),
+            _request(3, "tools/call", name="query_database", arguments={}),
+        )
+
+        result = subprocess.run([sys.executable, str(script)], input=stdin,
+                                capture_output=True, timeout=30)
+
+        replies = [json.loads(line) for line in result.stdout.decode("utf-8").splitlines()]
+        assert [r["id"] for r in replies] == [1, 2, 3]
+        assert replies[0]["result"]["serverInfo"]["name"] == "acm-search-proxy"
+        assert replies[2]["result"]["isError"] is True
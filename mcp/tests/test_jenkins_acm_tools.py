@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Unit tests for jenkins-acm-tools.py subprocess handling and memoization.
+
+The upstream jenkins_mcp_server is replaced with a stub module, and the
+jenkins-tools scripts with small inline Python programs.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+TOOLS_PATH = Path(__file__).resolve().parent.parent / "jenkins-acm-tools.py"
+
+
+def _load_tools():
+    upstream = types.ModuleType("jenkins_mcp_server")
+    upstream.mcp = types.SimpleNamespace(tool=lambda: (lambda fn: fn))
+    upstream.get_jenkins_context = lambda: ("https://jenkins.example.com", "user", "token")
+    sys.modules.setdefault("jenkins_mcp_server", upstream)
+    spec = importlib.util.spec_from_file_location("jenkins_acm_tools", TOOLS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+tools = _load_tools()
+
+BUILD_URL = "https://jenkins.example.com/job/qe/job/clc-e2e/42/"
+
+
+def _script(code):
+    return [sys.executable, "-c", code]
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Each test gets its own semaphore and an empty result cache."""
+    monkeypatch.setattr(tools, "_tool_slots", None)
+    monkeypatch.setattr(tools, "_result_cache", type(tools._result_cache)())
+
+
+@pytest.fixture
+def counting_tool(tmp_path):
+    """A tool script that appends to a file on every run and prints its argument."""
+    calls = tmp_path / "calls"
+
+    def args(text="report"):
+        return _script(
+            f"open({str(calls)!r}, 'a').write('x'); print({text!r})"
+        )
+
+    def runs():
+        return len(calls.read_text()) if calls.exists() else 0
+
+    return args, runs
+
+
+@pytest.fixture
+def build_state(monkeypatch):
+    """Stub _fetch_build_finished; returns the list of URLs it was asked about."""
+    state = {"finished": True, "asked": []}
+
+    def fetch(build_url):
+        state["asked"].append(build_url)
+        return state["finished"]
+
+    monkeypatch.setattr(tools, "_fetch_build_finished", fetch)
+    return state
+
+
+class TestRunTool:
+    """Tests for the async _run_tool."""
+
+    def test_returns_stdout(self):
+        assert asyncio.run(tools._run_tool(_script("print('hello')"))) == "hello\n"
+
+    def test_nonzero_exit_is_reported(self):
+        output = asyncio.run(tools._run_tool(_script(
+            "import sys; print('partial'); sys.stderr.write('boom'); sys.exit(3)"
+        )))
+        assert output.startswith("Error (exit 3):")
+        assert "boom" in output and "partial" in output
+
+    def test_missing_executable_is_reported(self, tmp_path):
+        output = asyncio.run(tools._run_tool([str(tmp_path / "no-such-tool")]))
+        assert output.startswith("Error: script not found")
+
+    def test_timeout_kills_the_child(self):
+        started = time.monotonic()
+        output = asyncio.run(tools._run_tool(_script("import time; time.sleep(30)"), timeout=1))
+        assert output == "Error: timed out after 1s"
+        assert time.monotonic() - started < 10
+
+    def test_concurrent_calls_overlap(self):
+        async def run():
+            return await asyncio.gather(*(
+                tools._run_tool(_script("import time; time.sleep(0.5)")) for _ in range(3)
+            ))
+
+        started = time.monotonic()
+        asyncio.run(run())
+        assert time.monotonic() - started < 1.4
+
+    def test_semaphore_bounds_concurrency(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(tools, "MAX_CONCURRENT_TOOLS", 2)
+        running = tmp_path / "running"
+        running.mkdir()
+        code = (
+            "import os, time\n"
+            f"d = {str(running)!r}\n"
+            "marker = os.path.join(d, str(os.getpid()))\n"
+            "open(marker, 'w').close()\n"
+            "peak = 0\n"
+            "for _ in range(10):\n"
+            "    peak = max(peak, len(os.listdir(d)))\n"
+            "    time.sleep(0.03)\n"
+            "os.remove(marker)\n"
+            "print(peak)\n"
+        )
+
+        async def run():
+            return await asyncio.gather(*(tools._run_tool(_script(code)) for _ in range(5)))
+
+        peaks = [int(out) for out in asyncio.run(run())]
+        assert max(peaks) <= 2
+
+    def test_cancellation_kills_the_child(self, tmp_path):
+        pid_file = tmp_path / "pid"
+        code = (
+            "import os, time\n"
+            f"open({str(pid_file)!r}, 'w').write(str(os.getpid()))\n"
+            "time.sleep(30)\n"
+        )
+
+        async def run():
+            task = asyncio.create_task(tools._run_tool(_script(code)))
+            for _ in range(200):
+                if pid_file.exists() and pid_file.read_text():
+                    break
+                await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return int(pid_file.read_text())
+
+        pid = asyncio.run(run())
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+
+class TestRunToolCached:
+    """Tests for _run_tool_cached memoization rules."""
+
+    def test_finished_numbered_build_is_cached(self, counting_tool, build_state):
+        args, runs = counting_tool
+        key = ("analyze_pipeline", BUILD_URL)
+        first = asyncio.run(tools._run_tool_cached(key, BUILD_URL, args(), 30))
+        second = asyncio.run(tools._run_tool_cached(key, BUILD_URL, args(), 30))
+        assert first == second == "report\n"
+        assert runs() == 1
+
+    def test_in_progress_build_is_not_cached(self, counting_tool, build_state):
+        args, runs = counting_tool
+        build_state["finished"] = False
+        key = ("analyze_pipeline", BUILD_URL)
+        asyncio.run(tools._run_tool_cached(key, BUILD_URL, args(), 30))
+        asyncio.run(tools._run_tool_cached(key, BUILD_URL, args(), 30))
+        assert runs() == 2
+
+    @pytest.mark.parametrize("permalink", ["lastBuild", "lastCompletedBuild", "lastFailedBuild"])
+    def test_permalink_is_not_cached(self, counting_tool, build_state, permalink):
+        args, runs = counting_tool
+        url = f"https://jenkins.example.com/job/qe/job/clc-e2e/{permalink}/"
+        key = ("analyze_pipeline", url)
+        asyncio.run(tools._run_tool_cached(key, url, args(), 30))
+        asyncio.run(tools._run_tool_cached(key, url, args(), 30))
+        assert runs() == 2
+        assert build_state["asked"] == []
+
+    def test_latest_build_request_is_not_cached(self, counting_tool, build_state):
+        args, runs = counting_tool
+        key = ("get_test_results", "qe/clc-e2e", None, "summary")
+        asyncio.run(tools._run_tool_cached(key, None, args(), 30))
+        asyncio.run(tools._run_tool_cached(key, None, args(), 30))
+        assert runs() == 2
+
+    def test_error_output_is_not_cached(self, build_state):
+        key = ("analyze_pipeline", BUILD_URL)
+        failing = _script("import sys; sys.exit(1)")
+        assert asyncio.run(tools._run_tool_cached(key, BUILD_URL, failing, 30)).startswith("Error")
+        assert key not in tools._result_cache
+
+    def test_entries_expire_after_ttl(self, counting_tool, build_state, monkeypatch):
+        args, runs = counting_tool
+        key = ("analyze_pipeline", BUILD_URL)
+        asyncio.run(tools._run_tool_cached(key, BUILD_URL, args(), 30))
+        monkeypatch.setattr(tools, "RESULT_CACHE_TTL", 0)
+        asyncio.run(tools._run_tool_cached(key, BUILD_URL, args(), 30))
+        assert runs() == 2
+
+    def test_cache_is_bounded(self, counting_tool, build_state, monkeypatch):
+        args, _ = counting_tool
+        monkeypatch.setattr(tools, "RESULT_CACHE_SIZE", 2)
+        for build in (1, 2, 3):
+            url = f"https://jenkins.example.com/job/qe/job/clc-e2e/{build}/"
+            asyncio.run(tools._run_tool_cached(("analyze_pipeline", url), url, args(), 30))
+        assert len(tools._result_cache) == 2
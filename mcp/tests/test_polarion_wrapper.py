@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit tests for polarion-mcp-wrapper.py bulk writes.
+
+_post_bulk is exercised against a fake session; nothing reaches Polarion.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+import requests
+
+WRAPPER_PATH = Path(__file__).resolve().parent.parent / "polarion" / "polarion-mcp-wrapper.py"
+
+
+def _load_wrapper():
+    spec = importlib.util.spec_from_file_location("polarion_mcp_wrapper", WRAPPER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+wrapper = _load_wrapper()
+
+URL = "https://polarion.example.com/polarion/rest/v1/projects/ACM/testruns/run-1/testrecords"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self._body = body
+        self.text = json.dumps(body) if body is not None else "<html>error</html>"
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("not JSON")
+        return self._body
+
+
+class FakeSession:
+    """Answers each POST with the next scripted response (or raises it)."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.posts = []
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.posts.append([item["id"] for item in json["data"]])
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _items(n):
+    return [{"id": f"rec-{i}", "type": "testrecords"} for i in range(n)]
+
+
+def _pointer_errors(*indices):
+    return {"errors": [
+        {"source": {"pointer": f"/data/{i}/relationships/testCase"}, "detail": f"bad case {i}"}
+        for i in indices
+    ]}
+
+
+class TestPostBulk:
+    """Tests for _post_bulk error attribution and retries."""
+
+    def test_all_accepted(self):
+        session = FakeSession(FakeResponse(201, {"data": []}))
+        assert wrapper._post_bulk(session, URL, _items(3), {}) == [None, None, None]
+        assert len(session.posts) == 1
+
+    def test_pointer_attributed_rejects_retry_the_rest_once(self):
+        session = FakeSession(FakeResponse(400, _pointer_errors(1, 3)), FakeResponse(201, {"data": []}))
+        outcome = wrapper._post_bulk(session, URL, _items(4), {})
+        assert outcome[0] is None and outcome[2] is None
+        assert outcome[1] == "HTTP 400 - bad case 1"
+        assert outcome[3] == "HTTP 400 - bad case 3"
+        assert session.posts[1] == ["rec-0", "rec-2"]
+        assert len(session.posts) == 2
+
+    def test_unattributed_validation_error_posts_items_one_by_one(self):
+        session = FakeSession(
+            FakeResponse(400, {"errors": [{"detail": "invalid"}]}),
+            FakeResponse(201, {"data": []}),
+            FakeResponse(400, {"errors": [{"detail": "invalid"}]}),
+        )
+        outcome = wrapper._post_bulk(session, URL, _items(2), {})
+        assert outcome[0] is None
+        assert outcome[1].startswith("HTTP 400")
+        assert session.posts == [["rec-0", "rec-1"], ["rec-0"], ["rec-1"]]
+
+    def test_transport_error_marks_every_item_without_retry(self):
+        session = FakeSession(requests.ConnectionError("reset by peer"))
+        outcome = wrapper._post_bulk(session, URL, _items(3), {})
+        assert outcome == ["request failed - reset by peer"] * 3
+        assert len(session.posts) == 1
+
+    def test_server_error_marks_every_item_without_retry(self):
+        session = FakeSession(FakeResponse(502))
+        outcome = wrapper._post_bulk(session, URL, _items(3), {})
+        assert len(session.posts) == 1
+        assert all(message.startswith("HTTP 502") for message in outcome)
+
+    def test_server_error_on_retry_is_not_split(self):
+        session = FakeSession(FakeResponse(422, _pointer_errors(0)), FakeResponse(503))
+        outcome = wrapper._post_bulk(session, URL, _items(3), {})
+        assert outcome[0] == "HTTP 422 - bad case 0"
+        assert outcome[1].startswith("HTTP 503") and outcome[2].startswith("HTTP 503")
+        assert len(session.posts) == 2
+
+
+class TestChunks:
+    """Tests for _chunks."""
+
+    @pytest.mark.parametrize("size, expected", [(2, [[0, 1], [2, 3], [4]]), (0, [[0], [1], [2], [3], [4]])])
+    def test_splits_in_order(self, size, expected):
+        assert wrapper._chunks(list(range(5)), size) == expected